@@ -0,0 +1 @@
+""" benchmark namespace """
@@ -0,0 +1,106 @@
+""" HTTP client of the benchmark activity """
+
+import http.client
+import json
+from typing import Any, Optional, Union
+
+
+class BenchmarkClient:
+    """
+    Minimal HTTP/1.1 client of the tracking server REST API, one per benchmark client thread.  The connection is
+    kept alive between requests so the benchmark measures the server rather than connection setup.
+
+    Parameters
+    ----------
+    host: str
+        The host of the tracking server.
+    port: int
+        The port of the tracking server.
+    timeout: float
+        Seconds to wait for a response.
+    """
+
+    host: str
+    port: int
+    timeout: float
+
+    def __init__(self, host: str, port: int, timeout: float = 60.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._connection: Optional[http.client.HTTPConnection] = None
+
+    def request(self, method: str, path: str, body: Optional[Union[bytes, dict]] = None) -> tuple[int, bytes]:
+        """
+        Sends a request and reads the whole response.
+
+        Parameters
+        ----------
+        method: str
+            The HTTP method.
+        path: str
+            The path (and query) of the request.
+        body: Optional[Union[bytes, dict]]
+            The body of the request; dictionaries are sent as JSON.
+
+        Returns
+        -------
+            The status and the body of the response.
+        """
+
+        headers: dict[str, str] = {}
+        if isinstance(body, dict):
+            body = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        reused: bool = self._connection is not None
+        try:
+            return self._send(method=method, path=path, body=body, headers=headers)
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            self.close()
+            if not reused:
+                raise
+        # The server closed the idle keep-alive connection (e.g. its keep-alive timeout elapsed).
+        return self._send(method=method, path=path, body=body, headers=headers)
+
+    def _send(self, method: str, path: str, body: Optional[bytes], headers: dict[str, str]) -> tuple[int, bytes]:
+        """Sends a request on the kept alive connection, opening it if needed."""
+
+        if self._connection is None:
+            self._connection = http.client.HTTPConnection(host=self.host, port=self.port, timeout=self.timeout)
+        try:
+            self._connection.request(method=method, url=path, body=body, headers=headers)
+            response: http.client.HTTPResponse = self._connection.getresponse()
+            return response.status, response.read()
+        except Exception:
+            self.close()
+            raise
+
+    def call(self, method: str, endpoint: str, body: Optional[dict] = None) -> Any:
+        """
+        Calls a REST API endpoint of mlflow.
+
+        Parameters
+        ----------
+        method: str
+            The HTTP method.
+        endpoint: str
+            The endpoint below `/api/2.0/mlflow/`, e.g. `runs/create`.
+        body: Optional[dict]
+            The request.
+
+        Returns
+        -------
+            The decoded response.
+        """
+
+        status, content = self.request(method=method, path=f"/api/2.0/mlflow/{endpoint}", body=body)
+        if status >= 400:
+            raise RuntimeError(f"{method} {endpoint} failed with status {status}: {content[:1000]!r}")
+        return json.loads(content)
+
+    def close(self) -> None:
+        """Closes the connection."""
+
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
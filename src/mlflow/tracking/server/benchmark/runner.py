@@ -0,0 +1,275 @@
+""" Synthetic workloads driven against a running tracking server """
+
+import http.client
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from ..common.network import wait_for_port
+from ..contracts.dto.workload_result import WorkloadResult
+from ..contracts.types.benchmark_workload import BenchmarkWorkload
+from .client import BenchmarkClient
+
+# Metrics sent per `runs/log-batch` request.
+BATCH_SIZE: int = 100
+
+# Runs returned per `runs/search` request.
+SEARCH_PAGE_SIZE: int = 100
+
+ARTIFACTS_PATH: str = "/api/2.0/mlflow-artifacts/artifacts"
+
+
+# pylint: disable=too-many-arguments,too-many-instance-attributes
+class BenchmarkRunner:
+    """
+    Drives synthetic workloads against a tracking server with concurrent clients and measures them.
+
+    Each client logs to a run of its own (like concurrent training jobs) in an experiment created for the
+    benchmark, over a kept alive connection.  Workloads are measured one after the other:
+
+    * `log_metric`: `runs/log-metric` requests.
+    * `log_batch`: `runs/log-batch` requests of `BATCH_SIZE` metrics.
+    * `search_runs`: `runs/search` requests of the benchmark experiment.
+    * `artifact_upload`: proxied uploads of `artifact_size` bytes.
+    * `artifact_download`: proxied downloads of an artifact of `artifact_size` bytes.
+
+    Parameters
+    ----------
+    host: str
+        The host of the tracking server.
+    port: int
+        The port of the tracking server.
+    workloads: list[BenchmarkWorkload]
+        The workloads to measure, in order.
+    clients: int
+        Concurrent clients.
+    requests: int
+        Requests sent per workload, shared by the clients.
+    artifact_size: int
+        Size (bytes) of the uploaded and downloaded artifacts.
+    client_factory: Callable[[str, int], BenchmarkClient]
+        Builds the client of each thread from the host and port, defaults to `BenchmarkClient`.
+    """
+
+    host: str
+    port: int
+    workloads: list[BenchmarkWorkload]
+    clients: int
+    requests: int
+    artifact_size: int
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        workloads: list[BenchmarkWorkload],
+        *,
+        clients: int = 8,
+        requests: int = 1000,
+        artifact_size: int = 1024 * 1024,
+        client_factory: Callable[[str, int], BenchmarkClient] = BenchmarkClient,
+    ):
+        if clients < 1:
+            raise ValueError(f"clients must be positive, received: {clients}")
+        if requests < 1:
+            raise ValueError(f"requests must be positive, received: {requests}")
+        if artifact_size < 0:
+            raise ValueError(f"artifact_size must not be negative, received: {artifact_size}")
+
+        self.host = host
+        self.port = port
+        self.workloads = [BenchmarkWorkload(workload) for workload in workloads]
+        self.clients = clients
+        self.requests = requests
+        self.artifact_size = artifact_size
+        self.client_factory = client_factory
+        self._experiment_id: Optional[str] = None
+        self._run_ids: list[str] = []
+        self._payload: bytes = os.urandom(artifact_size)
+
+    def wait_until_ready(self, timeout: float = 120.0, abort: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Waits until the tracking server listens and answers its health check.
+
+        Parameters
+        ----------
+        timeout: float
+            Seconds to wait.
+        abort: Optional[Callable[[], bool]]
+            Optional check evaluated between attempts; waiting stops early when it returns `True`.
+
+        Returns
+        -------
+            `True` if the server is ready.
+        """
+
+        deadline: float = time.monotonic() + timeout
+        if not wait_for_port(host=self.host, port=self.port, timeout=timeout, abort=abort):
+            return False
+        client: BenchmarkClient = self.client_factory(self.host, self.port)
+        try:
+            while time.monotonic() < deadline and not (abort is not None and abort()):
+                try:
+                    if client.request(method="GET", path="/health")[0] == 200:
+                        return True
+                except OSError:
+                    pass
+                time.sleep(0.25)
+            return False
+        finally:
+            client.close()
+
+    def run(self) -> dict:
+        """
+        Measures the workloads.
+
+        Returns
+        -------
+            The report: the mlflow version of the server and the result of each workload.
+        """
+
+        client: BenchmarkClient = self.client_factory(self.host, self.port)
+        try:
+            status, version = client.request(method="GET", path="/version")
+            self._experiment_id = client.call(
+                method="POST", endpoint="experiments/create", body={"name": f"benchmark-{uuid.uuid4().hex}"}
+            )["experiment_id"]
+            self._run_ids = [
+                client.call(
+                    method="POST",
+                    endpoint="runs/create",
+                    body={"experiment_id": self._experiment_id, "start_time": int(time.time() * 1000)},
+                )["run"]["info"]["run_id"]
+                for _ in range(self.clients)
+            ]
+            if BenchmarkWorkload.ARTIFACT_DOWNLOAD in self.workloads:
+                for run_id in self._run_ids:
+                    self._check(
+                        client.request(method="PUT", path=self._artifact(run_id, "download"), body=self._payload)
+                    )
+        finally:
+            client.close()
+
+        results: dict[str, dict] = {}
+        for workload in self.workloads:
+            result: WorkloadResult = self.measure(workload=workload)
+            print(f"[benchmark] {workload.value}: {json.dumps(result.to_dict())}", flush=True)
+            results[workload.value] = result.to_dict()
+        return {
+            "mlflow_version": version.decode("utf-8").strip() if status == 200 else None,
+            "clients": self.clients,
+            "requests": self.requests,
+            "artifact_size": self.artifact_size,
+            "workloads": results,
+        }
+
+    @staticmethod
+    def _check(response: tuple[int, bytes]) -> None:
+        """Raises if a setup request failed."""
+
+        if response[0] >= 400:
+            raise RuntimeError(f"benchmark setup failed with status {response[0]}: {response[1][:1000]!r}")
+
+    def _artifact(self, run_id: str, name: str) -> str:
+        """Returns the proxied artifact path of a file of a benchmark run."""
+
+        return f"{ARTIFACTS_PATH}/{self._experiment_id}/{run_id}/artifacts/benchmark/{name}.bin"
+
+    def _send(self, workload: BenchmarkWorkload, client: BenchmarkClient, run_id: str, index: int) -> int:
+        """
+        Sends a single request of a workload.
+
+        Returns
+        -------
+            The status of the response.
+        """
+
+        timestamp: int = int(time.time() * 1000)
+        if workload == BenchmarkWorkload.LOG_METRIC:
+            metric: dict = {"key": "loss", "value": 1.0 / (index + 1), "timestamp": timestamp, "step": index}
+            return client.request(
+                method="POST", path="/api/2.0/mlflow/runs/log-metric", body={"run_id": run_id, **metric}
+            )[0]
+        if workload == BenchmarkWorkload.LOG_BATCH:
+            metrics: list[dict] = [
+                {"key": f"metric_{key}", "value": float(index), "timestamp": timestamp, "step": index}
+                for key in range(BATCH_SIZE)
+            ]
+            return client.request(
+                method="POST", path="/api/2.0/mlflow/runs/log-batch", body={"run_id": run_id, "metrics": metrics}
+            )[0]
+        if workload == BenchmarkWorkload.SEARCH_RUNS:
+            return client.request(
+                method="POST",
+                path="/api/2.0/mlflow/runs/search",
+                body={"experiment_ids": [self._experiment_id], "max_results": SEARCH_PAGE_SIZE},
+            )[0]
+        if workload == BenchmarkWorkload.ARTIFACT_UPLOAD:
+            return client.request(method="PUT", path=self._artifact(run_id, f"upload-{index}"), body=self._payload)[0]
+        status, content = client.request(method="GET", path=self._artifact(run_id, "download"))
+        return status if len(content) == self.artifact_size else 500
+
+    def _drive(self, workload: BenchmarkWorkload, number: int) -> tuple[list[float], int]:
+        """
+        Sends the share of the requests of a client.
+
+        Parameters
+        ----------
+        workload: BenchmarkWorkload
+            The workload.
+        number: int
+            The number of the client.
+
+        Returns
+        -------
+            The latency of each request and the number of failed requests.
+        """
+
+        client: BenchmarkClient = self.client_factory(self.host, self.port)
+        latencies: list[float] = []
+        errors: int = 0
+        try:
+            for index in range(number, self.requests, self.clients):
+                started: float = time.perf_counter()
+                try:
+                    status: int = self._send(
+                        workload=workload, client=client, run_id=self._run_ids[number], index=index
+                    )
+                except (OSError, http.client.HTTPException):
+                    status = 0
+                latencies.append(time.perf_counter() - started)
+                if not 0 < status < 400:
+                    errors += 1
+        finally:
+            client.close()
+        return latencies, errors
+
+    def measure(self, workload: BenchmarkWorkload) -> WorkloadResult:
+        """
+        Measures a single workload with concurrent clients.
+
+        Parameters
+        ----------
+        workload: BenchmarkWorkload
+            The workload.
+        """
+
+        started: float = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.clients) as executor:
+            shares: list[tuple[list[float], int]] = list(
+                executor.map(lambda number: self._drive(workload=workload, number=number), range(self.clients))
+            )
+        elapsed: float = time.perf_counter() - started
+
+        result: WorkloadResult = WorkloadResult(
+            workload=workload,
+            latencies=[latency for latencies, _ in shares for latency in latencies],
+            errors=sum(errors for _, errors in shares),
+            elapsed=elapsed,
+        )
+        if workload in [BenchmarkWorkload.ARTIFACT_UPLOAD, BenchmarkWorkload.ARTIFACT_DOWNLOAD]:
+            result.transferred = (result.requests - result.errors) * self.artifact_size
+        return result
@@ -0,0 +1,74 @@
+""" Helpers for recording the progress of resumable maintenance activities """
+
+import hashlib
+import json
+import os
+from typing import Optional
+
+
+def store_key(*uris: str) -> str:
+    """
+    Identifies the stores a checkpoint belongs to, without persisting their credentials.
+
+    Parameters
+    ----------
+    uris: str
+        The uris of the stores.
+    """
+
+    return hashlib.sha256("\n".join(uris).encode("utf-8")).hexdigest()
+
+
+def load_checkpoint(path: Optional[str], key: str) -> Optional[dict]:
+    """
+    Loads the progress recorded by `save_checkpoint`.
+
+    Parameters
+    ----------
+    path: Optional[str]
+        The checkpoint, progress is not recorded if `None`.
+    key: str
+        The `store_key` of the stores the activity works on.
+
+    Returns
+    -------
+        The recorded progress, or `None` if there is none for these stores.
+    """
+
+    if path is None or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as file:
+        state: dict = json.load(file)
+    if state.get("store") != key:
+        print(f"Ignoring checkpoint {path} of a different store")
+        return None
+    return state
+
+
+def save_checkpoint(path: Optional[str], key: str, state: dict) -> None:
+    """
+    Atomically records the progress of an activity.
+
+    Parameters
+    ----------
+    path: Optional[str]
+        The checkpoint, progress is not recorded if `None`.
+    key: str
+        The `store_key` of the stores the activity works on.
+    state: dict
+        The progress, JSON serializable.
+    """
+
+    if path is None:
+        return
+    temporary: str = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump({**state, "store": key}, file)
+    os.replace(temporary, path)
+
+
+def clear_checkpoint(path: Optional[str]) -> None:
+    """Removes the checkpoint of a completed activity."""
+
+    if path is not None and os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,113 @@
+""" Prometheus metrics of the wrapper itself """
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+# Directory shared by every process writing prometheus metrics (prometheus_client multiprocess mode).
+MULTIPROCESS_DIR_ENV_VAR: str = "PROMETHEUS_MULTIPROC_DIR"
+
+# Maintenance activities take seconds to hours.
+ACTIVITY_BUCKETS: tuple[float, ...] = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200, float("inf"))
+
+
+def prepare_multiprocess_directory(path: str, reset: bool = True) -> str:
+    """
+    Prepares the directory prometheus metrics of all processes (wrapper, servers and their gunicorn workers)
+    are written to and aggregated from, and exports it to the environment of this and launched processes.
+
+    Must be called before `prometheus_client` is imported.
+
+    Parameters
+    ----------
+    path: str
+        The directory to use.
+    reset: bool
+        If `True` metric files of a previous run are removed, which would otherwise be aggregated with (and
+        corrupt) the values of this run.
+
+    Returns
+    -------
+        The absolute path of the directory.
+    """
+
+    directory: Path = Path(path).resolve()
+    directory.mkdir(parents=True, exist_ok=True)
+    if reset:
+        for stale in directory.glob("*.db"):
+            stale.unlink()
+    os.environ[MULTIPROCESS_DIR_ENV_VAR] = str(directory)
+    return str(directory)
+
+
+# pylint: disable=too-few-public-methods
+class WrapperMetrics:
+    """
+    Metrics of the wrapper: restarts of supervised processes, forwarded and dropped log lines, the duration
+    of maintenance activities and requests rejected by admission control.  When a multiprocess directory is
+    prepared first, the values are exported alongside the request metrics of the tracking server on its
+    `/metrics` endpoint.
+    """
+
+    def __init__(self):
+        # pylint: disable=import-outside-toplevel
+        from prometheus_client import CollectorRegistry, Counter, Histogram
+
+        self.registry = CollectorRegistry()
+        self.process_restarts = Counter(
+            "process_restarts",
+            "Restarts of crashed supervised processes",
+            ["process"],
+            namespace="mlflow_wrapper",
+            registry=self.registry,
+        )
+        self.log_lines_forwarded = Counter(
+            "log_lines_forwarded",
+            "Output lines of launched processes forwarded by the wrapper",
+            ["process"],
+            namespace="mlflow_wrapper",
+            registry=self.registry,
+        )
+        self.log_lines_dropped = Counter(
+            "log_lines_dropped",
+            "Output lines of launched processes dropped by the wrapper (rate limit or slow output)",
+            ["process"],
+            namespace="mlflow_wrapper",
+            registry=self.registry,
+        )
+        self.activity_duration = Histogram(
+            "activity_duration_seconds",
+            "Duration of maintenance activities (garbage collection, database upgrade)",
+            ["activity", "status"],
+            namespace="mlflow_wrapper",
+            buckets=ACTIVITY_BUCKETS,
+            registry=self.registry,
+        )
+        self.requests_rejected = Counter(
+            "requests_rejected",
+            "Requests rejected by admission control (rate limit or overload)",
+            ["reason", "priority"],
+            namespace="mlflow_wrapper",
+            registry=self.registry,
+        )
+
+    @contextmanager
+    def time_activity(self, activity: str) -> Iterator[None]:
+        """
+        Records the duration of the enclosed activity, labelled `success` or `failure`.
+
+        Parameters
+        ----------
+        activity: str
+            The name of the activity.
+        """
+
+        began: float = time.monotonic()
+        status: str = "failure"
+        try:
+            yield
+            status = "success"
+        finally:
+            self.activity_duration.labels(activity=activity, status=status).observe(time.monotonic() - began)
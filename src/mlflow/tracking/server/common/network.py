@@ -0,0 +1,67 @@
+""" Helpers for working with network endpoints """
+
+import socket
+import time
+from typing import Callable, Optional
+
+
+def loopback_address(address: str) -> str:
+    """
+    Maps a listen address onto an address a local client can connect to.
+
+    Parameters
+    ----------
+    address: str
+        The address a server binds to.
+
+    Returns
+    -------
+        The loopback address for wildcard binds, otherwise the address itself.
+    """
+
+    if address in ["", "0.0.0.0"]:
+        return "127.0.0.1"
+    if address == "::":
+        return "::1"
+    return address
+
+
+def wait_for_port(
+    host: str,
+    port: int,
+    timeout: float = 120.0,
+    interval: float = 0.25,
+    abort: Optional[Callable[[], bool]] = None,
+) -> bool:
+    """
+    Waits until a TCP port accepts connections.
+
+    Parameters
+    ----------
+    host: str
+        The host to connect to.
+    port: int
+        The port to connect to.
+    timeout: float
+        Seconds to wait before giving up.
+    interval: float
+        Seconds to wait between connection attempts.
+    abort: Optional[Callable[[], bool]]
+        Optional check evaluated between attempts; waiting stops early when it returns `True`
+        (for example when the process expected to open the port has exited).
+
+    Returns
+    -------
+        `True` if the port accepted a connection within the timeout, otherwise `False`.
+    """
+
+    deadline: float = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((host, port), timeout=interval):
+                return True
+        except OSError:
+            pass
+        if (abort is not None and abort()) or time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
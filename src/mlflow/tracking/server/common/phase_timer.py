@@ -0,0 +1,66 @@
+""" Startup phase timing """
+
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class PhaseTimer:
+    """
+    Records how long each startup phase takes and when the service became ready.
+
+    Parameters
+    ----------
+    started_at: Optional[float]
+        The monotonic time startup began, defaults to now.
+    """
+
+    started_at: float
+    phases: list[tuple[str, float]]
+
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = time.monotonic() if started_at is None else started_at
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Times the enclosed block as a named phase.  The phase is recorded even if the block raises.
+
+        Parameters
+        ----------
+        name: str
+            The name the phase is reported under.
+        """
+
+        began: float = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.monotonic() - began))
+
+    def elapsed(self) -> float:
+        """Returns the seconds since startup began."""
+
+        return time.monotonic() - self.started_at
+
+    def report(self, milestone: str = "ready") -> str:
+        """
+        Summarizes the recorded phases.
+
+        Parameters
+        ----------
+        milestone: str
+            The name of the point in time the report is generated at.
+
+        Returns
+        -------
+            A multi line report of each phase duration and the total time to the milestone.
+        """
+
+        lines: list[str] = ["Startup phases:"]
+        width: int = max([len(name) for name, _ in self.phases] + [len(milestone)])
+        for name, duration in self.phases:
+            lines.append(f"  {name.ljust(width)} {duration:8.3f}s")
+        lines.append(f"  {milestone.ljust(width)} {self.elapsed():8.3f}s (total)")
+        return "\n".join(lines)
@@ -1,10 +1,133 @@
 """ Helpers for working with Anaconda Enterprise Secrets """
 
 import os
-from pathlib import Path
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
+# Where Anaconda Enterprise mounts the secrets of the user.
+AE5_USER_SECRETS_PATH: str = "/var/run/secrets/user_credentials/"
 
-def load_ae5_user_secrets(secrets_path: str = "/var/run/secrets/user_credentials/", silent: bool = True) -> None:
+# Secret files read at a time.
+SECRETS_READ_CONCURRENCY: int = 8
+
+
+def _read_secret(path: str) -> str:
+    """Reads the value of a secret file."""
+
+    with open(file=path, mode="r", encoding="utf-8") as file:
+        return file.read()
+
+
+# pylint: disable=too-few-public-methods
+class SecretsLoader:
+    """
+    Loads Anaconda Enterprise user secrets (one file per secret, named after the environment variable) into the
+    environment of the current process.
+
+    * The directory is listed once per load (`os.scandir`), the file status coming with the listing.
+    * Secrets are remembered with the modification time, size and inode of their file: unchanged secrets are
+      restored from memory, only new or rotated files are read, `concurrency` at a time.
+    * Secrets whose file was removed are removed from the environment.
+
+    Parameters
+    ----------
+    secrets_path: str
+        The file system location of the secrets.
+    concurrency: int
+        Secret files read at a time.
+    """
+
+    secrets_path: str
+    concurrency: int
+
+    def __init__(self, secrets_path: str = AE5_USER_SECRETS_PATH, concurrency: int = SECRETS_READ_CONCURRENCY):
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be positive, received: {concurrency}")
+
+        self.secrets_path = secrets_path
+        self.concurrency = concurrency
+        self._secrets: dict[str, tuple[tuple[int, int, int], str]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _scan(self) -> Optional[dict[str, tuple[str, tuple[int, int, int]]]]:
+        """Lists the secret files with their status, or returns `None` if the secrets path does not exist."""
+
+        files: dict[str, tuple[str, tuple[int, int, int]]] = {}
+        try:
+            with os.scandir(self.secrets_path) as entries:
+                for entry in entries:
+                    # Kubernetes mounts secrets as symbolic links to the current version of the volume.
+                    if not entry.is_file():
+                        continue
+                    try:
+                        status: os.stat_result = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    files[entry.name] = (entry.path, (status.st_mtime_ns, status.st_size, status.st_ino))
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return files
+
+    def load(self) -> Optional[list[str]]:
+        """
+        Loads the secrets into the environment of the current process.
+
+        Returns
+        -------
+            The names of the secrets which were added, changed or removed since the previous load, or `None` if the
+            secrets path does not exist.
+        """
+
+        with self._lock:
+            files: Optional[dict[str, tuple[str, tuple[int, int, int]]]] = self._scan()
+            if files is None:
+                return None
+
+            stale: list[str] = [
+                name
+                for name, (_, version) in files.items()
+                if name not in self._secrets or self._secrets[name][0] != version
+            ]
+            values: list[str] = []
+            if stale:
+                with ThreadPoolExecutor(max_workers=min(self.concurrency, len(stale))) as executor:
+                    values = list(executor.map(_read_secret, [files[name][0] for name in stale]))
+
+            changed: list[str] = []
+            for name, value in zip(stale, values):
+                if name not in self._secrets or self._secrets[name][1] != value:
+                    changed.append(name)
+                self._secrets[name] = (files[name][1], value)
+            for name in [name for name in self._secrets if name not in files]:
+                del self._secrets[name]
+                os.environ.pop(name, None)
+                changed.append(name)
+            for name, (_, value) in self._secrets.items():
+                os.environ[name] = value
+            return sorted(changed)
+
+
+# Loaders by secrets path, so repeated loads only read new or rotated secrets.
+_loaders: dict[str, SecretsLoader] = {}
+
+
+def ae5_user_secrets_loader(secrets_path: str = AE5_USER_SECRETS_PATH) -> SecretsLoader:
+    """
+    Returns the loader of a secrets path shared by the current process.
+
+    Parameters
+    ----------
+    secrets_path: str
+        The file system location of the secrets.
+    """
+
+    if secrets_path not in _loaders:
+        _loaders[secrets_path] = SecretsLoader(secrets_path=secrets_path)
+    return _loaders[secrets_path]
+
+
+def load_ae5_user_secrets(secrets_path: str = AE5_USER_SECRETS_PATH, silent: bool = True) -> None:
     """
     Load Anaconda Enterprise user secrets from the file system into environment values for the current session.
 
@@ -17,16 +140,79 @@ def load_ae5_user_secrets(secrets_path: str = "/var/run/secrets/user_credentials
         Flag for controlling logging.
     """
 
-    base_path: Path = Path(secrets_path)
-    if base_path.exists():
-        if not silent:
-            print(f"Loading environment variables from {base_path}:")
-        for secret in base_path.glob("*"):
-            if secret.is_file():
-                if not silent:
-                    print(secret.name)
-                with open(file=secret, mode="r", encoding="utf-8") as file:
-                    os.environ[secret.name] = file.read()
+    changed: Optional[list[str]] = ae5_user_secrets_loader(secrets_path=secrets_path).load()
+    if silent:
+        return
+    if changed is None:
+        print(f"Skipping loading AE5 user secrets, specified secrets path not found: {secrets_path}")
     else:
-        if not silent:
-            print(f"Skipping loading AE5 user secrets, specified secrets path not found: {secrets_path}")
+        print(f"Loaded environment variables from {secrets_path}: {', '.join(changed) or 'unchanged'}")
+
+
+class SecretsWatcher:
+    """
+    Polls the secrets path and reloads rotated secrets into the environment of the wrapper, so credentials can be
+    rotated without restarting the pod.
+
+    Parameters
+    ----------
+    loader: SecretsLoader
+        The loader of the watched secrets.
+    interval: float
+        Seconds between polls.
+    on_change: Callable[[list[str]], None]
+        Called with the names of the added, changed or removed secrets after a reload.
+    """
+
+    loader: SecretsLoader
+    interval: float
+
+    def __init__(self, loader: SecretsLoader, interval: float, on_change: Callable[[list[str]], None]):
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, received: {interval}")
+
+        self.loader = loader
+        self.interval = interval
+        self.on_change = on_change
+        self._stop_requested: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll(self) -> list[str]:
+        """
+        Reloads the secrets once, notifying `on_change` if any changed.
+
+        Returns
+        -------
+            The names of the added, changed or removed secrets.
+        """
+
+        changed: list[str] = self.loader.load() or []
+        if changed:
+            print(f"Reloaded AE5 user secrets: {', '.join(changed)}", flush=True)
+            self.on_change(changed)
+        return changed
+
+    def run(self) -> None:
+        """Polls until stopped."""
+
+        while not self._stop_requested.wait(timeout=self.interval):
+            try:
+                self.poll()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                # A failing poll (e.g. a volume being remounted) is retried on the next interval.
+                print(f"Failed to reload AE5 user secrets: {error}", flush=True)
+
+    def start(self) -> None:
+        """Starts polling in a background thread."""
+
+        self._stop_requested.clear()
+        self._thread = threading.Thread(target=self.run, name="secrets-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops polling and waits for an ongoing reload to finish."""
+
+        self._stop_requested.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
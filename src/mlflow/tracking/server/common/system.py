@@ -0,0 +1,68 @@
+""" Helpers for inspecting the host the wrapper is running on """
+
+import os
+from pathlib import Path
+from typing import Optional
+
+
+def _cgroup_cpu_limit(cgroup_root: str) -> Optional[int]:
+    """
+    Reads the container cpu quota (cgroup v2 first, then v1) and returns it as a whole number of cpus.
+
+    Parameters
+    ----------
+    cgroup_root: str
+        The mount point of the cgroup file system.
+
+    Returns
+    -------
+        The number of cpus the quota allows (rounded up), or `None` when no quota is set.
+    """
+
+    root: Path = Path(cgroup_root)
+    candidates: list[tuple[Path, Optional[Path]]] = [
+        (root / "cpu.max", None),
+        (root / "cpu" / "cpu.cfs_quota_us", root / "cpu" / "cpu.cfs_period_us"),
+        (root / "cpu,cpuacct" / "cpu.cfs_quota_us", root / "cpu,cpuacct" / "cpu.cfs_period_us"),
+    ]
+    for quota_path, period_path in candidates:
+        try:
+            if period_path is None:
+                quota, period = quota_path.read_text(encoding="utf-8").split()[:2]
+            else:
+                quota = quota_path.read_text(encoding="utf-8").strip()
+                period = period_path.read_text(encoding="utf-8").strip()
+        except (OSError, ValueError):
+            continue
+        if quota in ("max", "-1") or int(period) <= 0:
+            return None
+        return max(1, -(-int(quota) // int(period)))
+    return None
+
+
+def available_cpu_count(cgroup_root: str = "/sys/fs/cgroup") -> int:
+    """
+    Returns the number of cpus available to this process.
+
+    This honors cpu affinity and container (cgroup) cpu quotas so that an AE5 pod limited to a few cores
+    does not report the core count of the whole node.
+
+    Parameters
+    ----------
+    cgroup_root: str
+        The mount point of the cgroup file system.
+
+    Returns
+    -------
+        The number of usable cpus (always at least one).
+    """
+
+    if hasattr(os, "sched_getaffinity"):
+        count: int = len(os.sched_getaffinity(0))
+    else:
+        count = os.cpu_count() or 1
+
+    limit: Optional[int] = _cgroup_cpu_limit(cgroup_root=cgroup_root)
+    if limit is not None:
+        count = min(count, limit)
+    return max(1, count)
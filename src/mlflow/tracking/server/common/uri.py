@@ -0,0 +1,39 @@
+""" Helpers for working with store and artifact uris """
+
+import os
+from typing import Optional
+from urllib.parse import urlparse
+
+# SQLAlchemy dialects mlflow supports as tracking stores.
+DATABASE_ENGINES: list[str] = ["postgresql", "mysql", "sqlite", "mssql"]
+
+
+def local_path(uri: str) -> Optional[str]:
+    """
+    Returns the file system path of a local uri (plain path or `file://`), or `None` for remote uris.
+
+    Parameters
+    ----------
+    uri: str
+        The uri to inspect.
+    """
+
+    parsed = urlparse(uri)
+    if parsed.scheme == "file":
+        return parsed.path
+    if parsed.scheme == "" or (len(parsed.scheme) == 1 and os.name == "nt"):
+        return uri
+    return None
+
+
+def is_database_uri(uri: str) -> bool:
+    """
+    Checks whether a backend store uri points at a database (e.g. `postgresql+psycopg2://...`).
+
+    Parameters
+    ----------
+    uri: str
+        The backend store uri.
+    """
+
+    return urlparse(uri).scheme.split("+")[0] in DATABASE_ENGINES
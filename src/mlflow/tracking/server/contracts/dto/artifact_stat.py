@@ -0,0 +1,25 @@
+""" Artifact Stat """
+
+from typing import Optional
+
+
+# pylint: disable=too-few-public-methods
+class ArtifactStat:
+    """
+    Artifact Stat (DTO)
+    size: int
+        The size of the file in bytes.
+    etag: str
+        Changes whenever the file is replaced.
+    md5: Optional[str]
+        The hex MD5 digest of the content, if the destination records it.
+    """
+
+    size: int
+    etag: str
+    md5: Optional[str]
+
+    def __init__(self, size: int, etag: str, md5: Optional[str] = None):
+        self.size = size
+        self.etag = etag
+        self.md5 = md5
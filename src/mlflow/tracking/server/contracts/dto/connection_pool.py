@@ -0,0 +1,63 @@
+""" Backend Store Connection Pool """
+
+from typing import Optional
+
+# SQLAlchemy defaults mlflow falls back to when an option is not set.
+DEFAULT_POOL_SIZE: int = 5
+DEFAULT_MAX_OVERFLOW: int = 10
+
+
+# pylint: disable=too-few-public-methods
+class ConnectionPool:
+    """
+    Backend Store Connection Pool (DTO)
+    pool_size: Optional[int]
+        Connections kept open by each process, SQLAlchemy's default (5) if `None`.
+    max_overflow: Optional[int]
+        Connections opened beyond the pool under load, SQLAlchemy's default (10) if `None`.  mlflow only applies
+        positive values, `0` leaves the default in place.
+    pool_recycle: Optional[int]
+        Seconds after which pooled connections are replaced (e.g. before a proxy or firewall drops them).
+    null_pool: bool
+        If `True` connections are not pooled: each request opens and closes its own connection, for stores
+        behind a connection pooler such as pgbouncer.
+    """
+
+    pool_size: Optional[int]
+    max_overflow: Optional[int]
+    pool_recycle: Optional[int]
+    null_pool: bool
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        pool_recycle: Optional[int] = None,
+        null_pool: bool = False,
+    ):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_recycle = pool_recycle
+        self.null_pool = null_pool
+
+    @property
+    def capacity(self) -> Optional[int]:
+        """The most connections a process can hold at once, `None` (unbounded) without pooling."""
+
+        if self.null_pool:
+            return None
+        return (self.pool_size or DEFAULT_POOL_SIZE) + (self.max_overflow or DEFAULT_MAX_OVERFLOW)
+
+    def environment(self) -> dict[str, str]:
+        """Returns the mlflow environment variables configuring the SQLAlchemy engine of the tracking store."""
+
+        environment: dict[str, str] = {}
+        if self.null_pool:
+            environment["MLFLOW_SQLALCHEMYSTORE_POOLCLASS"] = "NullPool"
+        if self.pool_size is not None:
+            environment["MLFLOW_SQLALCHEMYSTORE_POOL_SIZE"] = str(self.pool_size)
+        if self.max_overflow is not None:
+            environment["MLFLOW_SQLALCHEMYSTORE_MAX_OVERFLOW"] = str(self.max_overflow)
+        if self.pool_recycle is not None:
+            environment["MLFLOW_SQLALCHEMYSTORE_POOL_RECYCLE"] = str(self.pool_recycle)
+        return environment
@@ -0,0 +1,57 @@
+""" Database Optimization Report """
+
+from typing import Optional
+
+from .index_recommendation import IndexRecommendation
+
+
+# pylint: disable=too-few-public-methods, too-many-arguments
+class DatabaseOptimizationReport:
+    """
+    Database Optimization Report (DTO)
+    dry_run: bool
+        If `True` nothing was executed and the report describes what would be executed.
+    sampled: Optional[int]
+        Slow statements the recommendations are based on, `None` if no workload could be sampled.
+    tables: dict[str, dict[str, Optional[int]]]
+        The rows of each advised table and, on PostgreSQL, its sequential and index scans since the statistics were
+        last reset, by table.
+    recommendations: list[IndexRecommendation]
+        The recommended indexes, in the order they are created.
+    maintenance: list[tuple[str, Optional[float]]]
+        The maintenance statements (`ANALYZE`, `VACUUM`) and the seconds each took, once executed.
+    """
+
+    dry_run: bool
+    sampled: Optional[int]
+    tables: dict[str, dict[str, Optional[int]]]
+    recommendations: list[IndexRecommendation]
+    maintenance: list[tuple[str, Optional[float]]]
+
+    def __init__(
+        self,
+        dry_run: bool = False,
+        sampled: Optional[int] = None,
+        tables: Optional[dict[str, dict[str, Optional[int]]]] = None,
+        recommendations: Optional[list[IndexRecommendation]] = None,
+        maintenance: Optional[list[tuple[str, Optional[float]]]] = None,
+    ):
+        self.dry_run = dry_run
+        self.sampled = sampled
+        self.tables = tables or {}
+        self.recommendations = recommendations or []
+        self.maintenance = maintenance or []
+
+    def to_dict(self) -> dict:
+        """Returns the report as a JSON serializable dictionary."""
+
+        return {
+            "dry_run": self.dry_run,
+            "sampled": self.sampled,
+            "tables": self.tables,
+            "recommendations": [recommendation.to_dict() for recommendation in self.recommendations],
+            "maintenance": [
+                {"statement": statement, "elapsed": None if elapsed is None else round(elapsed, 3)}
+                for statement, elapsed in self.maintenance
+            ],
+        }
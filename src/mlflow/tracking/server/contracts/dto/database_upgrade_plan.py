@@ -0,0 +1,60 @@
+""" Database Upgrade Plan """
+
+from typing import Optional
+
+from .pending_migration import PendingMigration
+
+
+# pylint: disable=too-few-public-methods, too-many-arguments
+class DatabaseUpgradePlan:
+    """
+    Database Upgrade Plan (DTO)
+    current: Optional[str]
+        The alembic revision of the database, `None` if the schema was never created.
+    target: str
+        The alembic revision of the installed mlflow.
+    migrations: list[PendingMigration]
+        The migrations between the two revisions, in the order they are applied.
+    active_sessions: Optional[int]
+        Other sessions running a statement on the database (PostgreSQL and MySQL), which migrations queue behind.
+    longest_transaction: Optional[float]
+        Seconds the oldest open transaction of another session has been running (PostgreSQL).
+    """
+
+    current: Optional[str]
+    target: str
+    migrations: list[PendingMigration]
+    active_sessions: Optional[int]
+    longest_transaction: Optional[float]
+
+    def __init__(
+        self,
+        current: Optional[str],
+        target: str,
+        migrations: Optional[list[PendingMigration]] = None,
+        active_sessions: Optional[int] = None,
+        longest_transaction: Optional[float] = None,
+    ):
+        self.current = current
+        self.target = target
+        self.migrations = migrations or []
+        self.active_sessions = active_sessions
+        self.longest_transaction = longest_transaction
+
+    @property
+    def estimated_seconds(self) -> float:
+        """The estimated duration of the upgrade."""
+
+        return sum(migration.estimated_seconds for migration in self.migrations)
+
+    def to_dict(self) -> dict:
+        """Returns the plan as a JSON serializable dictionary."""
+
+        return {
+            "current": self.current,
+            "target": self.target,
+            "estimated_seconds": round(self.estimated_seconds, 1),
+            "active_sessions": self.active_sessions,
+            "longest_transaction": None if self.longest_transaction is None else round(self.longest_transaction, 1),
+            "migrations": [migration.to_dict() for migration in self.migrations],
+        }
@@ -0,0 +1,60 @@
+""" Garbage Collection Report """
+
+
+# pylint: disable=too-few-public-methods, too-many-arguments
+class GarbageCollectionReport:
+    """
+    Garbage Collection Report (DTO)
+    dry_run: bool
+        If `True` nothing was deleted and the counts describe what would be deleted.
+    runs: int
+        Runs (metadata and artifacts) permanently deleted.
+    experiments: int
+        Experiments permanently deleted.
+    bytes_freed: int
+        Size of the deleted artifacts.
+    failures: int
+        Runs whose artifacts could not be deleted; they are kept and retried by the next collection.
+    elapsed: float
+        Seconds spent collecting.
+    """
+
+    dry_run: bool
+    runs: int
+    experiments: int
+    bytes_freed: int
+    failures: int
+    elapsed: float
+
+    def __init__(
+        self,
+        *,
+        dry_run: bool = False,
+        runs: int = 0,
+        experiments: int = 0,
+        bytes_freed: int = 0,
+        failures: int = 0,
+        elapsed: float = 0.0,
+    ):
+        self.dry_run = dry_run
+        self.runs = runs
+        self.experiments = experiments
+        self.bytes_freed = bytes_freed
+        self.failures = failures
+        self.elapsed = elapsed
+
+    @property
+    def runs_per_second(self) -> float:
+        """The run collection throughput."""
+
+        return self.runs / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Returns a one line, human readable summary."""
+
+        prefix: str = "[DRY RUN] would delete" if self.dry_run else "deleted"
+        return (
+            f"{prefix} {self.runs} runs and {self.experiments} experiments, "
+            f"{self.bytes_freed} bytes ({self.bytes_freed / (1024 * 1024):.1f} MiB) of artifacts, "
+            f"{self.failures} failures in {self.elapsed:.1f}s ({self.runs_per_second:.1f} runs/s)"
+        )
@@ -0,0 +1,76 @@
+""" Index Recommendation """
+
+from typing import Optional
+
+
+# pylint: disable=too-few-public-methods, too-many-arguments, too-many-instance-attributes
+class IndexRecommendation:
+    """
+    Index Recommendation (DTO)
+    table: str
+        The indexed table.
+    name: str
+        The name of the index.
+    statement: str
+        The statement creating the index.
+    reason: str
+        Why the index is recommended.
+    statements: int
+        Sampled statements (slow queries) the index serves.
+    calls: int
+        Calls of the sampled statements the index serves.
+    total_ms: float
+        Milliseconds the database spent on the sampled statements the index serves.
+    elapsed: Optional[float]
+        The seconds the index took to create, once created.
+    error: Optional[str]
+        Why the index could not be created, if it failed.
+    """
+
+    table: str
+    name: str
+    statement: str
+    reason: str
+    statements: int
+    calls: int
+    total_ms: float
+    elapsed: Optional[float]
+    error: Optional[str]
+
+    def __init__(
+        self,
+        table: str,
+        name: str,
+        statement: str,
+        reason: str,
+        *,
+        statements: int = 0,
+        calls: int = 0,
+        total_ms: float = 0.0,
+        elapsed: Optional[float] = None,
+        error: Optional[str] = None,
+    ):
+        self.table = table
+        self.name = name
+        self.statement = statement
+        self.reason = reason
+        self.statements = statements
+        self.calls = calls
+        self.total_ms = total_ms
+        self.elapsed = elapsed
+        self.error = error
+
+    def to_dict(self) -> dict:
+        """Returns the recommendation as a JSON serializable dictionary."""
+
+        return {
+            "table": self.table,
+            "name": self.name,
+            "statement": self.statement,
+            "reason": self.reason,
+            "statements": self.statements,
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 1),
+            "elapsed": None if self.elapsed is None else round(self.elapsed, 3),
+            "error": self.error,
+        }
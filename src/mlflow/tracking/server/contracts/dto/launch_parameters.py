@@ -1,9 +1,16 @@
 """ MLFlow Tracking Server Supported Launch Parameters """
 
+from typing import Optional, Union
+
 from ..types.activity import ActivityType
+from ..types.benchmark_workload import BenchmarkWorkload
+from ..types.log_format import LogFormat
+from ..types.rate_limit_scope import RateLimitScope
+from ..types.worker_class import WorkerClass
 
 
-# pylint: disable=too-few-public-methods, too-many-arguments
+# pylint: disable=too-few-public-methods, too-many-arguments, too-many-instance-attributes, too-many-locals
+# pylint: disable=too-many-statements
 class LaunchParameters:
     """
     MLFlow Tracking Server Supported Launch Parameters (DTO)
@@ -19,6 +26,232 @@ class LaunchParameters:
         The command activity type to invoke
     dry_run: bool
         For a supporting command activity type, defines whether to commit changes or report only.
+    workers: Optional[Union[int, str]]
+        The number of gunicorn worker processes, or `auto` for one worker per available cpu.
+        When not provided the mlflow default is used.
+    threads: Optional[int]
+        The number of threads per worker.  Requires the `sync` or `gthread` worker class.
+    worker_class: Optional[WorkerClass]
+        The gunicorn worker class (sync, gthread, gevent).
+    timeout: Optional[int]
+        Seconds a worker may be silent before it is killed and restarted.
+    keep_alive: Optional[int]
+        Seconds to wait for requests on a keep-alive connection.
+    max_requests: Optional[int]
+        Number of requests a worker serves before it is recycled.
+    max_requests_jitter: Optional[int]
+        Random jitter added to `max_requests` so workers do not recycle at the same time.
+    internal_port: int
+        The first of the loopback ports the cluster activity starts its process pools on.
+        The write, read and artifact pools listen on consecutive ports starting here.
+    write_workers: Optional[Union[int, str]]
+        Cluster activity worker count for the logging (write) pool.  Defaults to `workers`.
+    read_workers: Optional[Union[int, str]]
+        Cluster activity worker count for the search, UI and registry (read) pool.  Defaults to `workers`.
+    artifact_workers: Optional[Union[int, str]]
+        Worker count for the artifact proxy pool of the cluster activity, or for the dedicated artifact server.
+        Defaults to `workers`.
+    dedicated_artifacts: bool
+        If `True` the server activity launches a second, artifact only, mlflow server so large uploads do not
+        occupy the workers serving tracking metadata.  The tracking server then stops proxying artifacts and
+        points clients at the artifact server.  Experiments created before the switch keep their
+        `mlflow-artifacts:/` location.
+    artifacts_port: int
+        The port the dedicated artifact server listens on.
+    artifacts_uri: Optional[str]
+        The artifact endpoint clients are directed to.  Defaults to the dedicated artifact server address.
+    drain_timeout: float
+        Seconds supervised processes are given to finish in flight requests when stopping before being killed.
+    max_restarts: int
+        Number of crash restarts allowed within `restart_window` before the deployment is failed.
+    restart_window: float
+        Seconds over which crash restarts are counted.
+    log_format: LogFormat
+        The format the output of launched processes is forwarded in (raw, prefixed with the process name, json).
+    log_rate_limit: Optional[float]
+        Maximum lines per second forwarded from launched processes; excess lines are dropped and counted.
+        Unlimited when not provided.
+    embedded: bool
+        If `True` mlflow is served from the wrapper's interpreter with gunicorn's Python API instead of launching
+        `mlflow server`, avoiding a second (and third) interpreter importing mlflow before the port opens.
+    health_port: Optional[int]
+        If provided, the wrapper serves `/livez` and `/readyz` on this port.
+    liveness_interval: float
+        Seconds between liveness probes (launched processes running).
+    readiness_interval: float
+        Seconds between readiness probes (servers answering `/health`, backend store query, artifact
+        destination writable).  Health requests are answered from the cached probe results.
+    probe_timeout: float
+        Seconds a readiness probe waits on a server or the backend store.
+    metrics: bool
+        If `True` the servers export prometheus metrics on `/metrics`: per route request latency histograms of
+        every gunicorn worker plus the wrapper's own metrics (restarts, forwarded log lines, activity durations).
+    metrics_dir: Optional[str]
+        The prometheus multiprocess directory shared by all processes, defaults to a directory in the system
+        temporary directory.  Use the same directory for maintenance activities to export their durations.
+    gc_batch_size: int
+        Deleted runs garbage collected per batch (database backed stores).
+    gc_workers: int
+        Threads deleting run artifacts concurrently during garbage collection (database backed stores).
+    gc_checkpoint: Optional[str]
+        Where garbage collection records its progress so an interrupted collection resumes, defaults to a file
+        in the system temporary directory.
+    gc_max_runs_per_minute: Optional[float]
+        Sustained rate garbage collection deletes runs at; unlimited when not provided.
+    gc_interval: float
+        Seconds between the passes of continuous garbage collection.
+    gc_continuous: bool
+        If `True` deleted runs are garbage collected continuously alongside the server (process and cluster
+        launches), with the same options as the `gc_daemon` activity.
+    db_pool_size: Optional[int]
+        Backend store connections kept open by each tracking server worker (database backed stores).
+    db_max_overflow: Optional[int]
+        Connections each worker may open beyond its pool under load, at least 1 (mlflow ignores 0).
+    db_pool_recycle: Optional[int]
+        Seconds after which pooled connections are replaced.
+    db_null_pool: bool
+        If `True` connections are not pooled, for databases behind a connection pooler such as pgbouncer.
+    db_max_connections: Optional[int]
+        Connections the database allows this deployment; the launch fails if the connection budget (workers
+        times connections per worker, for every server) exceeds it.
+    sqlite_tuning: bool
+        If `True` a `sqlite:///` backend store is switched to write-ahead logging and every connection is tuned
+        (synchronous NORMAL, larger page cache, memory mapped reads, busy timeout).
+    sqlite_single_writer: bool
+        If `True` (with `sqlite_tuning`) run mutations are serialized across all workers, so concurrent loggers
+        queue instead of failing with `database is locked`.
+    sqlite_busy_timeout: int
+        Milliseconds a SQLite connection waits on a locked database before failing.
+    read_cache: bool
+        If `True` each server worker caches the responses of the hot read endpoints (run, experiment and
+        registered model lookups and searches); writes invalidate the cached responses they affect.
+    read_cache_ttl: float
+        Seconds a cached response is served at most.
+    read_cache_size: int
+        Responses cached per worker.
+    read_cache_dir: Optional[str]
+        Directory the servers share cache invalidations through, defaults to a directory in the system
+        temporary directory.
+    metric_buffer: bool
+        If `True` metric logging requests are acknowledged once journaled and written to the store in batches
+        by a background writer in each server worker.
+    metric_buffer_latency: float
+        Seconds a buffered metric waits at most before it is written to the store.
+    metric_buffer_size: int
+        Metrics buffered per worker at most; further requests are written synchronously.
+    metric_buffer_dir: Optional[str]
+        Directory of the metric journals (should be persistent storage), defaults to a directory in the system
+        temporary directory.
+    ingest_gateway: bool
+        If `True` an asyncio front end writes metric, param and tag logging requests to the (PostgreSQL) backend
+        store in batches with asyncpg, forwarding every other request to the tracking server.
+    ingest_gateway_connections: int
+        Backend store connections of the ingest gateway, each writing one batch at a time.
+    ingest_gateway_batch_size: int
+        Rows the ingest gateway writes per batch at most.
+    ingest_gateway_latency: float
+        Seconds a logging request waits at most for further requests to be written with, 0 to only batch
+        requests arriving while the previous batch is written.
+    admission_control: bool
+        If `True` a router in front of the server pools rate limits clients and queues requests by priority
+        (UI and model registry requests ahead of run logging), rejecting requests with `429 Too Many Requests`
+        when overloaded.
+    admission_rate_limit: Optional[float]
+        Requests per second allowed to each rate limited identity, unlimited if `None`.
+    admission_rate_burst: Optional[int]
+        Requests each identity may issue at once after being idle, defaults to one second of requests.
+    admission_rate_limit_by: Optional[list[RateLimitScope]]
+        The identities rate limited (independently) by the rate limit, defaults to the client address.
+    admission_trusted_proxy: bool
+        If `True` requests arrive through a trusted proxy, whose `X-Forwarded-For` (last hop) and
+        `X-Forwarded-User` headers identify the rate limited client and user.  Otherwise the client is the peer
+        address, and users can not be rate limited.
+    admission_concurrency: Optional[int]
+        Requests forwarded to each server pool at once, defaults to its worker threads.
+    admission_queue_size: int
+        Requests waiting for each server pool at most.
+    admission_queue_latency: float
+        Seconds a request waits for its server pool at most before it is shed.
+    compression: bool
+        If `True` responses are compressed with brotli (if installed) or gzip, as negotiated by `Accept-Encoding`.
+    compression_min_size: int
+        Responses of a known smaller size (bytes) are sent uncompressed.
+    compression_level: int
+        The gzip compression level (1-9).
+    stream_metric_history: bool
+        If `True` whole metric histories are read from the database and sent in batches (database backed stores),
+        bounding the memory of workers serving long training runs.
+    metric_archive: bool
+        If `True` metric histories archived by the `metric_archive` activity are served back from the artifact
+        destination (database backed stores).
+    artifact_transfers: bool
+        If `True` proxied artifacts are transferred directly to and from local, Azure Blob and GCS destinations:
+        ranged and parallel downloads, pipelined uploads and resumable multipart uploads.
+    artifact_part_size: int
+        Size (MiB) of the parts of multipart uploads and parallel downloads.
+    artifact_transfer_concurrency: int
+        Parts transferred concurrently per download and upload.
+    artifact_cache: bool
+        If `True` downloaded artifacts are cached on local disk (requires `artifact_transfers`), validated against
+        the etag of the artifact at the destination on every download.
+    artifact_cache_size: int
+        Size (MiB) the artifact cache is evicted down to, least recently served first.
+    artifact_cache_dir: Optional[str]
+        Directory of the artifact cache, defaults to a directory in the system temporary directory.
+    secrets_reload_interval: Optional[float]
+        If provided, seconds between polls of the AE5 user secrets (process and cluster launches).  Rotated secrets
+        are reloaded and the launched servers restarted one at a time to pick them up.
+    db_upgrade_rows_per_second: float
+        Rows a migration rewrites per second, the basis of the duration estimates of the `db_upgrade` activity.
+    db_upgrade_lock_timeout: Optional[float]
+        If provided, seconds a migration waits for a table lock before failing (PostgreSQL and MySQL).
+    db_upgrade_online: bool
+        If `True` the `db_upgrade` activity creates indexes concurrently on PostgreSQL, so the tracking server
+        keeps serving while large tables are indexed.
+    benchmark_workloads: Optional[list[BenchmarkWorkload]]
+        The workloads the benchmark activity measures, in order.  Defaults to every workload.
+    benchmark_clients: int
+        Concurrent clients of the benchmark activity.
+    benchmark_requests: int
+        Requests the benchmark activity sends per workload.
+    benchmark_store: str
+        The local backend store (`sqlite` or `file`) the benchmark activity launches the server against.
+    benchmark_artifact_size: int
+        Size (KiB) of the artifacts the benchmark activity uploads and downloads.
+    benchmark_output: Optional[str]
+        If provided, the file the benchmark report is written to (JSON), in addition to the standard output.
+    archive_older_than: str
+        The `metric_archive` activity archives the metric histories of runs which finished longer ago, in the
+        `mlflow gc --older-than` format (e.g. `90d`).
+    archive_batch_size: int
+        Runs enumerated and archived per batch by the `metric_archive` activity.
+    archive_workers: int
+        Threads archiving runs concurrently in the `metric_archive` activity.
+    db_optimize_query_log: Optional[str]
+        If provided, the query log (PostgreSQL, MySQL slow query log, or statements one per line) the `db_optimize`
+        activity samples slow queries from, instead of `pg_stat_statements` (PostgreSQL) or the performance schema
+        (MySQL).
+    db_optimize_slow_query_ms: float
+        Statements faster (on average) are ignored by the `db_optimize` activity.
+    db_optimize_create_indexes: bool
+        If `True` the `db_optimize` activity creates the indexes it recommends (concurrently on PostgreSQL),
+        otherwise it only reports them.
+    db_optimize_vacuum: bool
+        If `True` the `db_optimize` activity vacuums the tables it analyzes.
+    migrate_target_store_uri: Optional[str]
+        The database uri of the store the `migrate_store` activity copies the backend store into.
+    migrate_target_artifacts_destination: Optional[str]
+        If provided, the artifact destination the `migrate_store` activity copies the proxied artifacts into.
+    migrate_batch_size: int
+        Runs copied per batch (and transaction) by the `migrate_store` activity.
+    migrate_chunk_size: int
+        Rows read and inserted at a time by the `migrate_store` activity.
+    migrate_workers: int
+        Processes copying batches of runs concurrently in the `migrate_store` activity.
+    migrate_artifact_workers: int
+        Threads copying the artifacts of runs concurrently in the `migrate_store` activity.
+    migrate_checkpoint: Optional[str]
+        If provided, the file the `migrate_store` activity records its progress in (and resumes from).
     """
 
     sanity: bool
@@ -28,16 +261,319 @@ class LaunchParameters:
     activity: ActivityType
     dry_run: bool
 
+    workers: Optional[Union[int, str]]
+    threads: Optional[int]
+    worker_class: Optional[WorkerClass]
+    timeout: Optional[int]
+    keep_alive: Optional[int]
+    max_requests: Optional[int]
+    max_requests_jitter: Optional[int]
+
+    internal_port: int
+    write_workers: Optional[Union[int, str]]
+    read_workers: Optional[Union[int, str]]
+    artifact_workers: Optional[Union[int, str]]
+
+    dedicated_artifacts: bool
+    artifacts_port: int
+    artifacts_uri: Optional[str]
+
+    drain_timeout: float
+    max_restarts: int
+    restart_window: float
+
+    log_format: LogFormat
+    log_rate_limit: Optional[float]
+
+    embedded: bool
+
+    health_port: Optional[int]
+    liveness_interval: float
+    readiness_interval: float
+    probe_timeout: float
+
+    metrics: bool
+    metrics_dir: Optional[str]
+
+    gc_batch_size: int
+    gc_workers: int
+    gc_checkpoint: Optional[str]
+    gc_max_runs_per_minute: Optional[float]
+    gc_interval: float
+    gc_continuous: bool
+
+    db_pool_size: Optional[int]
+    db_max_overflow: Optional[int]
+    db_pool_recycle: Optional[int]
+    db_null_pool: bool
+    db_max_connections: Optional[int]
+
+    sqlite_tuning: bool
+    sqlite_single_writer: bool
+    sqlite_busy_timeout: int
+
+    read_cache: bool
+    read_cache_ttl: float
+    read_cache_size: int
+    read_cache_dir: Optional[str]
+
+    metric_buffer: bool
+    metric_buffer_latency: float
+    metric_buffer_size: int
+    metric_buffer_dir: Optional[str]
+
+    ingest_gateway: bool
+    ingest_gateway_connections: int
+    ingest_gateway_batch_size: int
+    ingest_gateway_latency: float
+
+    admission_control: bool
+    admission_rate_limit: Optional[float]
+    admission_rate_burst: Optional[int]
+    admission_rate_limit_by: Optional[list[RateLimitScope]]
+    admission_trusted_proxy: bool
+    admission_concurrency: Optional[int]
+    admission_queue_size: int
+    admission_queue_latency: float
+
+    compression: bool
+    compression_min_size: int
+    compression_level: int
+    stream_metric_history: bool
+    metric_archive: bool
+
+    artifact_transfers: bool
+    artifact_part_size: int
+    artifact_transfer_concurrency: int
+    artifact_cache: bool
+    artifact_cache_size: int
+    artifact_cache_dir: Optional[str]
+    secrets_reload_interval: Optional[float]
+    db_upgrade_rows_per_second: float
+    db_upgrade_lock_timeout: Optional[float]
+    db_upgrade_online: bool
+    benchmark_workloads: Optional[list[BenchmarkWorkload]]
+    benchmark_clients: int
+    benchmark_requests: int
+    benchmark_store: str
+    benchmark_artifact_size: int
+    benchmark_output: Optional[str]
+    archive_older_than: str
+    archive_batch_size: int
+    archive_workers: int
+    db_optimize_query_log: Optional[str]
+    db_optimize_slow_query_ms: float
+    db_optimize_create_indexes: bool
+    db_optimize_vacuum: bool
+    migrate_target_store_uri: Optional[str]
+    migrate_target_artifacts_destination: Optional[str]
+    migrate_batch_size: int
+    migrate_chunk_size: int
+    migrate_workers: int
+    migrate_artifact_workers: int
+    migrate_checkpoint: Optional[str]
+
     def __init__(
         self,
         activity: ActivityType,
+        *,
         sanity: bool = False,
         port: int = 8086,
         address: str = "0.0.0.0",
         dry_run: bool = False,
+        workers: Optional[Union[int, str]] = None,
+        threads: Optional[int] = None,
+        worker_class: Optional[WorkerClass] = None,
+        timeout: Optional[int] = None,
+        keep_alive: Optional[int] = None,
+        max_requests: Optional[int] = None,
+        max_requests_jitter: Optional[int] = None,
+        internal_port: int = 5000,
+        write_workers: Optional[Union[int, str]] = None,
+        read_workers: Optional[Union[int, str]] = None,
+        artifact_workers: Optional[Union[int, str]] = None,
+        dedicated_artifacts: bool = False,
+        artifacts_port: int = 8087,
+        artifacts_uri: Optional[str] = None,
+        drain_timeout: float = 30.0,
+        max_restarts: int = 5,
+        restart_window: float = 300.0,
+        log_format: LogFormat = LogFormat.PREFIXED,
+        log_rate_limit: Optional[float] = None,
+        embedded: bool = False,
+        health_port: Optional[int] = None,
+        liveness_interval: float = 1.0,
+        readiness_interval: float = 10.0,
+        probe_timeout: float = 2.0,
+        metrics: bool = False,
+        metrics_dir: Optional[str] = None,
+        gc_batch_size: int = 500,
+        gc_workers: int = 8,
+        gc_checkpoint: Optional[str] = None,
+        gc_max_runs_per_minute: Optional[float] = None,
+        gc_interval: float = 300.0,
+        gc_continuous: bool = False,
+        db_pool_size: Optional[int] = None,
+        db_max_overflow: Optional[int] = None,
+        db_pool_recycle: Optional[int] = None,
+        db_null_pool: bool = False,
+        db_max_connections: Optional[int] = None,
+        sqlite_tuning: bool = False,
+        sqlite_single_writer: bool = False,
+        sqlite_busy_timeout: int = 30000,
+        read_cache: bool = False,
+        read_cache_ttl: float = 5.0,
+        read_cache_size: int = 1024,
+        read_cache_dir: Optional[str] = None,
+        metric_buffer: bool = False,
+        metric_buffer_latency: float = 1.0,
+        metric_buffer_size: int = 100000,
+        metric_buffer_dir: Optional[str] = None,
+        ingest_gateway: bool = False,
+        ingest_gateway_connections: int = 4,
+        ingest_gateway_batch_size: int = 1000,
+        ingest_gateway_latency: float = 0.0,
+        admission_control: bool = False,
+        admission_rate_limit: Optional[float] = None,
+        admission_rate_burst: Optional[int] = None,
+        admission_rate_limit_by: Optional[list[RateLimitScope]] = None,
+        admission_trusted_proxy: bool = False,
+        admission_concurrency: Optional[int] = None,
+        admission_queue_size: int = 1000,
+        admission_queue_latency: float = 1.0,
+        compression: bool = False,
+        compression_min_size: int = 1024,
+        compression_level: int = 6,
+        stream_metric_history: bool = False,
+        metric_archive: bool = False,
+        artifact_transfers: bool = False,
+        artifact_part_size: int = 16,
+        artifact_transfer_concurrency: int = 8,
+        artifact_cache: bool = False,
+        artifact_cache_size: int = 10240,
+        artifact_cache_dir: Optional[str] = None,
+        secrets_reload_interval: Optional[float] = None,
+        db_upgrade_rows_per_second: float = 50000.0,
+        db_upgrade_lock_timeout: Optional[float] = None,
+        db_upgrade_online: bool = False,
+        benchmark_workloads: Optional[list[BenchmarkWorkload]] = None,
+        benchmark_clients: int = 8,
+        benchmark_requests: int = 1000,
+        benchmark_store: str = "sqlite",
+        benchmark_artifact_size: int = 1024,
+        benchmark_output: Optional[str] = None,
+        archive_older_than: str = "90d",
+        archive_batch_size: int = 100,
+        archive_workers: int = 4,
+        db_optimize_query_log: Optional[str] = None,
+        db_optimize_slow_query_ms: float = 100.0,
+        db_optimize_create_indexes: bool = False,
+        db_optimize_vacuum: bool = False,
+        migrate_target_store_uri: Optional[str] = None,
+        migrate_target_artifacts_destination: Optional[str] = None,
+        migrate_batch_size: int = 100,
+        migrate_chunk_size: int = 10000,
+        migrate_workers: int = 4,
+        migrate_artifact_workers: int = 8,
+        migrate_checkpoint: Optional[str] = None,
     ):
         self.sanity = sanity
         self.port = port
         self.address = address
         self.activity = activity
         self.dry_run = dry_run
+        self.workers = workers
+        self.threads = threads
+        self.worker_class = worker_class
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.internal_port = internal_port
+        self.write_workers = write_workers
+        self.read_workers = read_workers
+        self.artifact_workers = artifact_workers
+        self.dedicated_artifacts = dedicated_artifacts
+        self.artifacts_port = artifacts_port
+        self.artifacts_uri = artifacts_uri
+        self.drain_timeout = drain_timeout
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.log_format = log_format
+        self.log_rate_limit = log_rate_limit
+        self.embedded = embedded
+        self.health_port = health_port
+        self.liveness_interval = liveness_interval
+        self.readiness_interval = readiness_interval
+        self.probe_timeout = probe_timeout
+        self.metrics = metrics
+        self.metrics_dir = metrics_dir
+        self.gc_batch_size = gc_batch_size
+        self.gc_workers = gc_workers
+        self.gc_checkpoint = gc_checkpoint
+        self.gc_max_runs_per_minute = gc_max_runs_per_minute
+        self.gc_interval = gc_interval
+        self.gc_continuous = gc_continuous
+        self.db_pool_size = db_pool_size
+        self.db_max_overflow = db_max_overflow
+        self.db_pool_recycle = db_pool_recycle
+        self.db_null_pool = db_null_pool
+        self.db_max_connections = db_max_connections
+        self.sqlite_tuning = sqlite_tuning
+        self.sqlite_single_writer = sqlite_single_writer
+        self.sqlite_busy_timeout = sqlite_busy_timeout
+        self.read_cache = read_cache
+        self.read_cache_ttl = read_cache_ttl
+        self.read_cache_size = read_cache_size
+        self.read_cache_dir = read_cache_dir
+        self.metric_buffer = metric_buffer
+        self.metric_buffer_latency = metric_buffer_latency
+        self.metric_buffer_size = metric_buffer_size
+        self.metric_buffer_dir = metric_buffer_dir
+        self.ingest_gateway = ingest_gateway
+        self.ingest_gateway_connections = ingest_gateway_connections
+        self.ingest_gateway_batch_size = ingest_gateway_batch_size
+        self.ingest_gateway_latency = ingest_gateway_latency
+        self.admission_control = admission_control
+        self.admission_rate_limit = admission_rate_limit
+        self.admission_rate_burst = admission_rate_burst
+        self.admission_rate_limit_by = admission_rate_limit_by
+        self.admission_trusted_proxy = admission_trusted_proxy
+        self.admission_concurrency = admission_concurrency
+        self.admission_queue_size = admission_queue_size
+        self.admission_queue_latency = admission_queue_latency
+        self.compression = compression
+        self.compression_min_size = compression_min_size
+        self.compression_level = compression_level
+        self.stream_metric_history = stream_metric_history
+        self.metric_archive = metric_archive
+        self.artifact_transfers = artifact_transfers
+        self.artifact_part_size = artifact_part_size
+        self.artifact_transfer_concurrency = artifact_transfer_concurrency
+        self.artifact_cache = artifact_cache
+        self.artifact_cache_size = artifact_cache_size
+        self.artifact_cache_dir = artifact_cache_dir
+        self.secrets_reload_interval = secrets_reload_interval
+        self.db_upgrade_rows_per_second = db_upgrade_rows_per_second
+        self.db_upgrade_lock_timeout = db_upgrade_lock_timeout
+        self.db_upgrade_online = db_upgrade_online
+        self.benchmark_workloads = benchmark_workloads
+        self.benchmark_clients = benchmark_clients
+        self.benchmark_requests = benchmark_requests
+        self.benchmark_store = benchmark_store
+        self.benchmark_artifact_size = benchmark_artifact_size
+        self.benchmark_output = benchmark_output
+        self.archive_older_than = archive_older_than
+        self.archive_batch_size = archive_batch_size
+        self.archive_workers = archive_workers
+        self.db_optimize_query_log = db_optimize_query_log
+        self.db_optimize_slow_query_ms = db_optimize_slow_query_ms
+        self.db_optimize_create_indexes = db_optimize_create_indexes
+        self.db_optimize_vacuum = db_optimize_vacuum
+        self.migrate_target_store_uri = migrate_target_store_uri
+        self.migrate_target_artifacts_destination = migrate_target_artifacts_destination
+        self.migrate_batch_size = migrate_batch_size
+        self.migrate_chunk_size = migrate_chunk_size
+        self.migrate_workers = migrate_workers
+        self.migrate_artifact_workers = migrate_artifact_workers
+        self.migrate_checkpoint = migrate_checkpoint
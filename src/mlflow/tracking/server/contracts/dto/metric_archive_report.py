@@ -0,0 +1,71 @@
+""" Metric Archive Report """
+
+
+# pylint: disable=too-few-public-methods, too-many-arguments
+class MetricArchiveReport:
+    """
+    Metric Archive Report (DTO)
+    dry_run: bool
+        If `True` nothing was archived and the counts describe what would be archived.
+    runs: int
+        Runs whose metric history was archived.
+    rows: int
+        Rows archived and deleted from the `metrics` table.
+    table_bytes: int
+        Estimated size of the archived rows in the `metrics` table (uncompressed, without indexes).
+    archive_bytes: int
+        Size of the written (compressed) archives.
+    failures: int
+        Runs which could not be archived; their metrics are kept and retried by the next archival.
+    elapsed: float
+        Seconds spent archiving.
+    """
+
+    dry_run: bool
+    runs: int
+    rows: int
+    table_bytes: int
+    archive_bytes: int
+    failures: int
+    elapsed: float
+
+    def __init__(
+        self,
+        *,
+        dry_run: bool = False,
+        runs: int = 0,
+        rows: int = 0,
+        table_bytes: int = 0,
+        archive_bytes: int = 0,
+        failures: int = 0,
+        elapsed: float = 0.0,
+    ):
+        self.dry_run = dry_run
+        self.runs = runs
+        self.rows = rows
+        self.table_bytes = table_bytes
+        self.archive_bytes = archive_bytes
+        self.failures = failures
+        self.elapsed = elapsed
+
+    @property
+    def rows_per_second(self) -> float:
+        """The row archival throughput."""
+
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Returns a one line, human readable summary."""
+
+        mebibyte: int = 1024 * 1024
+        if self.dry_run:
+            return (
+                f"[DRY RUN] would archive {self.rows} metric rows of {self.runs} runs, "
+                f"about {self.table_bytes} bytes ({self.table_bytes / mebibyte:.1f} MiB) of the metrics table"
+            )
+        return (
+            f"archived {self.rows} metric rows of {self.runs} runs, "
+            f"about {self.table_bytes / mebibyte:.1f} MiB of the metrics table into "
+            f"{self.archive_bytes / mebibyte:.1f} MiB of archives, "
+            f"{self.failures} failures in {self.elapsed:.1f}s ({self.rows_per_second:.1f} rows/s)"
+        )
@@ -0,0 +1,58 @@
+""" Pending Database Migration """
+
+from typing import Optional
+
+
+# pylint: disable=too-few-public-methods, too-many-arguments
+class PendingMigration:
+    """
+    Pending Database Migration (DTO)
+    revision: str
+        The alembic revision.
+    description: str
+        The description of the migration.
+    tables: list[str]
+        The existing tables the migration alters (and locks while it runs).
+    rows: Optional[int]
+        The rows of the altered tables (estimated from the statistics of PostgreSQL and MySQL), if known.
+    estimated_seconds: float
+        The estimated duration of the migration.
+    elapsed: Optional[float]
+        The seconds the migration took, once applied.
+    """
+
+    revision: str
+    description: str
+    tables: list[str]
+    rows: Optional[int]
+    estimated_seconds: float
+    elapsed: Optional[float]
+
+    def __init__(
+        self,
+        revision: str,
+        description: str,
+        *,
+        tables: Optional[list[str]] = None,
+        rows: Optional[int] = None,
+        estimated_seconds: float = 0.0,
+        elapsed: Optional[float] = None,
+    ):
+        self.revision = revision
+        self.description = description
+        self.tables = tables or []
+        self.rows = rows
+        self.estimated_seconds = estimated_seconds
+        self.elapsed = elapsed
+
+    def to_dict(self) -> dict:
+        """Returns the migration as a JSON serializable dictionary."""
+
+        return {
+            "revision": self.revision,
+            "description": self.description,
+            "tables": self.tables,
+            "rows": self.rows,
+            "estimated_seconds": round(self.estimated_seconds, 1),
+            "elapsed": None if self.elapsed is None else round(self.elapsed, 3),
+        }
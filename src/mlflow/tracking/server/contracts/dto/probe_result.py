@@ -0,0 +1,23 @@
+""" Health Probe Result """
+
+
+# pylint: disable=too-few-public-methods
+class ProbeResult:
+    """
+    Health Probe Result (DTO)
+    healthy: bool
+        Whether the probed dependency is healthy.
+    detail: str
+        A short description of the outcome.
+    checked_at: float
+        The monotonic time the probe completed.
+    """
+
+    healthy: bool
+    detail: str
+    checked_at: float
+
+    def __init__(self, healthy: bool, detail: str, checked_at: float):
+        self.healthy = healthy
+        self.detail = detail
+        self.checked_at = checked_at
@@ -0,0 +1,36 @@
+""" Supervised Process Definition """
+
+from typing import Optional
+
+
+# pylint: disable=too-few-public-methods
+class ProcessDefinition:
+    """
+    Supervised Process Definition (DTO)
+    name: str
+        The name the process is reported under.
+    shell_out_cmd: str
+        The command to be executed.
+    env: Optional[dict[str, str]]
+        The environment for the process, defaults to the environment of the wrapper.
+    ready_address: Optional[tuple[str, int]]
+        If provided, the (host, port) the process listens on.  Processes defined after this one are only
+        started once the port accepts connections.
+    """
+
+    name: str
+    shell_out_cmd: str
+    env: Optional[dict[str, str]]
+    ready_address: Optional[tuple[str, int]]
+
+    def __init__(
+        self,
+        name: str,
+        shell_out_cmd: str,
+        env: Optional[dict[str, str]] = None,
+        ready_address: Optional[tuple[str, int]] = None,
+    ):
+        self.name = name
+        self.shell_out_cmd = shell_out_cmd
+        self.env = env
+        self.ready_address = ready_address
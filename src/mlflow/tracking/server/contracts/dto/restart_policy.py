@@ -0,0 +1,44 @@
+""" Supervised Process Restart Policy """
+
+
+# pylint: disable=too-few-public-methods, too-many-arguments
+class RestartPolicy:
+    """
+    Supervised Process Restart Policy (DTO)
+    initial_backoff: float
+        Seconds to wait before the first restart of a crashed process.
+    max_backoff: float
+        Upper bound of the (exponentially growing) wait between restarts.
+    multiplier: float
+        Factor the wait grows by for every consecutive crash.
+    max_restarts: int
+        Number of restarts allowed within `restart_window` before the process is considered crash looping.
+    restart_window: float
+        Seconds over which restarts are counted for crash loop detection.
+    stable_after: float
+        Seconds a process must stay up for its backoff to reset.
+    """
+
+    initial_backoff: float
+    max_backoff: float
+    multiplier: float
+    max_restarts: int
+    restart_window: float
+    stable_after: float
+
+    def __init__(
+        self,
+        *,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        multiplier: float = 2.0,
+        max_restarts: int = 5,
+        restart_window: float = 300.0,
+        stable_after: float = 60.0,
+    ):
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.stable_after = stable_after
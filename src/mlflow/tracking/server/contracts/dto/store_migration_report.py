@@ -0,0 +1,91 @@
+""" Store Migration Report """
+
+from typing import Optional
+
+
+# pylint: disable=too-few-public-methods, too-many-arguments
+class StoreMigrationReport:
+    """
+    Store Migration Report (DTO)
+    dry_run: bool
+        If `True` nothing was copied and the counts describe what would be copied.
+    tables: dict[str, int]
+        Rows copied per table, in the order the tables were copied.
+    artifact_runs: int
+        Runs whose (proxied) artifacts were copied.
+    artifact_bytes: int
+        Size of the copied artifacts.
+    failures: int
+        Runs whose artifacts could not be copied.
+    elapsed: float
+        Seconds spent migrating.
+    """
+
+    dry_run: bool
+    tables: dict[str, int]
+    artifact_runs: int
+    artifact_bytes: int
+    failures: int
+    elapsed: float
+
+    def __init__(
+        self,
+        *,
+        dry_run: bool = False,
+        tables: Optional[dict[str, int]] = None,
+        artifact_runs: int = 0,
+        artifact_bytes: int = 0,
+        failures: int = 0,
+        elapsed: float = 0.0,
+    ):
+        self.dry_run = dry_run
+        self.tables = tables or {}
+        self.artifact_runs = artifact_runs
+        self.artifact_bytes = artifact_bytes
+        self.failures = failures
+        self.elapsed = elapsed
+
+    @property
+    def rows(self) -> int:
+        """The rows copied across every table."""
+
+        return sum(self.tables.values())
+
+    @property
+    def rows_per_second(self) -> float:
+        """The row copy throughput."""
+
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """The artifact copy throughput."""
+
+        return self.artifact_bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """Returns the report as a JSON serializable dictionary."""
+
+        return {
+            "dry_run": self.dry_run,
+            "tables": dict(self.tables),
+            "artifact_runs": self.artifact_runs,
+            "artifact_bytes": self.artifact_bytes,
+            "failures": self.failures,
+            "elapsed": self.elapsed,
+        }
+
+    def summary(self) -> str:
+        """Returns a one line, human readable summary."""
+
+        mebibyte: int = 1024 * 1024
+        if self.dry_run:
+            return (
+                f"[DRY RUN] would copy {self.rows} rows of {len(self.tables)} tables "
+                f"and the artifacts of {self.artifact_runs} runs"
+            )
+        return (
+            f"copied {self.rows} rows of {len(self.tables)} tables ({self.rows_per_second:.1f} rows/s) "
+            f"and {self.artifact_bytes / mebibyte:.1f} MiB of artifacts of {self.artifact_runs} runs "
+            f"({self.bytes_per_second / mebibyte:.1f} MiB/s), {self.failures} failures in {self.elapsed:.1f}s"
+        )
@@ -0,0 +1,84 @@
+""" Benchmark Workload Result """
+
+import math
+
+from ..types.benchmark_workload import BenchmarkWorkload
+
+
+class WorkloadResult:
+    """
+    Benchmark Workload Result (DTO)
+    workload: BenchmarkWorkload
+        The workload measured.
+    latencies: list[float]
+        Seconds taken by each request, failed requests included.
+    errors: int
+        Requests which failed (connection errors and error responses).
+    elapsed: float
+        Seconds from the first request sent to the last response received.
+    transferred: int
+        Artifact bytes uploaded or downloaded.
+    """
+
+    workload: BenchmarkWorkload
+    latencies: list[float]
+    errors: int
+    elapsed: float
+    transferred: int
+
+    def __init__(
+        self,
+        workload: BenchmarkWorkload,
+        latencies: list[float],
+        errors: int = 0,
+        elapsed: float = 0.0,
+        transferred: int = 0,
+    ):
+        self.workload = workload
+        self.latencies = sorted(latencies)
+        self.errors = errors
+        self.elapsed = elapsed
+        self.transferred = transferred
+
+    @property
+    def requests(self) -> int:
+        """The number of requests sent."""
+
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        """Requests completed per second."""
+
+        return self.requests / self.elapsed if self.elapsed > 0 else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns a latency percentile (nearest rank).
+
+        Parameters
+        ----------
+        percent: float
+            The percentile, between 0 and 100.
+        """
+
+        if not self.latencies:
+            return 0.0
+        rank: int = max(math.ceil(percent / 100 * len(self.latencies)), 1)
+        return self.latencies[rank - 1]
+
+    def to_dict(self) -> dict:
+        """Returns the result as a JSON serializable dictionary, latencies in milliseconds."""
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.throughput, 2),
+            "bytes_per_second": round(self.transferred / self.elapsed if self.elapsed > 0 else 0.0, 1),
+            "latency_ms": {
+                "mean": round(1000 * sum(self.latencies) / max(self.requests, 1), 3),
+                **{f"p{percent}": round(1000 * self.percentile(percent), 3) for percent in [50, 90, 95, 99]},
+                "max": round(1000 * self.percentile(100), 3),
+            },
+        }
@@ -8,4 +8,10 @@ class ActivityType(str, Enum):
 
     SERVER = "server"
     GC = "gc"
+    GC_DAEMON = "gc_daemon"
     DB_UPGRADE = "db_upgrade"
+    CLUSTER = "cluster"
+    BENCHMARK = "benchmark"
+    METRIC_ARCHIVE = "metric_archive"
+    DB_OPTIMIZE = "db_optimize"
+    MIGRATE_STORE = "migrate_store"
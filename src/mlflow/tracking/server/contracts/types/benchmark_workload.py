@@ -0,0 +1,13 @@
+""" Defines the synthetic workloads of the benchmark activity """
+
+from enum import Enum
+
+
+class BenchmarkWorkload(str, Enum):
+    """Type of requests sent by the benchmark clients"""
+
+    LOG_METRIC = "log_metric"
+    LOG_BATCH = "log_batch"
+    SEARCH_RUNS = "search_runs"
+    ARTIFACT_UPLOAD = "artifact_upload"
+    ARTIFACT_DOWNLOAD = "artifact_download"
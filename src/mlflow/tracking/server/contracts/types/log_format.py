@@ -0,0 +1,11 @@
+""" Defines supported formats for forwarded process output """
+
+from enum import Enum
+
+
+class LogFormat(str, Enum):
+    """Format output of launched processes is forwarded in"""
+
+    RAW = "raw"
+    PREFIXED = "prefixed"
+    JSON = "json"
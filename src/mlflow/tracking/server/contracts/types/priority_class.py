@@ -0,0 +1,11 @@
+""" Defines the priority classes admission control serves requests in """
+
+from enum import Enum
+
+
+class PriorityClass(str, Enum):
+    """Class of tracking server request, queued requests of a higher class are served first"""
+
+    INTERACTIVE = "interactive"
+    STANDARD = "standard"
+    BULK = "bulk"
@@ -0,0 +1,11 @@
+""" Defines the scopes admission control limits request rates by """
+
+from enum import Enum
+
+
+class RateLimitScope(str, Enum):
+    """Identity each request rate limit applies to"""
+
+    CLIENT = "client"
+    USER = "user"
+    EXPERIMENT = "experiment"
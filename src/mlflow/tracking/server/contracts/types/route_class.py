@@ -0,0 +1,11 @@
+""" Defines the classes of requests the cluster router dispatches on """
+
+from enum import Enum
+
+
+class RouteClass(str, Enum):
+    """Class of tracking server request, each served by a dedicated process pool"""
+
+    WRITE = "write"
+    READ = "read"
+    ARTIFACT = "artifact"
@@ -0,0 +1,11 @@
+""" Defines supported gunicorn worker classes """
+
+from enum import Enum
+
+
+class WorkerClass(str, Enum):
+    """Type of gunicorn worker to serve requests with"""
+
+    SYNC = "sync"
+    GTHREAD = "gthread"
+    GEVENT = "gevent"
@@ -1,55 +1,1052 @@
 """ MLFlow Tracking Server Launch Controller """
+# pylint: disable=too-many-lines
+import json
+import math
+import os
 import shlex
+import signal
+import socket
 import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterator, Optional, Union
 
+from .benchmark.runner import BenchmarkRunner
 from .common.config.environment import demand_env_var
+from .common.metrics import WrapperMetrics, prepare_multiprocess_directory
+from .common.network import loopback_address
+from .common.phase_timer import PhaseTimer
+from .common.secrets import SecretsWatcher, ae5_user_secrets_loader
+from .common.system import available_cpu_count
+from .common.uri import is_database_uri
+from .contracts.dto.connection_pool import ConnectionPool
+from .contracts.dto.database_optimization_report import DatabaseOptimizationReport
+from .contracts.dto.database_upgrade_plan import DatabaseUpgradePlan
+from .contracts.dto.garbage_collection_report import GarbageCollectionReport
 from .contracts.dto.launch_parameters import LaunchParameters
+from .contracts.dto.metric_archive_report import MetricArchiveReport
+from .contracts.dto.process_definition import ProcessDefinition
+from .contracts.dto.restart_policy import RestartPolicy
+from .contracts.dto.store_migration_report import StoreMigrationReport
 from .contracts.types.activity import ActivityType
+from .contracts.types.benchmark_workload import BenchmarkWorkload
+from .contracts.types.rate_limit_scope import RateLimitScope
+from .contracts.types.route_class import RouteClass
+from .contracts.types.worker_class import WorkerClass
+from .health.health_server import HealthServer
+from .health.monitor import HealthMonitor
+from .health.probes import (
+    BackendStoreProbe,
+    Probe,
+    build_artifacts_destination_probe,
+    build_http_probe,
+    build_process_probe,
+)
+from .maintenance.database_upgrade import ROWS_PER_SECOND, DatabaseUpgrade
+from .maintenance.garbage_collection_daemon import GarbageCollectionDaemon
+from .maintenance.garbage_collector import GarbageCollector, parse_duration
+from .maintenance.index_advisor import IndexAdvisor
+from .maintenance.metric_archiver import MetricArchiver
+from .maintenance.store_migration import StoreMigration
+from .process.log_forwarder import LogForwarder
+from .process.supervisor import ProcessSupervisor
+from .proxy.admission import AdmissionControl, AdmissionQueue, AdmissionRouter, RateLimiter
+from .proxy.ingest_gateway import asyncpg_dsn, build_ingest_gateway_command
+from .proxy.router import MLFlowRouter
+from .wsgi.artifact_cache import build_artifact_cache_environment
+from .wsgi.artifact_stores import ArtifactStore, open_artifact_store
+from .wsgi.artifact_transfers import build_artifact_transfer_environment
+from .wsgi.compression import build_compression_environment
+from .wsgi.metric_archive import ARCHIVE_PART_SIZE, METRIC_ARCHIVE_ENV_VAR, MetricArchive
+from .wsgi.metric_buffer import build_metric_buffer_environment, close_metric_buffers, start_metric_buffers
+from .wsgi.metric_history import STREAM_METRIC_HISTORY_ENV_VAR
+from .wsgi.middleware import apply_middleware
+from .wsgi.read_cache import build_read_cache_environment
+from .wsgi.sqlite_tuning import build_tuning_environment, close_single_writers, enable_wal, sqlite_database_path
 
 
-# pylint: disable=fixme,too-few-public-methods
+# pylint: disable=fixme,too-few-public-methods,too-many-arguments
 class MLFlowTrackingServerController:
     """
     Responsible for the invocation of the mlflow process.
+
+    Parameters
+    ----------
+    timer: Optional[PhaseTimer]
+        Records the startup phases, defaults to a timer started now.
     """
 
+    timer: PhaseTimer
+    metrics: Optional[WrapperMetrics]
+
+    def __init__(self, timer: Optional[PhaseTimer] = None):
+        self.timer = timer if timer is not None else PhaseTimer()
+        self.metrics = None
+
+    @staticmethod
+    def _ensure_sane_runtime_environment() -> None:
+        """
+        Creates the needed file system directory structure on the host required by MLFlow.
+        This is required because MLFlow assumes this already exist and will fail to start
+        if they are not present.
+        """
+
+        backend_uri: str = demand_env_var(name="MLFLOW_BACKEND_STORE_URI")
+        if backend_uri.startswith("sqlite:///"):
+            path: str = backend_uri.split(sep="sqlite:///")[1]
+            parent: Path = Path(path).parent.resolve()
+            print(f"Ensuring metadata storage path exists: {parent}")
+            parent.mkdir(parents=True, exist_ok=True)
+
+        artifacts_destination: str = demand_env_var(name="MLFLOW_ARTIFACTS_DESTINATION")
+        print(f"Ensuring artifact storage path exists: {artifacts_destination}")
+        Path(artifacts_destination).mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _resolve_worker_count(workers: Optional[Union[int, str]]) -> Optional[int]:
+        """
+        Resolves the requested worker count into a concrete number of gunicorn workers.
+
+        Parameters
+        ----------
+        workers: Optional[Union[int, str]]
+            A positive number of workers, `auto` for one worker per available cpu, or `None` for the mlflow default.
+
+        Returns
+        -------
+            The number of workers to launch, or `None` when the mlflow default should be used.
+        """
+
+        if workers is None:
+            return None
+        if isinstance(workers, str):
+            if workers.strip().lower() == "auto":
+                return available_cpu_count()
+            try:
+                workers = int(workers)
+            except ValueError as error:
+                raise ValueError(f"workers must be a positive integer or 'auto', received: {workers}") from error
+        if workers < 1:
+            raise ValueError(f"workers must be a positive integer or 'auto', received: {workers}")
+        return workers
+
+    @staticmethod
+    def _build_gunicorn_options(params: LaunchParameters) -> list[str]:
+        """
+        Validates the gunicorn tuning parameters and maps them onto gunicorn command line options.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+
+        Returns
+        -------
+            The gunicorn options, empty when no tuning was requested.
+        """
+
+        options: list[str] = []
+        worker_class: Optional[WorkerClass] = (
+            WorkerClass(params.worker_class) if params.worker_class is not None else None
+        )
+
+        if params.threads is not None:
+            if params.threads < 1:
+                raise ValueError(f"threads must be a positive integer, received: {params.threads}")
+            if worker_class == WorkerClass.GEVENT:
+                raise ValueError("threads can not be used with the gevent worker class")
+
+        if worker_class is not None:
+            options.extend(["--worker-class", worker_class.value])
+        if params.threads is not None:
+            options.extend(["--threads", str(params.threads)])
+
+        for name, value in [
+            ("timeout", params.timeout),
+            ("keep-alive", params.keep_alive),
+            ("max-requests", params.max_requests),
+            ("max-requests-jitter", params.max_requests_jitter),
+        ]:
+            if value is None:
+                continue
+            if value < 0:
+                raise ValueError(f"{name} must not be negative, received: {value}")
+            options.extend([f"--{name}", str(value)])
+
+        if params.max_requests_jitter is not None and not params.max_requests:
+            raise ValueError("max-requests-jitter requires max-requests to be set")
+
+        return options
+
+    @staticmethod
+    def _build_gunicorn_settings(params: LaunchParameters) -> dict[str, Any]:
+        """
+        Maps the launch parameters onto gunicorn settings for an in-process (embedded) server.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+
+        Returns
+        -------
+            The gunicorn settings keyed by setting name.
+        """
+
+        resolved_workers: Optional[int] = MLFlowTrackingServerController._resolve_worker_count(workers=params.workers)
+        settings: dict[str, Any] = {
+            "bind": [
+                f"[{params.address}]:{params.port}" if ":" in params.address else f"{params.address}:{params.port}"
+            ],
+            # Same default as `mlflow server`.
+            "workers": resolved_workers if resolved_workers is not None else 4,
+            # Workers are forked from the already imported application and connected stores.
+            "preload_app": True,
+            "graceful_timeout": math.ceil(params.drain_timeout),
+        }
+
+        options: list[str] = MLFlowTrackingServerController._build_gunicorn_options(params=params)
+        for flag, value in zip(options[::2], options[1::2]):
+            name: str = flag.lstrip("-").replace("-", "_")
+            settings["keepalive" if name == "keep_alive" else name] = value
+
+        return settings
+
+    @staticmethod
+    def _build_server_command(
+        params: LaunchParameters,
+        *,
+        port: Optional[int] = None,
+        address: Optional[str] = None,
+        workers: Optional[Union[int, str]] = None,
+        artifacts_only: bool = False,
+        default_artifact_root: Optional[str] = None,
+    ) -> str:
+        """
+        Maps the launch parameters onto the `mlflow server` command line.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        port: Optional[int]
+            Overrides the port from the launch parameters.
+        address: Optional[str]
+            Overrides the address from the launch parameters.
+        workers: Optional[Union[int, str]]
+            Overrides the worker count from the launch parameters.
+        artifacts_only: bool
+            If `True` the server only serves the proxied artifact endpoints.
+        default_artifact_root: Optional[str]
+            If provided, artifacts are not served by this server and clients are directed to this location instead.
+
+        Returns
+        -------
+            The command to be executed.
+        """
+
+        port = params.port if port is None else port
+        address = params.address if address is None else address
+        workers = params.workers if workers is None else workers
+
+        # https://www.mlflow.org/docs/latest/cli.html#mlflow-server
+        if default_artifact_root is None:
+            cmd: str = f"mlflow server --serve-artifacts --port {port} --host {address}"
+        else:
+            cmd = (
+                f"mlflow server --no-serve-artifacts --default-artifact-root {shlex.quote(default_artifact_root)} "
+                f"--port {port} --host {address}"
+            )
+        if artifacts_only:
+            cmd += " --artifacts-only"
+
+        resolved_workers: Optional[int] = MLFlowTrackingServerController._resolve_worker_count(workers=workers)
+        if resolved_workers is not None:
+            cmd += f" --workers {resolved_workers}"
+
+        gunicorn_options: list[str] = MLFlowTrackingServerController._build_gunicorn_options(params=params)
+        if any(
+            [
+                params.metrics,
+                params.sqlite_tuning,
+                params.read_cache,
+                params.metric_buffer,
+                params.compression,
+                params.stream_metric_history,
+                params.metric_archive,
+                params.artifact_transfers,
+            ]
+        ):
+            # Hooks instrumenting each worker with per route request metrics and applying the middleware.
+            gunicorn_options.extend(["--config", f"python:{__package__}.wsgi.gunicorn_config"])
+        if gunicorn_options:
+            cmd += f" --gunicorn-opts {shlex.quote(' '.join(gunicorn_options))}"
+
+        return cmd
+
+    @staticmethod
+    def _resolve_artifacts_uri(params: LaunchParameters) -> str:
+        """
+        Determines the artifact endpoint clients are directed to when a dedicated artifact server is used.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+
+        Returns
+        -------
+            The default artifact root handed to the tracking server.
+        """
+
+        if params.artifacts_uri:
+            return params.artifacts_uri.rstrip("/")
+
+        host: str = socket.getfqdn() if params.address in ["0.0.0.0", "::", ""] else params.address
+        return f"http://{host}:{params.artifacts_port}/api/2.0/mlflow-artifacts/artifacts"
+
+    @staticmethod
+    def _build_cluster_upstreams(params: LaunchParameters) -> dict[RouteClass, tuple[str, int]]:
+        """
+        Assigns each cluster process pool a loopback port.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+
+        Returns
+        -------
+            The (host, port) each route class pool listens on.
+        """
+
+        return {
+            route_class: ("127.0.0.1", params.internal_port + offset)
+            for offset, route_class in enumerate([RouteClass.WRITE, RouteClass.READ, RouteClass.ARTIFACT])
+        }
+
+    @staticmethod
+    def _build_cluster_commands(params: LaunchParameters) -> dict[RouteClass, str]:
+        """
+        Maps the launch parameters onto one `mlflow server` command per cluster process pool.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+
+        Returns
+        -------
+            The command to be executed for each route class pool.
+        """
+
+        upstreams: dict[RouteClass, tuple[str, int]] = MLFlowTrackingServerController._build_cluster_upstreams(
+            params=params
+        )
+        if params.port in [port for _, port in upstreams.values()]:
+            raise ValueError(f"internal port range starting at {params.internal_port} overlaps port {params.port}")
+
+        workers: dict[RouteClass, Optional[Union[int, str]]] = {
+            RouteClass.WRITE: params.write_workers,
+            RouteClass.READ: params.read_workers,
+            RouteClass.ARTIFACT: params.artifact_workers,
+        }
+        return {
+            route_class: MLFlowTrackingServerController._build_server_command(
+                params=params,
+                port=port,
+                address=host,
+                workers=workers[route_class],
+                artifacts_only=route_class == RouteClass.ARTIFACT,
+            )
+            for route_class, (host, port) in upstreams.items()
+        }
+
+    @staticmethod
+    def _build_artifacts_only_environment() -> dict[str, str]:
+        """
+        Builds the environment for an `--artifacts-only` server.  mlflow refuses to start an artifact only
+        server when a backend store is configured, so the store variables are removed.
+
+        Returns
+        -------
+            A copy of the current environment without the backend store configuration.
+        """
+
+        excluded: list[str] = ["MLFLOW_BACKEND_STORE_URI", "MLFLOW_REGISTRY_STORE_URI"]
+        return {name: value for name, value in os.environ.items() if name not in excluded}
+
+    @staticmethod
+    def _build_log_forwarder(params: LaunchParameters, metrics: Optional[WrapperMetrics] = None) -> LogForwarder:
+        """
+        Builds the forwarder for the output of the launched processes.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        metrics: Optional[WrapperMetrics]
+            The wrapper metrics, if enabled.
+
+        Returns
+        -------
+            The (not yet started) log forwarder.
+        """
+
+        return LogForwarder(log_format=params.log_format, max_lines_per_second=params.log_rate_limit, metrics=metrics)
+
+    @staticmethod
+    def _build_supervisor(
+        definitions: list[ProcessDefinition],
+        params: LaunchParameters,
+        log_forwarder: Optional[LogForwarder] = None,
+        on_ready: Optional[Callable[[], None]] = None,
+        metrics: Optional[WrapperMetrics] = None,
+    ) -> ProcessSupervisor:
+        """
+        Builds the supervisor for the long running processes of an activity.
+
+        Parameters
+        ----------
+        definitions: list[ProcessDefinition]
+            The processes to supervise.
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        log_forwarder: Optional[LogForwarder]
+            The forwarder for the output of the processes.
+        on_ready: Optional[Callable[[], None]]
+            Called once the processes have started.
+        metrics: Optional[WrapperMetrics]
+            The wrapper metrics, if enabled.
+
+        Returns
+        -------
+            The process supervisor.
+        """
+
+        policy: RestartPolicy = RestartPolicy(
+            max_restarts=params.max_restarts,
+            restart_window=params.restart_window,
+        )
+        return ProcessSupervisor(
+            definitions=definitions,
+            policy=policy,
+            drain_timeout=params.drain_timeout,
+            log_forwarder=log_forwarder,
+            on_ready=on_ready,
+            metrics=metrics,
+        )
+
+    def _report_ready(self) -> None:
+        """Reports the startup phases once the launched processes are ready."""
+
+        print(self.timer.report(), flush=True)
+
+    @staticmethod
+    def _build_liveness_probes(supervisor: ProcessSupervisor) -> dict[str, Probe]:
+        """
+        Builds one liveness probe per supervised process.
+
+        Parameters
+        ----------
+        supervisor: ProcessSupervisor
+            The supervisor of the launched processes.
+
+        Returns
+        -------
+            The probes keyed by process name.
+        """
+
+        return {
+            name: build_process_probe(state=lambda name=name: supervisor.process_state(name=name))
+            for name in supervisor.processes
+        }
+
+    @staticmethod
+    def _build_readiness_probes(params: LaunchParameters, endpoints: dict[str, tuple[str, int]]) -> dict[str, Probe]:
+        """
+        Builds the readiness probes: every server answers `/health`, the backend store accepts a query and the
+        artifact destination accepts writes.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        endpoints: dict[str, tuple[str, int]]
+            The (host, port) of each launched server, keyed by name.
+
+        Returns
+        -------
+            The probes keyed by check name.
+        """
+
+        probes: dict[str, Probe] = {
+            name: build_http_probe(host=host, port=port, timeout=params.probe_timeout)
+            for name, (host, port) in endpoints.items()
+        }
+        backend_uri: Optional[str] = os.environ.get("MLFLOW_BACKEND_STORE_URI")
+        if backend_uri:
+            probes["backend_store"] = BackendStoreProbe(uri=backend_uri, timeout=params.probe_timeout)
+        artifacts_destination: Optional[str] = os.environ.get("MLFLOW_ARTIFACTS_DESTINATION")
+        if artifacts_destination:
+            probes["artifacts_destination"] = build_artifacts_destination_probe(destination=artifacts_destination)
+        return probes
+
+    @staticmethod
+    def _validate_health_port(params: LaunchParameters, ports: list[int]) -> None:
+        """
+        Ensures the health server does not collide with the ports of the launched servers.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        ports: list[int]
+            The ports used by the launched servers.
+        """
+
+        if params.health_port is not None and params.health_port in ports:
+            raise ValueError(f"the health port {params.health_port} is already used by a launched server")
+
+    @staticmethod
+    def _prepare_read_cache(params: LaunchParameters) -> None:
+        """
+        Validates the read cache parameters and hands the cache settings to the launched servers.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        """
+
+        if not params.read_cache:
+            return
+        if params.read_cache_ttl <= 0:
+            raise ValueError(f"read cache ttl must be positive, received: {params.read_cache_ttl}")
+        if params.read_cache_size < 1:
+            raise ValueError(f"read cache size must be positive, received: {params.read_cache_size}")
+        directory: str = params.read_cache_dir or os.path.join(
+            tempfile.gettempdir(), "mlflow-tracking-server-read-cache"
+        )
+        os.environ.update(
+            build_read_cache_environment(
+                directory=directory, ttl=params.read_cache_ttl, max_entries=params.read_cache_size
+            )
+        )
+        print(
+            f"Caching up to {params.read_cache_size} read responses per worker for {params.read_cache_ttl} "
+            f"seconds, invalidated through {directory}"
+        )
+
+    @staticmethod
+    def _prepare_metric_buffer(params: LaunchParameters) -> None:
+        """
+        Validates the metric buffer parameters and hands the buffer settings to the launched servers.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        """
+
+        if not params.metric_buffer:
+            return
+        if params.metric_buffer_latency <= 0:
+            raise ValueError(f"metric buffer latency must be positive, received: {params.metric_buffer_latency}")
+        if params.metric_buffer_size < 1:
+            raise ValueError(f"metric buffer size must be positive, received: {params.metric_buffer_size}")
+        directory: str = params.metric_buffer_dir or os.path.join(
+            tempfile.gettempdir(), "mlflow-tracking-server-metric-buffer"
+        )
+        os.environ.update(
+            build_metric_buffer_environment(
+                directory=directory, max_latency=params.metric_buffer_latency, max_pending=params.metric_buffer_size
+            )
+        )
+        print(
+            f"Buffering up to {params.metric_buffer_size} metrics per worker for {params.metric_buffer_latency} "
+            f"seconds, journaled in {directory}"
+        )
+
+    @staticmethod
+    def _prepare_ingest_gateway(params: LaunchParameters) -> None:
+        """
+        Validates the ingest gateway parameters.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        """
+
+        if not params.ingest_gateway:
+            return
+        asyncpg_dsn(backend_store_uri=demand_env_var(name="MLFLOW_BACKEND_STORE_URI"))
+        for name, value in [
+            ("connections", params.ingest_gateway_connections),
+            ("batch size", params.ingest_gateway_batch_size),
+        ]:
+            if value < 1:
+                raise ValueError(f"ingest gateway {name} must be positive, received: {value}")
+        if params.ingest_gateway_latency < 0:
+            raise ValueError(f"ingest gateway latency can not be negative, received: {params.ingest_gateway_latency}")
+        print(
+            f"Ingesting run logging through {params.ingest_gateway_connections} backend store connections in "
+            f"batches of up to {params.ingest_gateway_batch_size} rows"
+        )
+
+    @staticmethod
+    def _build_ingest_gateway_definition(
+        params: LaunchParameters, address: str, port: int, upstream: tuple[str, int]
+    ) -> ProcessDefinition:
+        """
+        Defines the ingest gateway process, listening in front of a tracking server.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        address: str
+            The address the gateway listens on.
+        port: int
+            The port the gateway listens on.
+        upstream: tuple[str, int]
+            The (host, port) of the tracking server serving every request the gateway does not write.
+
+        Returns
+        -------
+            The process definition.
+        """
+
+        return ProcessDefinition(
+            name="ingest",
+            shell_out_cmd=build_ingest_gateway_command(
+                address=address,
+                port=port,
+                upstream=upstream,
+                connections=params.ingest_gateway_connections,
+                batch_size=params.ingest_gateway_batch_size,
+                max_latency=params.ingest_gateway_latency,
+            ),
+        )
+
+    @staticmethod
+    def _build_admission_control(
+        params: LaunchParameters,
+        routes: dict[RouteClass, tuple[str, int]],
+        servers: dict[tuple[str, int], Optional[Union[int, str]]],
+        metrics: Optional[WrapperMetrics] = None,
+    ) -> Optional[AdmissionControl]:
+        """
+        Builds the admission control of the router: the rate limits and one queue per upstream, admitting as
+        many requests at once as the upstream serves (its worker threads, or the connections of the ingest
+        gateway times its batch size).
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        routes: dict[RouteClass, tuple[str, int]]
+            The (host, port) each route class is forwarded to.
+        servers: dict[tuple[str, int], Optional[Union[int, str]]]
+            The requested worker count of each tracking server upstream, keyed by (host, port); any other
+            upstream is the ingest gateway.
+        metrics: Optional[WrapperMetrics]
+            The wrapper metrics, counting rejected requests.
+
+        Returns
+        -------
+            The admission control, or `None` when it is disabled.
+        """
+
+        if not params.admission_control:
+            return None
+
+        limiter: Optional[RateLimiter] = None
+        if params.admission_rate_limit is not None:
+            limiter = RateLimiter(
+                rate=params.admission_rate_limit,
+                burst=(
+                    params.admission_rate_burst
+                    if params.admission_rate_burst is not None
+                    else max(1, math.ceil(params.admission_rate_limit))
+                ),
+            )
+        elif params.admission_rate_burst is not None or params.admission_rate_limit_by:
+            raise ValueError("an admission rate burst or rate limit scope requires an admission rate limit")
+        if RateLimitScope.USER in (params.admission_rate_limit_by or []) and not params.admission_trusted_proxy:
+            # Only an authenticating proxy can tell who sent a request.
+            raise ValueError("rate limiting users requires a trusted proxy identifying them")
+        if params.admission_concurrency is None and params.worker_class == WorkerClass.GEVENT:
+            # Greenlets per worker are unbounded, so the requests a server serves at once are unknown.
+            raise ValueError("gevent workers require an explicit admission concurrency")
+
+        queues: dict[tuple[str, int], AdmissionQueue] = {}
+        for upstream in dict.fromkeys(routes.values()):
+            if upstream not in servers:
+                concurrency: int = params.ingest_gateway_connections * params.ingest_gateway_batch_size
+            elif params.admission_concurrency is not None:
+                concurrency = params.admission_concurrency
+            else:
+                workers: Optional[int] = MLFlowTrackingServerController._resolve_worker_count(workers=servers[upstream])
+                # Same default as `mlflow server`.
+                concurrency = (workers if workers is not None else 4) * (params.threads or 1)
+            queues[upstream] = AdmissionQueue(
+                concurrency=concurrency,
+                max_queue=params.admission_queue_size,
+                max_latency=params.admission_queue_latency,
+            )
+        admission: AdmissionControl = AdmissionControl(
+            queues={route_class: queues[upstream] for route_class, upstream in routes.items()},
+            limiter=limiter,
+            scopes=params.admission_rate_limit_by,
+            metrics=metrics,
+            trusted_proxy=params.admission_trusted_proxy,
+        )
+        limits: str = (
+            f"{limiter.rate} requests/s (burst {limiter.burst}) per {', '.join(admission.scopes)}"
+            if limiter is not None
+            else "no rate limit"
+        )
+        print(
+            f"Admitting requests with {limits}, queueing up to {params.admission_queue_size} requests per server "
+            f"for at most {params.admission_queue_latency}s"
+        )
+        return admission
+
+    @staticmethod
+    def _prepare_responses(params: LaunchParameters) -> None:
+        """
+        Validates the response compression parameters and hands compression, metric history streaming and the
+        archived metric histories to the launched servers.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        """
+
+        if params.compression:
+            if params.compression_min_size < 0:
+                raise ValueError(
+                    f"compression minimum size must not be negative, received: {params.compression_min_size}"
+                )
+            if not 1 <= params.compression_level <= 9:
+                raise ValueError(f"compression level must be between 1 and 9, received: {params.compression_level}")
+            os.environ.update(
+                build_compression_environment(minimum_size=params.compression_min_size, level=params.compression_level)
+            )
+        if params.stream_metric_history:
+            os.environ[STREAM_METRIC_HISTORY_ENV_VAR] = "true"
+        if params.metric_archive:
+            if not is_database_uri(uri=demand_env_var(name="MLFLOW_BACKEND_STORE_URI")):
+                raise ValueError("archived metric histories require a database backed store")
+            os.environ[METRIC_ARCHIVE_ENV_VAR] = demand_env_var(name="MLFLOW_ARTIFACTS_DESTINATION")
+
+    @staticmethod
+    def _prepare_artifact_transfers(params: LaunchParameters) -> None:
+        """
+        Validates the artifact transfer and cache parameters and hands them to the launched servers.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        """
+
+        if params.artifact_cache and not params.artifact_transfers:
+            raise ValueError("the artifact cache requires artifact transfers")
+        if not params.artifact_transfers:
+            return
+        if params.artifact_part_size < 1:
+            raise ValueError(f"artifact part size must be at least 1 MiB, received: {params.artifact_part_size}")
+        if params.artifact_transfer_concurrency < 1:
+            raise ValueError(
+                f"artifact transfer concurrency must be positive, received: {params.artifact_transfer_concurrency}"
+            )
+        os.environ.update(
+            build_artifact_transfer_environment(
+                part_size=params.artifact_part_size * 1024 * 1024, concurrency=params.artifact_transfer_concurrency
+            )
+        )
+        print(
+            f"Transferring artifacts directly in {params.artifact_part_size} MiB parts, "
+            f"{params.artifact_transfer_concurrency} at a time"
+        )
+        if not params.artifact_cache:
+            return
+        if params.artifact_cache_size < 1:
+            raise ValueError(f"artifact cache size must be at least 1 MiB, received: {params.artifact_cache_size}")
+        directory: str = params.artifact_cache_dir or os.path.join(
+            tempfile.gettempdir(), "mlflow-tracking-server-artifact-cache"
+        )
+        os.environ.update(
+            build_artifact_cache_environment(directory=directory, max_bytes=params.artifact_cache_size * 1024 * 1024)
+        )
+        print(f"Caching up to {params.artifact_cache_size} MiB of downloaded artifacts in {directory}")
+
+    @staticmethod
+    def _validate_sqlite_tuning(params: LaunchParameters) -> Optional[str]:
+        """
+        Validates the SQLite tuning parameters.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+
+        Returns
+        -------
+            The database file to tune, or `None` when tuning is disabled.
+        """
+
+        if not params.sqlite_tuning:
+            if params.sqlite_single_writer:
+                raise ValueError("serializing sqlite writes requires sqlite tuning")
+            return None
+        if params.sqlite_busy_timeout < 0:
+            raise ValueError(f"sqlite busy timeout must not be negative, received: {params.sqlite_busy_timeout}")
+        path: Optional[str] = sqlite_database_path(uri=demand_env_var(name="MLFLOW_BACKEND_STORE_URI"))
+        if path is None:
+            raise ValueError("sqlite tuning requires a sqlite:/// backend store")
+        return path
+
+    @staticmethod
+    def _tune_sqlite(params: LaunchParameters, path: Optional[str]) -> None:
+        """
+        Switches the database to write-ahead logging and hands the per connection tuning (pragmas and, if
+        requested, the single writer lock) to the launched servers.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        path: Optional[str]
+            The database file, nothing is tuned if `None`.
+        """
+
+        if path is None:
+            return
+        journal_mode: str = enable_wal(path=path)
+        writer_lock: Optional[str] = f"{path}.writer.lock" if params.sqlite_single_writer else None
+        os.environ.update(build_tuning_environment(busy_timeout=params.sqlite_busy_timeout, writer_lock=writer_lock))
+        print(
+            f"SQLite tuning: journal mode {journal_mode}, busy timeout {params.sqlite_busy_timeout}ms, "
+            f"{'serialized' if writer_lock else 'concurrent'} run writes"
+        )
+
+    @staticmethod
+    def _build_connection_pool(params: LaunchParameters) -> ConnectionPool:
+        """
+        Validates the backend store connection pool parameters.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        """
+
+        if params.db_max_overflow == 0:
+            # mlflow only applies a non zero overflow: SQLAlchemy's default would stay in force.
+            raise ValueError("database max overflow must be at least 1, mlflow ignores 0 and keeps the default of 10")
+        for name, value, minimum in [
+            ("pool size", params.db_pool_size, 1),
+            ("max overflow", params.db_max_overflow, 1),
+            ("pool recycle", params.db_pool_recycle, 1),
+            ("max connections", params.db_max_connections, 1),
+        ]:
+            if value is not None and value < minimum:
+                raise ValueError(f"database {name} must be at least {minimum}, received: {value}")
+        if params.db_null_pool and (params.db_pool_size is not None or params.db_max_overflow is not None):
+            raise ValueError("database pool size and max overflow can not be used without pooling (null pool)")
+
+        return ConnectionPool(
+            pool_size=params.db_pool_size,
+            max_overflow=params.db_max_overflow,
+            pool_recycle=params.db_pool_recycle,
+            null_pool=params.db_null_pool,
+        )
+
     @staticmethod
-    def _ensure_sane_runtime_environment() -> None:
+    def _build_connection_budget(
+        params: LaunchParameters, pool: ConnectionPool, servers: dict[str, Optional[Union[int, str]]]
+    ) -> dict[str, Optional[int]]:
         """
-        Creates the needed file system directory structure on the host required by MLFlow.
-        This is required because MLFlow assumes this already exist and will fail to start
-        if they are not present.
+        Computes the most backend store connections each process group can hold at once.  A gunicorn worker
+        holds at most one connection per request in flight (one for sync workers, one per thread for threaded
+        workers), and one more for the thread writing its buffered metrics (`metric_buffer`), bounded by its pool
+        capacity.  The `mlflow server` launcher (or embedded gunicorn master) keeps the pooled connection it
+        initialized the store with.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        pool: ConnectionPool
+            The connection pool of every tracking server process.
+        servers: dict[str, Optional[Union[int, str]]]
+            The requested worker count of each launched tracking server, keyed by name.
+
+        Returns
+        -------
+            The connection budget keyed by process group, `None` where it is unbounded (gevent workers without
+            pooling).
         """
 
-        backend_uri: str = demand_env_var(name="MLFLOW_BACKEND_STORE_URI")
-        if backend_uri.startswith("sqlite:///"):
-            path: str = backend_uri.split(sep="sqlite:///")[1]
-            parent: Path = Path(path).parent.resolve()
-            print(f"Ensuring metadata storage path exists: {parent}")
-            parent.mkdir(parents=True, exist_ok=True)
+        concurrency: Optional[int] = (
+            None
+            if params.worker_class == WorkerClass.GEVENT
+            else (params.threads or 1) + (1 if params.metric_buffer else 0)
+        )
+        per_worker: Optional[int] = (
+            pool.capacity if concurrency is None else min(concurrency, pool.capacity or concurrency)
+        )
+        budget: dict[str, Optional[int]] = {}
+        for name, workers in servers.items():
+            resolved: Optional[int] = MLFlowTrackingServerController._resolve_worker_count(workers=workers)
+            # Same default as `mlflow server`.
+            count: int = resolved if resolved is not None else 4
+            budget[name] = None if per_worker is None else count * per_worker + (0 if pool.null_pool else 1)
 
-        artifacts_destination: str = demand_env_var(name="MLFLOW_ARTIFACTS_DESTINATION")
-        print(f"Ensuring artifact storage path exists: {artifacts_destination}")
-        Path(artifacts_destination).mkdir(parents=True, exist_ok=True)
+        if params.ingest_gateway:
+            budget["ingest"] = params.ingest_gateway_connections
+        wrapper: int = (1 if params.health_port is not None else 0) + (1 if params.gc_continuous else 0)
+        if wrapper:
+            budget["wrapper"] = wrapper
+        return budget
 
-    def _process_launch(self, shell_out_cmd: str) -> None:
+    @staticmethod
+    def _prepare_backend_connections(params: LaunchParameters, servers: dict[str, Optional[Union[int, str]]]) -> None:
         """
-        Internal function for wrapping process launches.
+        Configures the connection pool of the launched tracking servers (database backed stores), validates the
+        resulting connection budget against the allowed maximum and reports it.
 
         Parameters
         ----------
-        shell_out_cmd: str
-            The command to be executed.
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        servers: dict[str, Optional[Union[int, str]]]
+            The requested worker count of each launched tracking server, keyed by name.
         """
 
-        args = shlex.split(shell_out_cmd)
+        pool: ConnectionPool = MLFlowTrackingServerController._build_connection_pool(params=params)
+        if not is_database_uri(uri=demand_env_var(name="MLFLOW_BACKEND_STORE_URI")):
+            return
+
+        budget: dict[str, Optional[int]] = MLFlowTrackingServerController._build_connection_budget(
+            params=params, pool=pool, servers=servers
+        )
+        total: Optional[int] = None if None in budget.values() else sum(budget.values())
+        lines: list[str] = ["Backend store connection budget:"]
+        for name, connections in budget.items():
+            lines.append(f"  {name.ljust(8)} {'unbounded' if connections is None else connections}")
+        limit: str = f" of {params.db_max_connections} allowed" if params.db_max_connections is not None else ""
+        lines.append(f"  {'total'.ljust(8)} {'unbounded' if total is None else total}{limit}")
+        print("\n".join(lines))
+
+        if params.db_max_connections is not None and (total is None or total > params.db_max_connections):
+            raise ValueError(
+                f"the backend store connection budget ({'unbounded' if total is None else total}) exceeds the "
+                f"{params.db_max_connections} allowed connections, reduce the workers or the pool size"
+            )
+        os.environ.update(pool.environment())
+
+    @contextmanager
+    def _serve_health(
+        self, params: LaunchParameters, liveness: dict[str, Probe], readiness: dict[str, Probe]
+    ) -> Iterator[None]:
+        """
+        Serves `/livez` and `/readyz` on the health port (if configured) for the duration of the context.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        liveness: dict[str, Probe]
+            The liveness probes.
+        readiness: dict[str, Probe]
+            The readiness probes.
+        """
+
+        if params.health_port is None:
+            yield
+            return
+
+        monitor: HealthMonitor = HealthMonitor(
+            liveness=liveness,
+            readiness=readiness,
+            liveness_interval=params.liveness_interval,
+            readiness_interval=params.readiness_interval,
+        )
+        with HealthServer(address=params.address, port=params.health_port, monitor=monitor) as health_server:
+            monitor.start()
+            health_thread: threading.Thread = threading.Thread(target=health_server.serve_forever, daemon=True)
+            health_thread.start()
+            print(f"Serving health checks on {params.address}:{params.health_port}")
+            try:
+                yield
+            finally:
+                health_server.shutdown()
+                health_thread.join()
+                monitor.stop()
+
+    def _process_launch(
+        self,
+        definitions: list[ProcessDefinition],
+        params: LaunchParameters,
+        endpoints: Optional[dict[str, tuple[str, int]]] = None,
+        router: Optional[MLFlowRouter] = None,
+    ) -> None:
+        """
+        Internal function for wrapping long running process launches.  The processes are supervised as one
+        deployment: crashes are restarted with backoff and termination signals are forwarded.  The supervisor
+        owns the main thread (signal handling); a router serves from a background thread until it returns.
+
+        Parameters
+        ----------
+        definitions: list[ProcessDefinition]
+            The processes to be executed.
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        endpoints: Optional[dict[str, tuple[str, int]]]
+            The (host, port) of each launched server, probed for readiness.
+        router: Optional[MLFlowRouter]
+            The router in front of the launched servers, if any.
+        """
 
-        # Normally this would be leveraged within a context, however we are explicitly daemonize here.
-        # pylint: disable=consider-using-with
-        process = subprocess.Popen(args, stdout=subprocess.PIPE)
-        for line in iter(process.stdout.readline, b""):
-            print(line)
+        with MLFlowTrackingServerController._build_log_forwarder(
+            params=params, metrics=self.metrics
+        ) as log_forwarder, router or nullcontext() as serving:
+            supervisor: ProcessSupervisor = MLFlowTrackingServerController._build_supervisor(
+                definitions=definitions,
+                params=params,
+                log_forwarder=log_forwarder,
+                on_ready=self._report_ready,
+                metrics=self.metrics,
+            )
+            router_thread: Optional[threading.Thread] = None
+            if serving is not None:
+                print(f"Routing requests on {params.address}:{params.port}")
+                router_thread = threading.Thread(target=serving.serve_forever, daemon=True)
+                router_thread.start()
+            readiness: dict[str, Probe] = MLFlowTrackingServerController._build_readiness_probes(
+                params=params, endpoints=endpoints or {}
+            )
+            try:
+                with self._serve_health(
+                    params=params,
+                    liveness=MLFlowTrackingServerController._build_liveness_probes(supervisor=supervisor),
+                    readiness=readiness,
+                ), self._collect_continuously(params=params) as daemon, MLFlowTrackingServerController._watch_secrets(
+                    params=params, supervisor=supervisor, definitions=definitions, probes=readiness, daemon=daemon
+                ):
+                    supervisor.run()
+            finally:
+                if router_thread is not None:
+                    serving.shutdown()
+                    router_thread.join()
 
     def _process_launch_wait(self, shell_out_cmd: str) -> None:
         """
@@ -63,9 +1060,11 @@ class MLFlowTrackingServerController:
 
         args = shlex.split(shell_out_cmd)
 
-        with subprocess.Popen(args, stdout=subprocess.PIPE) as process:
-            for line in iter(process.stdout.readline, b""):
-                print(line)
+        with LogForwarder() as log_forwarder:
+            with subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as process:
+                log_forwarder.add(name=args[0], process=process)
+                process.wait()
+                log_forwarder.drain()
 
     def launch_server(self, params: LaunchParameters) -> None:
         """
@@ -78,13 +1077,350 @@ class MLFlowTrackingServerController:
             Parameters needed for mlflow configuration.
         """
 
+        if params.embedded:
+            self._launch_embedded(params=params)
+            return
+
+        # Validate before touching the file system so bad tuning fails fast.
+        address, port = params.address, params.port
+        if params.ingest_gateway or params.admission_control:
+            # The router (or gateway) takes the AE5 port and forwards requests to the tracking server.
+            address, port = "127.0.0.1", params.internal_port
+            if port in [params.port, params.artifacts_port]:
+                raise ValueError(f"the internal port {port} must differ from the tracking and artifact server ports")
+        ready_address: tuple[str, int] = (loopback_address(address), port)
+        endpoints: dict[str, tuple[str, int]] = {"tracking": ready_address}
+        if not params.dedicated_artifacts:
+            definitions: list[ProcessDefinition] = [
+                ProcessDefinition(
+                    name="tracking",
+                    shell_out_cmd=MLFlowTrackingServerController._build_server_command(
+                        params=params, port=port, address=address
+                    ),
+                    ready_address=ready_address,
+                )
+            ]
+        else:
+            if params.artifacts_port == params.port:
+                raise ValueError(f"the artifact server port must differ from the tracking server port {params.port}")
+            definitions = [
+                ProcessDefinition(
+                    name="tracking",
+                    shell_out_cmd=MLFlowTrackingServerController._build_server_command(
+                        params=params,
+                        port=port,
+                        address=address,
+                        default_artifact_root=MLFlowTrackingServerController._resolve_artifacts_uri(params=params),
+                    ),
+                    ready_address=ready_address,
+                ),
+                ProcessDefinition(
+                    name="artifacts",
+                    shell_out_cmd=MLFlowTrackingServerController._build_server_command(
+                        params=params, port=params.artifacts_port, workers=params.artifact_workers, artifacts_only=True
+                    ),
+                    env=MLFlowTrackingServerController._build_artifacts_only_environment(),
+                ),
+            ]
+            endpoints["artifacts"] = (loopback_address(params.address), params.artifacts_port)
+        routes: dict[RouteClass, tuple[str, int]] = {route_class: ready_address for route_class in RouteClass}
+        if params.ingest_gateway:
+            # Behind the router the gateway takes the next internal port and the router sends it the writes.
+            gateway: tuple[str, int] = (
+                ("127.0.0.1", params.internal_port + 1) if params.admission_control else (params.address, params.port)
+            )
+            if params.admission_control and gateway[1] in [params.port, params.artifacts_port]:
+                raise ValueError(f"the internal port {gateway[1]} must differ from the tracking and artifact ports")
+            definitions.append(
+                MLFlowTrackingServerController._build_ingest_gateway_definition(
+                    params=params, address=gateway[0], port=gateway[1], upstream=ready_address
+                )
+            )
+            endpoints["ingest"] = routes[RouteClass.WRITE] = (loopback_address(gateway[0]), gateway[1])
+        if params.admission_control:
+            endpoints["router"] = (loopback_address(params.address), params.port)
+        MLFlowTrackingServerController._validate_health_port(
+            params=params, ports=[port for _, port in endpoints.values()]
+        )
+        admission: Optional[AdmissionControl] = MLFlowTrackingServerController._build_admission_control(
+            params=params, routes=routes, servers={ready_address: params.workers}, metrics=self.metrics
+        )
+        MLFlowTrackingServerController._prepare_backend_connections(params=params, servers={"tracking": params.workers})
+        sqlite_path: Optional[str] = MLFlowTrackingServerController._validate_sqlite_tuning(params=params)
+        MLFlowTrackingServerController._prepare_read_cache(params=params)
+        MLFlowTrackingServerController._prepare_metric_buffer(params=params)
+        MLFlowTrackingServerController._prepare_ingest_gateway(params=params)
+        MLFlowTrackingServerController._prepare_responses(params=params)
+        MLFlowTrackingServerController._prepare_artifact_transfers(params=params)
+
         if params.sanity:
-            MLFlowTrackingServerController._ensure_sane_runtime_environment()
+            with self.timer.phase("sanity checks"):
+                MLFlowTrackingServerController._ensure_sane_runtime_environment()
+        MLFlowTrackingServerController._tune_sqlite(params=params, path=sqlite_path)
 
-        # https://www.mlflow.org/docs/latest/cli.html#mlflow-server
-        cmd: str = f"mlflow server --serve-artifacts --port {params.port} --host {params.address}"
-        print(cmd)
-        self._process_launch(shell_out_cmd=cmd)
+        self._process_launch(
+            definitions=definitions,
+            params=params,
+            endpoints=endpoints,
+            router=(
+                AdmissionRouter(address=params.address, port=params.port, upstreams=routes, admission=admission)
+                if admission is not None
+                else None
+            ),
+        )
+
+    def _launch_embedded(self, params: LaunchParameters) -> None:
+        """
+        Serves mlflow from this interpreter with gunicorn's Python API instead of launching `mlflow server`,
+        which would import mlflow again (twice: the mlflow CLI and then gunicorn) before opening the port.
+        mlflow is imported and the stores are connected once; workers are forked from the loaded application.
+        Gunicorn handles termination signals (draining for `drain_timeout`) and replaces crashed workers.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        """
+
+        if params.dedicated_artifacts:
+            raise ValueError("an embedded launch does not support a dedicated artifact server")
+        if params.gc_continuous:
+            # Gunicorn forks workers from this process; a collector thread could hold locks across the fork.
+            raise ValueError("an embedded launch does not support continuous garbage collection, use gc_daemon")
+        if params.secrets_reload_interval is not None:
+            # Workers are forked from this process, which cannot restart itself.
+            raise ValueError("an embedded launch does not support reloading secrets")
+        if params.ingest_gateway:
+            # The gateway is a supervised process in front of the server, which an embedded launch does not have.
+            raise ValueError("an embedded launch does not support the ingest gateway")
+        if params.admission_control:
+            # Admission control is applied by a router in front of the server, which takes its port.
+            raise ValueError("an embedded launch does not support admission control")
+        # Validate before touching the file system so bad tuning fails fast.
+        settings: dict[str, Any] = MLFlowTrackingServerController._build_gunicorn_settings(params=params)
+        MLFlowTrackingServerController._validate_health_port(params=params, ports=[params.port])
+        MLFlowTrackingServerController._prepare_backend_connections(params=params, servers={"tracking": params.workers})
+        MLFlowTrackingServerController._validate_sqlite_tuning(params=params)
+        MLFlowTrackingServerController._prepare_read_cache(params=params)
+        MLFlowTrackingServerController._prepare_metric_buffer(params=params)
+        MLFlowTrackingServerController._prepare_responses(params=params)
+        MLFlowTrackingServerController._prepare_artifact_transfers(params=params)
+
+        # Health is served from the start so a booting server reports alive but not ready.  The health server
+        # thread runs in the gunicorn master (this process); forked workers do not run it.
+        with self._serve_health(
+            params=params,
+            liveness={},
+            readiness=MLFlowTrackingServerController._build_readiness_probes(
+                params=params, endpoints={"tracking": (loopback_address(params.address), params.port)}
+            ),
+        ):
+            self._serve_embedded(params=params, settings=settings)
+
+    def _serve_embedded(self, params: LaunchParameters, settings: dict[str, Any]) -> None:
+        """
+        Loads mlflow into this interpreter, connects the stores and runs gunicorn until it is stopped.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        settings: dict[str, Any]
+            The gunicorn settings.
+        """
+
+        if params.sanity:
+            with self.timer.phase("sanity checks"):
+                MLFlowTrackingServerController._ensure_sane_runtime_environment()
+        MLFlowTrackingServerController._tune_sqlite(
+            params=params, path=MLFlowTrackingServerController._validate_sqlite_tuning(params=params)
+        )
+
+        # pylint: disable=import-outside-toplevel
+        from .wsgi import app as mlflow_app
+        from .wsgi.gunicorn_application import MLFlowGunicornApplication
+
+        backend_store_uri: str = demand_env_var(name="MLFLOW_BACKEND_STORE_URI")
+        registry_store_uri: Optional[str] = os.environ.get("MLFLOW_REGISTRY_STORE_URI")
+        default_artifact_root: str = os.environ.get("MLFLOW_DEFAULT_ARTIFACT_ROOT", "mlflow-artifacts:/")
+
+        with self.timer.phase("mlflow import"):
+            server = mlflow_app.load_mlflow_server()
+        mlflow_app.configure_mlflow_server(
+            server=server,
+            backend_store_uri=backend_store_uri,
+            registry_store_uri=registry_store_uri,
+            default_artifact_root=default_artifact_root,
+            artifacts_destination=os.environ.get("MLFLOW_ARTIFACTS_DESTINATION", "./mlartifacts"),
+        )
+        # Connections opened from here on (the store initialization and every forked worker) are tuned.
+        application: Callable = apply_middleware(application=server.app)
+        with self.timer.phase("backend store"):
+            mlflow_app.initialize_mlflow_stores(
+                server=server,
+                backend_store_uri=backend_store_uri,
+                registry_store_uri=registry_store_uri,
+                default_artifact_root=default_artifact_root,
+            )
+
+        def when_ready(_arbiter) -> None:
+            print(self.timer.report(milestone="port bound"), flush=True)
+
+        def post_fork(_arbiter, _worker) -> None:
+            mlflow_app.reset_store_connections(server=server)
+            start_metric_buffers()
+
+        def worker_exit(_arbiter, _worker) -> None:
+            close_metric_buffers()
+            close_single_writers()
+
+        settings.update({"when_ready": when_ready, "post_fork": post_fork, "worker_exit": worker_exit})
+        if params.metrics:
+            # pylint: disable=import-outside-toplevel
+            from .wsgi.metrics import instrument_application, mark_worker_dead
+
+            instrument_application(application=server.app)
+
+            def child_exit(_arbiter, worker) -> None:
+                mark_worker_dead(pid=worker.pid)
+
+            settings["child_exit"] = child_exit
+
+        print(f"Serving mlflow in-process on {params.address}:{params.port}")
+        MLFlowGunicornApplication(application=application, options=settings).run()
+
+    def launch_cluster(self, params: LaunchParameters) -> None:
+        """
+        Launches one mlflow server process pool per route class (writes, reads, artifacts) on loopback ports
+        and routes requests arriving on the AE5 port to them by URL prefix.  This keeps metric logging
+        latency flat while the UI issues heavy searches, and lets each pool be sized independently.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        """
+
+        # Validate before touching the file system so bad tuning fails fast.
+        commands: dict[RouteClass, str] = MLFlowTrackingServerController._build_cluster_commands(params=params)
+        upstreams: dict[RouteClass, tuple[str, int]] = MLFlowTrackingServerController._build_cluster_upstreams(
+            params=params
+        )
+
+        if params.embedded:
+            raise ValueError("an embedded launch is only supported by the server activity")
+        # The router sends writes to the gateway, which forwards what it does not write to the write pool.
+        routes: dict[RouteClass, tuple[str, int]] = dict(upstreams)
+        if params.ingest_gateway:
+            routes[RouteClass.WRITE] = ("127.0.0.1", params.internal_port + len(upstreams))
+            if routes[RouteClass.WRITE][1] == params.port:
+                raise ValueError(f"internal port range starting at {params.internal_port} overlaps port {params.port}")
+        MLFlowTrackingServerController._validate_health_port(
+            params=params, ports=[params.port] + sorted({port for _, port in [*upstreams.values(), *routes.values()]})
+        )
+        admission: Optional[AdmissionControl] = MLFlowTrackingServerController._build_admission_control(
+            params=params,
+            routes=routes,
+            servers={
+                upstreams[RouteClass.WRITE]: params.write_workers,
+                upstreams[RouteClass.READ]: params.read_workers,
+                upstreams[RouteClass.ARTIFACT]: params.artifact_workers,
+            },
+            metrics=self.metrics,
+        )
+        MLFlowTrackingServerController._prepare_backend_connections(
+            params=params,
+            servers={RouteClass.WRITE.value: params.write_workers, RouteClass.READ.value: params.read_workers},
+        )
+        sqlite_path: Optional[str] = MLFlowTrackingServerController._validate_sqlite_tuning(params=params)
+        MLFlowTrackingServerController._prepare_read_cache(params=params)
+        MLFlowTrackingServerController._prepare_metric_buffer(params=params)
+        MLFlowTrackingServerController._prepare_ingest_gateway(params=params)
+        MLFlowTrackingServerController._prepare_responses(params=params)
+        MLFlowTrackingServerController._prepare_artifact_transfers(params=params)
+
+        if params.sanity:
+            with self.timer.phase("sanity checks"):
+                MLFlowTrackingServerController._ensure_sane_runtime_environment()
+        MLFlowTrackingServerController._tune_sqlite(params=params, path=sqlite_path)
+
+        definitions: list[ProcessDefinition] = []
+        for route_class, cmd in commands.items():
+            definitions.append(
+                ProcessDefinition(
+                    name=route_class.value,
+                    shell_out_cmd=cmd,
+                    env=(
+                        MLFlowTrackingServerController._build_artifacts_only_environment()
+                        if route_class == RouteClass.ARTIFACT
+                        else None
+                    ),
+                    # The first tracking pool creates or migrates the backend store schema; starting the other
+                    # pools concurrently races on that initialization.
+                    ready_address=upstreams[route_class] if route_class == RouteClass.WRITE else None,
+                )
+            )
+        if params.ingest_gateway:
+            definitions.append(
+                MLFlowTrackingServerController._build_ingest_gateway_definition(
+                    params=params,
+                    address=routes[RouteClass.WRITE][0],
+                    port=routes[RouteClass.WRITE][1],
+                    upstream=upstreams[RouteClass.WRITE],
+                )
+            )
+        endpoints: dict[str, tuple[str, int]] = {
+            "router": (loopback_address(params.address), params.port),
+            **{route_class.value: upstream for route_class, upstream in upstreams.items()},
+            **({"ingest": routes[RouteClass.WRITE]} if params.ingest_gateway else {}),
+        }
+        self._process_launch(
+            definitions=definitions,
+            params=params,
+            endpoints=endpoints,
+            router=(
+                AdmissionRouter(address=params.address, port=params.port, upstreams=routes, admission=admission)
+                if admission is not None
+                else MLFlowRouter(address=params.address, port=params.port, upstreams=routes)
+            ),
+        )
+
+    @staticmethod
+    def _build_metrics(params: LaunchParameters) -> Optional[WrapperMetrics]:
+        """
+        Prepares the shared prometheus multiprocess directory and the wrapper metrics, if metrics are enabled.
+        Servers start from an empty directory; maintenance activities add to the metrics already present.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+
+        Returns
+        -------
+            The wrapper metrics, or `None` when metrics are disabled.
+        """
+
+        if not params.metrics:
+            return None
+        directory: str = prepare_multiprocess_directory(
+            path=params.metrics_dir or os.path.join(tempfile.gettempdir(), "mlflow-tracking-server-metrics"),
+            reset=params.activity in [ActivityType.SERVER, ActivityType.CLUSTER, ActivityType.BENCHMARK],
+        )
+        print(f"Writing prometheus metrics to {directory}")
+        return WrapperMetrics()
+
+    def _time_activity(self, activity: str) -> ContextManager:
+        """
+        Records the duration of a maintenance activity when metrics are enabled.
+
+        Parameters
+        ----------
+        activity: str
+            The name of the activity.
+        """
+
+        return self.metrics.time_activity(activity=activity) if self.metrics is not None else nullcontext()
 
     def execute(self, params: LaunchParameters) -> None:
         """
@@ -96,23 +1432,74 @@ class MLFlowTrackingServerController:
             Parameters needed for mlflow configuration.
         """
 
+        # Launched processes inherit the metrics directory, so it is prepared first.
+        self.metrics = MLFlowTrackingServerController._build_metrics(params=params)
+
         # Invoke the selected command
         if params.activity == ActivityType.SERVER:
             # Launch MLFlow Tracking Server
             self.launch_server(params=params)
+        elif params.activity == ActivityType.CLUSTER:
+            # Launch MLFlow Tracking Server process pools behind the router
+            self.launch_cluster(params=params)
         elif params.activity == ActivityType.GC:
             # Launch Garbage Collection Process
-            self.perform_garbage_collection(dry_run=params.dry_run)
+            self.perform_garbage_collection(
+                dry_run=params.dry_run,
+                batch_size=params.gc_batch_size,
+                workers=params.gc_workers,
+                checkpoint=params.gc_checkpoint,
+                max_runs_per_minute=params.gc_max_runs_per_minute,
+            )
+        elif params.activity == ActivityType.GC_DAEMON:
+            # Reclaim deleted runs continuously
+            self.perform_continuous_garbage_collection(params=params)
         elif params.activity == ActivityType.DB_UPGRADE:
             # Perform DB Upgrade
-            self.perform_database_upgrade(dry_run=params.dry_run)
+            self.perform_database_upgrade(
+                dry_run=params.dry_run,
+                rows_per_second=params.db_upgrade_rows_per_second,
+                lock_timeout=params.db_upgrade_lock_timeout,
+                online=params.db_upgrade_online,
+            )
+        elif params.activity == ActivityType.DB_OPTIMIZE:
+            # Recommend (and create) indexes, then refresh the statistics of the backend store
+            self.perform_database_optimization(
+                dry_run=params.dry_run,
+                query_log=params.db_optimize_query_log,
+                slow_query_ms=params.db_optimize_slow_query_ms,
+                create_indexes=params.db_optimize_create_indexes,
+                vacuum=params.db_optimize_vacuum,
+            )
+        elif params.activity == ActivityType.MIGRATE_STORE:
+            # Copy the backend store (and its artifacts) into another store
+            self.perform_store_migration(params=params)
+        elif params.activity == ActivityType.BENCHMARK:
+            # Measure the tracking server against a throwaway local store
+            self.perform_benchmark(params=params)
+        elif params.activity == ActivityType.METRIC_ARCHIVE:
+            # Move the metric histories of old finished runs to the artifact destination
+            self.perform_metric_archival(
+                dry_run=params.dry_run,
+                older_than=params.archive_older_than,
+                batch_size=params.archive_batch_size,
+                workers=params.archive_workers,
+            )
         else:
             message = f"launch type {params.activity} is not supported"
             raise ValueError(message)
 
-    def perform_database_upgrade(self, dry_run: bool = True) -> None:
+    def perform_database_upgrade(
+        self,
+        dry_run: bool = True,
+        rows_per_second: float = ROWS_PER_SECOND,
+        lock_timeout: Optional[float] = None,
+        online: bool = False,
+    ) -> DatabaseUpgradePlan:
         """
-        Performs MLFLow's internal database upgrade.
+        Performs MLFLow's internal database upgrade, a migration at a time.  The plan (current and target
+        revisions, pending migrations, the tables they lock with their row counts and the estimated duration)
+        is reported first; a real run then reports how long each migration took.
 
         !!! THIS PROCESS CAN CAUSE IRREVERSIBLE DAMAGE !!!
 
@@ -122,25 +1509,490 @@ class MLFlowTrackingServerController:
         Parameters
         ----------
         dry_run: bool
-            Flag to control actually calling the backend process.
+            Flag to control actually migrating the database.
             Disabled by default.  The call must explicitly set `False`.
+        rows_per_second: float
+            Rows a migration rewrites per second, the basis of the duration estimates.
+        lock_timeout: Optional[float]
+            If provided, seconds a migration waits for a table lock before failing (PostgreSQL and MySQL).
+        online: bool
+            If `True` indexes are created concurrently on PostgreSQL.
+
+        Returns
+        -------
+            The plan, with the duration of each applied migration.
         """
 
         # https://mlflow.org/docs/latest/tracking.html#backend-stores
-        cmd: str = f"mlflow db upgrade {demand_env_var(name='MLFLOW_BACKEND_STORE_URI')}"
+        backend_store_uri: str = demand_env_var(name="MLFLOW_BACKEND_STORE_URI")
+        if not is_database_uri(uri=backend_store_uri):
+            raise ValueError("database upgrades require a database backed store")
+        upgrade: DatabaseUpgrade = DatabaseUpgrade(
+            backend_store_uri=backend_store_uri,
+            rows_per_second=rows_per_second,
+            lock_timeout=lock_timeout,
+            online=online,
+        )
+        plan: DatabaseUpgradePlan = upgrade.plan()
+        print(json.dumps(plan.to_dict(), indent=2), flush=True)
+        print(
+            f"Schema revision {plan.current} -> {plan.target}: {len(plan.migrations)} pending migrations, "
+            f"estimated {plan.estimated_seconds:.0f} seconds"
+        )
+        if plan.active_sessions:
+            print(
+                f"{plan.active_sessions} other sessions are running statements, migrations wait for their locks "
+                "(stop the tracking servers before upgrading)"
+            )
         if dry_run:
             print("[DRY RUN] This process would start the database upgrade process.")
-        else:
-            print("Performing database upgrade")
-            print(cmd)
-            self._process_launch_wait(shell_out_cmd=cmd)
+            return plan
+        if plan.current is None:
+            # Same as `mlflow db upgrade`, which creates the schema of an empty (or missing) database.
+            print("The database schema was never created, creating it")
+            with self._time_activity(activity="db_upgrade"):
+                plan = upgrade.initialize()
+            print(f"Created the database schema at revision {plan.current}")
+            return plan
+        if not plan.migrations:
+            print("The database schema is up to date")
+            return plan
+
+        print("Performing database upgrade")
+        with self._time_activity(activity="db_upgrade"):
+            upgrade.run(plan=plan)
+        print(json.dumps(plan.to_dict(), indent=2), flush=True)
+        return plan
+
+    def perform_database_optimization(
+        self,
+        dry_run: bool = True,
+        query_log: Optional[str] = None,
+        slow_query_ms: float = 100.0,
+        create_indexes: bool = False,
+        vacuum: bool = False,
+    ) -> DatabaseOptimizationReport:
+        """
+        Recommends the indexes the access patterns of the tracking server lack (`IndexAdvisor`), from the slow
+        queries of the database or of a query log, optionally creates them, and analyzes (and vacuums) the `params`,
+        `tags`, `metrics` and `latest_metrics` tables.  The recommendations are reported first; a real run then
+        reports how long each statement took.
+
+        Parameters
+        ----------
+        dry_run: bool
+            Flag to control actually executing the statements.
+            Disabled by default.  The call must explicitly set `False`.
+        query_log: Optional[str]
+            If provided, the query log slow queries are sampled from.
+        slow_query_ms: float
+            Sampled statements faster on average are ignored.
+        create_indexes: bool
+            If `True` the recommended indexes are created (concurrently on PostgreSQL).
+        vacuum: bool
+            If `True` the tables are vacuumed as well as analyzed.
+
+        Returns
+        -------
+            The report, with the duration of each executed statement.
+        """
+
+        backend_store_uri: str = demand_env_var(name="MLFLOW_BACKEND_STORE_URI")
+        if not is_database_uri(uri=backend_store_uri):
+            raise ValueError("database optimization requires a database backed store")
+        advisor: IndexAdvisor = IndexAdvisor(
+            backend_store_uri=backend_store_uri, query_log=query_log, slow_query_ms=slow_query_ms, vacuum=vacuum
+        )
+        report: DatabaseOptimizationReport = advisor.plan(dry_run=dry_run)
+        print(json.dumps(report.to_dict(), indent=2), flush=True)
+        if report.sampled is None:
+            print("No slow queries could be sampled, indexes are recommended for every access pattern of mlflow")
+        if dry_run:
+            print("[DRY RUN] This process would start the database optimization process.")
+            return report
+        if report.recommendations and not create_indexes:
+            print(f"{len(report.recommendations)} recommended indexes are not created (`--db-optimize-create-indexes`)")
+
+        print("Performing database optimization")
+        with self._time_activity(activity="db_optimize"):
+            advisor.run(report=report, create_indexes=create_indexes)
+        print(json.dumps(report.to_dict(), indent=2), flush=True)
+        return report
+
+    def perform_store_migration(self, params: LaunchParameters) -> StoreMigrationReport:
+        """
+        Copies the database backed store (`MLFLOW_BACKEND_STORE_URI`, e.g. the standalone SQLite store) into
+        another database (`migrate_target_store_uri`, e.g. PostgreSQL) with `StoreMigration`: tables are streamed
+        in chunks, runs are copied in batches by a pool of processes, and proxied artifacts are copied from
+        `MLFLOW_ARTIFACTS_DESTINATION` to `migrate_target_artifacts_destination` if provided.  The migration is
+        resumable with `migrate_checkpoint`.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.  `dry_run` only counts what would be copied.
+
+        Returns
+        -------
+            The report of the migration (of what would be copied for a dry run).
+        """
+
+        backend_store_uri: str = demand_env_var(name="MLFLOW_BACKEND_STORE_URI")
+        if not is_database_uri(uri=backend_store_uri):
+            raise ValueError("store migration requires a database backed store")
+        if not params.migrate_target_store_uri or not is_database_uri(uri=params.migrate_target_store_uri):
+            raise ValueError("store migration requires the database uri of the target store")
+        target_artifacts: Optional[str] = params.migrate_target_artifacts_destination
+        migration: StoreMigration = StoreMigration(
+            source_uri=backend_store_uri,
+            target_uri=params.migrate_target_store_uri,
+            source_artifacts=demand_env_var(name="MLFLOW_ARTIFACTS_DESTINATION") if target_artifacts else None,
+            target_artifacts=target_artifacts,
+            batch_size=params.migrate_batch_size,
+            chunk_size=params.migrate_chunk_size,
+            workers=params.migrate_workers,
+            artifact_workers=params.migrate_artifact_workers,
+            checkpoint_path=params.migrate_checkpoint,
+        )
+        print("[DRY RUN] Measuring store migration" if params.dry_run else "Migrating the backend store")
+        with self._time_activity(activity="migrate_store"):
+            report: StoreMigrationReport = migration.run(dry_run=params.dry_run)
+        print(json.dumps(report.to_dict(), indent=2), flush=True)
+        print(f"Store migration {report.summary()}")
+        if not params.dry_run:
+            print("Point MLFLOW_BACKEND_STORE_URI (and MLFLOW_ARTIFACTS_DESTINATION) at the target to serve it")
+        return report
+
+    def perform_metric_archival(
+        self, dry_run: bool = True, older_than: str = "90d", batch_size: int = 100, workers: int = 4
+    ) -> MetricArchiveReport:
+        """
+        Archives the metric histories of runs which finished longer than `older_than` ago into compressed Parquet
+        files below the artifact destination (`MetricArchiver`), and deletes them from the `metrics` table.  The
+        latest value of every metric is kept, and the launched servers serve archived histories back.
+
+        Parameters
+        ----------
+        dry_run: bool
+            Flag to control actually archiving the histories.
+            Disabled by default.  The call must explicitly set `False`.
+        older_than: str
+            The age of the finished runs to archive, in the `mlflow gc --older-than` format (e.g. `90d`).
+        batch_size: int
+            Runs archived per batch.
+        workers: int
+            Threads archiving runs concurrently.
+
+        Returns
+        -------
+            The report of the archival (of what would be archived for a dry run).
+        """
+
+        backend_store_uri: str = demand_env_var(name="MLFLOW_BACKEND_STORE_URI")
+        if not is_database_uri(uri=backend_store_uri):
+            raise ValueError("metric archival requires a database backed store")
+        destination: str = demand_env_var(name="MLFLOW_ARTIFACTS_DESTINATION")
+        store: Optional[ArtifactStore] = open_artifact_store(
+            destination=destination, part_size=ARCHIVE_PART_SIZE, concurrency=1
+        )
+        if store is None:
+            raise ValueError(
+                "metric archival requires a local, Azure Blob Storage or Google Cloud Storage artifacts destination"
+            )
+        archiver: MetricArchiver = MetricArchiver(
+            backend_store_uri=backend_store_uri,
+            archive=MetricArchive(store=store, cache_size=0),
+            older_than=parse_duration(value=older_than),
+            batch_size=batch_size,
+            workers=workers,
+        )
+        print("[DRY RUN] Measuring metric archival" if dry_run else f"Archiving metric histories to {destination}")
+        with self._time_activity(activity="metric_archive"):
+            report: MetricArchiveReport = archiver.run(dry_run=dry_run)
+        print(f"Metric archival {report.summary()}")
+        print("Archived histories are served by tracking servers launched with `--metric-archive`")
+        return report
+
+    def perform_benchmark(self, params: LaunchParameters) -> dict:
+        """
+        Launches the tracking server (`launch_server`, with the server settings of the parameters) against a
+        temporary local store, drives the benchmark workloads against it and stops it.  The report (mlflow version,
+        server settings, throughput and latency percentiles of each workload) is printed as JSON.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+
+        Returns
+        -------
+            The benchmark report.
+        """
+
+        if params.benchmark_store not in ["sqlite", "file"]:
+            raise ValueError(f"benchmark store must be sqlite or file, received: {params.benchmark_store}")
+        runner: BenchmarkRunner = BenchmarkRunner(
+            host=loopback_address(params.address),
+            port=params.port,
+            workloads=params.benchmark_workloads or list(BenchmarkWorkload),
+            clients=params.benchmark_clients,
+            requests=params.benchmark_requests,
+            artifact_size=params.benchmark_artifact_size * 1024,
+        )
+
+        outcome: dict[str, Any] = {}
+        launched: threading.Event = threading.Event()
+        stopped: threading.Event = threading.Event()
+        lock: threading.Lock = threading.Lock()
+
+        def drive() -> None:
+            try:
+                if not runner.wait_until_ready(abort=launched.is_set):
+                    raise RuntimeError("the benchmarked server did not become ready")
+                outcome["report"] = runner.run()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                outcome["error"] = error
+            finally:
+                with lock:
+                    # The server is stopped as by its deployment: supervised processes and embedded workers drain.
+                    if not launched.is_set():
+                        stopped.set()
+                        os.kill(os.getpid(), signal.SIGTERM)
+
+        with tempfile.TemporaryDirectory(prefix="mlflow-benchmark-") as directory:
+            os.environ.update(
+                {
+                    "MLFLOW_BACKEND_STORE_URI": (
+                        f"sqlite:///{os.path.join(directory, 'benchmark.sqlite')}"
+                        if params.benchmark_store == "sqlite"
+                        else os.path.join(directory, "mlruns")
+                    ),
+                    "MLFLOW_ARTIFACTS_DESTINATION": os.path.join(directory, "artifacts"),
+                }
+            )
+            driver: threading.Thread = threading.Thread(target=drive, name="benchmark", daemon=True)
+            driver.start()
+            try:
+                self.launch_server(params=params)
+            except SystemExit:
+                # gunicorn exits once an embedded server is stopped.
+                if not stopped.is_set():
+                    raise
+            finally:
+                with lock:
+                    launched.set()
+                driver.join()
+
+        if "error" in outcome:
+            raise RuntimeError(f"benchmark failed: {outcome['error']}") from outcome["error"]
+        report: dict = {
+            **outcome["report"],
+            "settings": {
+                name: value
+                for name, value in vars(params).items()
+                if not name.startswith("benchmark_") and name not in ["activity", "dry_run", "sanity"]
+            },
+            "store": params.benchmark_store,
+        }
+        print(json.dumps(report, indent=2, default=str), flush=True)
+        if params.benchmark_output:
+            with open(file=params.benchmark_output, mode="w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2, default=str)
+        return report
+
+    @staticmethod
+    def _build_garbage_collector(
+        backend_store_uri: str,
+        batch_size: int = 500,
+        workers: int = 8,
+        checkpoint: Optional[str] = None,
+        max_runs_per_minute: Optional[float] = None,
+    ) -> GarbageCollector:
+        """
+        Builds the native garbage collector of a database backed store.
+
+        Parameters
+        ----------
+        backend_store_uri: str
+            The backend store uri.
+        batch_size: int
+            Runs deleted per batch.
+        workers: int
+            Threads deleting artifacts concurrently.
+        checkpoint: Optional[str]
+            Where the progress of the collection is recorded, defaults to a file in the system temporary directory.
+        max_runs_per_minute: Optional[float]
+            Sustained rate runs are deleted at.  Unlimited if `None`.
+        """
+
+        return GarbageCollector(
+            backend_store_uri=backend_store_uri,
+            artifacts_destination=os.environ.get("MLFLOW_ARTIFACTS_DESTINATION"),
+            older_than=parse_duration(value=demand_env_var(name="MLFLOW_TRACKING_GC_TTL")),
+            batch_size=batch_size,
+            workers=workers,
+            checkpoint_path=checkpoint
+            or os.path.join(tempfile.gettempdir(), "mlflow-tracking-server-gc-checkpoint.json"),
+            max_runs_per_minute=max_runs_per_minute,
+        )
+
+    @staticmethod
+    def _build_continuous_garbage_collector(params: LaunchParameters) -> GarbageCollector:
+        """
+        Builds the collector of the continuous garbage collection passes, from the current environment (database
+        backed stores only).
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        """
+
+        backend_store_uri: str = demand_env_var(name="MLFLOW_BACKEND_STORE_URI")
+        if not is_database_uri(uri=backend_store_uri):
+            raise ValueError("continuous garbage collection requires a database backed store")
+        return MLFlowTrackingServerController._build_garbage_collector(
+            backend_store_uri=backend_store_uri,
+            batch_size=params.gc_batch_size,
+            workers=params.gc_workers,
+            checkpoint=params.gc_checkpoint,
+            max_runs_per_minute=params.gc_max_runs_per_minute,
+        )
+
+    @staticmethod
+    def _build_garbage_collection_daemon(params: LaunchParameters) -> GarbageCollectionDaemon:
+        """
+        Builds the continuous garbage collection daemon (database backed stores only).
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        """
+
+        return GarbageCollectionDaemon(
+            collector=MLFlowTrackingServerController._build_continuous_garbage_collector(params=params),
+            interval=params.gc_interval,
+            dry_run=params.dry_run,
+        )
+
+    @contextmanager
+    def _collect_continuously(self, params: LaunchParameters) -> Iterator[Optional[GarbageCollectionDaemon]]:
+        """
+        Runs the garbage collection daemon in a background thread for the duration of the context, if
+        continuous garbage collection is enabled.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+
+        Returns
+        -------
+            The running daemon, `None` if continuous garbage collection is disabled.
+        """
+
+        if not params.gc_continuous:
+            yield None
+            return
+
+        daemon: GarbageCollectionDaemon = MLFlowTrackingServerController._build_garbage_collection_daemon(params=params)
+        daemon_thread: threading.Thread = threading.Thread(target=daemon.run, name="gc-daemon", daemon=True)
+        daemon_thread.start()
+        try:
+            yield daemon
+        finally:
+            daemon.stop()
+            daemon_thread.join(timeout=params.drain_timeout)
+
+    @staticmethod
+    @contextmanager
+    def _watch_secrets(
+        params: LaunchParameters,
+        supervisor: ProcessSupervisor,
+        definitions: list[ProcessDefinition],
+        probes: Optional[dict[str, Probe]] = None,
+        daemon: Optional[GarbageCollectionDaemon] = None,
+    ) -> Iterator[None]:
+        """
+        Polls the AE5 user secrets for the duration of the context, if secrets reloading is enabled.  Rotated
+        secrets are reloaded into the environment of the wrapper and the supervised processes are restarted one
+        at a time, from the reloaded environment.  The backend store probe and the garbage collection daemon of
+        the wrapper connect with the reloaded backend store uri from then on.
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        supervisor: ProcessSupervisor
+            The supervisor of the launched processes.
+        definitions: list[ProcessDefinition]
+            The supervised processes.
+        probes: Optional[dict[str, Probe]]
+            The readiness probes of the wrapper.
+        daemon: Optional[GarbageCollectionDaemon]
+            The continuous garbage collection daemon of the wrapper, if running.
+        """
+
+        if params.secrets_reload_interval is None:
+            yield
+            return
 
-    def perform_garbage_collection(self, dry_run: bool = True) -> None:
+        def restart(_: list[str]) -> None:
+            for definition in definitions:
+                # Only artifact only servers are launched with an environment of their own.
+                if definition.env is not None:
+                    definition.env = MLFlowTrackingServerController._build_artifacts_only_environment()
+            backend_probe: Optional[Probe] = (probes or {}).get("backend_store")
+            backend_uri: Optional[str] = os.environ.get("MLFLOW_BACKEND_STORE_URI")
+            if isinstance(backend_probe, BackendStoreProbe) and backend_uri:
+                backend_probe.update(uri=backend_uri)
+            supervisor.restart()
+            if daemon is not None:
+                daemon.replace_collector(
+                    collector=MLFlowTrackingServerController._build_continuous_garbage_collector(params=params)
+                )
+
+        watcher: SecretsWatcher = SecretsWatcher(
+            loader=ae5_user_secrets_loader(), interval=params.secrets_reload_interval, on_change=restart
+        )
+        watcher.start()
+        print(f"Reloading AE5 user secrets every {params.secrets_reload_interval} seconds")
+        try:
+            yield
+        finally:
+            watcher.stop()
+
+    def perform_continuous_garbage_collection(self, params: LaunchParameters) -> None:
+        """
+        Reclaims deleted runs continuously (rate limited passes on an interval) until stopped by a signal.
+
+        !!! THIS PROCESS IS NOT REVERSIBLE !!!
+
+        Parameters
+        ----------
+        params: LaunchParameters
+            Parameters needed for mlflow configuration.
+        """
+
+        MLFlowTrackingServerController._build_garbage_collection_daemon(params=params).run()
+
+    def perform_garbage_collection(
+        self,
+        dry_run: bool = True,
+        batch_size: int = 500,
+        workers: int = 8,
+        checkpoint: Optional[str] = None,
+        max_runs_per_minute: Optional[float] = None,
+    ) -> None:
         """
         From https://mlflow.org/docs/latest/cli.html#mlflow-gc :
         Permanently delete runs in the deleted lifecycle stage from the specified backend store.
         This command deletes all artifacts and metadata associated with the specified runs.
 
+        Database backed stores are collected natively (`GarbageCollector`): in resumable batches, with artifacts
+        deleted concurrently and metadata deleted in bulk.  Other stores are collected by `mlflow gc`.
+
         !!! THIS PROCESS IS NOT REVERSIBLE !!!
 
         Consult the MLFlow documentation prior to executing this method:
@@ -151,17 +2003,44 @@ class MLFlowTrackingServerController:
         dry_run: bool
             Flag to control actually calling the backend process.
             Disabled by default.  The call must explicitly set `False`.
+        batch_size: int
+            Runs deleted per batch (database backed stores).
+        workers: int
+            Threads deleting artifacts concurrently (database backed stores).
+        checkpoint: Optional[str]
+            Where the progress of the collection is recorded so an interrupted collection resumes, defaults to a
+            file in the system temporary directory (database backed stores).
+        max_runs_per_minute: Optional[float]
+            Sustained rate runs are deleted at, unlimited if `None` (database backed stores).
         """
 
+        backend_store_uri: str = demand_env_var(name="MLFLOW_BACKEND_STORE_URI")
+        if is_database_uri(uri=backend_store_uri):
+            collector: GarbageCollector = MLFlowTrackingServerController._build_garbage_collector(
+                backend_store_uri=backend_store_uri,
+                batch_size=batch_size,
+                workers=workers,
+                checkpoint=checkpoint,
+                max_runs_per_minute=max_runs_per_minute,
+            )
+            print(
+                "[DRY RUN] Measuring mlflow garbage collection" if dry_run else "Performing mlflow garbage collection"
+            )
+            with self._time_activity(activity="gc"):
+                report: GarbageCollectionReport = collector.run(dry_run=dry_run)
+            print(f"Garbage collection {report.summary()}")
+            return
+
         # https://mlflow.org/docs/latest/cli.html#mlflow-gc
         cmd: str = (
             "mlflow gc "
             f"--older-than {demand_env_var(name='MLFLOW_TRACKING_GC_TTL')} "
-            f"--backend-store-uri {demand_env_var(name='MLFLOW_BACKEND_STORE_URI')}"
+            f"--backend-store-uri {backend_store_uri}"
         )
         if dry_run:
             print("[DRY RUN] This process would remove all data in deleted the lifecycle state")
         else:
             print("Performing mlflow garbage collection")
             print(cmd)
-            self._process_launch_wait(shell_out_cmd=cmd)
+            with self._time_activity(activity="gc"):
+                self._process_launch_wait(shell_out_cmd=cmd)
@@ -2,14 +2,23 @@
 import sys
 from argparse import ArgumentParser, Namespace
 
+from .common.phase_timer import PhaseTimer
 from .common.secrets import load_ae5_user_secrets
 from .contracts.dto.launch_parameters import LaunchParameters
+from .contracts.types.activity import ActivityType
+from .contracts.types.benchmark_workload import BenchmarkWorkload
+from .contracts.types.log_format import LogFormat
+from .contracts.types.rate_limit_scope import RateLimitScope
+from .contracts.types.worker_class import WorkerClass
 from .controller import MLFlowTrackingServerController
 
 if __name__ == "__main__":
     # This function is meant to provide a handler mechanism between the AE5 deployment arguments
     # and those required by the called process (or service).
 
+    # Startup is timed from here; the phases are reported once the server is ready.
+    timer: PhaseTimer = PhaseTimer()
+
     # arg parser for the standard anaconda-project options
     parser = ArgumentParser(
         prog="mlflow-tracking-server-launch-wrapper", description="mlflow tracking server launch wrapper"
@@ -51,8 +60,534 @@ if __name__ == "__main__":
         "--activity",
         action="store",
         type=str,
-        choices=["server", "gc", "db_upgrade"],
-        help="The function (server, gc, db upgrade) to perform",
+        choices=[activity.value for activity in ActivityType],
+        help=f"The function ({', '.join(activity.value for activity in ActivityType)}) to perform",
+    )
+
+    # gunicorn tuning options for the server activity
+    parser.add_argument(
+        "--workers",
+        action="store",
+        type=str,
+        help="Number of gunicorn worker processes, or `auto` for one worker per available cpu",
+    )
+    parser.add_argument("--threads", action="store", type=int, help="Number of threads per worker")
+    parser.add_argument(
+        "--worker-class",
+        action="store",
+        type=str,
+        choices=[worker_class.value for worker_class in WorkerClass],
+        help="The gunicorn worker class to serve requests with",
+    )
+    parser.add_argument(
+        "--timeout", action="store", type=int, help="Seconds a silent worker is allowed before being restarted"
+    )
+    parser.add_argument(
+        "--keep-alive", action="store", type=int, help="Seconds to wait for requests on a keep-alive connection"
+    )
+    parser.add_argument(
+        "--max-requests", action="store", type=int, help="Number of requests a worker serves before being recycled"
+    )
+    parser.add_argument(
+        "--max-requests-jitter",
+        action="store",
+        type=int,
+        help="Random jitter added to max requests to stagger worker recycling",
+    )
+
+    # process pool options for the cluster activity
+    parser.add_argument(
+        "--internal-port",
+        action="store",
+        default=5000,
+        type=int,
+        help="First loopback port for the cluster process pools (write, read and artifact use consecutive ports)",
+    )
+    parser.add_argument("--write-workers", action="store", type=str, help="Workers for the cluster logging pool")
+    parser.add_argument("--read-workers", action="store", type=str, help="Workers for the cluster search/UI pool")
+    parser.add_argument(
+        "--artifact-workers", action="store", type=str, help="Workers for the cluster or dedicated artifact server"
+    )
+
+    # in-process launch option for the server activity
+    parser.add_argument(
+        "--embedded",
+        action="store_true",
+        default=False,
+        help="Serve mlflow in-process with gunicorn's Python API instead of launching `mlflow server`",
+    )
+
+    # dedicated artifact server options for the server activity
+    parser.add_argument(
+        "--dedicated-artifacts",
+        action="store_true",
+        default=False,
+        help="Serve proxied artifacts from a separate artifact only server process",
+    )
+    parser.add_argument(
+        "--artifacts-port", action="store", default=8087, type=int, help="Port for the dedicated artifact server"
+    )
+    parser.add_argument(
+        "--artifacts-uri",
+        action="store",
+        type=str,
+        help="Artifact endpoint clients are directed to, defaults to the dedicated artifact server address",
+    )
+
+    # supervision options for long running activities
+    parser.add_argument(
+        "--drain-timeout",
+        action="store",
+        default=30.0,
+        type=float,
+        help="Seconds processes are given to finish in flight requests when stopping",
+    )
+    parser.add_argument(
+        "--max-restarts",
+        action="store",
+        default=5,
+        type=int,
+        help="Crash restarts allowed within the restart window before the deployment is failed",
+    )
+    parser.add_argument(
+        "--restart-window", action="store", default=300.0, type=float, help="Seconds over which restarts are counted"
+    )
+
+    # output forwarding options
+    parser.add_argument(
+        "--log-format",
+        action="store",
+        default=LogFormat.PREFIXED.value,
+        type=str,
+        choices=[log_format.value for log_format in LogFormat],
+        help="Format process output is forwarded in",
+    )
+    parser.add_argument(
+        "--log-rate-limit",
+        action="store",
+        type=float,
+        help="Maximum process output lines forwarded per second, excess lines are dropped",
+    )
+
+    # health endpoint options
+    parser.add_argument("--health-port", action="store", type=int, help="Port to serve /livez and /readyz on")
+    parser.add_argument(
+        "--liveness-interval", action="store", default=1.0, type=float, help="Seconds between liveness probes"
+    )
+    parser.add_argument(
+        "--readiness-interval", action="store", default=10.0, type=float, help="Seconds between readiness probes"
+    )
+    parser.add_argument(
+        "--probe-timeout", action="store", default=2.0, type=float, help="Seconds a readiness probe may take"
+    )
+
+    # metrics options
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        default=False,
+        help="Export prometheus metrics (per route request latency and wrapper metrics) on /metrics",
+    )
+    parser.add_argument(
+        "--metrics-dir", action="store", type=str, help="Prometheus multiprocess directory shared by all processes"
+    )
+
+    # garbage collection options
+    parser.add_argument(
+        "--gc-batch-size", action="store", default=500, type=int, help="Deleted runs garbage collected per batch"
+    )
+    parser.add_argument(
+        "--gc-workers", action="store", default=8, type=int, help="Threads deleting run artifacts concurrently"
+    )
+    parser.add_argument(
+        "--gc-checkpoint", action="store", type=str, help="File garbage collection records its progress in"
+    )
+    parser.add_argument(
+        "--gc-max-runs-per-minute",
+        action="store",
+        type=float,
+        help="Maximum deleted runs garbage collected per minute, unlimited if not provided",
+    )
+    parser.add_argument(
+        "--gc-interval",
+        action="store",
+        default=300.0,
+        type=float,
+        help="Seconds between continuous garbage collection passes",
+    )
+    parser.add_argument(
+        "--gc-continuous",
+        action="store_true",
+        default=False,
+        help="Garbage collect deleted runs continuously alongside the server",
+    )
+
+    # backend store connection pool options
+    parser.add_argument(
+        "--db-pool-size", action="store", type=int, help="Backend store connections kept open per server worker"
+    )
+    parser.add_argument(
+        "--db-max-overflow",
+        action="store",
+        type=int,
+        help="Connections per worker beyond the pool under load (at least 1)",
+    )
+    parser.add_argument(
+        "--db-pool-recycle", action="store", type=int, help="Seconds after which pooled connections are replaced"
+    )
+    parser.add_argument(
+        "--db-null-pool",
+        action="store_true",
+        default=False,
+        help="Do not pool backend store connections (e.g. behind pgbouncer)",
+    )
+    parser.add_argument(
+        "--db-max-connections",
+        action="store",
+        type=int,
+        help="Connections the database allows, the launch fails if the connection budget exceeds it",
+    )
+    parser.add_argument(
+        "--sqlite-tuning",
+        action="store_true",
+        default=False,
+        help="Enable write-ahead logging and tuned connections for a sqlite backend store",
+    )
+    parser.add_argument(
+        "--sqlite-single-writer",
+        action="store_true",
+        default=False,
+        help="Serialize run mutations across workers (requires --sqlite-tuning)",
+    )
+    parser.add_argument(
+        "--sqlite-busy-timeout",
+        action="store",
+        type=int,
+        default=30000,
+        help="Milliseconds a sqlite connection waits on a locked database",
+    )
+    parser.add_argument(
+        "--read-cache",
+        action="store_true",
+        default=False,
+        help="Cache responses of hot read endpoints in each server worker, invalidated by writes",
+    )
+    parser.add_argument(
+        "--read-cache-ttl",
+        action="store",
+        type=float,
+        default=5.0,
+        help="Seconds a cached response is served at most",
+    )
+    parser.add_argument(
+        "--read-cache-size",
+        action="store",
+        type=int,
+        default=1024,
+        help="Responses cached per worker",
+    )
+    parser.add_argument(
+        "--read-cache-dir",
+        action="store",
+        help="Directory the servers share cache invalidations through",
+    )
+    parser.add_argument(
+        "--metric-buffer",
+        action="store_true",
+        default=False,
+        help="Acknowledge metric logging once journaled and write metrics to the store in batches",
+    )
+    parser.add_argument(
+        "--metric-buffer-latency",
+        action="store",
+        type=float,
+        default=1.0,
+        help="Seconds a buffered metric waits at most before it is written to the store",
+    )
+    parser.add_argument(
+        "--metric-buffer-size",
+        action="store",
+        type=int,
+        default=100000,
+        help="Metrics buffered per worker at most",
+    )
+    parser.add_argument(
+        "--metric-buffer-dir",
+        action="store",
+        help="Directory of the metric journals (persistent storage)",
+    )
+    parser.add_argument(
+        "--ingest-gateway",
+        action="store_true",
+        default=False,
+        help="Write metric, param and tag logging to a PostgreSQL store through an asyncio gateway",
+    )
+    parser.add_argument(
+        "--ingest-gateway-connections",
+        action="store",
+        type=int,
+        default=4,
+        help="Backend store connections of the ingest gateway",
+    )
+    parser.add_argument(
+        "--ingest-gateway-batch-size",
+        action="store",
+        type=int,
+        default=1000,
+        help="Rows the ingest gateway writes per batch at most",
+    )
+    parser.add_argument(
+        "--ingest-gateway-latency",
+        action="store",
+        type=float,
+        default=0.0,
+        help="Seconds a logging request waits at most for further requests to be batched with",
+    )
+    parser.add_argument(
+        "--admission-control",
+        action="store_true",
+        default=False,
+        help="Rate limit clients and queue requests by priority, rejecting requests with 429 when overloaded",
+    )
+    parser.add_argument(
+        "--admission-rate-limit",
+        action="store",
+        type=float,
+        help="Requests per second allowed to each rate limited identity",
+    )
+    parser.add_argument(
+        "--admission-rate-burst",
+        action="store",
+        type=int,
+        help="Requests each identity may issue at once after being idle",
+    )
+    parser.add_argument(
+        "--admission-rate-limit-by",
+        action="store",
+        nargs="+",
+        choices=[scope.value for scope in RateLimitScope],
+        help="The identities rate limited, defaults to the client address",
+    )
+    parser.add_argument(
+        "--admission-trusted-proxy",
+        action="store_true",
+        default=False,
+        help="Identify clients and users by the X-Forwarded-For and X-Forwarded-User headers of a trusted proxy",
+    )
+    parser.add_argument(
+        "--admission-concurrency",
+        action="store",
+        type=int,
+        help="Requests forwarded to each server pool at once, defaults to its worker threads",
+    )
+    parser.add_argument(
+        "--admission-queue-size",
+        action="store",
+        type=int,
+        default=1000,
+        help="Requests waiting for each server pool at most",
+    )
+    parser.add_argument(
+        "--admission-queue-latency",
+        action="store",
+        type=float,
+        default=1.0,
+        help="Seconds a request waits for its server pool at most before it is rejected",
+    )
+    parser.add_argument(
+        "--compression",
+        action="store_true",
+        default=False,
+        help="Compress responses with brotli or gzip as negotiated by Accept-Encoding",
+    )
+    parser.add_argument(
+        "--compression-min-size",
+        action="store",
+        type=int,
+        default=1024,
+        help="Responses of a known smaller size (bytes) are sent uncompressed",
+    )
+    parser.add_argument(
+        "--compression-level",
+        action="store",
+        type=int,
+        default=6,
+        help="The gzip compression level (1-9)",
+    )
+    parser.add_argument(
+        "--stream-metric-history",
+        action="store_true",
+        default=False,
+        help="Stream whole metric histories from the database in batches",
+    )
+    parser.add_argument(
+        "--metric-archive",
+        action="store_true",
+        default=False,
+        help="Serve metric histories archived by the metric_archive activity from the artifact destination",
+    )
+    parser.add_argument(
+        "--artifact-transfers",
+        action="store_true",
+        default=False,
+        help="Ranged, parallel and resumable multipart transfers of proxied artifacts (local, Azure Blob, GCS)",
+    )
+    parser.add_argument(
+        "--artifact-part-size",
+        action="store",
+        type=int,
+        default=16,
+        help="Size (MiB) of the parts of multipart uploads and parallel downloads",
+    )
+    parser.add_argument(
+        "--artifact-transfer-concurrency",
+        action="store",
+        type=int,
+        default=8,
+        help="Parts transferred concurrently per artifact download and upload",
+    )
+    parser.add_argument(
+        "--artifact-cache",
+        action="store_true",
+        default=False,
+        help="Cache downloaded artifacts on local disk (requires --artifact-transfers)",
+    )
+    parser.add_argument(
+        "--artifact-cache-size",
+        action="store",
+        type=int,
+        default=10240,
+        help="Size (MiB) the artifact cache is evicted down to",
+    )
+    parser.add_argument(
+        "--artifact-cache-dir",
+        action="store",
+        help="Directory of the artifact cache (local disk)",
+    )
+    parser.add_argument(
+        "--secrets-reload-interval",
+        action="store",
+        type=float,
+        help="Seconds between polls of the AE5 user secrets, rotated secrets restart the servers one at a time",
+    )
+
+    # database upgrade options
+    parser.add_argument(
+        "--db-upgrade-rows-per-second",
+        action="store",
+        default=50000.0,
+        type=float,
+        help="Rows a migration rewrites per second, the basis of the upgrade duration estimates",
+    )
+    parser.add_argument(
+        "--db-upgrade-lock-timeout",
+        action="store",
+        type=float,
+        help="Seconds a migration waits for a table lock before failing (PostgreSQL and MySQL)",
+    )
+    parser.add_argument(
+        "--db-upgrade-online",
+        action="store_true",
+        default=False,
+        help="Create indexes concurrently on PostgreSQL so the server keeps serving during the upgrade",
+    )
+
+    # database optimization options
+    parser.add_argument(
+        "--db-optimize-query-log",
+        action="store",
+        type=str,
+        help="Query log (PostgreSQL, MySQL slow query log or one statement per line) to sample slow queries from",
+    )
+    parser.add_argument(
+        "--db-optimize-slow-query-ms",
+        action="store",
+        default=100.0,
+        type=float,
+        help="Sampled statements faster on average (milliseconds) are ignored",
+    )
+    parser.add_argument(
+        "--db-optimize-create-indexes",
+        action="store_true",
+        default=False,
+        help="Create the recommended indexes (concurrently on PostgreSQL) instead of only reporting them",
+    )
+    parser.add_argument(
+        "--db-optimize-vacuum",
+        action="store_true",
+        default=False,
+        help="Vacuum the analyzed tables (VACUUM, OPTIMIZE TABLE on MySQL)",
+    )
+
+    # store migration options
+    parser.add_argument(
+        "--migrate-target-store-uri", action="store", type=str, help="Database uri of the store to copy the store into"
+    )
+    parser.add_argument(
+        "--migrate-target-artifacts-destination",
+        action="store",
+        type=str,
+        help="Artifact destination to copy the proxied artifacts into (artifacts are not copied if omitted)",
+    )
+    parser.add_argument(
+        "--migrate-batch-size", action="store", default=100, type=int, help="Runs copied per batch (and transaction)"
+    )
+    parser.add_argument(
+        "--migrate-chunk-size", action="store", default=10000, type=int, help="Rows read and inserted at a time"
+    )
+    parser.add_argument(
+        "--migrate-workers", action="store", default=4, type=int, help="Processes copying batches of runs concurrently"
+    )
+    parser.add_argument(
+        "--migrate-artifact-workers",
+        action="store",
+        default=8,
+        type=int,
+        help="Threads copying the artifacts of runs concurrently",
+    )
+    parser.add_argument(
+        "--migrate-checkpoint", action="store", type=str, help="File the migration records its progress in"
+    )
+
+    # benchmark options
+    parser.add_argument(
+        "--benchmark-workloads",
+        action="store",
+        nargs="+",
+        choices=[workload.value for workload in BenchmarkWorkload],
+        help="Workloads to measure, in order (defaults to every workload)",
+    )
+    parser.add_argument("--benchmark-clients", action="store", default=8, type=int, help="Concurrent clients")
+    parser.add_argument(
+        "--benchmark-requests", action="store", default=1000, type=int, help="Requests sent per workload"
+    )
+    parser.add_argument(
+        "--benchmark-store",
+        action="store",
+        default="sqlite",
+        choices=["sqlite", "file"],
+        help="Local backend store the benchmarked server is launched against",
+    )
+    parser.add_argument(
+        "--benchmark-artifact-size",
+        action="store",
+        default=1024,
+        type=int,
+        help="Size (KiB) of the artifacts uploaded and downloaded",
+    )
+    parser.add_argument("--benchmark-output", action="store", help="File the benchmark report (JSON) is written to")
+
+    # metric archival options
+    parser.add_argument(
+        "--archive-older-than",
+        action="store",
+        default="90d",
+        type=str,
+        help="Archive the metric histories of runs which finished longer ago (e.g. `90d`, `2d8h5m20s`)",
+    )
+    parser.add_argument("--archive-batch-size", action="store", default=100, type=int, help="Runs archived per batch")
+    parser.add_argument(
+        "--archive-workers", action="store", default=4, type=int, help="Threads archiving runs concurrently"
     )
 
     # Load command line arguments
@@ -60,10 +595,11 @@ if __name__ == "__main__":
     print(args)
 
     # Load defined environmental variables
-    load_ae5_user_secrets(silent=False)
+    with timer.phase("secrets"):
+        load_ae5_user_secrets(silent=False)
 
     # Create our controller
-    controller: MLFlowTrackingServerController = MLFlowTrackingServerController()
+    controller: MLFlowTrackingServerController = MLFlowTrackingServerController(timer=timer)
 
     # Build launch parameters
     params: LaunchParameters = LaunchParameters(
@@ -72,6 +608,101 @@ if __name__ == "__main__":
         port=args.anaconda_project_port,
         address=args.anaconda_project_address,
         dry_run=args.dry_run,
+        workers=args.workers,
+        threads=args.threads,
+        worker_class=args.worker_class,
+        timeout=args.timeout,
+        keep_alive=args.keep_alive,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        internal_port=args.internal_port,
+        write_workers=args.write_workers,
+        read_workers=args.read_workers,
+        artifact_workers=args.artifact_workers,
+        dedicated_artifacts=args.dedicated_artifacts,
+        artifacts_port=args.artifacts_port,
+        artifacts_uri=args.artifacts_uri,
+        drain_timeout=args.drain_timeout,
+        max_restarts=args.max_restarts,
+        restart_window=args.restart_window,
+        log_format=args.log_format,
+        log_rate_limit=args.log_rate_limit,
+        embedded=args.embedded,
+        health_port=args.health_port,
+        liveness_interval=args.liveness_interval,
+        readiness_interval=args.readiness_interval,
+        probe_timeout=args.probe_timeout,
+        metrics=args.metrics,
+        metrics_dir=args.metrics_dir,
+        gc_batch_size=args.gc_batch_size,
+        gc_workers=args.gc_workers,
+        gc_checkpoint=args.gc_checkpoint,
+        gc_max_runs_per_minute=args.gc_max_runs_per_minute,
+        gc_interval=args.gc_interval,
+        gc_continuous=args.gc_continuous,
+        db_pool_size=args.db_pool_size,
+        db_max_overflow=args.db_max_overflow,
+        db_pool_recycle=args.db_pool_recycle,
+        db_null_pool=args.db_null_pool,
+        db_max_connections=args.db_max_connections,
+        sqlite_tuning=args.sqlite_tuning,
+        sqlite_single_writer=args.sqlite_single_writer,
+        sqlite_busy_timeout=args.sqlite_busy_timeout,
+        read_cache=args.read_cache,
+        read_cache_ttl=args.read_cache_ttl,
+        read_cache_size=args.read_cache_size,
+        read_cache_dir=args.read_cache_dir,
+        metric_buffer=args.metric_buffer,
+        metric_buffer_latency=args.metric_buffer_latency,
+        metric_buffer_size=args.metric_buffer_size,
+        metric_buffer_dir=args.metric_buffer_dir,
+        ingest_gateway=args.ingest_gateway,
+        ingest_gateway_connections=args.ingest_gateway_connections,
+        ingest_gateway_batch_size=args.ingest_gateway_batch_size,
+        ingest_gateway_latency=args.ingest_gateway_latency,
+        admission_control=args.admission_control,
+        admission_rate_limit=args.admission_rate_limit,
+        admission_rate_burst=args.admission_rate_burst,
+        admission_rate_limit_by=args.admission_rate_limit_by,
+        admission_trusted_proxy=args.admission_trusted_proxy,
+        admission_concurrency=args.admission_concurrency,
+        admission_queue_size=args.admission_queue_size,
+        admission_queue_latency=args.admission_queue_latency,
+        compression=args.compression,
+        compression_min_size=args.compression_min_size,
+        compression_level=args.compression_level,
+        stream_metric_history=args.stream_metric_history,
+        metric_archive=args.metric_archive,
+        artifact_transfers=args.artifact_transfers,
+        artifact_part_size=args.artifact_part_size,
+        artifact_transfer_concurrency=args.artifact_transfer_concurrency,
+        artifact_cache=args.artifact_cache,
+        artifact_cache_size=args.artifact_cache_size,
+        artifact_cache_dir=args.artifact_cache_dir,
+        secrets_reload_interval=args.secrets_reload_interval,
+        db_upgrade_rows_per_second=args.db_upgrade_rows_per_second,
+        db_upgrade_lock_timeout=args.db_upgrade_lock_timeout,
+        db_upgrade_online=args.db_upgrade_online,
+        benchmark_workloads=args.benchmark_workloads,
+        benchmark_clients=args.benchmark_clients,
+        benchmark_requests=args.benchmark_requests,
+        benchmark_store=args.benchmark_store,
+        benchmark_artifact_size=args.benchmark_artifact_size,
+        benchmark_output=args.benchmark_output,
+        archive_older_than=args.archive_older_than,
+        archive_batch_size=args.archive_batch_size,
+        archive_workers=args.archive_workers,
+        db_optimize_query_log=args.db_optimize_query_log,
+        db_optimize_slow_query_ms=args.db_optimize_slow_query_ms,
+        db_optimize_create_indexes=args.db_optimize_create_indexes,
+        db_optimize_vacuum=args.db_optimize_vacuum,
+        migrate_target_store_uri=args.migrate_target_store_uri,
+        migrate_target_artifacts_destination=args.migrate_target_artifacts_destination,
+        migrate_batch_size=args.migrate_batch_size,
+        migrate_chunk_size=args.migrate_chunk_size,
+        migrate_workers=args.migrate_workers,
+        migrate_artifact_workers=args.migrate_artifact_workers,
+        migrate_checkpoint=args.migrate_checkpoint,
     )
 
     # Execute the request
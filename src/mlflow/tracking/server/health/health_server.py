@@ -0,0 +1,72 @@
+""" HTTP server exposing the wrapper's liveness and readiness endpoints """
+
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .monitor import HealthMonitor
+
+# Endpoint path to the kind of checks it reports.
+ENDPOINTS: dict[str, str] = {"/livez": "liveness", "/readyz": "readiness"}
+
+
+class HealthRequestHandler(BaseHTTPRequestHandler):
+    """Answers `/livez` and `/readyz` from the cached probe results: `200` when healthy, `503` otherwise."""
+
+    server: "HealthServer"
+
+    def log_message(self, format: str, *args) -> None:  # pylint: disable=redefined-builtin
+        """Health requests arrive every few seconds and are not logged."""
+
+    # pylint: disable=invalid-name
+    def do_GET(self) -> None:
+        """Reports the status of the requested kind of checks."""
+
+        kind = ENDPOINTS.get(self.path.split("?")[0])
+        if kind is None:
+            self._respond(status=404, body={"status": "not found"})
+            return
+
+        healthy, results = self.server.monitor.status(kind=kind)
+        now: float = time.monotonic()
+        body: dict = {
+            "status": "ok" if healthy else "unavailable",
+            "checks": {
+                name: {"healthy": result.healthy, "detail": result.detail, "age": round(now - result.checked_at, 3)}
+                for name, result in results.items()
+            },
+        }
+        self._respond(status=200 if healthy else 503, body=body)
+
+    def _respond(self, status: int, body: dict) -> None:
+        """Writes a JSON response."""
+
+        payload: bytes = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class HealthServer(ThreadingHTTPServer):
+    """
+    Serves the health endpoints of a `HealthMonitor` on a dedicated port.
+
+    Parameters
+    ----------
+    address: str
+        The address to listen on.
+    port: int
+        The port to listen on.
+    monitor: HealthMonitor
+        The monitor whose cached results are reported.
+    """
+
+    daemon_threads = True
+    monitor: HealthMonitor
+
+    def __init__(self, address: str, port: int, monitor: HealthMonitor):
+        self.monitor = monitor
+        super().__init__((address, port), HealthRequestHandler)
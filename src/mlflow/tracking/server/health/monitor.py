@@ -0,0 +1,141 @@
+""" Runs health probes in the background and caches their results """
+
+import threading
+import time
+from typing import Optional
+
+from ..contracts.dto.probe_result import ProbeResult
+from .probes import Probe
+
+
+# pylint: disable=too-many-instance-attributes
+class HealthMonitor:
+    """
+    Evaluates liveness and readiness probes on their own intervals, each kind from its own background thread
+    (a readiness probe waiting on a slow database never delays liveness).  Health requests are answered from
+    the cached results, so a burst of probes never reaches the database.
+
+    A check whose last result is older than `stale_after` intervals (e.g. a probe hanging on an unreachable
+    database) is reported as unhealthy.
+
+    Parameters
+    ----------
+    liveness: dict[str, Probe]
+        Probes that must pass for the service to be considered alive, keyed by check name.
+    readiness: dict[str, Probe]
+        Probes that must pass for the service to receive traffic, keyed by check name.
+    liveness_interval: float
+        Seconds between liveness probes.
+    readiness_interval: float
+        Seconds between readiness probes.
+    stale_after: float
+        Number of intervals after which a result is considered stale.
+    """
+
+    liveness_interval: float
+    readiness_interval: float
+    stale_after: float
+
+    def __init__(
+        self,
+        liveness: dict[str, Probe],
+        readiness: dict[str, Probe],
+        liveness_interval: float = 1.0,
+        readiness_interval: float = 10.0,
+        stale_after: float = 3.0,
+    ):
+        for name, interval in [("liveness", liveness_interval), ("readiness", readiness_interval)]:
+            if interval <= 0:
+                raise ValueError(f"{name} interval must be positive, received: {interval}")
+
+        self.liveness_interval = liveness_interval
+        self.readiness_interval = readiness_interval
+        self.stale_after = stale_after
+        self._probes: dict[str, dict[str, Probe]] = {"liveness": liveness, "readiness": readiness}
+        self._results: dict[str, dict[str, ProbeResult]] = {"liveness": {}, "readiness": {}}
+        self._lock: threading.Lock = threading.Lock()
+        self._stop: threading.Event = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def _interval(self, kind: str) -> float:
+        """Returns the probe interval of a kind of check."""
+
+        return self.liveness_interval if kind == "liveness" else self.readiness_interval
+
+    def start(self) -> None:
+        """Starts probing in background threads."""
+
+        for kind in self._probes:
+            thread: threading.Thread = threading.Thread(
+                target=self._run, kwargs={"kind": kind}, name=f"health-{kind}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Stops probing (without waiting on a probe which is still in flight)."""
+
+        self._stop.set()
+
+    def probe(self, kind: str) -> None:
+        """
+        Runs every probe of a kind once and caches the results.
+
+        Parameters
+        ----------
+        kind: str
+            `liveness` or `readiness`.
+        """
+
+        for name, probe in self._probes[kind].items():
+            try:
+                healthy, detail = probe()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                healthy, detail = False, f"probe failed: {type(error).__name__}"
+            with self._lock:
+                self._results[kind][name] = ProbeResult(healthy=healthy, detail=detail, checked_at=time.monotonic())
+
+    def status(self, kind: str) -> tuple[bool, dict[str, ProbeResult]]:
+        """
+        Returns the cached status of a kind of check.
+
+        Parameters
+        ----------
+        kind: str
+            `liveness` or `readiness`.
+
+        Returns
+        -------
+            Whether every check passed, and the (possibly stale or missing) result of each check.
+        """
+
+        interval: float = self._interval(kind=kind)
+        now: float = time.monotonic()
+        with self._lock:
+            results: dict[str, ProbeResult] = dict(self._results[kind])
+
+        healthy: bool = True
+        for name in self._probes[kind]:
+            result: Optional[ProbeResult] = results.get(name)
+            if result is None:
+                results[name] = ProbeResult(healthy=False, detail="not probed yet", checked_at=now)
+            elif now - result.checked_at > interval * self.stale_after:
+                results[name] = ProbeResult(
+                    healthy=False, detail=f"stale: {result.detail}", checked_at=result.checked_at
+                )
+            healthy = healthy and results[name].healthy
+        return healthy, results
+
+    def _run(self, kind: str) -> None:
+        """
+        Probe thread: runs the probes of a kind every interval until stopped.
+
+        Parameters
+        ----------
+        kind: str
+            `liveness` or `readiness`.
+        """
+
+        while not self._stop.is_set():
+            self.probe(kind=kind)
+            self._stop.wait(timeout=self._interval(kind=kind))
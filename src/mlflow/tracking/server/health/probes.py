@@ -0,0 +1,164 @@
+""" Probes for the dependencies the tracking server needs to serve requests """
+
+import http.client
+import os
+import sqlite3
+import tempfile
+from typing import Any, Callable, Optional
+
+from ..common.uri import local_path
+
+# A probe returns `(healthy, detail)`.
+Probe = Callable[[], tuple[bool, str]]
+
+
+def build_process_probe(state: Callable[[], str]) -> Probe:
+    """
+    Builds a probe reporting whether a supervised process is alive (not yet started counts as alive).
+
+    Parameters
+    ----------
+    state: Callable[[], str]
+        Returns the process state: `pending`, `running` or `exited`.
+    """
+
+    def probe() -> tuple[bool, str]:
+        current: str = state()
+        return current != "exited", current
+
+    return probe
+
+
+def build_http_probe(host: str, port: int, path: str = "/health", timeout: float = 2.0) -> Probe:
+    """
+    Builds a probe expecting `200` from an HTTP endpoint.
+
+    Parameters
+    ----------
+    host: str
+        The host to connect to.
+    port: int
+        The port to connect to.
+    path: str
+        The path to request.
+    timeout: float
+        Seconds to wait for the response.
+    """
+
+    def probe() -> tuple[bool, str]:
+        connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        try:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+        except OSError as error:
+            return False, f"{host}:{port}{path}: {error}"
+        finally:
+            connection.close()
+        return response.status == 200, f"{host}:{port}{path}: {response.status}"
+
+    return probe
+
+
+# pylint: disable=too-few-public-methods
+class BackendStoreProbe:
+    """
+    Probes the backend store with a cheap query.  SQLite stores are queried with the standard library;
+    other databases through a single, reused SQLAlchemy connection (SQLAlchemy is imported on first use).
+    File stores are checked for existence.
+
+    Parameters
+    ----------
+    uri: str
+        The backend store uri (`MLFLOW_BACKEND_STORE_URI`).
+    timeout: float
+        Seconds to wait for the database.
+    """
+
+    uri: str
+    timeout: float
+
+    def __init__(self, uri: str, timeout: float = 2.0):
+        self.uri = uri
+        self.timeout = timeout
+        self._engine: Optional[Any] = None
+
+    def __call__(self) -> tuple[bool, str]:
+        if self.uri.startswith("sqlite:///"):
+            return self._probe_sqlite(path=self.uri.split(sep="sqlite:///")[1])
+        path: Optional[str] = local_path(self.uri)
+        if path is not None:
+            return (True, "file store present") if os.path.isdir(path) else (False, f"file store missing: {path}")
+        return self._probe_database()
+
+    def update(self, uri: str) -> None:
+        """
+        Probes another uri from now on, e.g. with rotated credentials; the connection to the former one is closed.
+
+        Parameters
+        ----------
+        uri: str
+            The backend store uri.
+        """
+
+        if uri == self.uri:
+            return
+        engine: Optional[Any] = self._engine
+        self.uri, self._engine = uri, None
+        if engine is not None:
+            engine.dispose()
+
+    def _probe_sqlite(self, path: str) -> tuple[bool, str]:
+        """Runs `SELECT 1` against a sqlite database without creating it."""
+
+        if not os.path.exists(path):
+            return False, f"database missing: {path}"
+        try:
+            with sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=self.timeout) as connection:
+                connection.execute("SELECT 1").fetchone()
+        except sqlite3.Error as error:
+            return False, f"database error: {error}"
+        return True, "database answered"
+
+    def _probe_database(self) -> tuple[bool, str]:
+        """Runs `SELECT 1` against a database through SQLAlchemy."""
+
+        # pylint: disable=import-outside-toplevel
+        try:
+            import sqlalchemy
+
+            engine: Optional[Any] = self._engine
+            if engine is None:
+                engine = self._engine = sqlalchemy.create_engine(
+                    self.uri, pool_size=1, max_overflow=0, pool_timeout=self.timeout, pool_pre_ping=True
+                )
+            with engine.connect() as connection:
+                connection.execute(sqlalchemy.text("SELECT 1")).fetchone()
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            return False, f"database error: {type(error).__name__}"
+        return True, "database answered"
+
+
+def build_artifacts_destination_probe(destination: str) -> Probe:
+    """
+    Builds a probe checking that a local artifact destination accepts writes.  Remote destinations are not
+    probed (their credentials belong to the server processes).
+
+    Parameters
+    ----------
+    destination: str
+        The artifact destination (`MLFLOW_ARTIFACTS_DESTINATION`).
+    """
+
+    def probe() -> tuple[bool, str]:
+        path: Optional[str] = local_path(destination)
+        if path is None:
+            return True, "remote destination, not probed"
+        try:
+            with tempfile.NamedTemporaryFile(dir=path, prefix=".readyz-"):
+                pass
+        except OSError as error:
+            return False, f"not writable: {error}"
+        return True, "writable"
+
+    return probe
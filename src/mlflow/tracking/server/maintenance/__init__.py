@@ -0,0 +1 @@
+""" maintenance namespace """
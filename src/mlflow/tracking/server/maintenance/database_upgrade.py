@@ -0,0 +1,316 @@
+""" Planned, timed and lock aware upgrades of the backend store schema """
+
+import ast
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from ..contracts.dto.database_upgrade_plan import DatabaseUpgradePlan
+from ..contracts.dto.pending_migration import PendingMigration
+from ..wsgi.sqlite_tuning import sqlite_database_path
+
+# Rows a migration rewrites (or indexes) per second, the default of the duration estimates.
+ROWS_PER_SECOND: float = 50000.0
+
+# Estimated duration of a migration which only alters empty or new tables.
+MIGRATION_OVERHEAD: float = 1.0
+
+
+def migration_tables(path: str, tables: list[str]) -> list[str]:
+    """
+    Lists the tables a migration script refers to.
+
+    Parameters
+    ----------
+    path: str
+        The migration script.
+    tables: list[str]
+        The tables of the database.
+
+    Returns
+    -------
+        The tables of the database named by string literals of the script, in the order of `tables`.
+    """
+
+    with open(file=path, mode="r", encoding="utf-8") as file:
+        tree: ast.AST = ast.parse(file.read())
+    literals: set[str] = {
+        node.value for node in ast.walk(tree) if isinstance(node, ast.Constant) and isinstance(node.value, str)
+    }
+    return [table for table in tables if table in literals]
+
+
+class DatabaseUpgrade:
+    """
+    Upgrades the schema of a database backed store to the revision of the installed mlflow, a migration at a time.
+
+    * `plan` reports the current and target revisions, the pending migrations, the tables they alter with their
+      row counts, an estimated duration, and the sessions the migrations would queue behind.
+    * `run` applies the pending migrations, each in a transaction of its own, and records how long each took.
+    * `initialize` creates the schema of a store which was never initialized, as the tracking server would.
+    * `lock_timeout` makes a migration fail fast (PostgreSQL and MySQL) instead of queueing behind long running
+      transactions while blocking every other query of the locked table.
+    * `online` creates indexes concurrently on PostgreSQL (`CREATE INDEX CONCURRENTLY`), so logging and searches
+      continue while large tables are indexed.
+
+    Parameters
+    ----------
+    backend_store_uri: str
+        The database uri of the store.
+    rows_per_second: float
+        Rows a migration rewrites per second, the basis of the duration estimates.
+    lock_timeout: Optional[float]
+        If provided, seconds a migration waits for a table lock before failing.
+    online: bool
+        If `True` indexes are created concurrently on PostgreSQL.
+    script_location: Optional[str]
+        The alembic migration scripts, defaults to the ones of the installed mlflow.
+    """
+
+    backend_store_uri: str
+    rows_per_second: float
+    lock_timeout: Optional[float]
+    online: bool
+    script_location: Optional[str]
+
+    def __init__(
+        self,
+        backend_store_uri: str,
+        rows_per_second: float = ROWS_PER_SECOND,
+        lock_timeout: Optional[float] = None,
+        online: bool = False,
+        script_location: Optional[str] = None,
+    ):
+        if rows_per_second <= 0:
+            raise ValueError(f"rows_per_second must be positive, received: {rows_per_second}")
+        if lock_timeout is not None and lock_timeout <= 0:
+            raise ValueError(f"lock_timeout must be positive, received: {lock_timeout}")
+
+        self.backend_store_uri = backend_store_uri
+        self.rows_per_second = rows_per_second
+        self.lock_timeout = lock_timeout
+        self.online = online
+        self.script_location = script_location
+        self._engine: Optional[Any] = None
+
+    def _connect(self) -> Any:
+        """Creates the engine (on first use); its connections wait at most `lock_timeout` for locks."""
+
+        if self._engine is not None:
+            return self._engine
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+        from sqlalchemy.pool import NullPool
+
+        self._engine = sqlalchemy.create_engine(self.backend_store_uri, poolclass=NullPool)
+        if self.lock_timeout is not None:
+            statement: Optional[str] = {
+                "postgresql": f"SET lock_timeout = {int(self.lock_timeout * 1000)}",
+                "mysql": f"SET SESSION lock_wait_timeout = {max(int(self.lock_timeout), 1)}",
+            }.get(self._engine.dialect.name)
+
+            def on_connect(dbapi_connection: Any, _record: Any) -> None:
+                cursor: Any = dbapi_connection.cursor()
+                try:
+                    cursor.execute(statement)
+                finally:
+                    cursor.close()
+
+            if statement is not None:
+                sqlalchemy.event.listen(self._engine, "connect", on_connect)
+        return self._engine
+
+    def _config(self) -> Any:
+        """Returns the alembic configuration of the migrations."""
+
+        # pylint: disable=import-outside-toplevel
+        if self.script_location is None:
+            from mlflow.store.db.utils import _get_alembic_config
+
+            return _get_alembic_config(db_url=self.backend_store_uri)
+
+        from alembic.config import Config
+
+        config: Any = Config()
+        config.set_main_option("script_location", self.script_location)
+        config.set_main_option("sqlalchemy.url", self.backend_store_uri.replace("%", "%%"))
+        return config
+
+    def _rows(self, connection: Any, table: str) -> Optional[int]:
+        """Returns the rows of a table, estimated from the statistics of PostgreSQL and MySQL."""
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        dialect: str = connection.dialect.name
+        if dialect == "postgresql":
+            query = sqlalchemy.text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+        elif dialect == "mysql":
+            query = sqlalchemy.text(
+                "SELECT table_rows FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = :table"
+            )
+        else:
+            query = sqlalchemy.text(f"SELECT COUNT(*) FROM {connection.dialect.identifier_preparer.quote(table)}")
+        rows: Optional[int] = connection.execute(query, {"table": table}).scalar()
+        # PostgreSQL reports -1 for tables which were never analyzed.
+        return None if rows is None or rows < 0 else int(rows)
+
+    @staticmethod
+    def _activity(connection: Any) -> tuple[Optional[int], Optional[float]]:
+        """Returns the sessions of other clients running a statement, and the age of the oldest transaction."""
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        dialect: str = connection.dialect.name
+        if dialect == "postgresql":
+            sessions, oldest = connection.execute(
+                sqlalchemy.text(
+                    "SELECT COUNT(*) FILTER (WHERE state <> 'idle'), "
+                    "EXTRACT(EPOCH FROM MAX(now() - xact_start)) FROM pg_stat_activity "
+                    "WHERE datname = current_database() AND pid <> pg_backend_pid()"
+                )
+            ).one()
+            return int(sessions), None if oldest is None else float(oldest)
+        if dialect == "mysql":
+            sessions = connection.execute(
+                sqlalchemy.text(
+                    "SELECT COUNT(*) FROM information_schema.processlist "
+                    "WHERE db = DATABASE() AND command <> 'Sleep' AND id <> CONNECTION_ID()"
+                )
+            ).scalar()
+            return int(sessions), None
+        return None, None
+
+    def _pending(self, connection: Any, script: Any, current: str, target: str) -> list[PendingMigration]:
+        """Lists the migrations from the current to the target revision, in the order they are applied."""
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        tables: list[str] = sqlalchemy.inspect(connection).get_table_names()
+        rows: dict[str, Optional[int]] = {}
+        migrations: list[PendingMigration] = []
+        for revision in reversed(list(script.iterate_revisions(target, current))):
+            altered: list[str] = migration_tables(path=revision.path, tables=tables)
+            for table in altered:
+                if table not in rows:
+                    rows[table] = self._rows(connection=connection, table=table)
+            known: list[int] = [rows[table] for table in altered if rows[table] is not None]
+            migrations.append(
+                PendingMigration(
+                    revision=revision.revision,
+                    description=(revision.doc or "").strip(),
+                    tables=altered,
+                    rows=sum(known) if len(known) == len(altered) else None,
+                    estimated_seconds=MIGRATION_OVERHEAD + sum(known) / self.rows_per_second,
+                )
+            )
+        return migrations
+
+    def plan(self) -> DatabaseUpgradePlan:
+        """
+        Plans the upgrade without changing the database.
+
+        Returns
+        -------
+            The pending migrations, their estimated durations and the activity of the database.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from alembic.runtime.migration import MigrationContext
+        from alembic.script import ScriptDirectory
+
+        script: Any = ScriptDirectory.from_config(self._config())
+        target: str = script.get_current_head()
+        path: Optional[str] = sqlite_database_path(uri=self.backend_store_uri)
+        if path is not None and not os.path.exists(path):
+            # Connecting would create an empty database.
+            return DatabaseUpgradePlan(current=None, target=target)
+        with self._connect().connect() as connection:
+            current: Optional[str] = MigrationContext.configure(connection).get_current_revision()
+            migrations: list[PendingMigration] = (
+                self._pending(connection=connection, script=script, current=current, target=target)
+                if current is not None
+                else []
+            )
+            active_sessions, longest_transaction = DatabaseUpgrade._activity(connection=connection)
+        return DatabaseUpgradePlan(
+            current=current,
+            target=target,
+            migrations=migrations,
+            active_sessions=active_sessions,
+            longest_transaction=longest_transaction,
+        )
+
+    @contextmanager
+    def _concurrent_indexes(self) -> Iterator[None]:
+        """Creates the indexes of migrations concurrently (outside of a transaction) on PostgreSQL."""
+
+        if not self.online or self._connect().dialect.name != "postgresql":
+            yield
+            return
+        # pylint: disable=import-outside-toplevel
+        from alembic.operations import Operations
+
+        create_index: Any = Operations.create_index
+
+        def create_index_concurrently(operations: Any, *args: Any, **kwargs: Any) -> Any:
+            with operations.get_context().autocommit_block():
+                return create_index(operations, *args, postgresql_concurrently=True, **kwargs)
+
+        Operations.create_index = create_index_concurrently
+        try:
+            yield
+        finally:
+            Operations.create_index = create_index
+
+    def initialize(self) -> DatabaseUpgradePlan:
+        """
+        Creates the schema of the installed mlflow in a database which was never initialized (creating a missing
+        sqlite database), as the tracking server does on its first start.
+
+        Returns
+        -------
+            The plan of the initialized database, at the target revision.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from mlflow.store.db.utils import _initialize_tables
+
+        _initialize_tables(self._connect())
+        return self.plan()
+
+    def run(self, plan: Optional[DatabaseUpgradePlan] = None) -> DatabaseUpgradePlan:
+        """
+        Applies the pending migrations, one transaction per migration.
+
+        Parameters
+        ----------
+        plan: Optional[DatabaseUpgradePlan]
+            The plan to apply, planned first if not provided.
+
+        Returns
+        -------
+            The applied plan, with the duration of each migration.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from alembic import command
+
+        plan = plan if plan is not None else self.plan()
+        if plan.current is None:
+            raise ValueError("the database schema was never created, initialize it first")
+        config: Any = self._config()
+        with self._concurrent_indexes(), self._connect().connect() as connection:
+            # The migration environment of mlflow opens its connections from the engine of this connection.
+            config.attributes["connection"] = connection
+            for migration in plan.migrations:
+                print(f"Applying migration {migration.revision} ({migration.description})", flush=True)
+                started: float = time.monotonic()
+                command.upgrade(config, migration.revision)
+                migration.elapsed = time.monotonic() - started
+                print(f"Applied migration {migration.revision} in {migration.elapsed:.1f}s", flush=True)
+        return plan
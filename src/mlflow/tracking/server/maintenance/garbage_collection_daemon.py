@@ -0,0 +1,100 @@
+""" Continuous garbage collection """
+
+import signal
+import threading
+from typing import Optional
+
+from ..contracts.dto.garbage_collection_report import GarbageCollectionReport
+from .garbage_collector import GarbageCollector
+
+
+class GarbageCollectionDaemon:
+    """
+    Reclaims deleted runs continuously: a (rate limited) collection pass every `interval` seconds, so storage
+    is reclaimed steadily instead of by an occasional collection of everything at once.
+
+    A failing pass (e.g. the database is briefly unreachable) is reported and retried by the next pass.
+    SIGTERM / SIGINT stop the daemon after the batch in flight when it runs on the main thread.
+
+    Parameters
+    ----------
+    collector: GarbageCollector
+        Performs each pass; its rate limit, batch size and workers bound the load of the daemon.
+    interval: float
+        Seconds between the end of a pass and the start of the next one.
+    dry_run: bool
+        If `True` each pass only reports what it would delete.
+    """
+
+    collector: GarbageCollector
+    interval: float
+    dry_run: bool
+    passes: int
+
+    def __init__(self, collector: GarbageCollector, interval: float = 300.0, dry_run: bool = False):
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, received: {interval}")
+
+        self.collector = collector
+        self.interval = interval
+        self.dry_run = dry_run
+        self.passes = 0
+        self._stop: threading.Event = threading.Event()
+
+    def stop(self) -> None:
+        """Requests the daemon to stop after the batch in flight.  Safe to call from signal handlers and threads."""
+
+        self._stop.set()
+        self.collector.stop()
+
+    def replace_collector(self, collector: GarbageCollector) -> None:
+        """
+        Performs the next passes with another collector (e.g. connecting with rotated credentials); a pass in
+        flight stops after its batch in flight and is resumed by the next pass from the checkpoint.
+
+        Parameters
+        ----------
+        collector: GarbageCollector
+            The collector of the next passes.
+        """
+
+        replaced: GarbageCollector = self.collector
+        self.collector = collector
+        replaced.stop()
+
+    def _handle_signal(self, signum: int, _frame) -> None:
+        """Signal handler stopping the daemon."""
+
+        print(f"Received signal {signal.Signals(signum).name}, stopping garbage collection")
+        self.stop()
+
+    def collect(self) -> Optional[GarbageCollectionReport]:
+        """
+        Runs a single collection pass.
+
+        Returns
+        -------
+            The report of the pass, or `None` if it failed.
+        """
+
+        try:
+            report: GarbageCollectionReport = self.collector.run(dry_run=self.dry_run)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            print(f"Garbage collection pass failed, retrying in {self.interval} seconds: {error!r}", flush=True)
+            return None
+        finally:
+            self.passes += 1
+        print(f"Garbage collection pass {self.passes} {report.summary()}", flush=True)
+        return report
+
+    def run(self) -> None:
+        """Runs collection passes until a stop is requested (by signal or `stop`)."""
+
+        if threading.current_thread() is threading.main_thread():
+            for signum in [signal.SIGTERM, signal.SIGINT]:
+                signal.signal(signum, self._handle_signal)
+
+        print(f"Collecting garbage every {self.interval} seconds", flush=True)
+        while not self._stop.is_set():
+            self.collect()
+            self._stop.wait(timeout=self.interval)
@@ -0,0 +1,527 @@
+""" Native, batched and resumable garbage collection of deleted runs """
+
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Optional
+
+from ..common.checkpoint import clear_checkpoint, load_checkpoint, save_checkpoint, store_key
+from ..common.uri import local_path
+from ..contracts.dto.artifact_stat import ArtifactStat
+from ..contracts.dto.garbage_collection_report import GarbageCollectionReport
+from ..wsgi.artifact_stores import open_artifact_store
+from ..wsgi.metric_archive import ARCHIVE_PART_SIZE, MetricArchive
+
+# Same format `mlflow gc --older-than` accepts, e.g. `30d`, `2d8h5m20s`.
+DURATION_PATTERN: re.Pattern = re.compile(
+    r"^((?P<days>[\.\d]+?)d)?((?P<hours>[\.\d]+?)h)?((?P<minutes>[\.\d]+?)m)?((?P<seconds>[\.\d]+?)s)?$"
+)
+
+# Scheme of artifact uris served through the tracking server's artifact proxy.
+PROXIED_ARTIFACTS_SCHEME: str = "mlflow-artifacts:"
+
+MEBIBYTE: int = 1024 * 1024
+
+
+def parse_duration(value: str) -> timedelta:
+    """
+    Parses a duration in the `mlflow gc --older-than` format.
+
+    Parameters
+    ----------
+    value: str
+        The duration, e.g. `30d0h0m0s`.
+    """
+
+    parts: Optional[re.Match] = DURATION_PATTERN.match(value)
+    if not value or parts is None:
+        raise ValueError(f"unable to parse duration: '{value}', examples of valid durations: '8h', '2d8h5m20s'")
+    return timedelta(**{name: float(part) for name, part in parts.groupdict().items() if part})
+
+
+def proxied_artifact_path(artifact_uri: str) -> Optional[str]:
+    """
+    Returns the path below the artifact destination of a proxied artifact uri (`mlflow-artifacts:/path` or
+    `mlflow-artifacts://host:port/path`), or `None` if the uri is not proxied.
+    """
+
+    if not artifact_uri.startswith(PROXIED_ARTIFACTS_SCHEME):
+        return None
+    path: str = artifact_uri[len(PROXIED_ARTIFACTS_SCHEME) :]
+    if path.startswith("//"):
+        path = path[2:].partition("/")[2]
+    return path.lstrip("/")
+
+
+def _local_size(path: str) -> int:
+    """Returns the total size of the files below a local path (0 if it does not exist)."""
+
+    if os.path.isfile(path):
+        return os.lstat(path).st_size
+    size: int = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.lstat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                pass
+    return size
+
+
+def _repository_size(repository: Any, path: Optional[str] = None) -> int:
+    """Returns the total size of the artifacts below a path of an mlflow artifact repository."""
+
+    size: int = 0
+    for info in repository.list_artifacts(path):
+        size += _repository_size(repository=repository, path=info.path) if info.is_dir else info.file_size or 0
+    return size
+
+
+# pylint: disable=too-few-public-methods
+class _Collection:
+    """Progress of a collection, persisted in the checkpoint."""
+
+    last_run: str
+    report: GarbageCollectionReport
+
+    def __init__(self, last_run: str = "", report: Optional[GarbageCollectionReport] = None):
+        self.last_run = last_run
+        self.report = report if report is not None else GarbageCollectionReport()
+
+
+# pylint: disable=too-many-arguments,too-many-instance-attributes
+class GarbageCollector:
+    """
+    Permanently deletes runs in the `deleted` lifecycle stage (and deleted experiments) older than a time to
+    live from a database backed store, the same data `mlflow gc --older-than` removes, but at scale:
+
+    * Deleted runs are enumerated in batches of `batch_size` in run id order (keyset pagination).
+    * The artifacts of a batch are measured and deleted by a pool of `workers` threads.  Runs whose artifacts
+      could not be deleted are kept and retried by the next collection.
+    * The metadata of a batch is deleted with one bulk statement per table in a single transaction.
+    * Progress (last run id and running totals) is checkpointed after every batch, so an interrupted collection
+      resumes where it stopped.  The checkpoint is removed once the collection completes.
+    * Throughput (runs/s and bytes freed) is reported after every batch.
+    * With `max_runs_per_minute` set, batches are paced (and capped at one minute worth of runs) so the
+      backend and artifact stores see a steady trickle of deletes instead of a spike.
+    * `stop` ends a collection after the batch in flight; its progress stays checkpointed.
+
+    A dry run reports the number of runs and experiments and the size of the artifacts that would be deleted,
+    without deleting anything (or reading and writing the checkpoint).
+
+    Proxied artifacts (`mlflow-artifacts:/...`) are deleted directly from `artifacts_destination`, along with
+    the archived metric history of the run (`MetricArchive`).
+
+    Parameters
+    ----------
+    backend_store_uri: str
+        The SQLAlchemy uri of the tracking store (`MLFLOW_BACKEND_STORE_URI`).
+    artifacts_destination: Optional[str]
+        Where proxied artifacts are stored (`MLFLOW_ARTIFACTS_DESTINATION`).
+    older_than: timedelta
+        Only runs deleted (and experiments last updated) longer ago are collected.
+    batch_size: int
+        Runs enumerated and deleted per batch.
+    workers: int
+        Threads deleting artifacts concurrently.
+    checkpoint_path: Optional[str]
+        Where progress is recorded; progress is not recorded if `None`.
+    max_runs_per_minute: Optional[float]
+        Sustained rate runs are deleted at.  Unlimited if `None`.
+    """
+
+    backend_store_uri: str
+    artifacts_destination: Optional[str]
+    older_than: timedelta
+    batch_size: int
+    workers: int
+    checkpoint_path: Optional[str]
+    max_runs_per_minute: Optional[float]
+
+    def __init__(
+        self,
+        backend_store_uri: str,
+        artifacts_destination: Optional[str],
+        older_than: timedelta,
+        *,
+        batch_size: int = 500,
+        workers: int = 8,
+        checkpoint_path: Optional[str] = None,
+        max_runs_per_minute: Optional[float] = None,
+    ):
+        if batch_size < 1:
+            raise ValueError(f"batch size must be at least 1, received: {batch_size}")
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, received: {workers}")
+        if max_runs_per_minute is not None and max_runs_per_minute <= 0:
+            raise ValueError(f"max runs per minute must be positive, received: {max_runs_per_minute}")
+
+        self.backend_store_uri = backend_store_uri
+        self.artifacts_destination = artifacts_destination
+        self.older_than = older_than
+        self.batch_size = (
+            batch_size if max_runs_per_minute is None else min(batch_size, max(1, int(max_runs_per_minute)))
+        )
+        self.workers = workers
+        self.checkpoint_path = checkpoint_path
+        self.max_runs_per_minute = max_runs_per_minute
+        self._stop: threading.Event = threading.Event()
+        self._engine: Optional[Any] = None
+        self._tables: dict[str, Any] = {}
+        self._archive: Optional[MetricArchive] = None
+
+    # Store access
+
+    def _connect(self) -> None:
+        """Creates the engine and reflects the tables referencing runs and experiments (on first use)."""
+
+        if self._engine is not None:
+            return
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        self._engine = sqlalchemy.create_engine(self.backend_store_uri)
+        metadata = sqlalchemy.MetaData()
+        metadata.reflect(bind=self._engine)
+        self._tables = dict(metadata.tables)
+
+    def _children(self, table: str, column: str) -> list[tuple[Any, Any]]:
+        """
+        Returns the tables (and their columns) with a foreign key onto a column of a table.
+
+        Parameters
+        ----------
+        table: str
+            The referenced table.
+        column: str
+            The referenced column.
+        """
+
+        children: list[tuple[Any, Any]] = []
+        for child in self._tables.values():
+            for foreign_key in child.foreign_keys:
+                if foreign_key.column.table.name == table and foreign_key.column.name == column:
+                    children.append((child, foreign_key.parent))
+        return children
+
+    def _cutoff(self) -> int:
+        """Returns the time (epoch milliseconds) before which deleted runs and experiments are collected."""
+
+        return int((time.time() - self.older_than.total_seconds()) * 1000)
+
+    def _expired_experiments(self, cutoff: int) -> Any:
+        """Returns a select of the ids of deleted experiments last updated before the cutoff."""
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        experiments = self._tables["experiments"]
+        return sqlalchemy.select(experiments.c.experiment_id).where(
+            experiments.c.lifecycle_stage == "deleted", experiments.c.last_update_time < cutoff
+        )
+
+    def _next_batch(self, cutoff: int, after: str) -> list[tuple[str, Optional[str]]]:
+        """
+        Returns the next batch of collectable runs: deleted before the cutoff, or belonging to an expired deleted
+        experiment.
+
+        Parameters
+        ----------
+        cutoff: int
+            Epoch milliseconds.
+        after: str
+            The run id the previous batch ended with.
+
+        Returns
+        -------
+            Run ids and artifact uris, in run id order.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        runs = self._tables["runs"]
+        query = (
+            sqlalchemy.select(runs.c.run_uuid, runs.c.artifact_uri)
+            .where(
+                runs.c.lifecycle_stage == "deleted",
+                runs.c.run_uuid > after,
+                sqlalchemy.or_(
+                    runs.c.deleted_time <= cutoff, runs.c.experiment_id.in_(self._expired_experiments(cutoff=cutoff))
+                ),
+            )
+            .order_by(runs.c.run_uuid)
+            .limit(self.batch_size)
+        )
+        with self._engine.connect() as connection:
+            return [(row.run_uuid, row.artifact_uri) for row in connection.execute(query)]
+
+    def _delete_runs(self, run_ids: list[str]) -> None:
+        """Deletes the metadata of runs, one bulk statement per table, in a single transaction."""
+
+        runs = self._tables["runs"]
+        with self._engine.begin() as connection:
+            for child, column in self._children(table="runs", column="run_uuid"):
+                connection.execute(child.delete().where(column.in_(run_ids)))
+            connection.execute(runs.delete().where(runs.c.run_uuid.in_(run_ids)))
+
+    def _collect_experiments(self, cutoff: int, dry_run: bool) -> int:
+        """
+        Deletes expired deleted experiments which no longer have runs (a dry run counts those whose runs are
+        all collectable).
+
+        Returns
+        -------
+            The number of experiments (which would be) deleted.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        experiments = self._tables["experiments"]
+        runs = self._tables["runs"]
+        remaining = sqlalchemy.select(runs.c.run_uuid).where(runs.c.experiment_id == experiments.c.experiment_id)
+        if dry_run:
+            remaining = remaining.where(runs.c.lifecycle_stage != "deleted")
+        query = sqlalchemy.select(experiments.c.experiment_id).where(
+            experiments.c.experiment_id.in_(self._expired_experiments(cutoff=cutoff)), ~remaining.exists()
+        )
+        with self._engine.begin() as connection:
+            experiment_ids: list = [row.experiment_id for row in connection.execute(query)]
+            if experiment_ids and not dry_run:
+                for child, column in self._children(table="experiments", column="experiment_id"):
+                    connection.execute(child.delete().where(column.in_(experiment_ids)))
+                connection.execute(experiments.delete().where(experiments.c.experiment_id.in_(experiment_ids)))
+        return len(experiment_ids)
+
+    # Artifacts
+
+    def _resolve_artifacts(self, artifact_uri: str) -> Optional[str]:
+        """
+        Maps the artifact uri of a run onto the location its artifacts are stored at.
+
+        Returns
+        -------
+            The location, or `None` for proxied artifacts when no destination is configured.
+        """
+
+        path: Optional[str] = proxied_artifact_path(artifact_uri=artifact_uri)
+        if path is None:
+            return artifact_uri
+        if not self.artifacts_destination:
+            return None
+        return f"{self.artifacts_destination.rstrip('/')}/{path}"
+
+    def _collect_artifacts(self, run: tuple[str, Optional[str]], dry_run: bool) -> tuple[bool, int]:
+        """
+        Measures and deletes the artifacts of a run.
+
+        Parameters
+        ----------
+        run: tuple[str, Optional[str]]
+            The run id and its artifact uri.
+        dry_run: bool
+            If `True` the artifacts are measured only.
+
+        Returns
+        -------
+            Whether the run may be deleted, and the size of its artifacts.
+        """
+
+        run_id, artifact_uri = run
+        location: Optional[str] = self._resolve_artifacts(artifact_uri=artifact_uri) if artifact_uri else None
+        if location is None:
+            if artifact_uri:
+                print(f"[{run_id}] unable to resolve artifact location {artifact_uri}, deleting metadata only")
+            return True, 0
+
+        try:
+            path: Optional[str] = local_path(location)
+            if path is not None:
+                size: int = _local_size(path=path)
+                if not dry_run and os.path.isdir(path):
+                    shutil.rmtree(path)
+                elif not dry_run and os.path.lexists(path):
+                    os.remove(path)
+                return True, size
+
+            # pylint: disable=import-outside-toplevel
+            from mlflow.store.artifact.artifact_repository_registry import get_artifact_repository
+
+            repository = get_artifact_repository(location)
+            size = _repository_size(repository=repository)
+            if not dry_run:
+                repository.delete_artifacts()
+            return True, size
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            print(f"[{run_id}] unable to delete artifacts at {location}: {error!r}, keeping the run")
+            return False, 0
+
+    def _metric_archive(self) -> Optional[MetricArchive]:
+        """Opens the metric archive of the artifact destination (once), `None` if it can hold none."""
+
+        if self._archive is None and self.artifacts_destination:
+            store = open_artifact_store(
+                destination=self.artifacts_destination, part_size=ARCHIVE_PART_SIZE, concurrency=1
+            )
+            self._archive = MetricArchive(store=store, cache_size=0) if store is not None else None
+        return self._archive
+
+    def _collect_run(self, run: tuple[str, Optional[str]], dry_run: bool) -> tuple[bool, int]:
+        """
+        Measures and deletes the artifacts and the archived metric history of a run.
+
+        Returns
+        -------
+            Whether the run may be deleted, and the size of its artifacts and archive.
+        """
+
+        collectable, size = self._collect_artifacts(run=run, dry_run=dry_run)
+        if not collectable:
+            return False, 0
+        run_id: str = run[0]
+        try:
+            archive: Optional[MetricArchive] = self._metric_archive()
+            stat: Optional[ArtifactStat] = archive.stat(run_id=run_id) if archive is not None else None
+            if stat is None:
+                return True, size
+            if not dry_run:
+                archive.delete(run_id=run_id)
+            return True, size + stat.size
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            print(f"[{run_id}] unable to delete the archived metric history: {error!r}, keeping the run")
+            return False, 0
+
+    # Checkpoint
+
+    def _load_checkpoint(self) -> _Collection:
+        """Returns the progress of an interrupted collection of this store, or a new collection."""
+
+        state: Optional[dict] = load_checkpoint(path=self.checkpoint_path, key=store_key(self.backend_store_uri))
+        if state is None:
+            return _Collection()
+        report = GarbageCollectionReport(**state["report"])
+        print(f"Resuming garbage collection after run {state['last_run']} ({report.runs} runs already deleted)")
+        return _Collection(last_run=state["last_run"], report=report)
+
+    def _save_checkpoint(self, collection: _Collection) -> None:
+        """Atomically records the progress of a collection."""
+
+        report: GarbageCollectionReport = collection.report
+        state: dict = {
+            "last_run": collection.last_run,
+            "report": {
+                "runs": report.runs,
+                "experiments": report.experiments,
+                "bytes_freed": report.bytes_freed,
+                "failures": report.failures,
+                "elapsed": report.elapsed,
+            },
+        }
+        save_checkpoint(path=self.checkpoint_path, key=store_key(self.backend_store_uri), state=state)
+
+    # Collection
+
+    def _collect_batch(
+        self, collection: _Collection, cutoff: int, pool: ThreadPoolExecutor, dry_run: bool
+    ) -> Optional[int]:
+        """
+        Collects the next batch of runs.
+
+        Returns
+        -------
+            The number of runs in the batch, or `None` when no collectable runs are left.
+        """
+
+        batch: list[tuple[str, Optional[str]]] = self._next_batch(cutoff=cutoff, after=collection.last_run)
+        if not batch:
+            return None
+
+        deletable: list[str] = []
+        for run, (collectable, size) in zip(batch, pool.map(lambda run: self._collect_run(run, dry_run), batch)):
+            if collectable:
+                deletable.append(run[0])
+                collection.report.bytes_freed += size
+            else:
+                collection.report.failures += 1
+        if deletable and not dry_run:
+            self._delete_runs(run_ids=deletable)
+
+        collection.report.runs += len(deletable)
+        collection.last_run = batch[-1][0]
+        return len(batch)
+
+    def _throttle(self, runs: int, began: float) -> None:
+        """
+        Waits until deleting a batch of runs fits the rate limit (or a stop is requested).
+
+        Parameters
+        ----------
+        runs: int
+            The number of runs the batch deleted.
+        began: float
+            The monotonic time the batch started.
+        """
+
+        if self.max_runs_per_minute is None or not runs:
+            return
+        delay: float = began + runs * 60.0 / self.max_runs_per_minute - time.monotonic()
+        if delay > 0:
+            self._stop.wait(timeout=delay)
+
+    def stop(self) -> None:
+        """Requests the collection in progress to stop after its current batch.  Safe to call from other threads."""
+
+        self._stop.set()
+
+    def run(self, dry_run: bool = True) -> GarbageCollectionReport:
+        """
+        Collects every collectable run, then the expired deleted experiments left without runs.
+
+        Parameters
+        ----------
+        dry_run: bool
+            If `True` nothing is deleted and the report describes what would be deleted.
+
+        Returns
+        -------
+            The report of the (whole, if resumed) collection, which is partial if the collection was stopped.
+        """
+
+        self._connect()
+        self._metric_archive()
+        collection: _Collection = _Collection() if dry_run else self._load_checkpoint()
+        collection.report.dry_run = dry_run
+        cutoff: int = self._cutoff()
+        began: float = time.monotonic() - collection.report.elapsed
+        completed: bool = False
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="gc") as pool:
+            while not self._stop.is_set():
+                batch_began: float = time.monotonic()
+                deleted: int = collection.report.runs
+                if self._collect_batch(collection=collection, cutoff=cutoff, pool=pool, dry_run=dry_run) is None:
+                    completed = True
+                    break
+                collection.report.elapsed = time.monotonic() - began
+                if not dry_run:
+                    self._save_checkpoint(collection=collection)
+                print(
+                    f"Garbage collection: {collection.report.runs} runs, "
+                    f"{collection.report.bytes_freed / MEBIBYTE:.1f} MiB "
+                    f"({collection.report.runs_per_second:.1f} runs/s)",
+                    flush=True,
+                )
+                if not dry_run:
+                    self._throttle(runs=collection.report.runs - deleted, began=batch_began)
+
+        if completed:
+            collection.report.experiments += self._collect_experiments(cutoff=cutoff, dry_run=dry_run)
+        collection.report.elapsed = time.monotonic() - began
+        if completed and not dry_run:
+            clear_checkpoint(path=self.checkpoint_path)
+        return collection.report
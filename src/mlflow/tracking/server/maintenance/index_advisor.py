@@ -0,0 +1,445 @@
+""" Index recommendations and statistics maintenance of the backend store """
+
+import os
+import re
+import time
+from typing import Any, Optional
+
+from ..contracts.dto.database_optimization_report import DatabaseOptimizationReport
+from ..contracts.dto.index_recommendation import IndexRecommendation
+from ..wsgi.sqlite_tuning import sqlite_database_path
+
+# The access patterns of mlflow searches and metric history reads which the schema of mlflow does not index: the
+# table, the filtered columns (in index order) and the columns the queries select besides them.
+ACCESS_PATTERNS: list[tuple[str, list[str], list[str]]] = [
+    # Run searches filtering by `params.<key> = '<value>'`.
+    ("params", ["key", "value"], ["run_uuid"]),
+    # Run searches filtering by `tags.<key> = '<value>'`.
+    ("tags", ["key", "value"], ["run_uuid"]),
+    # Run searches filtering and ordering by `metrics.<key>`.
+    ("latest_metrics", ["key", "value"], ["run_uuid"]),
+    # The history of a metric of a run.
+    ("metrics", ["run_uuid", "key"], []),
+]
+
+# Columns holding text longer than PostgreSQL (about 2700 bytes) and MySQL (3072 bytes) allow in a B-tree index
+# entry.  Indexing them whole would make logging long values fail.
+UNBOUNDED_COLUMNS: set[tuple[str, str]] = {("params", "value"), ("tags", "value")}
+
+# Characters of unbounded columns indexed on MySQL (a prefix index).
+MYSQL_PREFIX_LENGTH: int = 255
+
+# The slow statements of a PostgreSQL log (`log_min_duration_statement`).
+POSTGRESQL_LOG_ENTRY: re.Pattern = re.compile(r"duration: ([\d.]+) ms\s+(?:statement|execute [^:]*):\s*(.*)")
+
+# The header of a statement of a MySQL slow query log.
+MYSQL_LOG_HEADER: re.Pattern = re.compile(r"^# Query_time: ([\d.]+)")
+
+# Lines of a query log which are statements.
+STATEMENT: re.Pattern = re.compile(r"^\s*(?:SELECT|WITH|UPDATE|DELETE|INSERT)\b", re.IGNORECASE)
+
+# A sampled statement: its text, calls and total milliseconds.
+QuerySample = tuple[str, int, float]
+
+
+def column_reference(table: str, column: str) -> str:
+    """Returns the pattern of a qualified (and possibly quoted) reference to a column, e.g. `"params"."key"`."""
+
+    quote: str = '["`]?'
+    return rf"(?<![\w\"`]){quote}{table}{quote}\s*\.\s*{quote}{column}{quote}(?![\w\"`])"
+
+
+def serves(statement: str, table: str, columns: list[str]) -> bool:
+    """
+    Tells whether an index on columns of a table serves a statement: the statement filters by the first column and
+    refers to the others.
+
+    Parameters
+    ----------
+    statement: str
+        The statement, with qualified column references (as generated by mlflow).
+    table: str
+        The table.
+    columns: list[str]
+        The indexed columns, in order.
+    """
+
+    predicate: str = column_reference(table=table, column=columns[0]) + r"\s*(?:=|<>|!=|<|>|IN\b|LIKE\b|ILIKE\b)"
+    if re.search(predicate, statement, re.IGNORECASE) is None:
+        return False
+    return all(re.search(column_reference(table, column), statement, re.IGNORECASE) for column in columns[1:])
+
+
+def read_query_log(path: str, slow_query_ms: float = 0.0) -> list[QuerySample]:
+    """
+    Reads the slow statements of a query log: a PostgreSQL log (`log_min_duration_statement`), a MySQL slow query
+    log, or a file of statements one per line.  PostgreSQL statements continue on indented lines.
+
+    Parameters
+    ----------
+    path: str
+        The query log.
+    slow_query_ms: float
+        Statements which took fewer milliseconds are ignored; statements without a duration are kept.
+
+    Returns
+    -------
+        The statements, one call each.
+    """
+
+    entries: list[tuple[str, Optional[float]]] = []
+    duration: Optional[float] = None
+    with open(file=path, mode="r", encoding="utf-8", errors="replace") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            if line[0] in " \t" and entries:
+                entries[-1] = (f"{entries[-1][0]} {line.strip()}", entries[-1][1])
+                continue
+            match: Optional[re.Match] = POSTGRESQL_LOG_ENTRY.search(line)
+            if match is not None:
+                entries.append((match.group(2).strip(), float(match.group(1))))
+                continue
+            match = MYSQL_LOG_HEADER.match(line)
+            if match is not None:
+                duration = float(match.group(1)) * 1000
+                continue
+            if STATEMENT.match(line) is not None:
+                entries.append((line.strip(), duration))
+                duration = None
+    return [
+        (statement, 1, elapsed or 0.0) for statement, elapsed in entries if elapsed is None or elapsed >= slow_query_ms
+    ]
+
+
+class IndexAdvisor:
+    """
+    Recommends and creates the indexes the access patterns of mlflow lack in a database backed store, and refreshes
+    the statistics of its tables.
+
+    * `plan` samples the slow statements of the workload: `pg_stat_statements` on PostgreSQL, the statement digests
+      of the performance schema on MySQL, or a provided query log (`read_query_log`).  An index of
+      `ACCESS_PATTERNS` is recommended when no existing index (or primary key) starts with its columns and sampled
+      statements would use it, or, when nothing could be sampled, because mlflow queries use it.
+    * Indexes cover the selected columns where the database can: `INCLUDE` on PostgreSQL, trailing columns on
+      SQLite, and the primary key InnoDB appends on MySQL.  Unbounded text values are hashed on PostgreSQL and
+      prefix indexed on MySQL.
+    * `run` creates the recommended indexes without blocking writes (`CREATE INDEX CONCURRENTLY` on PostgreSQL,
+      online DDL on MySQL), then analyzes the advised tables, vacuuming them if `vacuum`, and records how long
+      each statement took.
+
+    Parameters
+    ----------
+    backend_store_uri: str
+        The database uri of the store.
+    query_log: Optional[str]
+        If provided, the query log the workload is sampled from instead of the database.
+    slow_query_ms: float
+        Sampled statements faster on average are ignored.
+    vacuum: bool
+        If `True` the tables are vacuumed (`VACUUM`, `OPTIMIZE TABLE` on MySQL) as well as analyzed.
+    """
+
+    backend_store_uri: str
+    query_log: Optional[str]
+    slow_query_ms: float
+    vacuum: bool
+
+    def __init__(
+        self,
+        backend_store_uri: str,
+        query_log: Optional[str] = None,
+        slow_query_ms: float = 100.0,
+        vacuum: bool = False,
+    ):
+        if slow_query_ms < 0:
+            raise ValueError(f"slow_query_ms must not be negative, received: {slow_query_ms}")
+        if query_log is not None and not os.path.isfile(query_log):
+            raise ValueError(f"query log not found: {query_log}")
+
+        self.backend_store_uri = backend_store_uri
+        self.query_log = query_log
+        self.slow_query_ms = slow_query_ms
+        self.vacuum = vacuum
+        self._engine: Optional[Any] = None
+
+    def _connect(self) -> Any:
+        """Creates the engine (on first use)."""
+
+        if self._engine is None:
+            # pylint: disable=import-outside-toplevel
+            import sqlalchemy
+            from sqlalchemy.pool import NullPool
+
+            self._engine = sqlalchemy.create_engine(self.backend_store_uri, poolclass=NullPool)
+        return self._engine
+
+    def _sample(self) -> Optional[list[QuerySample]]:
+        """Returns the slow statements of the workload, or `None` if they cannot be sampled."""
+
+        if self.query_log is not None:
+            return read_query_log(path=self.query_log, slow_query_ms=self.slow_query_ms)
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        queries: list[str] = {
+            "postgresql": [
+                "SELECT query, calls, total_exec_time FROM pg_stat_statements "
+                "WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database()) "
+                "AND mean_exec_time >= :slow",
+                # PostgreSQL 12 and older.
+                "SELECT query, calls, total_time FROM pg_stat_statements "
+                "WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database()) "
+                "AND mean_time >= :slow",
+            ],
+            "mysql": [
+                "SELECT digest_text, count_star, sum_timer_wait / 1000000000 "
+                "FROM performance_schema.events_statements_summary_by_digest "
+                "WHERE schema_name = DATABASE() AND digest_text IS NOT NULL AND avg_timer_wait >= :slow * 1000000000"
+            ],
+        }.get(self._connect().dialect.name, [])
+        for query in queries:
+            # A failed statement aborts the transaction on PostgreSQL, each query gets a connection of its own.
+            try:
+                with self._connect().connect() as connection:
+                    rows: list = connection.execute(sqlalchemy.text(query), {"slow": self.slow_query_ms}).all()
+                return [(str(text), int(calls), float(total)) for text, calls, total in rows]
+            except sqlalchemy.exc.DBAPIError as error:
+                print(f"Unable to sample slow queries: {error.orig!r}", flush=True)
+        return None
+
+    @staticmethod
+    def _statistics(connection: Any, table: str) -> dict[str, Optional[int]]:
+        """Returns the rows of a table and, on PostgreSQL, its sequential and index scans."""
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        dialect: str = connection.dialect.name
+        if dialect == "postgresql":
+            row: Any = connection.execute(
+                sqlalchemy.text(
+                    "SELECT n_live_tup, seq_scan, idx_scan FROM pg_stat_user_tables WHERE relid = to_regclass(:table)"
+                ),
+                {"table": table},
+            ).one_or_none()
+            if row is None:
+                return {"rows": None, "sequential_scans": None, "index_scans": None}
+            return {"rows": row[0], "sequential_scans": row[1], "index_scans": row[2]}
+        if dialect == "mysql":
+            rows: Optional[int] = connection.execute(
+                sqlalchemy.text(
+                    "SELECT table_rows FROM information_schema.tables "
+                    "WHERE table_schema = DATABASE() AND table_name = :table"
+                ),
+                {"table": table},
+            ).scalar()
+            return {"rows": rows}
+        quoted: str = connection.dialect.identifier_preparer.quote(table)
+        return {"rows": connection.execute(sqlalchemy.text(f"SELECT COUNT(*) FROM {quoted}")).scalar()}
+
+    @staticmethod
+    def _definition(dialect: Any, table: str, columns: list[str], include: list[str]) -> tuple[str, list[str], str]:
+        """
+        Defines the index of an access pattern for a dialect.
+
+        Returns
+        -------
+            The name of the index, its (leading) columns and the statement creating it.
+        """
+
+        quote: Any = dialect.identifier_preparer.quote
+        unbounded: bool = (table, columns[-1]) in UNBOUNDED_COLUMNS
+        if dialect.name == "postgresql" and unbounded:
+            # Hash indexes have no size limit, and equality is what run searches filter text values by.
+            columns, include = columns[-1:], []
+            name: str = f"index_{table}_{'_'.join(columns)}_hash"
+            return (
+                name,
+                columns,
+                (f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {quote(table)} USING hash ({quote(columns[0])})"),
+            )
+
+        name = f"index_{table}_{'_'.join(columns)}_advised"
+        if dialect.name == "postgresql":
+            covering: str = f" INCLUDE ({', '.join(quote(column) for column in include)})" if include else ""
+            return (
+                name,
+                columns,
+                (
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {quote(table)} "
+                    f"({', '.join(quote(column) for column in columns)}){covering}"
+                ),
+            )
+        if dialect.name == "mysql":
+            indexed: list[str] = [quote(column) for column in columns]
+            if unbounded:
+                indexed[-1] += f"({MYSQL_PREFIX_LENGTH})"
+            return (
+                name,
+                columns,
+                (f"CREATE INDEX {name} ON {quote(table)} ({', '.join(indexed)}) ALGORITHM=INPLACE LOCK=NONE"),
+            )
+        return (
+            name,
+            columns,
+            (
+                f"CREATE INDEX IF NOT EXISTS {name} ON {quote(table)} "
+                f"({', '.join(quote(column) for column in columns + include)})"
+            ),
+        )
+
+    @staticmethod
+    def _indexed(inspector: Any, table: str) -> tuple[set[str], list[list[str]]]:
+        """Returns the names of the indexes of a table and the columns of its indexes and primary key."""
+
+        indexes: list[dict] = inspector.get_indexes(table)
+        columns: list[list[str]] = [list(index["column_names"]) for index in indexes]
+        columns.append(list(inspector.get_pk_constraint(table).get("constrained_columns") or []))
+        return {index["name"] for index in indexes}, columns
+
+    def _maintenance(self, connection: Any, tables: list[str]) -> list[str]:
+        """Returns the statements refreshing the statistics of (and vacuuming) the tables."""
+
+        quote: Any = connection.dialect.identifier_preparer.quote
+        dialect: str = connection.dialect.name
+        if dialect == "postgresql":
+            command: str = "VACUUM (ANALYZE)" if self.vacuum else "ANALYZE"
+            return [f"{command} {quote(table)}" for table in tables]
+        if dialect == "mysql":
+            command = "OPTIMIZE TABLE" if self.vacuum else "ANALYZE TABLE"
+            return [f"{command} {quote(table)}" for table in tables]
+        # SQLite vacuums the whole database.
+        return [f"ANALYZE {quote(table)}" for table in tables] + (["VACUUM"] if self.vacuum else [])
+
+    @staticmethod
+    def _recommend(
+        connection: Any, inspector: Any, pattern: tuple[str, list[str], list[str]], sample: Optional[list[QuerySample]]
+    ) -> Optional[IndexRecommendation]:
+        """
+        Recommends the index of an access pattern, unless an existing index serves it or no sampled statement
+        would use it.
+        """
+
+        table, columns, include = pattern
+        name, indexed, statement = IndexAdvisor._definition(
+            dialect=connection.dialect, table=table, columns=columns, include=include
+        )
+        names, covered = IndexAdvisor._indexed(inspector=inspector, table=table)
+        if name in names or any(index[: len(indexed)] == indexed for index in covered):
+            return None
+        served: list[QuerySample] = [
+            query for query in sample or [] if serves(statement=query[0], table=table, columns=columns)
+        ]
+        if sample is not None and not served:
+            return None
+        return IndexRecommendation(
+            table=table,
+            name=name,
+            statement=statement,
+            reason=(
+                f"{len(served)} slow statements filter {table} by {', '.join(columns)}"
+                if served
+                else f"mlflow filters {table} by {', '.join(columns)} (no workload was sampled)"
+            ),
+            statements=len(served),
+            calls=sum(calls for _, calls, _ in served),
+            total_ms=sum(total for _, _, total in served),
+        )
+
+    def plan(self, dry_run: bool = True) -> DatabaseOptimizationReport:
+        """
+        Samples the workload and recommends indexes without changing the database.
+
+        Parameters
+        ----------
+        dry_run: bool
+            Recorded in the report.
+
+        Returns
+        -------
+            The recommended indexes and the maintenance statements, not executed yet.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        report: DatabaseOptimizationReport = DatabaseOptimizationReport(dry_run=dry_run)
+        path: Optional[str] = sqlite_database_path(uri=self.backend_store_uri)
+        if path is not None and not os.path.exists(path):
+            # Connecting would create an empty database.
+            return report
+        sample: Optional[list[QuerySample]] = self._sample()
+        report.sampled = None if sample is None else len(sample)
+        with self._connect().connect() as connection:
+            inspector: Any = sqlalchemy.inspect(connection)
+            existing: list[str] = inspector.get_table_names()
+            tables: list[str] = [table for table, _, _ in ACCESS_PATTERNS if table in existing]
+            for pattern in ACCESS_PATTERNS:
+                if pattern[0] not in tables:
+                    continue
+                report.tables[pattern[0]] = IndexAdvisor._statistics(connection=connection, table=pattern[0])
+                recommendation: Optional[IndexRecommendation] = IndexAdvisor._recommend(
+                    connection=connection, inspector=inspector, pattern=pattern, sample=sample
+                )
+                if recommendation is not None:
+                    report.recommendations.append(recommendation)
+            report.maintenance = [(statement, None) for statement in self._maintenance(connection, tables)]
+        return report
+
+    def _create(self, connection: Any, recommendation: IndexRecommendation) -> None:
+        """Creates a recommended index, recording how long it took or why it failed."""
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        print(f"Creating index {recommendation.name} on {recommendation.table}", flush=True)
+        started: float = time.monotonic()
+        try:
+            connection.execute(sqlalchemy.text(recommendation.statement))
+        except sqlalchemy.exc.DBAPIError as error:
+            recommendation.error = repr(error.orig)
+            print(f"Unable to create index {recommendation.name}: {recommendation.error}", flush=True)
+            if connection.dialect.name == "postgresql":
+                # A failed concurrent build leaves an invalid index behind, which slows down every write.
+                connection.execute(sqlalchemy.text(f"DROP INDEX CONCURRENTLY IF EXISTS {recommendation.name}"))
+            return
+        recommendation.elapsed = time.monotonic() - started
+        print(f"Created index {recommendation.name} in {recommendation.elapsed:.1f}s", flush=True)
+
+    def run(
+        self, report: Optional[DatabaseOptimizationReport] = None, create_indexes: bool = False
+    ) -> DatabaseOptimizationReport:
+        """
+        Creates the recommended indexes (if `create_indexes`), then executes the maintenance statements.  Every
+        statement runs outside of a transaction, as concurrent index builds and `VACUUM` require.
+
+        Parameters
+        ----------
+        report: Optional[DatabaseOptimizationReport]
+            The plan to execute, planned first if not provided.
+        create_indexes: bool
+            If `True` the recommended indexes are created, otherwise they are only reported.
+
+        Returns
+        -------
+            The report, with the duration of each executed statement.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        report = report if report is not None else self.plan(dry_run=False)
+        report.dry_run = False
+        with self._connect().connect() as connection:
+            connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+            for recommendation in report.recommendations if create_indexes else []:
+                self._create(connection=connection, recommendation=recommendation)
+            for index, (statement, _) in enumerate(report.maintenance):
+                print(f"Executing {statement}", flush=True)
+                started: float = time.monotonic()
+                connection.execute(sqlalchemy.text(statement))
+                report.maintenance[index] = (statement, time.monotonic() - started)
+                print(f"Executed {statement} in {report.maintenance[index][1]:.1f}s", flush=True)
+        return report
@@ -0,0 +1,271 @@
+""" Archival of the metric histories of finished runs """
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Optional
+
+from ..contracts.dto.metric_archive_report import MetricArchiveReport
+from ..wsgi.metric_archive import MetricArchive
+
+# Statuses of runs which no longer log metrics.
+FINISHED_STATUSES: list[str] = ["FINISHED", "FAILED", "KILLED"]
+
+# Bytes of a `metrics` row besides its key: the run id, value, timestamp, step and NaN flag.
+ROW_BYTES: int = 32 + 8 + 8 + 8 + 1
+
+# Rows fetched from the database at a time while archiving a run.
+READ_BATCH_SIZE: int = 10000
+
+MEBIBYTE: int = 1024 * 1024
+
+
+# pylint: disable=too-many-arguments,too-many-instance-attributes
+class MetricArchiver:
+    """
+    Moves the metric histories of finished runs out of the `metrics` table of a database backed store into
+    compressed, columnar archives (`MetricArchive`) below the artifact destination, shrinking the table every
+    history read and run search goes through.
+
+    * Active runs which finished (`FINISHED`, `FAILED` or `KILLED`) longer than `older_than` ago and still have
+      history in the `metrics` table are archived, in batches of `batch_size` in run id order (keyset pagination).
+    * `latest_metrics` is kept, so runs still show (and are searched by) their latest values; the launched servers
+      serve archived histories back (`ArchivedMetricHistory`).
+    * The history of a run is archived by one of `workers` threads and deleted from the database in the
+      transaction it was read in.  If metrics were logged to the run meanwhile, the deletion is rolled back and the
+      run retried by the next archival (its archive is merged, never duplicated).
+    * Archival is naturally resumable: archived runs no longer have history in the database.
+
+    A dry run reports the number of runs and rows which would be archived and their estimated size in the
+    `metrics` table, without reading the histories.
+
+    Parameters
+    ----------
+    backend_store_uri: str
+        The SQLAlchemy uri of the tracking store (`MLFLOW_BACKEND_STORE_URI`).
+    archive: MetricArchive
+        Where histories are archived.
+    older_than: timedelta
+        Only runs which finished longer ago are archived.
+    batch_size: int
+        Runs enumerated and archived per batch.
+    workers: int
+        Threads archiving runs concurrently.
+    """
+
+    backend_store_uri: str
+    archive: MetricArchive
+    older_than: timedelta
+    batch_size: int
+    workers: int
+
+    def __init__(
+        self,
+        backend_store_uri: str,
+        archive: MetricArchive,
+        older_than: timedelta,
+        batch_size: int = 100,
+        workers: int = 4,
+    ):
+        if batch_size < 1:
+            raise ValueError(f"batch size must be at least 1, received: {batch_size}")
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, received: {workers}")
+
+        self.backend_store_uri = backend_store_uri
+        self.archive = archive
+        self.older_than = older_than
+        self.batch_size = batch_size
+        self.workers = workers
+        self._stop: threading.Event = threading.Event()
+        self._engine: Optional[Any] = None
+        self._tables: dict[str, Any] = {}
+
+    def _connect(self) -> None:
+        """Creates the engine and reflects the runs and metrics tables (on first use)."""
+
+        if self._engine is not None:
+            return
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        self._engine = sqlalchemy.create_engine(self.backend_store_uri)
+        metadata = sqlalchemy.MetaData()
+        metadata.reflect(bind=self._engine, only=["runs", "metrics"])
+        self._tables = dict(metadata.tables)
+
+    def _cutoff(self) -> int:
+        """Returns the time (epoch milliseconds) before which finished runs are archived."""
+
+        return int((time.time() - self.older_than.total_seconds()) * 1000)
+
+    def _next_batch(self, cutoff: int, after: str) -> list[str]:
+        """
+        Returns the next batch of archivable runs.
+
+        Parameters
+        ----------
+        cutoff: int
+            Epoch milliseconds.
+        after: str
+            The run id the previous batch ended with.
+
+        Returns
+        -------
+            Run ids, in order.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        runs = self._tables["runs"]
+        metrics = self._tables["metrics"]
+        query = (
+            sqlalchemy.select(runs.c.run_uuid)
+            .where(
+                runs.c.lifecycle_stage == "active",
+                runs.c.status.in_(FINISHED_STATUSES),
+                runs.c.end_time < cutoff,
+                runs.c.run_uuid > after,
+                sqlalchemy.select(metrics.c.run_uuid).where(metrics.c.run_uuid == runs.c.run_uuid).exists(),
+            )
+            .order_by(runs.c.run_uuid)
+            .limit(self.batch_size)
+        )
+        with self._engine.connect() as connection:
+            return [row.run_uuid for row in connection.execute(query)]
+
+    def _measure(self, run_ids: list[str]) -> dict[str, tuple[int, int]]:
+        """
+        Returns the rows of each run in the `metrics` table and their estimated size, by run id.
+
+        Parameters
+        ----------
+        run_ids: list[str]
+            The runs.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        metrics = self._tables["metrics"]
+        query = (
+            sqlalchemy.select(
+                metrics.c.run_uuid,
+                sqlalchemy.func.count().label("rows"),
+                sqlalchemy.func.sum(sqlalchemy.func.length(metrics.c.key)).label("keys"),
+            )
+            .where(metrics.c.run_uuid.in_(run_ids))
+            .group_by(metrics.c.run_uuid)
+        )
+        with self._engine.connect() as connection:
+            return {
+                row.run_uuid: (int(row.rows), int(row.keys or 0) + int(row.rows) * ROW_BYTES)
+                for row in connection.execute(query)
+            }
+
+    def _archive_run(self, run_id: str) -> Optional[tuple[int, int]]:
+        """
+        Archives the history of a run and deletes it from the database.
+
+        Returns
+        -------
+            The rows archived and the size of the archive, or `None` if the run could not be archived.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        metrics = self._tables["metrics"]
+        columns: dict[str, list] = {name: [] for name in ["key", "value", "timestamp", "step", "is_nan"]}
+        try:
+            with self._engine.begin() as connection:
+                rows: Any = connection.execution_options(yield_per=READ_BATCH_SIZE).execute(
+                    sqlalchemy.select(
+                        metrics.c.key, metrics.c.value, metrics.c.timestamp, metrics.c.step, metrics.c.is_nan
+                    ).where(metrics.c.run_uuid == run_id)
+                )
+                for row in rows:
+                    for name, value in zip(columns, row):
+                        columns[name].append(value)
+                size: int = self.archive.write(run_id=run_id, columns=columns)
+                deleted: int = connection.execute(metrics.delete().where(metrics.c.run_uuid == run_id)).rowcount
+                if deleted != len(columns["key"]):
+                    raise RuntimeError(f"{deleted - len(columns['key'])} metrics were logged while archiving")
+            return len(columns["key"]), size
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            print(f"[{run_id}] unable to archive metrics: {error!r}, keeping them")
+            return None
+
+    def _archive_batch(
+        self, report: MetricArchiveReport, cutoff: int, after: str, pool: ThreadPoolExecutor
+    ) -> Optional[str]:
+        """
+        Archives (or measures, for a dry run) the next batch of runs.
+
+        Returns
+        -------
+            The run id the batch ended with, or `None` when no archivable runs are left.
+        """
+
+        batch: list[str] = self._next_batch(cutoff=cutoff, after=after)
+        if not batch:
+            return None
+
+        measures: dict[str, tuple[int, int]] = self._measure(run_ids=batch)
+        if report.dry_run:
+            report.runs += len(measures)
+            report.rows += sum(rows for rows, _ in measures.values())
+            report.table_bytes += sum(size for _, size in measures.values())
+            return batch[-1]
+
+        for run_id, archived in zip(batch, pool.map(self._archive_run, batch)):
+            if archived is None:
+                report.failures += 1
+                continue
+            report.runs += 1
+            report.rows += archived[0]
+            report.archive_bytes += archived[1]
+            report.table_bytes += measures.get(run_id, (0, 0))[1]
+        return batch[-1]
+
+    def stop(self) -> None:
+        """Requests the archival in progress to stop after its current batch.  Safe to call from other threads."""
+
+        self._stop.set()
+
+    def run(self, dry_run: bool = True) -> MetricArchiveReport:
+        """
+        Archives the histories of every archivable run.
+
+        Parameters
+        ----------
+        dry_run: bool
+            If `True` nothing is archived and the report describes what would be archived.
+
+        Returns
+        -------
+            The report of the archival, which is partial if the archival was stopped.
+        """
+
+        self._connect()
+        report: MetricArchiveReport = MetricArchiveReport(dry_run=dry_run)
+        cutoff: int = self._cutoff()
+        began: float = time.monotonic()
+        after: Optional[str] = ""
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="metric-archive") as pool:
+            while not self._stop.is_set():
+                after = self._archive_batch(report=report, cutoff=cutoff, after=after, pool=pool)
+                if after is None:
+                    break
+                report.elapsed = time.monotonic() - began
+                print(
+                    f"Metric archival: {report.runs} runs, {report.rows} rows, "
+                    f"{report.table_bytes / MEBIBYTE:.1f} MiB ({report.rows_per_second:.1f} rows/s)",
+                    flush=True,
+                )
+
+        report.elapsed = time.monotonic() - began
+        return report
@@ -0,0 +1,635 @@
+""" Streaming, parallel and resumable migration of a backend store (and its artifacts) into another """
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Optional
+
+from ..common.checkpoint import clear_checkpoint, load_checkpoint, save_checkpoint, store_key
+from ..common.uri import local_path
+from ..contracts.dto.store_migration_report import StoreMigrationReport
+from ..wsgi.artifact_stores import ArtifactStore, open_artifact_store
+from ..wsgi.metric_archive import ARCHIVE_PART_SIZE, archive_path
+from .garbage_collector import PROXIED_ARTIFACTS_SCHEME, proxied_artifact_path
+
+# Tables which are not copied: the schema revision belongs to the schema the target was created with.
+SKIPPED_TABLES: set[str] = {"alembic_version"}
+
+# Batches of runs each worker process has queued, bounding the progress lost to an interruption.
+BATCHES_PER_WORKER: int = 2
+
+
+def _reflect(uri: str, tables: Optional[list[str]] = None) -> tuple[Any, dict[str, Any]]:
+    """
+    Creates an engine without a connection pool (so forked worker processes share no connections) and reflects the
+    tables of a database.
+
+    Returns
+    -------
+        The engine and the reflected tables by name, in foreign key order.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    import sqlalchemy
+    from sqlalchemy.pool import NullPool
+
+    engine: Any = sqlalchemy.create_engine(uri, poolclass=NullPool)
+    metadata: Any = sqlalchemy.MetaData()
+    metadata.reflect(bind=engine, only=tables)
+    return engine, {table.name: table for table in metadata.sorted_tables}
+
+
+def _insert(table: Any, dialect: str) -> Any:
+    """Returns an insert into a table which skips rows already present, so interrupted copies can be repeated."""
+
+    # pylint: disable=import-outside-toplevel
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+
+        return insert(table).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+
+        return insert(table).on_conflict_do_nothing()
+    if dialect == "mysql":
+        return table.insert().prefix_with("IGNORE")
+    return table.insert()
+
+
+def _copy_rows(reading: Any, writing: Any, query: Any, table: Any, chunk_size: int) -> int:
+    """
+    Streams the rows of a query into a table, `chunk_size` rows at a time.
+
+    Returns
+    -------
+        The rows copied.
+    """
+
+    copied: int = 0
+    insert: Any = _insert(table=table, dialect=writing.dialect.name)
+    for chunk in reading.execution_options(yield_per=chunk_size).execute(query).mappings().partitions(chunk_size):
+        writing.execute(insert, [dict(row) for row in chunk])
+        copied += len(chunk)
+    return copied
+
+
+# Engines and tables of the worker processes, reflected once per process.
+_DATABASES: dict[str, tuple[Any, dict[str, Any]]] = {}
+
+
+def copy_runs(source_uri: str, target_uri: str, tables: list[str], run_ids: list[str], chunk_size: int) -> dict:
+    """
+    Copies the rows of a batch of runs in the tables keyed by run (`params`, `tags`, `metrics`, ...) in one
+    transaction of the target.  Executed by the worker processes of `StoreMigration`.
+
+    Parameters
+    ----------
+    source_uri: str
+        The database uri of the source store.
+    target_uri: str
+        The database uri of the target store.
+    tables: list[str]
+        The tables keyed by run.
+    run_ids: list[str]
+        The runs.
+    chunk_size: int
+        Rows read and inserted at a time.
+
+    Returns
+    -------
+        The rows copied, by table.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    import sqlalchemy
+
+    for uri in [source_uri, target_uri]:
+        if uri not in _DATABASES:
+            _DATABASES[uri] = _reflect(uri=uri, tables=tables)
+    source, source_tables = _DATABASES[source_uri]
+    target, target_tables = _DATABASES[target_uri]
+
+    with source.connect() as reading, target.begin() as writing:
+        return {
+            name: _copy_rows(
+                reading=reading,
+                writing=writing,
+                query=sqlalchemy.select(source_tables[name]).where(source_tables[name].c.run_uuid.in_(run_ids)),
+                table=target_tables[name],
+                chunk_size=chunk_size,
+            )
+            for name in tables
+        }
+
+
+# pylint: disable=too-few-public-methods
+class _Migration:
+    """Progress of a migration, persisted in the checkpoint."""
+
+    completed: list[str]
+    last_key: Optional[list]
+    last_run: str
+    last_artifact_run: str
+    report: StoreMigrationReport
+
+    def __init__(
+        self,
+        completed: Optional[list[str]] = None,
+        last_key: Optional[list] = None,
+        last_run: str = "",
+        last_artifact_run: str = "",
+        report: Optional[StoreMigrationReport] = None,
+    ):
+        self.completed = completed or []
+        self.last_key = last_key
+        self.last_run = last_run
+        self.last_artifact_run = last_artifact_run
+        self.report = report if report is not None else StoreMigrationReport()
+
+
+# pylint: disable=too-many-arguments,too-many-instance-attributes
+class StoreMigration:
+    """
+    Copies a database backed store (e.g. the standalone SQLite store) into another (e.g. PostgreSQL), and the
+    proxied artifacts of its runs from one artifact destination to another.
+
+    * The target schema is created (by mlflow) if the target is empty; source and target must be at the same
+      schema revision (`db_upgrade` both first).
+    * Tables which are not keyed by run (`experiments`, `runs`, registered models, ...) are streamed first, in
+      foreign key order, in chunks of `chunk_size` rows in primary key order (keyset pagination).
+    * Tables keyed by run (`params`, `tags`, `metrics`, `latest_metrics`) are copied in batches of `batch_size`
+      runs by a pool of `workers` processes, a batch per transaction of the target.
+    * Inserts skip rows already present, so repeating part of a copy is harmless: progress (the last copied key
+      or run of every phase) is checkpointed, and an interrupted migration resumes where it stopped.
+    * Proxied artifacts (`mlflow-artifacts:/...`) and archived metric histories are copied by `artifact_workers`
+      threads; the artifact uris of runs stay valid as they are relative to the destination.
+    * PostgreSQL sequences are advanced past the copied ids, so new experiments do not collide with them.
+
+    A dry run reports the rows of every table and the runs whose artifacts would be copied, without connecting to
+    the target (or reading and writing the checkpoint).
+
+    Parameters
+    ----------
+    source_uri: str
+        The database uri of the store to copy.
+    target_uri: str
+        The database uri of the store to copy into.
+    source_artifacts: Optional[str]
+        The artifact destination of the source store.
+    target_artifacts: Optional[str]
+        The artifact destination to copy the artifacts into, artifacts are not copied if `None`.
+    batch_size: int
+        Runs copied per batch (and transaction).
+    chunk_size: int
+        Rows read and inserted at a time.
+    workers: int
+        Processes copying batches of runs concurrently.
+    artifact_workers: int
+        Threads copying the artifacts of runs concurrently.
+    checkpoint_path: Optional[str]
+        Where progress is recorded; progress is not recorded if `None`.
+    """
+
+    source_uri: str
+    target_uri: str
+    source_artifacts: Optional[str]
+    target_artifacts: Optional[str]
+    batch_size: int
+    chunk_size: int
+    workers: int
+    artifact_workers: int
+    checkpoint_path: Optional[str]
+
+    def __init__(
+        self,
+        source_uri: str,
+        target_uri: str,
+        *,
+        source_artifacts: Optional[str] = None,
+        target_artifacts: Optional[str] = None,
+        batch_size: int = 100,
+        chunk_size: int = 10000,
+        workers: int = 4,
+        artifact_workers: int = 8,
+        checkpoint_path: Optional[str] = None,
+    ):
+        for name, value in [
+            ("batch size", batch_size),
+            ("chunk size", chunk_size),
+            ("workers", workers),
+            ("artifact workers", artifact_workers),
+        ]:
+            if value < 1:
+                raise ValueError(f"{name} must be at least 1, received: {value}")
+        if source_uri == target_uri:
+            raise ValueError("the source and target stores must differ")
+        if target_artifacts is not None and not source_artifacts:
+            raise ValueError("copying artifacts requires the artifact destination of the source store")
+
+        self.source_uri = source_uri
+        self.target_uri = target_uri
+        self.source_artifacts = source_artifacts
+        self.target_artifacts = target_artifacts
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.artifact_workers = artifact_workers
+        self.checkpoint_path = checkpoint_path
+        self._stop: threading.Event = threading.Event()
+        self._source: Optional[Any] = None
+        self._source_tables: dict[str, Any] = {}
+        self._target: Optional[Any] = None
+        self._target_tables: dict[str, Any] = {}
+        self._began: float = 0.0
+
+    # Schema
+
+    @staticmethod
+    def _revision(engine: Any) -> Optional[str]:
+        """Returns the schema revision of a database, `None` if its schema was never created."""
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        with engine.connect() as connection:
+            if not sqlalchemy.inspect(connection).has_table("alembic_version"):
+                return None
+            return connection.execute(sqlalchemy.text("SELECT version_num FROM alembic_version")).scalar()
+
+    def _connect(self, dry_run: bool) -> None:
+        """Reflects the source (and, unless a dry run, the target, creating its schema if it was never created)."""
+
+        if self._source is None:
+            self._source, self._source_tables = _reflect(uri=self.source_uri)
+        if dry_run or self._target is not None:
+            return
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+        from sqlalchemy.pool import NullPool
+
+        source_revision: Optional[str] = StoreMigration._revision(engine=self._source)
+        engine: Any = sqlalchemy.create_engine(self.target_uri, poolclass=NullPool)
+        target_revision: Optional[str] = StoreMigration._revision(engine=engine)
+        if target_revision is None:
+            from mlflow.store.db.utils import _initialize_tables
+
+            print("Creating the schema of the target store", flush=True)
+            _initialize_tables(engine)
+            target_revision = StoreMigration._revision(engine=engine)
+        if source_revision != target_revision:
+            raise ValueError(
+                f"the schema revision of the source store ({source_revision}) differs from the target store "
+                f"({target_revision}), upgrade both with the db_upgrade activity first"
+            )
+        self._target, self._target_tables = _reflect(uri=self.target_uri)
+
+    def _copied_tables(self) -> tuple[list[str], list[str]]:
+        """
+        Returns the tables copied by key (in foreign key order) and the tables copied by run, both present in the
+        source and the target.
+        """
+
+        ordered: list[str] = [
+            name
+            for name in self._source_tables
+            if name not in SKIPPED_TABLES and (self._target is None or name in self._target_tables)
+        ]
+        by_run: list[str] = [name for name in ordered if name != "runs" and "run_uuid" in self._source_tables[name].c]
+        return [name for name in ordered if name not in by_run], by_run
+
+    # Tables
+
+    def _copy_table(self, name: str, migration: _Migration) -> None:
+        """Streams a table into the target in chunks, in primary key order, checkpointing after every chunk."""
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        table: Any = self._source_tables[name]
+        key: list[Any] = list(table.primary_key.columns)
+        insert: Any = _insert(table=self._target_tables[name], dialect=self._target.dialect.name)
+        migration.report.tables.setdefault(name, 0)
+        while not self._stop.is_set():
+            query: Any = sqlalchemy.select(table)
+            if key:
+                query = query.order_by(*key).limit(self.chunk_size)
+                if migration.last_key is not None:
+                    query = query.where(sqlalchemy.tuple_(*key) > sqlalchemy.tuple_(*migration.last_key))
+            with self._source.connect() as reading:
+                rows: list = reading.execute(query).mappings().all()
+            if rows:
+                with self._target.begin() as writing:
+                    writing.execute(insert, [dict(row) for row in rows])
+                migration.report.tables[name] += len(rows)
+            if not key or len(rows) < self.chunk_size:
+                migration.completed.append(name)
+                migration.last_key = None
+                self._save_checkpoint(migration=migration)
+                return
+            migration.last_key = [rows[-1][column.name] for column in key]
+            self._save_checkpoint(migration=migration)
+
+    def _next_runs(self, after: str, proxied: bool = False) -> list[tuple[str, Optional[str]]]:
+        """
+        Returns the next batch of runs of the source.
+
+        Parameters
+        ----------
+        after: str
+            The run id the previous batch ended with.
+        proxied: bool
+            If `True` only runs with proxied artifacts are returned.
+
+        Returns
+        -------
+            Run ids and artifact uris, in run id order.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        runs: Any = self._source_tables["runs"]
+        query: Any = sqlalchemy.select(runs.c.run_uuid, runs.c.artifact_uri).where(runs.c.run_uuid > after)
+        if proxied:
+            query = query.where(runs.c.artifact_uri.startswith(PROXIED_ARTIFACTS_SCHEME))
+        with self._source.connect() as connection:
+            return [tuple(row) for row in connection.execute(query.order_by(runs.c.run_uuid).limit(self.batch_size))]
+
+    def _copy_runs(self, tables: list[str], migration: _Migration) -> None:
+        """
+        Copies the tables keyed by run, in batches of runs executed by the worker processes.  Batches complete in
+        order, so the checkpoint records the last run below which every batch was copied.
+        """
+
+        # SQLite serializes writes, concurrent batches would only wait for (and time out on) each other.
+        workers: int = 1 if self._target.dialect.name == "sqlite" else self.workers
+        pending: deque[tuple[str, Future]] = deque()
+        after: str = migration.last_run
+        exhausted: bool = False
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while pending or not exhausted:
+                while not exhausted and not self._stop.is_set() and len(pending) < workers * BATCHES_PER_WORKER:
+                    batch: list[tuple[str, Optional[str]]] = self._next_runs(after=after)
+                    if not batch:
+                        exhausted = True
+                        break
+                    after = batch[-1][0]
+                    run_ids: list[str] = [run_id for run_id, _ in batch]
+                    pending.append(
+                        (
+                            after,
+                            pool.submit(copy_runs, self.source_uri, self.target_uri, tables, run_ids, self.chunk_size),
+                        )
+                    )
+                if self._stop.is_set():
+                    exhausted = True
+                if not pending:
+                    break
+                last_run, future = pending.popleft()
+                for name, rows in future.result().items():
+                    migration.report.tables[name] = migration.report.tables.get(name, 0) + rows
+                migration.last_run = last_run
+                self._save_checkpoint(migration=migration)
+                self._progress(migration=migration)
+
+    def _advance_sequences(self) -> None:
+        """Advances the PostgreSQL sequences of integer primary keys past the copied ids."""
+
+        if self._target.dialect.name != "postgresql":
+            return
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        with self._target.begin() as connection:
+            for name, table in self._target_tables.items():
+                key: list[Any] = list(table.primary_key.columns)
+                if len(key) != 1:
+                    continue
+                sequence: Optional[str] = connection.execute(
+                    sqlalchemy.text("SELECT pg_get_serial_sequence(:table, :column)"),
+                    {"table": name, "column": key[0].name},
+                ).scalar()
+                if sequence is None:
+                    continue
+                highest: Optional[int] = connection.execute(sqlalchemy.select(sqlalchemy.func.max(key[0]))).scalar()
+                connection.execute(
+                    sqlalchemy.text("SELECT setval(:sequence, :value, false)"),
+                    {"sequence": sequence, "value": (highest or 0) + 1},
+                )
+
+    # Artifacts
+
+    def _copy_directory(self, path: str) -> int:
+        """
+        Copies the artifacts below a path of the source destination to the same path of the target destination.
+
+        Returns
+        -------
+            The size of the copied artifacts.
+        """
+
+        source: str = f"{self.source_artifacts.rstrip('/')}/{path}"
+        target: str = f"{self.target_artifacts.rstrip('/')}/{path}"
+        source_path: Optional[str] = local_path(source)
+        target_path: Optional[str] = local_path(target)
+        copied: list[int] = []
+
+        def copy(from_path: str, to_path: str) -> Any:
+            copied.append(os.path.getsize(from_path))
+            return shutil.copy2(from_path, to_path)
+
+        if source_path is not None and target_path is not None:
+            if os.path.isdir(source_path):
+                shutil.copytree(source_path, target_path, copy_function=copy, dirs_exist_ok=True)
+            return sum(copied)
+
+        # pylint: disable=import-outside-toplevel
+        from mlflow.store.artifact.artifact_repository_registry import get_artifact_repository
+
+        with tempfile.TemporaryDirectory(prefix="mlflow-migration-") as directory:
+            downloaded: str = get_artifact_repository(source).download_artifacts(artifact_path="", dst_path=directory)
+            for root, _, files in os.walk(downloaded):
+                copied.extend(os.path.getsize(os.path.join(root, name)) for name in files)
+            if copied:
+                get_artifact_repository(target).log_artifacts(downloaded)
+        return sum(copied)
+
+    @staticmethod
+    def _copy_file(source: ArtifactStore, target: ArtifactStore, path: str) -> int:
+        """Copies a file (e.g. an archived metric history) between stores, part by part, if it exists."""
+
+        stat: Any = source.stat(path)
+        if stat is None:
+            return 0
+        upload_id: str = hashlib.sha256(path.encode("utf-8")).hexdigest()[:32]
+        part_numbers: list[int] = []
+        try:
+            for part_number, data in enumerate(source.stream(path=path, offset=0, length=stat.size), start=1):
+                target.write_part(path=path, upload_id=upload_id, part_number=part_number, data=data)
+                part_numbers.append(part_number)
+            target.complete(path=path, upload_id=upload_id, part_numbers=part_numbers)
+        except Exception:
+            target.abort(path=path, upload_id=upload_id)
+            raise
+        return stat.size
+
+    def _copy_run_artifacts(self, run: tuple[str, Optional[str]], stores: Optional[tuple]) -> Optional[int]:
+        """
+        Copies the proxied artifacts and the archived metric history of a run.
+
+        Returns
+        -------
+            The size of the copied artifacts, or `None` if they could not be copied.
+        """
+
+        run_id, artifact_uri = run
+        try:
+            size: int = self._copy_directory(path=proxied_artifact_path(artifact_uri=artifact_uri or "") or "")
+            if stores is not None:
+                size += StoreMigration._copy_file(source=stores[0], target=stores[1], path=archive_path(run_id))
+            return size
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            print(f"[{run_id}] unable to copy artifacts: {error!r}", flush=True)
+            return None
+
+    def _copy_artifacts(self, migration: _Migration) -> None:
+        """Copies the artifacts of the runs with proxied artifacts, in batches, checkpointing after every batch."""
+
+        stores: Optional[tuple] = None
+        opened: list[Optional[ArtifactStore]] = [
+            open_artifact_store(destination=destination, part_size=ARCHIVE_PART_SIZE, concurrency=1)
+            for destination in [self.source_artifacts, self.target_artifacts]
+        ]
+        if opened[0] is not None and opened[1] is not None:
+            stores = (opened[0], opened[1])
+        with ThreadPoolExecutor(max_workers=self.artifact_workers, thread_name_prefix="migration") as pool:
+            while not self._stop.is_set():
+                batch: list[tuple[str, Optional[str]]] = self._next_runs(
+                    after=migration.last_artifact_run, proxied=True
+                )
+                if not batch:
+                    return
+                for size in pool.map(lambda run: self._copy_run_artifacts(run=run, stores=stores), batch):
+                    if size is None:
+                        migration.report.failures += 1
+                        continue
+                    migration.report.artifact_runs += 1
+                    migration.report.artifact_bytes += size
+                migration.last_artifact_run = batch[-1][0]
+                self._save_checkpoint(migration=migration)
+                self._progress(migration=migration)
+
+    # Checkpoint
+
+    def _store_key(self) -> str:
+        """Identifies the stores a checkpoint belongs to."""
+
+        return store_key(self.source_uri, self.target_uri, self.target_artifacts or "")
+
+    def _load_checkpoint(self) -> _Migration:
+        """Returns the progress of an interrupted migration between these stores, or a new migration."""
+
+        state: Optional[dict] = load_checkpoint(path=self.checkpoint_path, key=self._store_key())
+        if state is None:
+            return _Migration()
+        report: StoreMigrationReport = StoreMigrationReport(**state["report"])
+        print(f"Resuming migration ({report.rows} rows and the artifacts of {report.artifact_runs} runs copied)")
+        return _Migration(
+            completed=state["completed"],
+            last_key=state["last_key"],
+            last_run=state["last_run"],
+            last_artifact_run=state["last_artifact_run"],
+            report=report,
+        )
+
+    def _save_checkpoint(self, migration: _Migration) -> None:
+        """Atomically records the progress of a migration."""
+
+        migration.report.elapsed = time.monotonic() - self._began
+        state: dict = {
+            "completed": migration.completed,
+            "last_key": migration.last_key,
+            "last_run": migration.last_run,
+            "last_artifact_run": migration.last_artifact_run,
+            "report": migration.report.to_dict(),
+        }
+        save_checkpoint(path=self.checkpoint_path, key=self._store_key(), state=state)
+
+    # Migration
+
+    def _progress(self, migration: _Migration) -> None:
+        """Reports the throughput of the migration."""
+
+        migration.report.elapsed = time.monotonic() - self._began
+        print(f"Store migration: {migration.report.summary()}", flush=True)
+
+    def _measure(self) -> StoreMigrationReport:
+        """Counts the rows of every copied table and the runs with proxied artifacts of the source."""
+
+        # pylint: disable=import-outside-toplevel
+        import sqlalchemy
+
+        report: StoreMigrationReport = StoreMigrationReport(dry_run=True)
+        by_key, by_run = self._copied_tables()
+        with self._source.connect() as connection:
+            for name in by_key + by_run:
+                table: Any = self._source_tables[name]
+                report.tables[name] = connection.execute(
+                    sqlalchemy.select(sqlalchemy.func.count()).select_from(table)
+                ).scalar()
+            if self.target_artifacts is not None:
+                runs: Any = self._source_tables["runs"]
+                report.artifact_runs = connection.execute(
+                    sqlalchemy.select(sqlalchemy.func.count()).where(
+                        runs.c.artifact_uri.startswith(PROXIED_ARTIFACTS_SCHEME)
+                    )
+                ).scalar()
+        return report
+
+    def stop(self) -> None:
+        """Requests the migration in progress to stop after its current chunk or batch.  Safe from other threads."""
+
+        self._stop.set()
+
+    def run(self, dry_run: bool = True) -> StoreMigrationReport:
+        """
+        Copies every table of the source store, then the artifacts of its runs.
+
+        Parameters
+        ----------
+        dry_run: bool
+            If `True` nothing is copied and the report describes what would be copied.
+
+        Returns
+        -------
+            The report of the (whole, if resumed) migration, which is partial if the migration was stopped.
+        """
+
+        self._connect(dry_run=dry_run)
+        if dry_run:
+            return self._measure()
+
+        migration: _Migration = self._load_checkpoint()
+        self._began = time.monotonic() - migration.report.elapsed
+        by_key, by_run = self._copied_tables()
+        for name in by_key:
+            if name not in migration.completed and not self._stop.is_set():
+                self._copy_table(name=name, migration=migration)
+                print(f"Copied table {name} ({migration.report.tables[name]} rows)", flush=True)
+        if not self._stop.is_set():
+            self._copy_runs(tables=by_run, migration=migration)
+        if not self._stop.is_set():
+            self._advance_sequences()
+        if self.target_artifacts is not None and not self._stop.is_set():
+            self._copy_artifacts(migration=migration)
+
+        migration.report.elapsed = time.monotonic() - self._began
+        if not self._stop.is_set():
+            clear_checkpoint(path=self.checkpoint_path)
+        return migration.report
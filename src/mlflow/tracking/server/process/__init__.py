@@ -0,0 +1 @@
+""" process namespace """
@@ -0,0 +1,5 @@
+""" Crash Loop Error Definition """
+
+
+class CrashLoopError(Exception):
+    """Crash Loop Error"""
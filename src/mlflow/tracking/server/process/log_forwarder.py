@@ -0,0 +1,366 @@
+""" Forwards the output of launched processes to the wrapper's stdout without stalling them """
+
+import json
+import os
+import selectors
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import BinaryIO, Optional
+
+from ..common.metrics import WrapperMetrics
+from ..contracts.types.log_format import LogFormat
+
+READ_SIZE: int = 64 * 1024
+
+# Longest partial line held back until its line break arrives; longer ones are forwarded in pieces of this size.
+MAX_LINE_SIZE: int = 16 * READ_SIZE
+
+
+# pylint: disable=too-few-public-methods
+class _Stream:
+    """A registered pipe and its partially received line."""
+
+    name: str
+    stream: str
+    pipe: Optional[BinaryIO]
+    pending: bytes
+
+    def __init__(self, name: str, stream: str, pipe: Optional[BinaryIO]):
+        self.name = name
+        self.stream = stream
+        self.pipe = pipe
+        self.pending = b""
+
+
+# pylint: disable=too-many-instance-attributes
+class LogForwarder:
+    """
+    Multiplexes stdout and stderr of any number of processes onto a single output.
+
+    * A single reader thread waits on all pipes with a selector and reads them in large chunks, so a chatty
+      process is never back-pressured by the wrapper.
+    * Complete lines are formatted (raw, prefixed with the process name, or as JSON lines) and handed to a
+      writer thread in batches, one write and flush per batch.  Output without line breaks is forwarded in
+      pieces of `MAX_LINE_SIZE` rather than held in memory until a line break arrives.
+    * With `max_lines_per_second` set, lines beyond the budget are dropped (and counted) instead of being queued.
+      Lines are also dropped when the output cannot keep up and more than `max_buffer_bytes` are pending.
+
+    Parameters
+    ----------
+    output: Optional[BinaryIO]
+        The binary stream to forward to, defaults to the wrapper's stdout.
+    log_format: LogFormat
+        The format forwarded lines are written in.
+    max_lines_per_second: Optional[float]
+        Sustained line rate to forward; bursts of up to one second worth of lines are allowed.  Unlimited if `None`.
+    max_buffer_bytes: int
+        Upper bound of formatted output waiting to be written.
+    metrics: Optional[WrapperMetrics]
+        If provided, forwarded and dropped lines are counted per process.
+    """
+
+    log_format: LogFormat
+    max_lines_per_second: Optional[float]
+    max_buffer_bytes: int
+    lines_forwarded: int
+    lines_dropped: int
+
+    def __init__(
+        self,
+        output: Optional[BinaryIO] = None,
+        log_format: LogFormat = LogFormat.PREFIXED,
+        max_lines_per_second: Optional[float] = None,
+        max_buffer_bytes: int = 4 * 1024 * 1024,
+        metrics: Optional[WrapperMetrics] = None,
+    ):
+        if max_lines_per_second is not None and max_lines_per_second <= 0:
+            raise ValueError(f"max lines per second must be positive, received: {max_lines_per_second}")
+
+        self.output = output if output is not None else sys.stdout.buffer
+        self.log_format = LogFormat(log_format)
+        self.max_lines_per_second = max_lines_per_second
+        self.max_buffer_bytes = max_buffer_bytes
+        self.metrics = metrics
+        self.lines_forwarded = 0
+        self.lines_dropped = 0
+
+        self._selector: selectors.BaseSelector = selectors.DefaultSelector()
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        self._selector.register(self._wakeup_read, selectors.EVENT_READ, None)
+        self._lock: threading.Lock = threading.Lock()
+        self._open_streams: int = 0
+        self._stopping: bool = False
+
+        self._batches: deque = deque()
+        self._buffered_bytes: int = 0
+        self._batch_ready: threading.Condition = threading.Condition()
+
+        self._tokens: float = max_lines_per_second or 0.0
+        self._tokens_updated: float = time.monotonic()
+        self._dropped_since_report: dict[str, int] = {}
+        self._last_report: float = time.monotonic()
+
+        self._reader: threading.Thread = threading.Thread(target=self._read_loop, name="log-reader", daemon=True)
+        self._writer: threading.Thread = threading.Thread(target=self._write_loop, name="log-writer", daemon=True)
+
+    def __enter__(self) -> "LogForwarder":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Starts the reader and writer threads."""
+
+        self._reader.start()
+        self._writer.start()
+
+    def add(self, name: str, process: subprocess.Popen) -> None:
+        """
+        Registers the stdout and stderr pipes of a process.  Pipes are unregistered when they reach end of file.
+
+        Parameters
+        ----------
+        name: str
+            The name the process output is reported under.
+        process: subprocess.Popen
+            A process started with `stdout` and/or `stderr` set to `subprocess.PIPE`.
+        """
+
+        for stream, pipe in [("stdout", process.stdout), ("stderr", process.stderr)]:
+            if pipe is None:
+                continue
+            os.set_blocking(pipe.fileno(), False)
+            with self._lock:
+                self._selector.register(pipe, selectors.EVENT_READ, _Stream(name=name, stream=stream, pipe=pipe))
+                self._open_streams += 1
+        os.write(self._wakeup_write, b"\0")
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        """
+        Waits for all registered pipes to reach end of file (i.e. their processes exited and the output was read).
+
+        Parameters
+        ----------
+        timeout: float
+            Seconds to wait.
+
+        Returns
+        -------
+            `True` if every registered pipe was fully read.
+        """
+
+        deadline: float = time.monotonic() + timeout
+        while self._reader.is_alive() and self._open_streams > 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self._open_streams == 0
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Forwards whatever remains readable, then stops the threads.
+
+        Parameters
+        ----------
+        timeout: float
+            Seconds to wait for registered pipes to reach end of file.
+        """
+
+        self.drain(timeout=timeout)
+        self._stopping = True
+        os.write(self._wakeup_write, b"\0")
+        if self._reader.is_alive():
+            self._reader.join()
+        with self._batch_ready:
+            self._batch_ready.notify()
+        if self._writer.is_alive():
+            self._writer.join()
+
+        for key in list(self._selector.get_map().values()):
+            if key.data is not None:
+                key.data.pipe.close()
+        self._selector.close()
+        os.close(self._wakeup_read)
+        os.close(self._wakeup_write)
+
+    def _admit(self, count: int) -> int:
+        """
+        Applies the line rate limit.
+
+        Parameters
+        ----------
+        count: int
+            The number of lines which want to be forwarded.
+
+        Returns
+        -------
+            The number of lines which may be forwarded.
+        """
+
+        if self.max_lines_per_second is None:
+            return count
+        now: float = time.monotonic()
+        self._tokens = min(
+            self.max_lines_per_second, self._tokens + (now - self._tokens_updated) * self.max_lines_per_second
+        )
+        self._tokens_updated = now
+        admitted: int = min(count, int(self._tokens))
+        self._tokens -= admitted
+        return admitted
+
+    def _format(self, source: _Stream, lines: list[bytes]) -> bytes:
+        """
+        Formats complete lines (without their line terminators) for output.
+
+        Parameters
+        ----------
+        source: _Stream
+            The stream the lines were read from.
+        lines: list[bytes]
+            The lines to format.
+        """
+
+        if self.log_format == LogFormat.RAW:
+            return b"".join(line + b"\n" for line in lines)
+        if self.log_format == LogFormat.PREFIXED:
+            prefix: bytes = f"[{source.name}] ".encode("utf-8")
+            return b"".join(prefix + line + b"\n" for line in lines)
+
+        timestamp: str = datetime.now(timezone.utc).isoformat()
+        records: list[str] = [
+            json.dumps(
+                {
+                    "timestamp": timestamp,
+                    "source": source.name,
+                    "stream": source.stream,
+                    "message": line.decode("utf-8", errors="replace").rstrip("\r"),
+                }
+            )
+            for line in lines
+        ]
+        return ("\n".join(records) + "\n").encode("utf-8")
+
+    def _drop(self, name: str, count: int) -> None:
+        """Records dropped lines for the periodic drop report."""
+
+        self.lines_dropped += count
+        self._dropped_since_report[name] = self._dropped_since_report.get(name, 0) + count
+        if self.metrics is not None:
+            self.metrics.log_lines_dropped.labels(process=name).inc(count)
+
+    def _report_drops(self, force: bool = False) -> Optional[bytes]:
+        """Returns a summary of the lines dropped since the last report (at most once a second)."""
+
+        if not self._dropped_since_report or (not force and time.monotonic() - self._last_report < 1.0):
+            return None
+        summary: str = ", ".join(f"{name}: {count}" for name, count in sorted(self._dropped_since_report.items()))
+        self._dropped_since_report = {}
+        self._last_report = time.monotonic()
+        source: _Stream = _Stream(name="log-forwarder", stream="stderr", pipe=None)
+        return self._format(source=source, lines=[f"dropped log lines ({summary})".encode("utf-8")])
+
+    def _enqueue(self, name: str, lines: int, data: bytes) -> None:
+        """Hands formatted output to the writer thread, dropping it when the output is not keeping up."""
+
+        with self._batch_ready:
+            if self._buffered_bytes + len(data) > self.max_buffer_bytes:
+                self._drop(name=name, count=lines)
+                return
+            self._batches.append(data)
+            self._buffered_bytes += len(data)
+            self.lines_forwarded += lines
+            self._batch_ready.notify()
+        if self.metrics is not None and lines:
+            self.metrics.log_lines_forwarded.labels(process=name).inc(lines)
+
+    def _read_available(self, source: _Stream) -> bool:
+        """
+        Reads everything currently available from a pipe and forwards its complete lines.
+
+        Parameters
+        ----------
+        source: _Stream
+            The stream to read.
+
+        Returns
+        -------
+            `False` once the pipe reached end of file.
+        """
+
+        chunks: list[bytes] = []
+        eof: bool = False
+        while True:
+            try:
+                chunk: Optional[bytes] = os.read(source.pipe.fileno(), READ_SIZE)
+            except BlockingIOError:
+                break
+            if not chunk:
+                eof = True
+                break
+            chunks.append(chunk)
+            if len(chunk) < READ_SIZE:
+                break
+
+        data: bytes = source.pending + b"".join(chunks)
+        lines: list[bytes] = data.split(b"\n")
+        source.pending = lines.pop()
+        while len(source.pending) > MAX_LINE_SIZE:
+            lines.append(source.pending[:MAX_LINE_SIZE])
+            source.pending = source.pending[MAX_LINE_SIZE:]
+        if eof and source.pending:
+            lines.append(source.pending)
+            source.pending = b""
+
+        if lines:
+            admitted: int = self._admit(count=len(lines))
+            if admitted < len(lines):
+                self._drop(name=source.name, count=len(lines) - admitted)
+            if admitted:
+                self._enqueue(
+                    name=source.name, lines=admitted, data=self._format(source=source, lines=lines[:admitted])
+                )
+        return not eof
+
+    def _read_loop(self) -> None:
+        """Reader thread: waits on all registered pipes and forwards what they produce."""
+
+        while not self._stopping:
+            for key, _ in self._selector.select(timeout=1.0):
+                if key.data is None:
+                    os.read(self._wakeup_read, READ_SIZE)
+                    continue
+                if not self._read_available(source=key.data):
+                    with self._lock:
+                        self._selector.unregister(key.fileobj)
+                        self._open_streams -= 1
+                    key.data.pipe.close()
+            report: Optional[bytes] = self._report_drops()
+            if report is not None:
+                self._enqueue(name="log-forwarder", lines=0, data=report)
+
+        report = self._report_drops(force=True)
+        if report is not None:
+            self._enqueue(name="log-forwarder", lines=0, data=report)
+
+    def _write_loop(self) -> None:
+        """Writer thread: writes pending batches with a single write and flush each."""
+
+        while True:
+            with self._batch_ready:
+                while not self._batches and not (self._stopping and not self._reader.is_alive()):
+                    self._batch_ready.wait(timeout=0.5)
+                if not self._batches:
+                    return
+                data: bytes = b"".join(self._batches)
+                self._batches.clear()
+                self._buffered_bytes = 0
+            try:
+                self.output.write(data)
+                self.output.flush()
+            except (OSError, ValueError):
+                # The output went away (closed terminal / pipe); keep draining the processes regardless.
+                pass
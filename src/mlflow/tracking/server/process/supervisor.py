@@ -0,0 +1,407 @@
+""" Supervisor for the long running processes launched by the wrapper """
+
+import ctypes
+import os
+import shlex
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from ..common.metrics import WrapperMetrics
+from ..common.network import wait_for_port
+from ..contracts.dto.process_definition import ProcessDefinition
+from ..contracts.dto.restart_policy import RestartPolicy
+from .crash_loop_error import CrashLoopError
+from .log_forwarder import LogForwarder
+
+# prctl option marking a process as the reaper of orphaned descendants (linux/prctl.h).
+PR_SET_CHILD_SUBREAPER: int = 36
+
+
+# pylint: disable=too-few-public-methods
+class _SupervisedProcess:
+    """Runtime state of a single supervised process."""
+
+    definition: ProcessDefinition
+    process: Optional[subprocess.Popen]
+    started_at: float
+    restart_at: Optional[float]
+    consecutive_failures: int
+    restarts: deque
+
+    def __init__(self, definition: ProcessDefinition):
+        self.definition = definition
+        self.process = None
+        self.started_at = 0.0
+        self.restart_at = None
+        self.consecutive_failures = 0
+        self.restarts = deque()
+
+
+# pylint: disable=too-many-arguments,too-many-instance-attributes
+class ProcessSupervisor:
+    """
+    Starts a group of processes and keeps them running.
+
+    * Crashed processes are restarted with exponential backoff.
+    * A process restarting more than `max_restarts` times within `restart_window` is considered crash looping;
+      the group is stopped and `CrashLoopError` is raised so the deployment fails visibly.
+    * SIGTERM / SIGINT received by the wrapper are forwarded to every process group, which is given
+      `drain_timeout` seconds to finish in flight requests before being killed.
+    * Exited descendants which are not supervised (e.g. orphaned gunicorn workers) are reaped.
+    * `restart` replaces the processes one at a time (e.g. so they pick up rotated credentials).
+
+    Parameters
+    ----------
+    definitions: list[ProcessDefinition]
+        The processes to supervise, started in order.
+    policy: Optional[RestartPolicy]
+        The restart policy, defaults to `RestartPolicy()`.
+    drain_timeout: float
+        Seconds processes are given to exit after being asked to stop.
+    poll_interval: float
+        Seconds between process health checks.
+    log_forwarder: Optional[LogForwarder]
+        If provided, stdout and stderr of the processes are captured and forwarded through it; otherwise the
+        processes inherit the wrapper's output streams.
+    on_ready: Optional[Callable[[], None]]
+        Called once every process has been started (and is listening, if it defines a ready address).
+    metrics: Optional[WrapperMetrics]
+        If provided, restarts are counted per process.
+    """
+
+    policy: RestartPolicy
+    drain_timeout: float
+    poll_interval: float
+
+    def __init__(
+        self,
+        definitions: list[ProcessDefinition],
+        *,
+        policy: Optional[RestartPolicy] = None,
+        drain_timeout: float = 30.0,
+        poll_interval: float = 0.5,
+        log_forwarder: Optional[LogForwarder] = None,
+        on_ready: Optional[Callable[[], None]] = None,
+        metrics: Optional[WrapperMetrics] = None,
+    ):
+        names: list[str] = [definition.name for definition in definitions]
+        if len(set(names)) != len(names):
+            raise ValueError(f"supervised process names must be unique: {', '.join(names)}")
+
+        self.policy = policy if policy is not None else RestartPolicy()
+        self.drain_timeout = drain_timeout
+        self.poll_interval = poll_interval
+        self.log_forwarder = log_forwarder
+        self.on_ready = on_ready
+        self.metrics = metrics
+        self._children: list[_SupervisedProcess] = [_SupervisedProcess(definition) for definition in definitions]
+        self._stop_requested: threading.Event = threading.Event()
+        self._stop_signal: Optional[int] = None
+        self._restart_requested: threading.Event = threading.Event()
+
+    @property
+    def processes(self) -> dict[str, Optional[subprocess.Popen]]:
+        """The current process of each supervised definition, keyed by name."""
+
+        return {child.definition.name: child.process for child in self._children}
+
+    def restart_counts(self) -> dict[str, int]:
+        """Returns the number of restarts within the crash loop window, keyed by process name."""
+
+        return {child.definition.name: len(child.restarts) for child in self._children}
+
+    def process_state(self, name: str) -> str:
+        """
+        Returns the state of a supervised process without blocking: `pending` before its first start,
+        `running`, or `exited` (crashed and waiting to be restarted, or stopped).
+
+        Parameters
+        ----------
+        name: str
+            The name of the supervised process.
+        """
+
+        process: Optional[subprocess.Popen] = self.processes[name]
+        if process is None:
+            return "pending"
+        return "running" if process.poll() is None else "exited"
+
+    def stop(self, signum: int = signal.SIGTERM) -> None:
+        """
+        Requests the supervised processes to be stopped.  Safe to call from signal handlers and other threads.
+
+        Parameters
+        ----------
+        signum: int
+            The signal forwarded to the processes.
+        """
+
+        self._stop_signal = signum
+        self._stop_requested.set()
+
+    def restart(self) -> None:
+        """
+        Requests a rolling restart: each process is drained and started again (from the current environment of
+        the wrapper, unless its definition provides one) before the next one is restarted.  Safe to call from
+        other threads.
+        """
+
+        self._restart_requested.set()
+
+    def _handle_signal(self, signum: int, _frame) -> None:
+        """Signal handler forwarding termination requests to the supervised processes."""
+
+        print(f"Received signal {signal.Signals(signum).name}, stopping supervised processes")
+        self.stop(signum=signal.SIGTERM)
+
+    @staticmethod
+    def _become_subreaper() -> None:
+        """Best effort: adopt orphaned descendants (linux only) so they are reaped by the supervisor."""
+
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            libc.prctl(PR_SET_CHILD_SUBREAPER, 1, 0, 0, 0)
+        except (OSError, AttributeError):
+            pass
+
+    def _reap_orphans(self) -> None:
+        """
+        Reaps exited descendants.  Supervised processes are reaped through `Popen.poll` so their exit status is
+        recorded, anything else (e.g. orphaned gunicorn workers adopted by the subreaper) is reaped directly.
+        """
+
+        if not hasattr(os, "waitid"):
+            return
+        managed: dict[int, subprocess.Popen] = {
+            child.process.pid: child.process for child in self._children if child.process is not None
+        }
+        while True:
+            try:
+                # Peek without reaping so the exit status of supervised processes is left for `Popen`.
+                result = os.waitid(os.P_ALL, 0, os.WEXITED | os.WNOHANG | os.WNOWAIT)
+            except ChildProcessError:
+                return
+            if result is None:
+                return
+            try:
+                if result.si_pid in managed:
+                    managed[result.si_pid].poll()
+                else:
+                    os.waitpid(result.si_pid, 0)
+            except ChildProcessError:
+                return
+
+    def _spawn(self, child: _SupervisedProcess) -> None:
+        """
+        Starts (or restarts) a supervised process in its own process group.
+
+        Parameters
+        ----------
+        child: _SupervisedProcess
+            The process to start.
+        """
+
+        print(f"[{child.definition.name}] {child.definition.shell_out_cmd}", flush=True)
+        args: list[str] = shlex.split(child.definition.shell_out_cmd)
+
+        # The supervisor owns the process lifecycle.
+        # pylint: disable=consider-using-with
+        if self.log_forwarder is None:
+            child.process = subprocess.Popen(args, env=child.definition.env, start_new_session=True)
+        else:
+            child.process = subprocess.Popen(
+                args,
+                env=child.definition.env,
+                start_new_session=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            self.log_forwarder.add(name=child.definition.name, process=child.process)
+        child.started_at = time.monotonic()
+        child.restart_at = None
+
+    def _wait_until_ready(self, child: _SupervisedProcess) -> None:
+        """
+        Blocks until the process listens on its ready address (if it defines one).
+
+        Parameters
+        ----------
+        child: _SupervisedProcess
+            The process to wait on.
+        """
+
+        if child.definition.ready_address is None:
+            return
+        host, port = child.definition.ready_address
+        ready: bool = wait_for_port(
+            host=host,
+            port=port,
+            abort=lambda: self._stop_requested.is_set() or child.process.poll() is not None,
+        )
+        if not ready and not self._stop_requested.is_set() and child.process.poll() is None:
+            raise RuntimeError(f"[{child.definition.name}] did not start listening on {host}:{port}")
+
+    def _schedule_restart(self, child: _SupervisedProcess, now: float) -> None:
+        """
+        Records a crash and schedules the restart of the process with exponential backoff.
+
+        Parameters
+        ----------
+        child: _SupervisedProcess
+            The crashed process.
+        now: float
+            The current monotonic time.
+        """
+
+        if now - child.started_at >= self.policy.stable_after:
+            child.consecutive_failures = 0
+        delay: float = min(
+            self.policy.max_backoff,
+            self.policy.initial_backoff * self.policy.multiplier**child.consecutive_failures,
+        )
+        child.consecutive_failures += 1
+
+        while child.restarts and now - child.restarts[0] > self.policy.restart_window:
+            child.restarts.popleft()
+        child.restarts.append(now)
+        if len(child.restarts) > self.policy.max_restarts:
+            raise CrashLoopError(
+                f"[{child.definition.name}] crashed {len(child.restarts)} times within "
+                f"{self.policy.restart_window} seconds, giving up"
+            )
+
+        print(
+            f"[{child.definition.name}] exited with return code {child.process.returncode}, "
+            f"restarting in {delay:.1f} seconds"
+        )
+        child.restart_at = now + delay
+        if self.metrics is not None:
+            self.metrics.process_restarts.labels(process=child.definition.name).inc()
+
+    def _check_children(self) -> None:
+        """Restarts crashed processes whose backoff has elapsed and schedules restarts for new crashes."""
+
+        now: float = time.monotonic()
+        for child in self._children:
+            if child.restart_at is not None:
+                if now >= child.restart_at:
+                    self._spawn(child=child)
+            elif child.process is not None and child.process.poll() is not None:
+                # Kill what is left of the group (e.g. gunicorn still holding the port after the `mlflow server`
+                # launcher died) so the restarted process can bind again.
+                self._signal_group(child=child, signum=signal.SIGKILL)
+                self._schedule_restart(child=child, now=now)
+
+    @staticmethod
+    def _signal_group(child: _SupervisedProcess, signum: int) -> None:
+        """
+        Sends a signal to the process group of a supervised process.  The group outlives its leader, e.g.
+        gunicorn still draining after the `mlflow server` launcher exited.
+
+        Parameters
+        ----------
+        child: _SupervisedProcess
+            The process to signal.
+        signum: int
+            The signal to send.
+        """
+
+        if child.process is None:
+            return
+        try:
+            os.killpg(child.process.pid, signum)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _group_alive(self, child: _SupervisedProcess) -> bool:
+        """
+        Checks whether any process of the group of a supervised process is still running.
+
+        Parameters
+        ----------
+        child: _SupervisedProcess
+            The process to check.
+        """
+
+        if child.process is None:
+            return False
+        self._reap_orphans()
+        try:
+            os.killpg(child.process.pid, 0)
+        except (ProcessLookupError, PermissionError):
+            return False
+        return True
+
+    def _rolling_restart(self) -> None:
+        """Drains and restarts the processes one at a time, in start order."""
+
+        for child in self._children:
+            if self._stop_requested.is_set():
+                return
+            print(f"[{child.definition.name}] restarting", flush=True)
+            if child.process is not None and child.process.poll() is None:
+                self._signal_group(child=child, signum=signal.SIGTERM)
+            deadline: float = time.monotonic() + self.drain_timeout
+            while time.monotonic() < deadline and self._group_alive(child=child):
+                time.sleep(0.05)
+            if self._group_alive(child=child):
+                print(f"[{child.definition.name}] did not drain within {self.drain_timeout} seconds, killing")
+                self._signal_group(child=child, signum=signal.SIGKILL)
+            if child.process is not None:
+                child.process.wait()
+            self._spawn(child=child)
+            self._wait_until_ready(child=child)
+
+    def _shutdown(self) -> None:
+        """Asks every process group to stop, waits up to the drain timeout and then kills what remains."""
+
+        signum: int = self._stop_signal if self._stop_signal is not None else signal.SIGTERM
+        for child in self._children:
+            if child.process is not None and child.process.poll() is None:
+                self._signal_group(child=child, signum=signum)
+
+        deadline: float = time.monotonic() + self.drain_timeout
+        while time.monotonic() < deadline and any(self._group_alive(child=child) for child in self._children):
+            time.sleep(0.05)
+
+        for child in self._children:
+            if self._group_alive(child=child):
+                print(f"[{child.definition.name}] did not drain within {self.drain_timeout} seconds, killing")
+                self._signal_group(child=child, signum=signal.SIGKILL)
+            if child.process is not None:
+                child.process.wait()
+        self._reap_orphans()
+
+    def run(self) -> None:
+        """
+        Starts the supervised processes and blocks until a stop is requested (by signal or `stop`).
+
+        Must be called from the main thread when signal forwarding is wanted.
+        """
+
+        if threading.current_thread() is threading.main_thread():
+            for signum in [signal.SIGTERM, signal.SIGINT]:
+                signal.signal(signum, self._handle_signal)
+        self._become_subreaper()
+
+        try:
+            for child in self._children:
+                if self._stop_requested.is_set():
+                    break
+                self._spawn(child=child)
+                self._wait_until_ready(child=child)
+            if self.on_ready is not None and not self._stop_requested.is_set():
+                self.on_ready()
+
+            while not self._stop_requested.wait(timeout=self.poll_interval):
+                self._reap_orphans()
+                if self._restart_requested.is_set():
+                    self._restart_requested.clear()
+                    self._rolling_restart()
+                self._check_children()
+        finally:
+            self._shutdown()
@@ -0,0 +1 @@
+""" proxy namespace """
@@ -0,0 +1,668 @@
+""" Admission control for the tracking server: per client rate limits and prioritized, bounded request queues """
+
+import heapq
+import http.client
+import itertools
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+from urllib.parse import urlencode
+
+from ..common.metrics import WrapperMetrics
+from ..contracts.types.priority_class import PriorityClass
+from ..contracts.types.rate_limit_scope import RateLimitScope
+from ..contracts.types.route_class import RouteClass
+from ..wsgi.read_cache import request_parameters
+from .request_rejected_error import RequestRejectedError
+from .router import (
+    API_ROOTS,
+    ARTIFACT_ROOTS,
+    FORWARDED_FOR_HEADER,
+    WRITE_ENDPOINTS,
+    MLFlowRouter,
+    RouterRequestHandler,
+    api_endpoint,
+    classify_request,
+)
+
+# Queued requests are served in this order, first come first served within a class.
+PRIORITIES: list[PriorityClass] = [PriorityClass.INTERACTIVE, PriorityClass.STANDARD, PriorityClass.BULK]
+
+# Run logging issued by training clients, often in tight loops.
+BULK_ENDPOINTS: list[str] = [
+    endpoint for endpoint in WRITE_ENDPOINTS if endpoint.startswith("runs/log-") or endpoint == "runs/set-tag"
+]
+
+# Model registry endpoints, served ahead of the run logging.
+REGISTRY_PREFIXES: list[str] = ["registered-models/", "model-versions/"]
+
+# REST root of the requests issued by the mlflow UI.
+UI_ROOT: str = "/ajax-api/"
+
+# Probes and scrapes, never limited or queued.
+EXEMPT_PATHS: list[str] = ["/health", "/version", "/metrics"]
+
+# Header naming the authenticated user, set by a proxy in front of the server.
+USER_HEADER: str = "X-Forwarded-User"
+
+# Rate limited identities remembered at most; the least recently seen are forgotten (with a full bucket).
+MAX_BUCKETS: int = 10000
+
+# Weight of the latest request when smoothing the service time of a server.
+SERVICE_TIME_WEIGHT: float = 0.1
+
+# Largest request body read for the experiment or run it names; larger requests are limited without it.
+MAX_INSPECTED_BODY: int = 1024 * 1024
+
+# Runs whose experiment the router remembers at most, and seconds to wait on looking one up.
+MAX_RUN_EXPERIMENTS: int = 10000
+LOOKUP_TIMEOUT: float = 5.0
+
+
+def classify_priority(method: str, path: str) -> PriorityClass:
+    """
+    Determines the priority class of a request.
+
+    Parameters
+    ----------
+    method: str
+        The HTTP method of the request.
+    path: str
+        The request path (query strings are ignored).
+
+    Returns
+    -------
+        Interactive for the UI and the model registry, bulk for run logging and artifact uploads, standard for
+        everything else (e.g. client searches and downloads).
+    """
+
+    method, path = method.upper(), path.split("?", 1)[0]
+    if any(path.startswith(root) for root in ARTIFACT_ROOTS):
+        if method in ["PUT", "POST"]:
+            return PriorityClass.BULK
+        return PriorityClass.INTERACTIVE if path.startswith(UI_ROOT) else PriorityClass.STANDARD
+    endpoint: Optional[str] = api_endpoint(path=path)
+    if endpoint is None:
+        # The UI itself (static files).
+        return PriorityClass.INTERACTIVE
+    if any(endpoint.startswith(prefix) for prefix in REGISTRY_PREFIXES):
+        return PriorityClass.INTERACTIVE
+    if method == "POST" and endpoint in BULK_ENDPOINTS:
+        return PriorityClass.BULK
+    return PriorityClass.INTERACTIVE if path.startswith(UI_ROOT) else PriorityClass.STANDARD
+
+
+def is_exempt(path: str) -> bool:
+    """
+    Checks whether a request bypasses admission control (probes and scrapes).
+
+    Parameters
+    ----------
+    path: str
+        The request path.
+    """
+
+    return path.split("?", 1)[0] in EXEMPT_PATHS
+
+
+def request_user(headers: Any, trusted_proxy: bool) -> Optional[str]:
+    """
+    Returns the user of a request, as authenticated by a trusted proxy in front of the server.  The server does
+    not authenticate requests itself, so without one (or from credentials the proxy did not check) any client
+    could claim, and exhaust the rate limit of, any user.
+
+    Parameters
+    ----------
+    headers: Any
+        The request headers (`email.message.Message`).
+    trusted_proxy: bool
+        Whether the requests arrive through a trusted proxy, setting `X-Forwarded-User`.
+    """
+
+    if not trusted_proxy:
+        return None
+    return (headers.get(USER_HEADER) or "").strip() or None
+
+
+def request_client(headers: Any, address: str, trusted_proxy: bool) -> str:
+    """
+    Returns the client of a request: the address a trusted proxy received it from (the last `X-Forwarded-For`
+    hop, appended by the proxy; earlier hops are sent by the client), else the peer address.
+
+    Parameters
+    ----------
+    headers: Any
+        The request headers (`email.message.Message`).
+    address: str
+        The peer address of the connection.
+    trusted_proxy: bool
+        Whether the requests arrive through a trusted proxy, appending to `X-Forwarded-For`.
+    """
+
+    if not trusted_proxy:
+        return address
+    hops: list[str] = [hop.strip() for hop in ",".join(headers.get_all(FORWARDED_FOR_HEADER) or []).split(",")]
+    return hops[-1] or address
+
+
+# pylint: disable=too-few-public-methods
+class TokenBucket:
+    """
+    Allows `rate` requests per second on average, with bursts of up to `burst` requests.
+
+    Parameters
+    ----------
+    rate: float
+        Tokens added per second.
+    burst: int
+        Tokens held at most (and initially).
+    now: float
+        The current (monotonic) time.
+    """
+
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def wait(self, now: float) -> float:
+        """
+        Returns the seconds until a token is available, 0 if one is.
+
+        Parameters
+        ----------
+        now: float
+            The current (monotonic) time.
+        """
+
+        self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Token bucket rate limits per identity (e.g. `client:10.0.0.1`), shared by the threads of the router.
+
+    Parameters
+    ----------
+    rate: float
+        Requests per second allowed to each identity.
+    burst: int
+        Requests each identity may issue at once after being idle.
+    max_buckets: int
+        Identities remembered at most.
+    """
+
+    def __init__(self, rate: float, burst: int, max_buckets: int = MAX_BUCKETS):
+        if rate <= 0:
+            raise ValueError(f"rate limit must be positive, received: {rate}")
+        if burst < 1:
+            raise ValueError(f"rate limit burst must be at least 1, received: {burst}")
+
+        self.rate = rate
+        self.burst = burst
+        self.max_buckets = max_buckets
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _bucket(self, key: str, now: float) -> TokenBucket:
+        """Returns the bucket of an identity, remembering it as recently seen."""
+
+        bucket: Optional[TokenBucket] = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rate=self.rate, burst=self.burst, now=now)
+            self._buckets[key] = bucket
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def acquire(self, keys: list[str]) -> float:
+        """
+        Takes a token for a request from the bucket of each of its identities, if every bucket has one.
+
+        Parameters
+        ----------
+        keys: list[str]
+            The identities of the request.
+
+        Returns
+        -------
+            0 if the request is admitted, else the seconds until it would be.
+        """
+
+        with self._lock:
+            now: float = time.monotonic()
+            buckets: list[TokenBucket] = [self._bucket(key=key, now=now) for key in keys]
+            wait: float = max((bucket.wait(now=now) for bucket in buckets), default=0.0)
+            if wait == 0:
+                for bucket in buckets:
+                    bucket.tokens -= 1
+            return wait
+
+
+# pylint: disable=too-few-public-methods
+class _Waiter:
+    """A queued request, ordered by priority then arrival."""
+
+    def __init__(self, rank: int, sequence: int):
+        self.rank = rank
+        self.sequence = sequence
+        self.event: threading.Event = threading.Event()
+        self.admitted: Optional[float] = None
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.rank, self.sequence) < (other.rank, other.sequence)
+
+
+# pylint: disable=too-many-instance-attributes
+class AdmissionQueue:
+    """
+    Bounds the requests forwarded to a server at once.  Further requests wait for a slot and are served by
+    priority class, then in arrival order.  Requests are shed (rejected) when they waited `max_latency` without
+    being served, when the queue is full (the newest request of the lowest class is shed), and on arrival when
+    the requests ahead of them are expected to take longer than `max_latency`: under load, bulk requests are
+    shed first while interactive requests are still queued.
+
+    Parameters
+    ----------
+    concurrency: int
+        Requests forwarded to the server at once.
+    max_queue: int
+        Requests waiting at most.
+    max_latency: float
+        Seconds a request waits at most.
+    """
+
+    def __init__(self, concurrency: int, max_queue: int = 1000, max_latency: float = 1.0):
+        if concurrency < 1:
+            raise ValueError(f"admission concurrency must be positive, received: {concurrency}")
+        if max_queue < 1:
+            raise ValueError(f"admission queue size must be positive, received: {max_queue}")
+        if max_latency <= 0:
+            raise ValueError(f"admission queue latency must be positive, received: {max_latency}")
+
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_latency = max_latency
+        self._active: int = 0
+        self._waiting: list[_Waiter] = []
+        self._sequence: Any = itertools.count()
+        self._service_time: float = 0.0
+        self._lock = threading.Lock()
+
+    def _enqueue(self, rank: int) -> Optional[_Waiter]:
+        """Queues a request (the caller holds the lock), returns `None` if it is shed instead."""
+
+        ahead: int = sum(1 for waiter in self._waiting if waiter.rank <= rank)
+        if (ahead + 1) * self._service_time / self.concurrency > self.max_latency:
+            return None
+        if len(self._waiting) >= self.max_queue:
+            lowest: _Waiter = max(self._waiting)
+            if lowest.rank <= rank:
+                return None
+            self._waiting.remove(lowest)
+            heapq.heapify(self._waiting)
+            lowest.event.set()
+        waiter: _Waiter = _Waiter(rank=rank, sequence=next(self._sequence))
+        heapq.heappush(self._waiting, waiter)
+        return waiter
+
+    def admit(self, priority: PriorityClass) -> Optional[float]:
+        """
+        Waits for a slot.
+
+        Parameters
+        ----------
+        priority: PriorityClass
+            The priority class of the request.
+
+        Returns
+        -------
+            The (monotonic) time the request was admitted at, to be handed to `release`, or `None` if it was shed.
+        """
+
+        with self._lock:
+            if self._active < self.concurrency and not self._waiting:
+                self._active += 1
+                return time.monotonic()
+            waiter: Optional[_Waiter] = self._enqueue(rank=PRIORITIES.index(PriorityClass(priority)))
+        if waiter is None:
+            return None
+
+        waiter.event.wait(timeout=self.max_latency)
+        with self._lock:
+            if waiter.admitted is None and waiter in self._waiting:
+                self._waiting.remove(waiter)
+                heapq.heapify(self._waiting)
+            return waiter.admitted
+
+    def release(self, admitted: float) -> None:
+        """
+        Frees the slot of a served request, handing it to the first queued request.
+
+        Parameters
+        ----------
+        admitted: float
+            The time the request was admitted at.
+        """
+
+        now: float = time.monotonic()
+        with self._lock:
+            self._service_time += SERVICE_TIME_WEIGHT * (now - admitted - self._service_time)
+            if self._waiting:
+                waiter: _Waiter = heapq.heappop(self._waiting)
+                waiter.admitted = now
+                waiter.event.set()
+            else:
+                self._active -= 1
+
+
+class AdmissionControl:
+    """
+    Admits the requests of the router: each request takes a token from the rate limit of each of its identities
+    and then waits for a slot of the server it is forwarded to.
+
+    Parameters
+    ----------
+    queues: dict[RouteClass, AdmissionQueue]
+        The queue of the server each route class is forwarded to, shared by route classes served by one server.
+    limiter: Optional[RateLimiter]
+        The rate limits, if any.
+    scopes: list[RateLimitScope]
+        The identities rate limits apply to.
+    metrics: Optional[WrapperMetrics]
+        The wrapper metrics, counting rejected requests.
+    trusted_proxy: bool
+        If `True` requests arrive through a trusted proxy, whose `X-Forwarded-For` and `X-Forwarded-User`
+        headers identify the client and user; otherwise the client is the peer address and users are unknown.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        queues: dict[RouteClass, AdmissionQueue],
+        limiter: Optional[RateLimiter] = None,
+        scopes: Optional[list[RateLimitScope]] = None,
+        metrics: Optional[WrapperMetrics] = None,
+        trusted_proxy: bool = False,
+    ):
+        missing: list[str] = [route_class.value for route_class in RouteClass if route_class not in queues]
+        if missing:
+            raise ValueError(f"no admission queue defined for route classes: {', '.join(missing)}")
+
+        self.queues = queues
+        self.limiter = limiter
+        self.scopes = [RateLimitScope(scope) for scope in scopes or [RateLimitScope.CLIENT]]
+        self.metrics = metrics
+        self.trusted_proxy = trusted_proxy
+
+    @property
+    def reads_bodies(self) -> bool:
+        """Whether rate limit identities are read from request bodies (the experiment of a request)."""
+
+        return self.limiter is not None and RateLimitScope.EXPERIMENT in self.scopes
+
+    def limit_keys(
+        self,
+        headers: Any,
+        address: str,
+        parameters: dict[str, str],
+        experiment_of: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> list[str]:
+        """
+        Returns the rate limited identities of a request.
+
+        Parameters
+        ----------
+        headers: Any
+            The request headers (`email.message.Message`).
+        address: str
+            The peer address of the connection.
+        parameters: dict[str, str]
+            The request parameters.
+        experiment_of: Optional[Callable[[str], Optional[str]]]
+            Looks up the experiment of a run, for requests naming a run.
+        """
+
+        if self.limiter is None:
+            return []
+        keys: list[str] = []
+        if RateLimitScope.CLIENT in self.scopes:
+            client: str = request_client(headers=headers, address=address, trusted_proxy=self.trusted_proxy)
+            keys.append(f"client:{client}")
+        user: Optional[str] = (
+            request_user(headers=headers, trusted_proxy=self.trusted_proxy)
+            if RateLimitScope.USER in self.scopes
+            else None
+        )
+        if user:
+            keys.append(f"user:{user}")
+        if RateLimitScope.EXPERIMENT in self.scopes:
+            experiment: Optional[str] = parameters.get("experiment_id")
+            run_id: Optional[str] = parameters.get("run_id") or parameters.get("run_uuid")
+            if not experiment and run_id and experiment_of is not None:
+                experiment = experiment_of(run_id)
+            if experiment:
+                keys.append(f"experiment:{experiment}")
+        return keys
+
+    def _reject(self, reason: str, priority: PriorityClass, message: str, retry_after: float) -> None:
+        """Counts and raises a rejection."""
+
+        if self.metrics is not None:
+            self.metrics.requests_rejected.labels(reason=reason, priority=PriorityClass(priority).value).inc()
+        raise RequestRejectedError(message=message, retry_after=retry_after)
+
+    def admit(self, route_class: RouteClass, priority: PriorityClass, keys: list[str]) -> float:
+        """
+        Admits a request, waiting for a slot of its server.
+
+        Parameters
+        ----------
+        route_class: RouteClass
+            The route class of the request.
+        priority: PriorityClass
+            The priority class of the request.
+        keys: list[str]
+            The rate limited identities of the request.
+
+        Returns
+        -------
+            The admission time, to be handed to `release` once the request was served.
+
+        Raises
+        ------
+        RequestRejectedError
+            If the request exceeds a rate limit or was shed.
+        """
+
+        if self.limiter is not None and keys:
+            wait: float = self.limiter.acquire(keys=keys)
+            if wait > 0:
+                self._reject(reason="rate_limit", priority=priority, message="Rate limit exceeded", retry_after=wait)
+        queue: AdmissionQueue = self.queues[route_class]
+        admitted: Optional[float] = queue.admit(priority=priority)
+        if admitted is None:
+            self._reject(
+                reason="overload",
+                priority=priority,
+                message="The tracking server is overloaded",
+                retry_after=queue.max_latency,
+            )
+        return admitted
+
+    def release(self, route_class: RouteClass, admitted: float) -> None:
+        """
+        Frees the slot of a served request.
+
+        Parameters
+        ----------
+        route_class: RouteClass
+            The route class of the request.
+        admitted: float
+            The admission time returned by `admit`.
+        """
+
+        self.queues[route_class].release(admitted=admitted)
+
+
+class AdmissionRequestHandler(RouterRequestHandler):
+    """Admits each request (rate limits, then a slot of its upstream pool) before forwarding it."""
+
+    server: "AdmissionRouter"
+
+    def _read_body(self) -> Optional[bytes]:
+        """Reads the body of a (small) REST request, which may name the experiment or run of the request."""
+
+        length: str = self.headers.get("Content-Length") or ""
+        if self.command != "POST" or api_endpoint(path=self.path.split("?", 1)[0]) is None:
+            return None
+        if "Transfer-Encoding" in self.headers or not length.isdigit() or int(length) > MAX_INSPECTED_BODY:
+            return None
+        return self.rfile.read(int(length))
+
+    def _reject(self, error: RequestRejectedError, body: Optional[bytes]) -> None:
+        """
+        Responds `429 Too Many Requests`, with the seconds after which the client may retry.
+
+        Parameters
+        ----------
+        error: RequestRejectedError
+            The rejection.
+        body: Optional[bytes]
+            The request body, if it was read.
+        """
+
+        payload: bytes = json.dumps({"error_code": "REQUEST_LIMIT_EXCEEDED", "message": str(error)}).encode("utf-8")
+        self.send_response_only(429)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Retry-After", str(max(1, math.ceil(error.retry_after))))
+        length: str = self.headers.get("Content-Length") or "0"
+        if body is None and ("Transfer-Encoding" in self.headers or length != "0"):
+            # The unread request body can not be told apart from the next request.
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _forward(self) -> None:
+        """Admits the current request and forwards it to its upstream pool."""
+
+        route_class: RouteClass = classify_request(method=self.command, path=self.path)
+        if is_exempt(path=self.path):
+            self._proxy(route_class=route_class)
+            return
+
+        admission: AdmissionControl = self.server.admission
+        body: Optional[bytes] = self._read_body() if admission.reads_bodies else None
+        try:
+            admitted: float = admission.admit(
+                route_class=route_class,
+                priority=classify_priority(method=self.command, path=self.path),
+                keys=admission.limit_keys(
+                    headers=self.headers,
+                    address=self.client_address[0],
+                    parameters=request_parameters(environ={"QUERY_STRING": self.path.partition("?")[2]}, body=body),
+                    experiment_of=self.server.experiment_of,
+                ),
+            )
+        except RequestRejectedError as error:
+            self._reject(error=error, body=body)
+            return
+        try:
+            self._proxy(route_class=route_class, body=body)
+        finally:
+            admission.release(route_class=route_class, admitted=admitted)
+
+    do_GET = do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _forward
+
+
+class AdmissionRouter(MLFlowRouter):
+    """
+    Router admitting requests through admission control before dispatching them to the tracking server pools.
+
+    Parameters
+    ----------
+    address: str
+        The address to listen on.
+    port: int
+        The port to listen on.
+    upstreams: dict[RouteClass, tuple[str, int]]
+        The (host, port) of the pool serving each route class.
+    admission: AdmissionControl
+        The admission control of the requests.
+    upstream_timeout: float
+        Seconds to wait on an upstream pool before failing the request.
+    """
+
+    request_handler = AdmissionRequestHandler
+    admission: AdmissionControl
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        address: str,
+        port: int,
+        upstreams: dict[RouteClass, tuple[str, int]],
+        admission: AdmissionControl,
+        upstream_timeout: float = 300.0,
+    ):
+        self.admission = admission
+        self._experiments: OrderedDict[str, Optional[str]] = OrderedDict()
+        self._experiments_lock = threading.Lock()
+        super().__init__(address=address, port=port, upstreams=upstreams, upstream_timeout=upstream_timeout)
+
+    def experiment_of(self, run_id: str) -> Optional[str]:
+        """
+        Looks up the experiment of a run from the read pool, once per run.
+
+        Parameters
+        ----------
+        run_id: str
+            The run.
+
+        Returns
+        -------
+            The experiment, or `None` if the run does not exist or the lookup failed.
+        """
+
+        with self._experiments_lock:
+            if run_id in self._experiments:
+                self._experiments.move_to_end(run_id)
+                return self._experiments[run_id]
+
+        host, port = self.upstreams[RouteClass.READ]
+        connection: http.client.HTTPConnection = http.client.HTTPConnection(
+            host=host, port=port, timeout=LOOKUP_TIMEOUT
+        )
+        try:
+            connection.request("GET", f"{API_ROOTS[0]}runs/get?{urlencode({'run_id': run_id})}")
+            response: http.client.HTTPResponse = connection.getresponse()
+            payload: bytes = response.read()
+        except (OSError, http.client.HTTPException):
+            return None
+        finally:
+            connection.close()
+
+        experiment: Optional[str] = None
+        if response.status == 200:
+            try:
+                experiment = str(json.loads(payload)["run"]["info"]["experiment_id"])
+            except (ValueError, KeyError, TypeError):
+                return None
+        elif response.status not in (400, 404):
+            # Not remembered, the server may recover.
+            return None
+        with self._experiments_lock:
+            self._experiments[run_id] = experiment
+            while len(self._experiments) > MAX_RUN_EXPERIMENTS:
+                self._experiments.popitem(last=False)
+        return experiment
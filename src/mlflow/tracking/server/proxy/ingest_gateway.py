@@ -0,0 +1,917 @@
+""" Asynchronous ingest front end for the metric, param and tag logging endpoints of the mlflow tracking server """
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import shlex
+import signal
+import sys
+import threading
+from typing import Any, AsyncIterator, Optional, Union
+
+from ..common.config.environment import demand_env_var
+from ..wsgi.read_cache import READ_CACHE_ENV_VAR, InvalidationLog
+from .param_conflict_error import ParamConflictError
+from .router import CHUNK_SIZE, FORWARDED_FOR_HEADER, HOP_BY_HOP_HEADERS, api_endpoint
+
+# Run logging endpoints written by the gateway; every other request is forwarded to the tracking server.
+INGEST_ENDPOINTS: list[str] = ["runs/log-metric", "runs/log-batch", "runs/log-parameter", "runs/set-tag"]
+
+# Largest ingested request body; larger requests are forwarded (mlflow rejects batches this large).
+MAX_BODY_SIZE: int = 4 * 1024 * 1024
+
+# Tags mlflow also applies elsewhere (the run name is a column of the run), always written by mlflow.
+FORWARDED_TAGS: list[str] = ["mlflow.runName"]
+
+# SQL can not represent infinite values, mlflow stores the largest floats instead.
+MAX_FLOAT: float = 1.7976931348623157e308
+
+# Statements writing the rows of a batch, in the order mlflow writes them.  Params logged again keep their value
+# and are only returned if the value is unchanged, metrics logged again are skipped (as mlflow does) and the latest
+# metric is only replaced by a strictly more recent (step, timestamp, value), like mlflow's
+# `_update_latest_metrics_if_necessary` does.
+INSERT_PARAMS: str = (
+    "INSERT INTO params (key, value, run_uuid) SELECT * FROM unnest($1::text[], $2::text[], $3::text[]) "
+    "ON CONFLICT (key, run_uuid) DO UPDATE SET value = EXCLUDED.value WHERE params.value = EXCLUDED.value "
+    "RETURNING key, run_uuid"
+)
+INSERT_METRICS: str = (
+    "INSERT INTO metrics (key, value, timestamp, step, run_uuid, is_nan) VALUES ($1, $2, $3, $4, $5, $6) "
+    "ON CONFLICT DO NOTHING"
+)
+UPSERT_LATEST_METRICS: str = (
+    "INSERT INTO latest_metrics (key, value, timestamp, step, run_uuid, is_nan) VALUES ($1, $2, $3, $4, $5, $6) "
+    "ON CONFLICT (key, run_uuid) DO UPDATE SET value = EXCLUDED.value, timestamp = EXCLUDED.timestamp, "
+    "step = EXCLUDED.step, is_nan = EXCLUDED.is_nan "
+    "WHERE (EXCLUDED.step, EXCLUDED.timestamp, EXCLUDED.value) > "
+    "(latest_metrics.step, latest_metrics.timestamp, latest_metrics.value)"
+)
+UPSERT_TAGS: str = (
+    "INSERT INTO tags (key, value, run_uuid) VALUES ($1, $2, $3) "
+    "ON CONFLICT (key, run_uuid) DO UPDATE SET value = EXCLUDED.value"
+)
+
+
+# pylint: disable=too-many-arguments
+def build_ingest_gateway_command(
+    address: str, port: int, upstream: tuple[str, int], *, connections: int, batch_size: int, max_latency: float
+) -> str:
+    """
+    Builds the command launching the ingest gateway process.  The backend store is read from the environment
+    (`MLFLOW_BACKEND_STORE_URI`) so credentials do not show in the process list.
+
+    Parameters
+    ----------
+    address: str
+        The address to listen on.
+    port: int
+        The port to listen on.
+    upstream: tuple[str, int]
+        The (host, port) of the tracking server every other request is forwarded to.
+    connections: int
+        Backend store connections, each writing one batch at a time.
+    batch_size: int
+        Rows written per batch at most.
+    max_latency: float
+        Seconds a request waits at most for further requests to be written with.
+
+    Returns
+    -------
+        The command to be executed.
+    """
+
+    return (
+        f"{shlex.quote(sys.executable)} -m {__name__} --address {address} --port {port} "
+        f"--upstream {upstream[0]}:{upstream[1]} --connections {connections} --batch-size {batch_size} "
+        f"--max-latency {max_latency}"
+    )
+
+
+def asyncpg_dsn(backend_store_uri: str) -> str:
+    """
+    Converts a PostgreSQL backend store URI (with or without a SQLAlchemy driver) to an asyncpg DSN.
+
+    Parameters
+    ----------
+    backend_store_uri: str
+        The backend store URI, e.g. `postgresql+psycopg2://user@host/mlflow`.
+
+    Returns
+    -------
+        The DSN, e.g. `postgresql://user@host/mlflow`.
+    """
+
+    scheme, separator, rest = backend_store_uri.partition("://")
+    if not separator or scheme.split("+", 1)[0] not in ["postgresql", "postgres"]:
+        raise ValueError(f"the ingest gateway requires a PostgreSQL backend store, received: {scheme}")
+    return f"postgresql://{rest}"
+
+
+# pylint: disable=too-few-public-methods
+class IngestRequest:
+    """
+    A validated logging request of a run.
+
+    Parameters
+    ----------
+    run_id: str
+        The run.
+    metrics: list[tuple[str, float, int, int]]
+        The `(key, value, timestamp, step)` metrics.
+    params: list[tuple[str, str]]
+        The `(key, value)` params.
+    tags: list[tuple[str, str]]
+        The `(key, value)` tags.
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        metrics: list[tuple[str, float, int, int]],
+        params: list[tuple[str, str]],
+        tags: list[tuple[str, str]],
+    ):
+        self.run_id = run_id
+        self.metrics = metrics
+        self.params = params
+        self.tags = tags
+
+    @property
+    def rows(self) -> int:
+        """The rows the request writes."""
+
+        return len(self.metrics) + len(self.params) + len(self.tags)
+
+
+def validate_ingest(request: IngestRequest) -> bool:
+    """
+    Checks a logging request the way mlflow does when logging a batch (e.g. key names, value lengths and the
+    batch limits).
+
+    Parameters
+    ----------
+    request: IngestRequest
+        The request.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from mlflow.entities import Metric, Param, RunTag
+    from mlflow.exceptions import MlflowException
+    from mlflow.utils.validation import (
+        _validate_batch_log_data,
+        _validate_batch_log_limits,
+        _validate_param_keys_unique,
+        _validate_run_id,
+    )
+
+    metrics: list = [
+        Metric(key=key, value=value, timestamp=timestamp, step=step) for key, value, timestamp, step in request.metrics
+    ]
+    params: list = [Param(key=key, value=value) for key, value in request.params]
+    tags: list = [RunTag(key=key, value=value) for key, value in request.tags]
+    try:
+        _validate_run_id(request.run_id)
+        _validate_batch_log_data(metrics, params, tags)
+        _validate_batch_log_limits(metrics, params, tags)
+        _validate_param_keys_unique(params)
+    except MlflowException:
+        return False
+    return True
+
+
+def _entries(payload: dict, endpoint: str) -> tuple[list, list, list]:
+    """Returns the requested metrics, params and tags of a logging request."""
+
+    if endpoint == "runs/log-metric":
+        return [payload], [], []
+    if endpoint == "runs/log-parameter":
+        return [], [payload], []
+    if endpoint == "runs/set-tag":
+        return [], [], [payload]
+    entries: list[Any] = [payload.get("metrics") or [], payload.get("params") or [], payload.get("tags") or []]
+    if not all(isinstance(entry, list) for entry in entries):
+        raise TypeError("metrics, params and tags must be lists")
+    return entries[0], entries[1], entries[2]
+
+
+def _metric(entry: dict) -> tuple[str, float, int, int]:
+    """Returns the `(key, value, timestamp, step)` of a requested metric."""
+
+    key, value, timestamp, step = entry["key"], entry["value"], entry["timestamp"], entry.get("step", 0)
+    if not isinstance(key, str) or isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise TypeError("invalid metric")
+    if any(isinstance(number, bool) or not isinstance(number, int) for number in [timestamp, step]):
+        raise TypeError("invalid metric timestamp or step")
+    return key, float(value), timestamp, step
+
+
+def _entry(entry: dict) -> tuple[str, str]:
+    """Returns the `(key, value)` of a requested param or tag."""
+
+    key, value = entry["key"], entry.get("value", "")
+    if not isinstance(key, str) or not isinstance(value, str):
+        raise TypeError("invalid param or tag")
+    return key, value
+
+
+def parse_ingest_request(endpoint: str, body: bytes) -> Optional[IngestRequest]:
+    """
+    Extracts a logging request which can be written by the gateway.
+
+    Parameters
+    ----------
+    endpoint: str
+        The REST endpoint, one of `INGEST_ENDPOINTS`.
+    body: bytes
+        The JSON request body.
+
+    Returns
+    -------
+        The request, or `None` if it must be served by mlflow: requests setting the run name, and invalid
+        requests (mlflow reports the error).
+    """
+
+    try:
+        payload: Any = json.loads(body)
+        run_id: Any = payload.get("run_id") or payload.get("run_uuid")
+        metrics, params, tags = _entries(payload=payload, endpoint=endpoint)
+        request: IngestRequest = IngestRequest(
+            run_id=run_id,
+            metrics=[_metric(entry=entry) for entry in metrics],
+            params=[_entry(entry=entry) for entry in params],
+            tags=[_entry(entry=entry) for entry in tags],
+        )
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+    if not isinstance(run_id, str) or not request.rows or any(key in FORWARDED_TAGS for key, _ in request.tags):
+        return None
+    if not validate_ingest(request=request):
+        return None
+    return request
+
+
+def build_rows(requests: list[IngestRequest]) -> tuple[list[tuple], list[tuple], list[tuple], list[tuple]]:
+    """
+    Builds the rows a batch of requests writes, the way mlflow stores them (NaN and infinite values are
+    replaced).  Rows are sorted so concurrent batches lock them in the same order.
+
+    Parameters
+    ----------
+    requests: list[IngestRequest]
+        The requests, in arrival order: later tags replace earlier ones.
+
+    Returns
+    -------
+        The `params`, `metrics`, `latest_metrics` and `tags` rows, in the column order of the insert statements.
+    """
+
+    params: dict[tuple[str, str], str] = {}
+    metrics: set[tuple] = set()
+    latest: dict[tuple[str, str], tuple] = {}
+    tags: dict[tuple[str, str], str] = {}
+    for request in requests:
+        for key, value in request.params:
+            params.setdefault((request.run_id, key), value)
+        for key, value, timestamp, step in request.metrics:
+            is_nan: bool = math.isnan(value)
+            stored: float = 0.0 if is_nan else max(-MAX_FLOAT, min(MAX_FLOAT, value))
+            row: tuple = (key, stored, timestamp, step, request.run_id, is_nan)
+            metrics.add(row)
+            current: Optional[tuple] = latest.get((request.run_id, key))
+            if current is None or (step, timestamp, stored) > (current[3], current[2], current[1]):
+                latest[(request.run_id, key)] = row
+        for key, value in request.tags:
+            tags[(request.run_id, key)] = value
+
+    return (
+        [(key, value, run_id) for (run_id, key), value in sorted(params.items())],
+        sorted(metrics, key=lambda row: (row[4], row[0], row[3], row[2], row[1], row[5])),
+        [row for _, row in sorted(latest.items())],
+        [(key, value, run_id) for (run_id, key), value in sorted(tags.items())],
+    )
+
+
+# pylint: disable=too-many-instance-attributes
+class IngestWriter:
+    """
+    Writes logging requests to a PostgreSQL backend store with asyncpg.  Requests arriving while the writers are
+    busy are coalesced into batches (one transaction each); every connection has a batch in flight, written with
+    pipelined `executemany` calls.  A request is acknowledged once its batch committed.
+
+    Parameters
+    ----------
+    backend_store_uri: str
+        The PostgreSQL backend store.
+    connections: int
+        Backend store connections, each writing one batch at a time.
+    batch_size: int
+        Rows written per batch at most.
+    max_latency: float
+        Seconds a batch waits at most for further requests, 0 to write whatever arrived meanwhile.
+    invalidations: Optional[InvalidationLog]
+        The read cache invalidations of the tracking server workers, if they cache reads.
+    """
+
+    def __init__(
+        self,
+        backend_store_uri: str,
+        connections: int = 4,
+        batch_size: int = 1000,
+        max_latency: float = 0.0,
+        invalidations: Optional[InvalidationLog] = None,
+    ):
+        if connections < 1:
+            raise ValueError(f"ingest connections must be positive, received: {connections}")
+        if batch_size < 1:
+            raise ValueError(f"ingest batch size must be positive, received: {batch_size}")
+        if max_latency < 0:
+            raise ValueError(f"ingest latency can not be negative, received: {max_latency}")
+
+        self.dsn = asyncpg_dsn(backend_store_uri=backend_store_uri)
+        self.connections = connections
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.invalidations = invalidations
+        self._pool: Any = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Connects to the backend store and starts the writers."""
+
+        # pylint: disable=import-outside-toplevel
+        import asyncpg
+
+        self._pool = await asyncpg.create_pool(dsn=self.dsn, min_size=1, max_size=self.connections)
+        self._queue = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._write_continuously(queue=self._queue)) for _ in range(self.connections)
+        ]
+
+    async def close(self) -> None:
+        """Writes the pending requests and disconnects."""
+
+        if self._queue is None:
+            return
+        queue, self._queue = self._queue, None
+        for _ in self._tasks:
+            queue.put_nowait(None)
+        await asyncio.gather(*self._tasks)
+        await self._pool.close()
+
+    async def submit(self, request: IngestRequest) -> bool:
+        """
+        Writes a request with the next batch.
+
+        Parameters
+        ----------
+        request: IngestRequest
+            The request.
+
+        Returns
+        -------
+            `True` once written, `False` if the request must be served by mlflow (e.g. the run is not active, a
+            param was logged with another value or the batch failed).
+        """
+
+        if self._queue is None:
+            return False
+        written: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((request, written))
+        return await written
+
+    def _take(self, queue: asyncio.Queue, batch: list, rows: int) -> tuple[int, bool]:
+        """Adds the queued requests to a batch until it is full, returns its rows and whether the writer stops."""
+
+        while rows < self.batch_size and not queue.empty():
+            item: Optional[tuple] = queue.get_nowait()
+            if item is None:
+                return rows, True
+            batch.append(item)
+            rows += item[0].rows
+        return rows, False
+
+    async def _write_continuously(self, queue: asyncio.Queue) -> None:
+        """Writes the batches of a queue until the writer is closed."""
+
+        stopping: bool = False
+        while not stopping:
+            item: Optional[tuple] = await queue.get()
+            if item is None:
+                return
+            batch: list[tuple] = [item]
+            rows, stopping = self._take(queue=queue, batch=batch, rows=item[0].rows)
+            if not stopping and rows < self.batch_size and self.max_latency > 0:
+                await asyncio.sleep(self.max_latency)
+                rows, stopping = self._take(queue=queue, batch=batch, rows=rows)
+            await self._write(batch=batch)
+
+    async def _accepted(self, connection: Any, requests: list[IngestRequest]) -> list[IngestRequest]:
+        """Returns the requests mlflow would accept: the run is active and no logged param changes value."""
+
+        run_ids: list[str] = sorted({request.run_id for request in requests})
+        active: set[str] = {
+            row["run_uuid"]
+            for row in await connection.fetch(
+                "SELECT run_uuid FROM runs WHERE run_uuid = ANY($1::text[]) AND lifecycle_stage = 'active'", run_ids
+            )
+        }
+        logged: dict[tuple[str, str], str] = {}
+        keys: list[str] = sorted({key for request in requests for key, _ in request.params})
+        if keys:
+            for row in await connection.fetch(
+                "SELECT run_uuid, key, value FROM params WHERE run_uuid = ANY($1::text[]) AND key = ANY($2::text[])",
+                run_ids,
+                keys,
+            ):
+                logged[(row["run_uuid"], row["key"])] = row["value"]
+
+        accepted: list[IngestRequest] = []
+        for request in requests:
+            if request.run_id not in active:
+                continue
+            if any(logged.get((request.run_id, key), value) != value for key, value in request.params):
+                continue
+            logged.update({(request.run_id, key): value for key, value in request.params})
+            accepted.append(request)
+        return accepted
+
+    async def _write_params(self, connection: Any, rows: list[tuple]) -> None:
+        """
+        Writes the params of a batch, failing if a param was meanwhile logged with another value (by a concurrent
+        batch or by mlflow) so the transaction is rolled back rather than the value silently dropped.
+
+        Parameters
+        ----------
+        connection: Any
+            The connection of the batch transaction.
+        rows: list[tuple]
+            The `(key, value, run_uuid)` rows.
+        """
+
+        keys, values, run_ids = (list(column) for column in zip(*rows))
+        written: set[tuple] = {
+            (row["run_uuid"], row["key"]) for row in await connection.fetch(INSERT_PARAMS, keys, values, run_ids)
+        }
+        changed: list[str] = [f"{run_id}/{key}" for key, _, run_id in rows if (run_id, key) not in written]
+        if changed:
+            raise ParamConflictError(f"params logged with another value: {', '.join(changed)}")
+
+    async def _write(self, batch: list[tuple]) -> None:
+        """Writes a batch in one transaction and reports each request as written or not."""
+
+        # pylint: disable=import-outside-toplevel
+        import asyncpg
+
+        requests: list[IngestRequest] = [request for request, _ in batch]
+        try:
+            async with self._pool.acquire() as connection:
+                async with connection.transaction():
+                    accepted: list[IngestRequest] = await self._accepted(connection=connection, requests=requests)
+                    params, *rows = build_rows(requests=accepted)
+                    if params:
+                        await self._write_params(connection=connection, rows=params)
+                    for statement, statement_rows in zip([INSERT_METRICS, UPSERT_LATEST_METRICS, UPSERT_TAGS], rows):
+                        if statement_rows:
+                            await connection.executemany(statement, statement_rows)
+        except (
+            OSError,
+            asyncio.TimeoutError,
+            asyncpg.PostgresError,
+            asyncpg.InterfaceError,
+            ParamConflictError,
+        ) as error:
+            print(f"Ingest batch of {len(batch)} requests failed, forwarding them to mlflow: {error}", flush=True)
+            accepted = []
+
+        if accepted and self.invalidations is not None:
+            self.invalidations.touch(scopes=["runs", *sorted({f"run:{request.run_id}" for request in accepted})])
+        written: set[int] = {id(request) for request in accepted}
+        for request, future in batch:
+            if not future.done():
+                future.set_result(id(request) in written)
+
+
+def header(headers: list[tuple[str, str]], name: str) -> Optional[str]:
+    """
+    Returns the value of a header, if present.
+
+    Parameters
+    ----------
+    headers: list[tuple[str, str]]
+        The `(name, value)` headers of a message.
+    name: str
+        The header name (case insensitive).
+    """
+
+    for key, value in headers:
+        if key.lower() == name.lower():
+            return value
+    return None
+
+
+async def read_head(reader: asyncio.StreamReader) -> Optional[tuple[str, list[tuple[str, str]]]]:
+    """
+    Reads the start line and headers of an HTTP message.
+
+    Parameters
+    ----------
+    reader: asyncio.StreamReader
+        The connection.
+
+    Returns
+    -------
+        The start line and the `(name, value)` headers, or `None` once the connection is closed.
+    """
+
+    try:
+        data: bytes = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        return None
+    lines: list[str] = data.decode("latin-1").split("\r\n")
+    headers: list[tuple[str, str]] = []
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers.append((name.strip(), value.strip()))
+    return lines[0], headers
+
+
+async def read_body(
+    reader: asyncio.StreamReader, headers: list[tuple[str, str]], until_close: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Reads the body of an HTTP message in chunks.
+
+    Parameters
+    ----------
+    reader: asyncio.StreamReader
+        The connection.
+    headers: list[tuple[str, str]]
+        The headers of the message.
+    until_close: bool
+        If `True` a body without length or chunked encoding lasts until the connection is closed (responses).
+    """
+
+    if "chunked" in (header(headers=headers, name="Transfer-Encoding") or "").lower():
+        while True:
+            size: int = int((await reader.readline()).split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                # Drain any trailers and the terminating line.
+                while await reader.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                return
+            yield await reader.readexactly(size)
+            await reader.readline()
+
+    length: Optional[str] = header(headers=headers, name="Content-Length")
+    remaining: int = int(length) if length is not None else (-1 if until_close else 0)
+    while remaining != 0:
+        chunk: bytes = await reader.read(CHUNK_SIZE if remaining < 0 else min(CHUNK_SIZE, remaining))
+        if not chunk:
+            if remaining > 0:
+                raise ConnectionResetError("connection closed before the end of the body")
+            return
+        remaining = remaining - len(chunk) if remaining > 0 else remaining
+        yield chunk
+
+
+def write_head(writer: asyncio.StreamWriter, start_line: str, headers: list[tuple[str, str]]) -> None:
+    """
+    Writes the start line and headers of an HTTP message.
+
+    Parameters
+    ----------
+    writer: asyncio.StreamWriter
+        The connection.
+    start_line: str
+        The request or status line.
+    headers: list[tuple[str, str]]
+        The `(name, value)` headers.
+    """
+
+    lines: list[str] = [start_line, *[f"{name}: {value}" for name, value in headers], "", ""]
+    writer.write("\r\n".join(lines).encode("latin-1"))
+
+
+async def write_body(writer: asyncio.StreamWriter, body: Union[bytes, AsyncIterator[bytes]], chunked: bool) -> None:
+    """
+    Writes the body of an HTTP message.
+
+    Parameters
+    ----------
+    writer: asyncio.StreamWriter
+        The connection.
+    body: Union[bytes, AsyncIterator[bytes]]
+        The body, read or streamed.
+    chunked: bool
+        If `True` the body is written with chunked encoding.
+    """
+
+    if isinstance(body, bytes):
+        if chunked:
+            body = (b"%x\r\n%s\r\n" % (len(body), body) if body else b"") + b"0\r\n\r\n"
+        writer.write(body)
+        await writer.drain()
+        return
+    async for chunk in body:
+        writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk) if chunked else chunk)
+        await writer.drain()
+    if chunked:
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+# pylint: disable=too-few-public-methods
+class _Upstream:
+    """The tracking server connection of a client connection, kept alive between requests."""
+
+    def __init__(self):
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    def close(self) -> None:
+        """Closes the connection, the next request opens a new one."""
+
+        if self.writer is not None:
+            self.writer.close()
+        self.reader, self.writer = None, None
+
+
+class IngestGateway:
+    """
+    Front end listening in front of the tracking server: run logging requests (`INGEST_ENDPOINTS`) are validated
+    and written by the ingest writer from a single event loop, every other request (and logging requests the
+    writer declines) is forwarded to the tracking server, streaming both bodies.
+
+    Parameters
+    ----------
+    address: str
+        The address to listen on.
+    port: int
+        The port to listen on, 0 for any free port.
+    upstream: tuple[str, int]
+        The (host, port) of the tracking server.
+    writer: IngestWriter
+        The writer of the logging requests.
+    upstream_timeout: float
+        Seconds to wait on the tracking server before failing the request.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        port: int,
+        upstream: tuple[str, int],
+        writer: IngestWriter,
+        upstream_timeout: float = 300.0,
+    ):
+        self.address = address
+        self.port = port
+        self.upstream = upstream
+        self.writer = writer
+        self.upstream_timeout = upstream_timeout
+        self.started: threading.Event = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._active: int = 0
+
+    async def serve(self) -> None:
+        """Serves requests until stopped, then completes the requests in flight."""
+
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        await self.writer.start()
+        server: asyncio.AbstractServer = await asyncio.start_server(
+            self._serve_connection, host=self.address, port=self.port
+        )
+        self.port = server.sockets[0].getsockname()[1]
+        self.started.set()
+        try:
+            await self._stopping.wait()
+        finally:
+            server.close()
+            while self._active:
+                await asyncio.sleep(0.05)
+            await self.writer.close()
+
+    def stop(self) -> None:
+        """Stops serving (callable from any thread)."""
+
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves the requests of a client connection."""
+
+        upstream: _Upstream = _Upstream()
+        try:
+            keep_alive: bool = True
+            while keep_alive and not self._stopping.is_set():
+                head: Optional[tuple[str, list[tuple[str, str]]]] = await read_head(reader=reader)
+                if head is None:
+                    break
+                self._active += 1
+                try:
+                    keep_alive = await self._serve_request(
+                        reader=reader, writer=writer, upstream=upstream, start_line=head[0], headers=head[1]
+                    )
+                finally:
+                    self._active -= 1
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            upstream.close()
+            writer.close()
+
+    async def _serve_request(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        upstream: _Upstream,
+        start_line: str,
+        headers: list[tuple[str, str]],
+    ) -> bool:
+        """Ingests or forwards a request, returns whether the client connection is kept alive."""
+
+        method, target, version = start_line.split(" ", 2)
+        keep_alive: bool = version == "HTTP/1.1" and (header(headers, "Connection") or "").lower() != "close"
+        if (header(headers, "Expect") or "").lower() == "100-continue":
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            headers = [(name, value) for name, value in headers if name.lower() != "expect"]
+
+        length: Optional[str] = header(headers, "Content-Length")
+        endpoint: Optional[str] = api_endpoint(path=target.split("?", 1)[0])
+        body: Union[bytes, AsyncIterator[bytes]] = read_body(reader=reader, headers=headers)
+        if length is None and header(headers, "Transfer-Encoding") is None:
+            body = b""
+        if method == "POST" and endpoint in INGEST_ENDPOINTS and length is not None and int(length) <= MAX_BODY_SIZE:
+            body = await reader.readexactly(int(length))
+            request: Optional[IngestRequest] = parse_ingest_request(endpoint=endpoint, body=body)
+            if request is not None and await self.writer.submit(request=request):
+                write_head(
+                    writer,
+                    "HTTP/1.1 200 OK",
+                    [("Content-Type", "application/json"), ("Content-Length", "2")]
+                    + ([] if keep_alive else [("Connection", "close")]),
+                )
+                await write_body(writer=writer, body=b"{}", chunked=False)
+                return keep_alive
+
+        # The client is appended as one more hop to the addresses forwarded by the proxies in front of the gateway.
+        hops: list[str] = [value for name, value in headers if name.lower() == FORWARDED_FOR_HEADER.lower()]
+        forwarded: list[tuple[str, str]] = [
+            *[(name, value) for name, value in headers if name.lower() != FORWARDED_FOR_HEADER.lower()],
+            (FORWARDED_FOR_HEADER, ", ".join([*hops, writer.get_extra_info("peername")[0]])),
+        ]
+        return await self._forward(
+            writer=writer,
+            upstream=upstream,
+            request=(method, target, forwarded),
+            body=body,
+            keep_alive=keep_alive,
+        )
+
+    async def _send(self, upstream: _Upstream, request: tuple, body: Union[bytes, AsyncIterator[bytes]]) -> tuple:
+        """Sends a request to the tracking server, returns the response head."""
+
+        if upstream.writer is None:
+            upstream.reader, upstream.writer = await asyncio.wait_for(
+                asyncio.open_connection(*self.upstream), timeout=self.upstream_timeout
+            )
+        method, target, headers = request
+        chunked: bool = "chunked" in (header(headers, "Transfer-Encoding") or "").lower()
+        forwarded: list[tuple[str, str]] = [
+            (name, value) for name, value in headers if name.lower() not in HOP_BY_HOP_HEADERS
+        ]
+        write_head(
+            upstream.writer,
+            f"{method} {target} HTTP/1.1",
+            forwarded + ([("Transfer-Encoding", "chunked")] if chunked else []),
+        )
+        await write_body(writer=upstream.writer, body=body, chunked=chunked)
+        head: Optional[tuple] = await asyncio.wait_for(read_head(reader=upstream.reader), timeout=self.upstream_timeout)
+        if head is None:
+            raise ConnectionResetError("the tracking server closed the connection")
+        return head
+
+    async def _forward(
+        self,
+        writer: asyncio.StreamWriter,
+        upstream: _Upstream,
+        request: tuple,
+        body: Union[bytes, AsyncIterator[bytes]],
+        keep_alive: bool,
+    ) -> bool:
+        """Forwards a request to the tracking server and relays the response, returns whether to keep alive."""
+
+        reused: bool = upstream.writer is not None
+        try:
+            try:
+                status_line, headers = await self._send(upstream=upstream, request=request, body=body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # A kept-alive connection may have been closed by the server; retry once on a fresh connection
+                # when the request body has not been consumed.
+                if not reused or not isinstance(body, bytes):
+                    raise
+                upstream.close()
+                status_line, headers = await self._send(upstream=upstream, request=request, body=body)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as error:
+            upstream.close()
+            message: bytes = f"Upstream tracking server unavailable: {error}".encode("utf-8")
+            write_head(
+                writer,
+                "HTTP/1.1 502 Bad Gateway",
+                [("Content-Type", "text/plain"), ("Content-Length", str(len(message))), ("Connection", "close")],
+            )
+            await write_body(writer=writer, body=message, chunked=False)
+            return False
+
+        return await self._relay(
+            writer=writer, upstream=upstream, method=request[0], response=(status_line, headers), keep_alive=keep_alive
+        )
+
+    async def _relay(
+        self, writer: asyncio.StreamWriter, upstream: _Upstream, method: str, response: tuple, keep_alive: bool
+    ) -> bool:
+        """Relays a tracking server response to the client, returns whether to keep the client alive."""
+
+        status_line, headers = response
+        status: int = int(status_line.split(" ", 2)[1])
+        no_body: bool = method == "HEAD" or status in (204, 304) or 100 <= status < 200
+        has_length: bool = header(headers, "Content-Length") is not None
+        upstream_chunked: bool = "chunked" in (header(headers, "Transfer-Encoding") or "").lower()
+        closes: bool = (
+            status_line.startswith("HTTP/1.0")
+            or (header(headers, "Connection") or "").lower() == "close"
+            or (not no_body and not has_length and not upstream_chunked)
+        )
+
+        relayed: list[tuple[str, str]] = [
+            (name, value) for name, value in headers if name.lower() not in HOP_BY_HOP_HEADERS
+        ]
+        chunked: bool = not no_body and not has_length
+        write_head(
+            writer,
+            "HTTP/1.1 " + status_line.split(" ", 1)[1],
+            relayed
+            + ([("Transfer-Encoding", "chunked")] if chunked else [])
+            + ([] if keep_alive else [("Connection", "close")]),
+        )
+        await write_body(
+            writer=writer,
+            body=b"" if no_body else read_body(reader=upstream.reader, headers=headers, until_close=True),
+            chunked=chunked,
+        )
+        if closes:
+            upstream.close()
+        return keep_alive
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """
+    Runs the ingest gateway process until it receives a termination signal.
+
+    Parameters
+    ----------
+    argv: Optional[list[str]]
+        The command line arguments, see `build_ingest_gateway_command`.
+    """
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="MLFlow Tracking Server Ingest Gateway")
+    parser.add_argument("--address", required=True)
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--upstream", required=True)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--max-latency", type=float, default=0.0)
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    upstream_host, upstream_port = args.upstream.rsplit(":", 1)
+    cache: Optional[str] = os.environ.get(READ_CACHE_ENV_VAR)
+    gateway: IngestGateway = IngestGateway(
+        address=args.address,
+        port=args.port,
+        upstream=(upstream_host, int(upstream_port)),
+        writer=IngestWriter(
+            backend_store_uri=demand_env_var(name="MLFLOW_BACKEND_STORE_URI"),
+            connections=args.connections,
+            batch_size=args.batch_size,
+            max_latency=args.max_latency,
+            invalidations=InvalidationLog(directory=json.loads(cache)["directory"]) if cache else None,
+        ),
+    )
+
+    async def run() -> None:
+        for signum in [signal.SIGTERM, signal.SIGINT]:
+            asyncio.get_running_loop().add_signal_handler(signum, gateway.stop)
+        await gateway.serve()
+
+    print(f"Ingesting run logging on {args.address}:{args.port}, forwarding other requests to {args.upstream}")
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+""" Param Conflict Error Definition """
+
+
+class ParamConflictError(Exception):
+    """
+    Param Conflict Error, raised when a batch of the ingest gateway logs a param which meanwhile was logged with
+    another value.  mlflow rejects such requests (`INVALID_PARAMETER_VALUE`).
+
+    Parameters
+    ----------
+    message: str
+        The params which changed value.
+    """
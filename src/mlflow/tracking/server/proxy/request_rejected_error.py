@@ -0,0 +1,18 @@
+""" Request Rejected Error Definition """
+
+
+class RequestRejectedError(Exception):
+    """
+    Request Rejected Error, raised when admission control turns a request away.
+
+    Parameters
+    ----------
+    message: str
+        The reason the request was rejected.
+    retry_after: float
+        Seconds after which the request may be retried.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,332 @@
+""" Lightweight reverse proxy which dispatches tracking server requests to dedicated process pools """
+
+import http.client
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from ..contracts.types.route_class import RouteClass
+
+# REST roots the mlflow server registers its handlers under.
+API_ROOTS: list[str] = ["/api/2.0/mlflow/", "/ajax-api/2.0/mlflow/", "/api/2.0/preview/mlflow/"]
+ARTIFACT_ROOTS: list[str] = ["/api/2.0/mlflow-artifacts/", "/ajax-api/2.0/mlflow-artifacts/"]
+
+# Run mutations issued by clients while training (metric, param, tag logging and run lifecycle).
+WRITE_ENDPOINTS: list[str] = [
+    "runs/create",
+    "runs/update",
+    "runs/delete",
+    "runs/restore",
+    "runs/log-metric",
+    "runs/log-parameter",
+    "runs/log-batch",
+    "runs/log-model",
+    "runs/log-inputs",
+    "runs/set-tag",
+    "runs/delete-tag",
+]
+
+# Headers which apply to a single connection and must not be forwarded.
+HOP_BY_HOP_HEADERS: set[str] = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+}
+
+CHUNK_SIZE: int = 64 * 1024
+
+FORWARDED_FOR_HEADER: str = "X-Forwarded-For"
+
+
+def api_endpoint(path: str) -> Optional[str]:
+    """
+    Returns the REST endpoint of a request path, e.g. `runs/get`.
+
+    Parameters
+    ----------
+    path: str
+        The request path (without query string).
+
+    Returns
+    -------
+        The endpoint, or `None` outside the tracking API.
+    """
+
+    for root in API_ROOTS:
+        if path.startswith(root):
+            return path[len(root) :]
+    return None
+
+
+def artifact_endpoint(path: str) -> Optional[str]:
+    """
+    Returns the artifact path of a proxied artifact request path, e.g. `1/<run id>/artifacts/model.pkl`.
+
+    Parameters
+    ----------
+    path: str
+        The request path (without query string).
+
+    Returns
+    -------
+        The artifact path, or `None` outside the proxied artifact endpoints (including listings).
+    """
+
+    for root in ARTIFACT_ROOTS:
+        if path.startswith(root + "artifacts/"):
+            return path[len(root + "artifacts/") :]
+    return None
+
+
+def classify_request(method: str, path: str) -> RouteClass:
+    """
+    Determines which process pool should serve a request.
+
+    Parameters
+    ----------
+    method: str
+        The HTTP method of the request.
+    path: str
+        The request path (query strings are ignored).
+
+    Returns
+    -------
+        The route class of the request.  Anything not recognized is served by the read pool.
+    """
+
+    path = path.split("?", 1)[0]
+    if any(path.startswith(root) for root in ARTIFACT_ROOTS):
+        return RouteClass.ARTIFACT
+    if method.upper() == "POST":
+        for root in API_ROOTS:
+            if path.startswith(root) and path[len(root) :] in WRITE_ENDPOINTS:
+                return RouteClass.WRITE
+    return RouteClass.READ
+
+
+class RouterRequestHandler(BaseHTTPRequestHandler):
+    """Forwards each request to the upstream pool selected by `classify_request`, streaming both bodies."""
+
+    protocol_version = "HTTP/1.1"
+    server: "MLFlowRouter"
+
+    def log_message(self, format: str, *args) -> None:  # pylint: disable=redefined-builtin
+        """Request logging is left to the upstream servers."""
+
+    def _upstream_connection(self, route_class: RouteClass, fresh: bool = False) -> http.client.HTTPConnection:
+        """
+        Returns a (per thread, reused) connection to the upstream pool for the route class.
+
+        Parameters
+        ----------
+        route_class: RouteClass
+            The pool to connect to.
+        fresh: bool
+            If `True` any cached connection is discarded first.
+        """
+
+        connections: dict = self.server.connections()
+        connection: Optional[http.client.HTTPConnection] = connections.get(route_class)
+        if connection is not None and fresh:
+            connection.close()
+            connection = None
+        if connection is None:
+            host, port = self.server.upstreams[route_class]
+            connection = http.client.HTTPConnection(host=host, port=port, timeout=self.server.upstream_timeout)
+            connections[route_class] = connection
+        return connection
+
+    def _send_request(self, connection: http.client.HTTPConnection, body: Optional[bytes] = None) -> None:
+        """
+        Sends the request line, headers and (streamed) body to the upstream connection.
+
+        Parameters
+        ----------
+        connection: http.client.HTTPConnection
+            The upstream connection.
+        body: Optional[bytes]
+            The request body, if it was already read from the client.
+        """
+
+        connection.putrequest(self.command, self.path, skip_host=True, skip_accept_encoding=True)
+        for name, value in self.headers.items():
+            if name.lower() not in HOP_BY_HOP_HEADERS and name.lower() != FORWARDED_FOR_HEADER.lower():
+                connection.putheader(name, value)
+        # The client is appended as one more hop to the addresses forwarded by the proxies in front of the router.
+        hops: list[str] = [*(self.headers.get_all(FORWARDED_FOR_HEADER) or []), self.client_address[0]]
+        connection.putheader(FORWARDED_FOR_HEADER, ", ".join(hops))
+
+        chunked: bool = "chunked" in self.headers.get("Transfer-Encoding", "").lower()
+        if chunked:
+            connection.putheader("Transfer-Encoding", "chunked")
+        connection.endheaders()
+
+        if body is not None:
+            connection.send(body)
+        elif chunked:
+            while True:
+                size: int = int(self.rfile.readline().split(b";", 1)[0].strip(), 16)
+                if size == 0:
+                    # Drain any trailers and the terminating line.
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    connection.send(b"0\r\n\r\n")
+                    break
+                connection.send(b"%x\r\n" % size + self.rfile.read(size) + b"\r\n")
+                self.rfile.readline()
+        else:
+            remaining: int = int(self.headers.get("Content-Length", 0) or 0)
+            while remaining > 0:
+                chunk: bytes = self.rfile.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                connection.send(chunk)
+                remaining -= len(chunk)
+
+    def _send_response(self, response: http.client.HTTPResponse) -> None:
+        """
+        Relays the upstream response to the client, streaming the body.
+
+        Parameters
+        ----------
+        response: http.client.HTTPResponse
+            The upstream response.
+        """
+
+        self.send_response_only(response.status, response.reason)
+        has_length: bool = response.getheader("Content-Length") is not None
+        for name, value in response.getheaders():
+            if name.lower() not in HOP_BY_HOP_HEADERS:
+                self.send_header(name, value)
+
+        no_body: bool = self.command == "HEAD" or response.status in (204, 304) or 100 <= response.status < 200
+        chunked: bool = not has_length and not no_body
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        if response.will_close and not has_length and not chunked:
+            self.close_connection = True
+        self.end_headers()
+
+        if no_body:
+            response.read()
+            return
+
+        while True:
+            chunk: bytes = response.read1(CHUNK_SIZE)
+            if not chunk:
+                break
+            if chunked:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            else:
+                self.wfile.write(chunk)
+        if chunked:
+            self.wfile.write(b"0\r\n\r\n")
+
+    def _proxy(self, route_class: RouteClass, body: Optional[bytes] = None) -> None:
+        """
+        Forwards the current request to the upstream pool of a route class and relays the response.
+
+        Parameters
+        ----------
+        route_class: RouteClass
+            The pool to forward to.
+        body: Optional[bytes]
+            The request body, if it was already read from the client.
+        """
+
+        has_body: bool = "Content-Length" in self.headers or "Transfer-Encoding" in self.headers
+
+        try:
+            connection: http.client.HTTPConnection = self._upstream_connection(route_class=route_class)
+            try:
+                self._send_request(connection=connection, body=body)
+                response: http.client.HTTPResponse = connection.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # A kept-alive upstream connection may have been closed by the server; retry once on a fresh
+                # connection when the request body has not been consumed.
+                if has_body and body is None:
+                    raise
+                connection = self._upstream_connection(route_class=route_class, fresh=True)
+                self._send_request(connection=connection, body=body)
+                response = connection.getresponse()
+        except ValueError as error:
+            # A malformed chunked request body: the upstream connection was left with a partial request.
+            stale: Optional[http.client.HTTPConnection] = self.server.connections().pop(route_class, None)
+            if stale is not None:
+                stale.close()
+            self.close_connection = True
+            self.send_error(400, f"Malformed request body: {error}")
+            return
+        except (OSError, http.client.HTTPException) as error:
+            self.server.connections().pop(route_class, None)
+            self.send_error(502, f"Upstream {route_class.value} pool unavailable: {error}")
+            return
+
+        self._send_response(response=response)
+        if response.will_close:
+            self.server.connections().pop(route_class, None)
+            connection.close()
+
+    def _forward(self) -> None:
+        """Forwards the current request to its upstream pool."""
+
+        self._proxy(route_class=classify_request(method=self.command, path=self.path))
+
+    do_GET = _forward
+    do_HEAD = _forward
+    do_POST = _forward
+    do_PUT = _forward
+    do_PATCH = _forward
+    do_DELETE = _forward
+    do_OPTIONS = _forward
+
+
+class MLFlowRouter(ThreadingHTTPServer):
+    """
+    Reverse proxy listening on the AE5 port, dispatching requests by URL prefix to the tracking server pools.
+
+    Parameters
+    ----------
+    address: str
+        The address to listen on.
+    port: int
+        The port to listen on.
+    upstreams: dict[RouteClass, tuple[str, int]]
+        The (host, port) of the pool serving each route class.
+    upstream_timeout: float
+        Seconds to wait on an upstream pool before failing the request.
+    """
+
+    daemon_threads = True
+    request_handler: type[BaseHTTPRequestHandler] = RouterRequestHandler
+    upstreams: dict[RouteClass, tuple[str, int]]
+    upstream_timeout: float
+
+    def __init__(
+        self,
+        address: str,
+        port: int,
+        upstreams: dict[RouteClass, tuple[str, int]],
+        upstream_timeout: float = 300.0,
+    ):
+        missing: list[str] = [route_class.value for route_class in RouteClass if route_class not in upstreams]
+        if missing:
+            raise ValueError(f"no upstream defined for route classes: {', '.join(missing)}")
+
+        self.upstreams = upstreams
+        self.upstream_timeout = upstream_timeout
+        self._local = threading.local()
+        super().__init__((address, port), self.request_handler)
+
+    def connections(self) -> dict:
+        """Returns the upstream connections owned by the calling thread."""
+
+        if not hasattr(self._local, "connections"):
+            self._local.connections = {}
+        return self._local.connections
@@ -0,0 +1 @@
+""" wsgi namespace """
@@ -0,0 +1,113 @@
+""" Loads the mlflow tracking server application into the current interpreter """
+
+import os
+from types import ModuleType
+from typing import Optional
+
+
+def load_mlflow_server() -> ModuleType:
+    """
+    Imports the mlflow server (mlflow, flask, sqlalchemy and the request handlers).
+
+    Returns
+    -------
+        The `mlflow.server` module, whose `app` attribute is the WSGI application.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from mlflow import server
+
+    return server
+
+
+# pylint: disable=too-many-arguments
+def configure_mlflow_server(
+    server: ModuleType,
+    backend_store_uri: str,
+    default_artifact_root: str,
+    artifacts_destination: Optional[str],
+    *,
+    serve_artifacts: bool = True,
+    artifacts_only: bool = False,
+    registry_store_uri: Optional[str] = None,
+) -> None:
+    """
+    Configures the mlflow server the same way `mlflow server` does before it launches gunicorn: the request
+    handlers read their store configuration from these (mlflow internal) environment variables.
+
+    Parameters
+    ----------
+    server: ModuleType
+        The `mlflow.server` module.
+    backend_store_uri: str
+        The tracking store uri.
+    default_artifact_root: str
+        The artifact location handed to clients for new experiments.
+    artifacts_destination: Optional[str]
+        Where proxied artifacts are stored.
+    serve_artifacts: bool
+        If `True` the server proxies artifact requests.
+    artifacts_only: bool
+        If `True` the server only serves the proxied artifact endpoints.
+    registry_store_uri: Optional[str]
+        The model registry store uri, defaults to the tracking store uri.
+    """
+
+    environment: dict[str, str] = {
+        server.BACKEND_STORE_URI_ENV_VAR: backend_store_uri,
+        server.REGISTRY_STORE_URI_ENV_VAR: registry_store_uri or backend_store_uri,
+        server.ARTIFACT_ROOT_ENV_VAR: default_artifact_root,
+    }
+    if serve_artifacts:
+        environment[server.SERVE_ARTIFACTS_ENV_VAR] = "true"
+    if artifacts_only:
+        environment[server.ARTIFACTS_ONLY_ENV_VAR] = "true"
+    if artifacts_destination:
+        environment[server.ARTIFACTS_DESTINATION_ENV_VAR] = artifacts_destination
+    os.environ.update(environment)
+
+
+def initialize_mlflow_stores(
+    server: ModuleType, backend_store_uri: str, default_artifact_root: str, registry_store_uri: Optional[str] = None
+) -> None:
+    """
+    Connects to the backend stores, creating or verifying the database schema.
+
+    Parameters
+    ----------
+    server: ModuleType
+        The `mlflow.server` module.
+    backend_store_uri: str
+        The tracking store uri.
+    default_artifact_root: str
+        The artifact location handed to clients for new experiments.
+    registry_store_uri: Optional[str]
+        The model registry store uri, defaults to the tracking store uri.
+    """
+
+    server.handlers.initialize_backend_stores(
+        backend_store_uri, registry_store_uri or backend_store_uri, default_artifact_root
+    )
+
+
+def reset_store_connections(server: ModuleType) -> None:
+    """
+    Drops the database connections a forked worker inherited from the process which opened the stores.
+    The connections are left open for the parent; the worker opens its own on first use.
+
+    Parameters
+    ----------
+    server: ModuleType
+        The `mlflow.server` module.
+    """
+
+    # pylint: disable=protected-access
+    for store in [server.handlers._tracking_store, server.handlers._model_registry_store]:
+        engine = getattr(store, "engine", None)
+        if engine is None:
+            continue
+        try:
+            engine.dispose(close=False)
+        except TypeError:
+            # SQLAlchemy < 1.4.33 can not leave the parent's connections open.
+            engine.dispose()
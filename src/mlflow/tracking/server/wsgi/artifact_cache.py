@@ -0,0 +1,231 @@
+""" Content addressed disk cache of proxied artifact downloads """
+
+import hashlib
+import json
+import os
+import tempfile
+import uuid
+from typing import Any, Iterable, Iterator, Optional
+
+from ..contracts.dto.artifact_stat import ArtifactStat
+from .metrics import worker_counter
+
+# Cache settings handed from the wrapper to the launched server processes.
+ARTIFACT_CACHE_ENV_VAR: str = "MLFLOW_TRACKING_SERVER_ARTIFACT_CACHE"
+
+
+def build_artifact_cache_environment(directory: str, max_bytes: int) -> dict[str, str]:
+    """
+    Builds the environment variable handing the cache settings to the launched server processes.
+
+    Parameters
+    ----------
+    directory: str
+        The cache directory shared by every server process.
+    max_bytes: int
+        The size the cached files are evicted down to.
+    """
+
+    return {ARTIFACT_CACHE_ENV_VAR: json.dumps({"directory": directory, "max_bytes": max_bytes})}
+
+
+class ArtifactCache:
+    """
+    Disk cache of downloaded artifacts, shared by every server process of the host.
+
+    * Files are stored once per content (`blobs/<sha256>`), however many runs logged the same model.
+    * Each version of an artifact (`refs/<sha256 of destination, path, size and etag>`) links to its content.  A
+      download looks up the current etag of the artifact at the destination, so a replaced artifact is fetched
+      again and never served stale.
+    * A file is only cached once downloaded whole with the expected size (and MD5 digest, where the destination
+      records it).
+    * Files are evicted least recently served first, down to `max_bytes`.
+
+    Parameters
+    ----------
+    directory: str
+        The cache directory.
+    max_bytes: int
+        The size the cached files are evicted down to; larger artifacts are not cached.
+    """
+
+    directory: str
+    max_bytes: int
+    hits: int
+    misses: int
+
+    def __init__(self, directory: str, max_bytes: int):
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be positive, received: {max_bytes}")
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        for name in ["blobs", "refs", "tmp"]:
+            os.makedirs(os.path.join(directory, name), exist_ok=True)
+        self._counter: Optional[Any] = worker_counter(
+            name="artifact_cache_requests",
+            documentation="Artifact downloads served by the artifact cache, by result (hit or miss)",
+            labels=["result"],
+        )
+
+    def _ref(self, destination: str, path: str, stat: ArtifactStat) -> str:
+        """Returns the reference of an artifact version."""
+
+        key: str = hashlib.sha256(f"{destination}\0{path}\0{stat.size}\0{stat.etag}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, "refs", key[:2], key)
+
+    def _count(self, hit: bool) -> None:
+        """Counts a hit or a miss."""
+
+        self.hits, self.misses = (self.hits + 1, self.misses) if hit else (self.hits, self.misses + 1)
+        if self._counter is not None:
+            self._counter.labels(result="hit" if hit else "miss").inc()
+
+    def lookup(self, destination: str, path: str, stat: ArtifactStat) -> Optional[str]:
+        """
+        Looks up the cached content of an artifact version, counting the hit or miss.
+
+        Parameters
+        ----------
+        destination: str
+            The artifact destination.
+        path: str
+            The artifact path.
+        stat: ArtifactStat
+            The current size and etag of the artifact at the destination.
+
+        Returns
+        -------
+            The cached file, or `None` if the version is not cached.
+        """
+
+        ref: str = self._ref(destination=destination, path=path, stat=stat)
+        try:
+            blob: str = os.path.realpath(ref, strict=True)
+            # Eviction is least recently served first.
+            os.utime(blob)
+        except OSError:
+            if os.path.islink(ref):
+                # The content was evicted.
+                os.unlink(ref)
+            self._count(hit=False)
+            return None
+        self._count(hit=True)
+        return blob
+
+    def fill(self, destination: str, path: str, stat: ArtifactStat, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Passes a download on while writing it to the cache.
+
+        Parameters
+        ----------
+        destination: str
+            The artifact destination.
+        path: str
+            The artifact path.
+        stat: ArtifactStat
+            The size and etag of the artifact at the destination.
+        chunks: Iterable[bytes]
+            The content of the artifact.
+        """
+
+        if stat.size > self.max_bytes:
+            yield from chunks
+            return
+
+        content: Any = hashlib.sha256()
+        checksum: Any = hashlib.md5(usedforsecurity=False)
+        size: int = 0
+        complete: bool = False
+        with tempfile.NamedTemporaryFile(dir=os.path.join(self.directory, "tmp"), delete=False) as temporary:
+            try:
+                for chunk in chunks:
+                    temporary.write(chunk)
+                    content.update(chunk)
+                    checksum.update(chunk)
+                    size += len(chunk)
+                    yield chunk
+                complete = True
+            finally:
+                if hasattr(chunks, "close"):
+                    chunks.close()
+                temporary.close()
+                if complete and size == stat.size and stat.md5 in [None, checksum.hexdigest()]:
+                    self._insert(
+                        ref=self._ref(destination=destination, path=path, stat=stat),
+                        digest=content.hexdigest(),
+                        temporary=temporary.name,
+                    )
+                else:
+                    # Interrupted or corrupted downloads are not cached.
+                    os.unlink(temporary.name)
+
+    def _insert(self, ref: str, digest: str, temporary: str) -> None:
+        """Stores downloaded content and links the artifact version to it."""
+
+        blob: str = os.path.join(self.directory, "blobs", digest[:2], digest)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        if os.path.exists(blob):
+            os.unlink(temporary)
+            os.utime(blob)
+        else:
+            os.replace(temporary, blob)
+
+        os.makedirs(os.path.dirname(ref), exist_ok=True)
+        # Unique per insert: threads of a worker finishing the same download link the same reference.
+        link: str = f"{ref}.{uuid.uuid4().hex}.tmp"
+        os.symlink(os.path.relpath(blob, os.path.dirname(ref)), link)
+        os.replace(link, ref)
+        self.evict()
+
+    def evict(self) -> None:
+        """Deletes the least recently served files beyond `max_bytes`, and the references to them."""
+
+        blobs: list[tuple[float, int, str]] = []
+        for root, _, names in os.walk(os.path.join(self.directory, "blobs")):
+            for name in names:
+                try:
+                    status: os.stat_result = os.stat(os.path.join(root, name))
+                except FileNotFoundError:
+                    continue
+                blobs.append((status.st_mtime, status.st_size, os.path.join(root, name)))
+
+        total: int = sum(size for _, size, _ in blobs)
+        if total <= self.max_bytes:
+            return
+        for _, size, blob in sorted(blobs):
+            if total <= self.max_bytes:
+                break
+            try:
+                # Downloads still sending the file keep reading it.
+                os.unlink(blob)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+        for root, _, names in os.walk(os.path.join(self.directory, "refs")):
+            for name in names:
+                ref: str = os.path.join(root, name)
+                if os.path.islink(ref) and not os.path.exists(ref):
+                    try:
+                        os.unlink(ref)
+                    except FileNotFoundError:
+                        pass
+
+
+def open_artifact_cache() -> Optional[ArtifactCache]:
+    """
+    Opens the artifact cache configured by the wrapper (if any) in this server process.
+
+    Returns
+    -------
+        The cache, or `None` if downloads are not cached.
+    """
+
+    settings: Optional[str] = os.environ.get(ARTIFACT_CACHE_ENV_VAR)
+    if not settings:
+        return None
+    cache: dict = json.loads(settings)
+    return ArtifactCache(directory=cache["directory"], max_bytes=cache["max_bytes"])
@@ -0,0 +1,427 @@
+""" Direct access to the artifact destination for ranged downloads and multipart uploads """
+
+import base64
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterator, Optional
+
+from ..common.uri import local_path
+from ..contracts.dto.artifact_stat import ArtifactStat
+
+# Multipart uploads are staged below this directory (local destinations) or prefix (Google Cloud Storage) of the
+# destination until they are completed.
+UPLOADS_DIRECTORY: str = ".mlflow-uploads"
+
+# Staged uploads which were neither completed nor aborted are discarded after a week, like uncommitted Azure
+# blocks are.
+UPLOAD_EXPIRY: float = 7 * 24 * 3600.0
+
+# Upload ids are generated by the server (uuid4 hex), part numbers follow the S3 limits.
+UPLOAD_ID_PATTERN: re.Pattern = re.compile(r"^[0-9a-f]{32}$")
+MAX_PART_NUMBER: int = 10000
+
+# Google Cloud Storage composes at most 32 objects at a time.
+GCS_COMPOSE_LIMIT: int = 32
+
+READ_CHUNK_SIZE: int = 1024 * 1024
+
+
+class ArtifactStore(ABC):
+    """
+    Ranged reads and multipart writes of the files below an artifact destination.
+
+    Ranges of remote files are read `concurrency` parts of `part_size` bytes at a time and passed on in order.
+
+    Parameters
+    ----------
+    part_size: int
+        Bytes read from or written to the destination per request.
+    concurrency: int
+        Parts transferred concurrently by a download.
+    """
+
+    part_size: int
+    concurrency: int
+
+    def __init__(self, part_size: int, concurrency: int):
+        self.part_size = part_size
+        self.concurrency = concurrency
+
+    @abstractmethod
+    def stat(self, path: str) -> Optional[ArtifactStat]:
+        """Returns the size and version of a file, or `None` if it is not a file (missing or a directory)."""
+
+    @abstractmethod
+    def read(self, path: str, offset: int, length: int) -> bytes:
+        """Reads `length` bytes of a file starting at `offset`."""
+
+    @abstractmethod
+    def write_part(self, path: str, upload_id: str, part_number: int, data: bytes) -> None:
+        """Stages a part of a multipart upload, replacing a previous upload of the same part."""
+
+    @abstractmethod
+    def parts(self, path: str, upload_id: str) -> dict[int, int]:
+        """Returns the size of each staged part of a multipart upload by part number."""
+
+    @abstractmethod
+    def complete(self, path: str, upload_id: str, part_numbers: list[int]) -> None:
+        """Assembles the staged parts, in order, into the file (empty without parts) and discards the upload."""
+
+    @abstractmethod
+    def abort(self, path: str, upload_id: str) -> None:
+        """Discards the staged parts of a multipart upload."""
+
+    @abstractmethod
+    def delete(self, path: str) -> None:
+        """Deletes a file, if it exists."""
+
+    def stream(self, path: str, offset: int, length: int) -> Iterator[bytes]:
+        """
+        Streams a range of a file, reading up to `concurrency` parts ahead.
+
+        Parameters
+        ----------
+        path: str
+            The file, relative to the destination.
+        offset: int
+            The first byte of the range.
+        length: int
+            The length of the range.
+        """
+
+        ends: int = offset + length
+        starts: Iterator[int] = iter(range(offset, ends, self.part_size))
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="artifact-read") as pool:
+            pending: list[Future] = []
+            try:
+                for start in starts:
+                    pending.append(pool.submit(self.read, path, start, min(self.part_size, ends - start)))
+                    if len(pending) < self.concurrency:
+                        continue
+                    yield pending.pop(0).result()
+                while pending:
+                    yield pending.pop(0).result()
+            finally:
+                # The client went away: parts not started yet are not read.
+                for future in pending:
+                    future.cancel()
+
+
+class LocalArtifactStore(ArtifactStore):
+    """
+    Artifacts in a local (or mounted) directory.  Parts are staged below the destination, so completing an upload
+    only concatenates files on the same file system.
+
+    Parameters
+    ----------
+    root: str
+        The destination directory.
+    part_size: int
+        Bytes read from or written to the destination per request.
+    concurrency: int
+        Parts transferred concurrently by a download.
+    """
+
+    root: str
+
+    def __init__(self, root: str, part_size: int, concurrency: int):
+        super().__init__(part_size=part_size, concurrency=concurrency)
+        self.root = root
+
+    def _staging(self, upload_id: str) -> str:
+        return os.path.join(self.root, UPLOADS_DIRECTORY, upload_id)
+
+    def stat(self, path: str) -> Optional[ArtifactStat]:
+        target: str = os.path.join(self.root, path)
+        if not os.path.isfile(target):
+            return None
+        status: os.stat_result = os.stat(target)
+        return ArtifactStat(size=status.st_size, etag=f"{status.st_mtime_ns:x}-{status.st_size:x}")
+
+    def read(self, path: str, offset: int, length: int) -> bytes:
+        with open(os.path.join(self.root, path), "rb") as file:
+            file.seek(offset)
+            return file.read(length)
+
+    def stream(self, path: str, offset: int, length: int) -> Iterator[bytes]:
+        # Local reads are sequential, concurrency would only add seeks.
+        with open(os.path.join(self.root, path), "rb") as file:
+            file.seek(offset)
+            while length > 0:
+                chunk: bytes = file.read(min(READ_CHUNK_SIZE, length))
+                if not chunk:
+                    return
+                length -= len(chunk)
+                yield chunk
+
+    def expire_uploads(self) -> None:
+        """Discards staged uploads which were last written to more than `UPLOAD_EXPIRY` seconds ago."""
+
+        uploads: str = os.path.join(self.root, UPLOADS_DIRECTORY)
+        if not os.path.isdir(uploads):
+            return
+        cutoff: float = time.time() - UPLOAD_EXPIRY
+        for upload_id in os.listdir(uploads):
+            staging: str = os.path.join(uploads, upload_id)
+            try:
+                if os.path.getmtime(staging) < cutoff:
+                    shutil.rmtree(staging, ignore_errors=True)
+            except FileNotFoundError:
+                pass
+
+    def write_part(self, path: str, upload_id: str, part_number: int, data: bytes) -> None:
+        staging: str = self._staging(upload_id=upload_id)
+        os.makedirs(staging, exist_ok=True)
+        # Written aside (to a file of its own per upload of the part) and renamed, so a retried or concurrent
+        # upload of the part never leaves a torn part.
+        descriptor, temporary = tempfile.mkstemp(dir=staging, prefix=f"{part_number:05d}.", suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary, os.path.join(staging, f"{part_number:05d}"))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def parts(self, path: str, upload_id: str) -> dict[int, int]:
+        staging: str = self._staging(upload_id=upload_id)
+        if not os.path.isdir(staging):
+            return {}
+        return {
+            int(name): os.path.getsize(os.path.join(staging, name)) for name in os.listdir(staging) if name.isdigit()
+        }
+
+    def complete(self, path: str, upload_id: str, part_numbers: list[int]) -> None:
+        staging: str = self._staging(upload_id=upload_id)
+        target: str = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        assembled: str = os.path.join(staging, "assembled")
+        with open(assembled, "wb") as output:
+            for part_number in part_numbers:
+                with open(os.path.join(staging, f"{part_number:05d}"), "rb") as part:
+                    shutil.copyfileobj(part, output, READ_CHUNK_SIZE)
+        os.replace(assembled, target)
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def abort(self, path: str, upload_id: str) -> None:
+        shutil.rmtree(self._staging(upload_id=upload_id), ignore_errors=True)
+
+    def delete(self, path: str) -> None:
+        try:
+            os.remove(os.path.join(self.root, path))
+        except FileNotFoundError:
+            pass
+
+
+class AzureBlobArtifactStore(ArtifactStore):
+    """
+    Artifacts in an Azure Blob Storage container.  Parts are staged as uncommitted blocks of the blob itself and
+    committed as a block list, so completing an upload copies nothing; Azure discards uncommitted blocks after a
+    week.
+
+    Parameters
+    ----------
+    container: Any
+        The `azure.storage.blob.ContainerClient` of the destination.
+    prefix: str
+        The path of the destination within the container.
+    part_size: int
+        Bytes read from or written to the destination per request.
+    concurrency: int
+        Parts transferred concurrently by a download.
+    """
+
+    def __init__(self, container: Any, prefix: str, part_size: int, concurrency: int):
+        super().__init__(part_size=part_size, concurrency=concurrency)
+        self.container = container
+        self.prefix = prefix
+
+    def _blob(self, path: str) -> Any:
+        return self.container.get_blob_client(posixpath.join(self.prefix, path))
+
+    @staticmethod
+    def _block_id(upload_id: str, part_number: int) -> str:
+        # Block ids of a blob must all have the same length.
+        return f"{upload_id}-{part_number:05d}"
+
+    def stat(self, path: str) -> Optional[ArtifactStat]:
+        # pylint: disable=import-outside-toplevel
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            properties: Any = self._blob(path=path).get_blob_properties()
+        except ResourceNotFoundError:
+            return None
+        # Only set for blobs uploaded in a single request.
+        md5: Optional[bytes] = properties.content_settings.content_md5
+        return ArtifactStat(
+            size=properties.size, etag=properties.etag.strip('"'), md5=bytes(md5).hex() if md5 else None
+        )
+
+    def read(self, path: str, offset: int, length: int) -> bytes:
+        return self._blob(path=path).download_blob(offset=offset, length=length).readall()
+
+    def write_part(self, path: str, upload_id: str, part_number: int, data: bytes) -> None:
+        self._blob(path=path).stage_block(block_id=self._block_id(upload_id, part_number), data=data)
+
+    def parts(self, path: str, upload_id: str) -> dict[int, int]:
+        # pylint: disable=import-outside-toplevel
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            _, uncommitted = self._blob(path=path).get_block_list(block_list_type="uncommitted")
+        except ResourceNotFoundError:
+            return {}
+        return {
+            int(block.id.rsplit("-", 1)[1]): block.size for block in uncommitted if block.id.startswith(f"{upload_id}-")
+        }
+
+    def complete(self, path: str, upload_id: str, part_numbers: list[int]) -> None:
+        # pylint: disable=import-outside-toplevel
+        from azure.storage.blob import BlobBlock
+
+        self._blob(path=path).commit_block_list(
+            [BlobBlock(block_id=self._block_id(upload_id, part_number)) for part_number in part_numbers]
+        )
+
+    def abort(self, path: str, upload_id: str) -> None:
+        # Uncommitted blocks can not be deleted, Azure discards them.
+        pass
+
+    def delete(self, path: str) -> None:
+        # pylint: disable=import-outside-toplevel
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            self._blob(path=path).delete_blob()
+        except ResourceNotFoundError:
+            pass
+
+
+class GCSArtifactStore(ArtifactStore):
+    """
+    Artifacts in a Google Cloud Storage bucket.  Parts are staged as objects below `UPLOADS_DIRECTORY` and composed
+    into the object when the upload is completed (a copy within the bucket); add a lifecycle rule deleting that
+    prefix after a week to discard abandoned uploads.
+
+    Parameters
+    ----------
+    bucket: Any
+        The `google.cloud.storage.Bucket` of the destination.
+    prefix: str
+        The path of the destination within the bucket.
+    part_size: int
+        Bytes read from or written to the destination per request.
+    concurrency: int
+        Parts transferred concurrently by a download.
+    """
+
+    def __init__(self, bucket: Any, prefix: str, part_size: int, concurrency: int):
+        super().__init__(part_size=part_size, concurrency=concurrency)
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _staging(self, upload_id: str) -> str:
+        return posixpath.join(self.prefix, UPLOADS_DIRECTORY, upload_id) + "/"
+
+    def stat(self, path: str) -> Optional[ArtifactStat]:
+        blob: Any = self.bucket.get_blob(posixpath.join(self.prefix, path))
+        if blob is None:
+            return None
+        # Composed objects have no MD5 hash.
+        return ArtifactStat(
+            size=blob.size, etag=blob.etag, md5=base64.b64decode(blob.md5_hash).hex() if blob.md5_hash else None
+        )
+
+    def read(self, path: str, offset: int, length: int) -> bytes:
+        return self.bucket.blob(posixpath.join(self.prefix, path)).download_as_bytes(
+            start=offset, end=offset + length - 1
+        )
+
+    def write_part(self, path: str, upload_id: str, part_number: int, data: bytes) -> None:
+        self.bucket.blob(f"{self._staging(upload_id=upload_id)}{part_number:05d}").upload_from_string(data)
+
+    def parts(self, path: str, upload_id: str) -> dict[int, int]:
+        staging: str = self._staging(upload_id=upload_id)
+        return {
+            int(blob.name[len(staging) :]): blob.size
+            for blob in self.bucket.list_blobs(prefix=staging)
+            if blob.name[len(staging) :].isdigit()
+        }
+
+    def complete(self, path: str, upload_id: str, part_numbers: list[int]) -> None:
+        staging: str = self._staging(upload_id=upload_id)
+        target: Any = self.bucket.blob(posixpath.join(self.prefix, path))
+        sources: list[Any] = [self.bucket.blob(f"{staging}{part_number:05d}") for part_number in part_numbers]
+        if not sources:
+            target.upload_from_string(b"")
+            return
+        # Composed 32 objects at a time, the target being the first source of every later round.
+        target.compose(sources[:GCS_COMPOSE_LIMIT])
+        for start in range(GCS_COMPOSE_LIMIT, len(sources), GCS_COMPOSE_LIMIT - 1):
+            target.compose([target] + sources[start : start + GCS_COMPOSE_LIMIT - 1])
+        self.abort(path=path, upload_id=upload_id)
+
+    def abort(self, path: str, upload_id: str) -> None:
+        for blob in self.bucket.list_blobs(prefix=self._staging(upload_id=upload_id)):
+            blob.delete()
+
+    def delete(self, path: str) -> None:
+        blob: Any = self.bucket.get_blob(posixpath.join(self.prefix, path))
+        if blob is not None:
+            blob.delete()
+
+
+def open_artifact_store(destination: str, part_size: int, concurrency: int) -> Optional[ArtifactStore]:
+    """
+    Opens the artifact destination of the mlflow server for direct transfers.  Remote destinations reuse the
+    clients (and credentials) of mlflow's artifact repositories.
+
+    Parameters
+    ----------
+    destination: str
+        The artifact destination (a local path, `wasbs://` or `gs://` uri).
+    part_size: int
+        Bytes read from or written to the destination per request.
+    concurrency: int
+        Parts transferred concurrently by a download.
+
+    Returns
+    -------
+        The store, or `None` if the destination does not support direct transfers (e.g. S3), in which case
+        mlflow serves every transfer.
+    """
+
+    root: Optional[str] = local_path(destination)
+    if root is not None:
+        return LocalArtifactStore(root=root, part_size=part_size, concurrency=concurrency)
+
+    # pylint: disable=import-outside-toplevel
+    if destination.startswith("wasbs://"):
+        from mlflow.store.artifact.azure_blob_artifact_repo import AzureBlobArtifactRepository
+
+        container, _, prefix, _ = AzureBlobArtifactRepository.parse_wasbs_uri(destination)
+        client: Any = AzureBlobArtifactRepository(destination).client
+        return AzureBlobArtifactStore(
+            container=client.get_container_client(container),
+            prefix=prefix,
+            part_size=part_size,
+            concurrency=concurrency,
+        )
+    if destination.startswith("gs://"):
+        from mlflow.store.artifact.gcs_artifact_repo import GCSArtifactRepository
+
+        bucket, prefix = GCSArtifactRepository.parse_gcs_uri(destination)
+        return GCSArtifactStore(
+            bucket=GCSArtifactRepository(destination).client.bucket(bucket),
+            prefix=prefix,
+            part_size=part_size,
+            concurrency=concurrency,
+        )
+    return None
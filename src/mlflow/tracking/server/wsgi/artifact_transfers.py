@@ -0,0 +1,436 @@
+""" Ranged, parallel and resumable multipart transfers of proxied artifacts """
+
+import json
+import mimetypes
+import os
+import pathlib
+import posixpath
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional
+from urllib.parse import parse_qs
+
+from ..contracts.dto.artifact_stat import ArtifactStat
+from ..proxy.router import artifact_endpoint
+from .artifact_cache import ArtifactCache, open_artifact_cache
+from .artifact_stores import (
+    MAX_PART_NUMBER,
+    READ_CHUNK_SIZE,
+    UPLOAD_ID_PATTERN,
+    UPLOADS_DIRECTORY,
+    ArtifactStore,
+    LocalArtifactStore,
+    open_artifact_store,
+)
+
+# Transfer settings handed from the wrapper to the launched server processes.
+ARTIFACT_TRANSFERS_ENV_VAR: str = "MLFLOW_TRACKING_SERVER_ARTIFACT_TRANSFERS"
+
+# Set by `mlflow server` (and the embedded launch) in the server processes.
+SERVE_ARTIFACTS_ENV_VAR: str = "_MLFLOW_SERVER_SERVE_ARTIFACTS"
+ARTIFACTS_DESTINATION_ENV_VAR: str = "_MLFLOW_SERVER_ARTIFACT_DESTINATION"
+
+MEBIBYTE: int = 1024 * 1024
+
+# Extensions mlflow serves as `text/plain` (mlflow.utils.mime_type_utils).
+TEXT_EXTENSIONS: list[str] = [
+    "txt", "log", "err", "cfg", "conf", "cnf", "cf", "ini", "properties", "prop", "hocon", "toml", "yaml", "yml",
+    "xml", "json", "js", "py", "py3", "csv", "tsv", "md", "rst", "MLmodel", "mlproject",
+]  # fmt: skip
+
+
+def build_artifact_transfer_environment(part_size: int, concurrency: int) -> dict[str, str]:
+    """
+    Builds the environment variable handing the transfer settings to the launched server processes.
+
+    Parameters
+    ----------
+    part_size: int
+        Bytes per part of multipart uploads and parallel downloads.
+    concurrency: int
+        Parts transferred concurrently per download and upload.
+    """
+
+    return {ARTIFACT_TRANSFERS_ENV_VAR: json.dumps({"part_size": part_size, "concurrency": concurrency})}
+
+
+def safe_artifact_path(path: str) -> Optional[str]:
+    """
+    Checks an artifact path like mlflow's `validate_path_is_safe` does.
+
+    Parameters
+    ----------
+    path: str
+        The artifact path of the request.
+
+    Returns
+    -------
+        The path, or `None` if it escapes the destination, is a uri or points into the staged uploads.
+    """
+
+    if not path or "\\" in path or pathlib.PurePosixPath(path).is_absolute():
+        return None
+    parts: list[str] = path.split("/")
+    if ":" in parts[0] or ".." in parts or parts[0] == UPLOADS_DIRECTORY:
+        return None
+    return path
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Parses a single `bytes` range of a `Range` header.
+
+    Parameters
+    ----------
+    header: str
+        The header value, e.g. `bytes=0-1023`, `bytes=1024-` or `bytes=-512`.
+    size: int
+        The size of the file.
+
+    Returns
+    -------
+        The offset and length of the range, or `None` if the header is not a single byte range (the whole file is
+        sent then).
+
+    Raises
+    ------
+    ValueError
+        If the range lies beyond the end of the file.
+    """
+
+    unit, _, ranges = header.partition("=")
+    if unit.strip() != "bytes" or "," in ranges:
+        return None
+    first, _, last = ranges.strip().partition("-")
+    if not (first.isdigit() or first == "") or not (last.isdigit() or last == "") or first == last == "":
+        return None
+    if first and last and int(last) < int(first):
+        return None
+    if first == "":
+        # The last `last` bytes.
+        start, end = max(size - int(last), 0), size - 1 if int(last) else -1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(f"unsatisfiable range: {header}")
+    return start, end - start + 1
+
+
+def _guess_mime_type(path: str) -> str:
+    """Guesses the content type of an artifact like mlflow does."""
+
+    name: str = posixpath.basename(path)
+    extension: str = os.path.splitext(name)[-1].replace(".", "") or name
+    if extension in TEXT_EXTENSIONS:
+        return "text/plain"
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def _respond(start_response: Callable, status: str, payload: dict) -> list[bytes]:
+    """Answers with a JSON body."""
+
+    body: bytes = json.dumps(payload).encode("utf-8")
+    start_response(status, [("Content-Type", "application/json"), ("Content-Length", str(len(body)))])
+    return [body]
+
+
+def _invalid(start_response: Callable, message: str) -> list[bytes]:
+    """Answers with an mlflow style `INVALID_PARAMETER_VALUE` error."""
+
+    return _respond(start_response, "400 BAD REQUEST", {"error_code": "INVALID_PARAMETER_VALUE", "message": message})
+
+
+def _send_file(environ: dict, path: str, offset: int, length: int) -> Iterable[bytes]:
+    """Sends a range of a local file, with `sendfile` where the server supports it."""
+
+    file: Any = open(path, "rb")  # pylint: disable=consider-using-with
+    file.seek(offset)
+    if "wsgi.file_wrapper" in environ and offset + length == os.fstat(file.fileno()).st_size:
+        # Sent from the current position to the end of the file (gunicorn uses sendfile).
+        return environ["wsgi.file_wrapper"](file, READ_CHUNK_SIZE)
+
+    def chunks() -> Iterator[bytes]:
+        remaining: int = length
+        with file:
+            while remaining > 0:
+                chunk: bytes = file.read(min(READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+
+    return chunks()
+
+
+def _read_exactly(stream: Any, size: int) -> bytes:
+    """Reads `size` bytes of a request body, fewer only at its end."""
+
+    chunks: list[bytes] = []
+    remaining: int = size
+    while remaining > 0:
+        chunk: bytes = stream.read(min(remaining, MEBIBYTE))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+# pylint: disable=too-few-public-methods,too-many-instance-attributes
+class ArtifactTransfers:
+    """
+    WSGI middleware transferring proxied artifacts directly between clients and the artifact destination, instead
+    of through a temporary file and a single stream as mlflow does:
+
+    * Downloads honour `Range` requests (so clients can fetch parts in parallel and resume) and read remote files
+      `concurrency` parts ahead.
+    * Uploads (`PUT`) are sent on to the destination a part at a time, `concurrency` parts in flight.
+    * Resumable multipart uploads, on the artifact path itself (S3 style):
+
+      * `POST ...?uploads` starts an upload and returns its `upload_id`, `part_size` and `concurrency`.
+      * `PUT ...?upload_id=<id>&part_number=<n>` uploads a part (of at most `part_size` bytes), parts may be sent
+        concurrently and retried.
+      * `GET ...?upload_id=<id>` lists the parts received so far, so an interrupted upload can resume.
+      * `POST ...?upload_id=<id>` assembles parts 1 to n into the artifact.
+      * `DELETE ...?upload_id=<id>` discards the upload.
+
+    Downloads carry the `ETag` of the artifact version (answering `If-None-Match` with 304) and, with a `cache`,
+    are served from local disk once downloaded.  Listings, directories and destinations without direct access
+    (e.g. S3) are served by mlflow.
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+    destination: str
+        The artifact destination of the server.
+    part_size: int
+        Bytes per part of multipart uploads and parallel downloads.
+    concurrency: int
+        Parts transferred concurrently per download and upload.
+    store_factory: Callable[..., Optional[ArtifactStore]]
+        Opens the destination, defaults to `open_artifact_store`.
+    cache: Optional[ArtifactCache]
+        If provided, whole downloads are cached on local disk and cached files are served from there.
+    """
+
+    part_size: int
+    concurrency: int
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        application: Callable,
+        destination: str,
+        *,
+        part_size: int = 16 * MEBIBYTE,
+        concurrency: int = 8,
+        store_factory: Callable[..., Optional[ArtifactStore]] = open_artifact_store,
+        cache: Optional[ArtifactCache] = None,
+    ):
+        if part_size < MEBIBYTE:
+            raise ValueError(f"part_size must be at least {MEBIBYTE} bytes, received: {part_size}")
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be positive, received: {concurrency}")
+
+        self.application = application
+        self.destination = destination
+        self.part_size = part_size
+        self.concurrency = concurrency
+        self._store_factory = store_factory
+        self.cache = cache
+        self._stores: dict[str, Optional[ArtifactStore]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _open(self) -> Optional[ArtifactStore]:
+        """Opens the destination on first use (in the worker, after the fork)."""
+
+        with self._lock:
+            if self.destination not in self._stores:
+                self._stores[self.destination] = self._store_factory(self.destination, self.part_size, self.concurrency)
+            return self._stores[self.destination]
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        path: Optional[str] = artifact_endpoint(path=environ.get("PATH_INFO", ""))
+        store: Optional[ArtifactStore] = self._open() if path else None
+        artifact: Optional[str] = safe_artifact_path(path=path) if path and store else None
+        if artifact is None:
+            return self.application(environ, start_response)
+
+        method: str = environ.get("REQUEST_METHOD", "GET").upper()
+        query: dict[str, list[str]] = parse_qs(environ.get("QUERY_STRING", ""), keep_blank_values=True)
+        if "upload_id" in query:
+            return self._multipart(environ, start_response, store, artifact)
+        if "uploads" in query and method == "POST":
+            if isinstance(store, LocalArtifactStore):
+                store.expire_uploads()
+            return _respond(
+                start_response,
+                "200 OK",
+                {"upload_id": uuid.uuid4().hex, "part_size": self.part_size, "concurrency": self.concurrency},
+            )
+        if method == "GET":
+            return self._download(environ, start_response, store, artifact)
+        if method == "PUT":
+            self._upload(environ=environ, store=store, artifact=artifact)
+            return _respond(start_response, "200 OK", {})
+        return self.application(environ, start_response)
+
+    def _download(
+        self, environ: dict, start_response: Callable, store: ArtifactStore, artifact: str
+    ) -> Iterable[bytes]:
+        """Sends a file, or the requested range of it."""
+
+        stat: Optional[ArtifactStat] = store.stat(path=artifact)
+        if stat is None:
+            # Missing files and directories are answered by mlflow.
+            return self.application(environ, start_response)
+
+        etag: str = f'"{stat.etag}"'
+        if etag in [tag.strip() for tag in environ.get("HTTP_IF_NONE_MATCH", "").split(",")]:
+            start_response("304 NOT MODIFIED", [("ETag", etag)])
+            return [b""]
+        headers: list[tuple[str, str]] = [
+            ("Content-Type", _guess_mime_type(path=artifact)),
+            ("Content-Disposition", f"attachment; filename={posixpath.basename(artifact)}"),
+            ("X-Content-Type-Options", "nosniff"),
+            ("Accept-Ranges", "bytes"),
+            ("ETag", etag),
+        ]
+        try:
+            requested: Optional[tuple[int, int]] = parse_range(header=environ.get("HTTP_RANGE", ""), size=stat.size)
+        except ValueError:
+            start_response("416 RANGE NOT SATISFIABLE", [("Content-Range", f"bytes */{stat.size}")])
+            return [b""]
+
+        offset, length = requested if requested is not None else (0, stat.size)
+        cached: Optional[str] = (
+            self.cache.lookup(destination=self.destination, path=artifact, stat=stat) if self.cache else None
+        )
+        if self.cache:
+            headers.append(("X-MLflow-Cache", "miss" if cached is None else "hit"))
+        headers.append(("Content-Length", str(length)))
+        if requested is None:
+            start_response("200 OK", headers)
+        else:
+            headers.append(("Content-Range", f"bytes {offset}-{offset + length - 1}/{stat.size}"))
+            start_response("206 PARTIAL CONTENT", headers)
+
+        if cached is not None:
+            return _send_file(environ=environ, path=cached, offset=offset, length=length)
+        chunks: Iterable[bytes] = store.stream(path=artifact, offset=offset, length=length)
+        if self.cache and requested is None:
+            return self.cache.fill(destination=self.destination, path=artifact, stat=stat, chunks=chunks)
+        return chunks
+
+    def _parts(self, stream: Any) -> Iterator[bytes]:
+        """Splits a request body into parts."""
+
+        while True:
+            part: bytes = _read_exactly(stream=stream, size=self.part_size)
+            if not part:
+                return
+            yield part
+            if len(part) < self.part_size:
+                return
+
+    def _upload(self, environ: dict, store: ArtifactStore, artifact: str) -> None:
+        """Sends an uploaded file on to the destination a part at a time, while the next parts are received."""
+
+        upload_id: str = uuid.uuid4().hex
+        part_numbers: list[int] = []
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="artifact-write") as pool:
+            pending: list[Future] = []
+            try:
+                for part_number, part in enumerate(self._parts(stream=environ["wsgi.input"]), start=1):
+                    pending.append(pool.submit(store.write_part, artifact, upload_id, part_number, part))
+                    part_numbers.append(part_number)
+                    # Bounds the parts held in memory.
+                    while len(pending) >= self.concurrency:
+                        pending.pop(0).result()
+                while pending:
+                    pending.pop(0).result()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                store.abort(path=artifact, upload_id=upload_id)
+                raise
+        store.complete(path=artifact, upload_id=upload_id, part_numbers=part_numbers)
+
+    # pylint: disable=too-many-return-statements
+    def _multipart(
+        self, environ: dict, start_response: Callable, store: ArtifactStore, artifact: str
+    ) -> Iterable[bytes]:
+        """Serves the requests of a multipart upload."""
+
+        method: str = environ.get("REQUEST_METHOD", "GET").upper()
+        query: dict[str, list[str]] = parse_qs(environ.get("QUERY_STRING", ""), keep_blank_values=True)
+        upload_id: str = query["upload_id"][0]
+        if not UPLOAD_ID_PATTERN.match(upload_id):
+            return _invalid(start_response, f"invalid upload id: {upload_id}")
+
+        if method == "PUT":
+            try:
+                part_number: int = int(query.get("part_number", [""])[0])
+                length: int = int(environ.get("CONTENT_LENGTH") or -1)
+            except ValueError:
+                return _invalid(start_response, "part_number and Content-Length must be integers")
+            if not 1 <= part_number <= MAX_PART_NUMBER:
+                return _invalid(start_response, f"part_number must be between 1 and {MAX_PART_NUMBER}")
+            if not 0 <= length <= self.part_size:
+                return _invalid(start_response, f"parts must have a Content-Length of at most {self.part_size}")
+            data: bytes = _read_exactly(stream=environ["wsgi.input"], size=length)
+            if len(data) != length:
+                return _invalid(start_response, f"part {part_number} ended after {len(data)} of {length} bytes")
+            store.write_part(path=artifact, upload_id=upload_id, part_number=part_number, data=data)
+            return _respond(start_response, "200 OK", {"part_number": part_number, "size": length})
+
+        if method == "GET":
+            parts: dict[int, int] = store.parts(path=artifact, upload_id=upload_id)
+            return _respond(
+                start_response,
+                "200 OK",
+                {"parts": [{"part_number": number, "size": parts[number]} for number in sorted(parts)]},
+            )
+
+        if method == "POST":
+            received: list[int] = sorted(store.parts(path=artifact, upload_id=upload_id))
+            if not received or received != list(range(1, len(received) + 1)):
+                return _invalid(start_response, f"upload {upload_id} is missing parts, received: {received}")
+            store.complete(path=artifact, upload_id=upload_id, part_numbers=received)
+            return _respond(start_response, "200 OK", {})
+
+        if method == "DELETE":
+            store.abort(path=artifact, upload_id=upload_id)
+            return _respond(start_response, "200 OK", {})
+        return self.application(environ, start_response)
+
+
+def apply_artifact_transfers(application: Callable) -> Callable:
+    """
+    Wraps this server process' application with direct artifact transfers, if enabled by the wrapper and this
+    process serves artifacts.
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+
+    Returns
+    -------
+        The application, wrapped by `ArtifactTransfers` if transfers are enabled.
+    """
+
+    settings: Optional[str] = os.environ.get(ARTIFACT_TRANSFERS_ENV_VAR)
+    destination: Optional[str] = os.environ.get(ARTIFACTS_DESTINATION_ENV_VAR)
+    if not settings or os.environ.get(SERVE_ARTIFACTS_ENV_VAR) != "true" or not destination:
+        return application
+    transfers: dict = json.loads(settings)
+    return ArtifactTransfers(
+        application=application,
+        destination=destination,
+        part_size=transfers["part_size"],
+        concurrency=transfers["concurrency"],
+        cache=open_artifact_cache(),
+    )
@@ -0,0 +1,40 @@
+""" Buffering of WSGI request and response bodies """
+
+import io
+from typing import Iterable
+
+
+def read_body(environ: dict) -> bytes:
+    """
+    Reads the body of a request and puts it back, so the application can read it again.
+
+    Parameters
+    ----------
+    environ: dict
+        The WSGI environment of the request.
+    """
+
+    try:
+        length: int = int(environ.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        length = 0
+    body: bytes = environ["wsgi.input"].read(length) if length > 0 else b""
+    environ["wsgi.input"] = io.BytesIO(body)
+    return body
+
+
+def drain(result: Iterable[bytes]) -> bytes:
+    """
+    Produces the whole body of a response and closes the application iterable.
+
+    Parameters
+    ----------
+    result: Iterable[bytes]
+        The iterable returned by the WSGI application.
+    """
+
+    try:
+        return b"".join(result)
+    finally:
+        if hasattr(result, "close"):
+            result.close()
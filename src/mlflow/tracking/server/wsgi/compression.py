@@ -0,0 +1,197 @@
+""" Response compression negotiated by `Accept-Encoding` """
+
+import json
+import os
+import zlib
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, responses are then gzip compressed
+    brotli = None
+
+# Compression settings handed from the wrapper to the launched server processes.
+COMPRESSION_ENV_VAR: str = "MLFLOW_TRACKING_SERVER_COMPRESSION"
+
+# Content types worth compressing: API responses and the UI bundle.
+COMPRESSIBLE_TYPES: list[str] = ["application/json", "application/javascript", "text/", "image/svg+xml"]
+
+# Brotli quality for responses compressed on the fly (11 is meant for static assets compressed once).
+BROTLI_QUALITY: int = 4
+
+
+def build_compression_environment(minimum_size: int, level: int) -> dict[str, str]:
+    """
+    Builds the environment variable handing the compression settings to the launched server processes.
+
+    Parameters
+    ----------
+    minimum_size: int
+        Responses of a known smaller size are sent uncompressed.
+    level: int
+        The gzip compression level (1-9).
+    """
+
+    return {COMPRESSION_ENV_VAR: json.dumps({"minimum_size": minimum_size, "level": level})}
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Selects the response encoding from an `Accept-Encoding` header, preferring brotli (when installed) over gzip.
+
+    Parameters
+    ----------
+    accept_encoding: str
+        The header value, e.g. `gzip, deflate, br`.
+
+    Returns
+    -------
+        `br`, `gzip` or `None` if the client accepts neither.
+    """
+
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, parameters = item.strip().partition(";")
+        quality: float = 1.0
+        if parameters.strip().startswith("q="):
+            try:
+                quality = float(parameters.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+
+    wildcard: float = accepted.get("*", 0.0)
+    for encoding in ["br", "gzip"] if brotli is not None else ["gzip"]:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def _compressible(status: str, headers: list, minimum_size: int) -> bool:
+    """Checks whether a response is worth compressing."""
+
+    if status[:3] in ["204", "206", "304"]:
+        return False
+    values: dict[str, str] = {name.lower(): value for name, value in headers}
+    if "content-encoding" in values:
+        return False
+    if not any(values.get("content-type", "").startswith(content_type) for content_type in COMPRESSIBLE_TYPES):
+        return False
+    try:
+        return int(values.get("content-length", minimum_size)) >= minimum_size
+    except ValueError:
+        return True
+
+
+class _Compressor:
+    """Streaming gzip or brotli compressor."""
+
+    def __init__(self, encoding: str, level: int):
+        self._brotli: Optional[Any] = brotli.Compressor(quality=BROTLI_QUALITY) if encoding == "br" else None
+        # wbits 31: gzip container
+        self._gzip: Optional[Any] = zlib.compressobj(level, zlib.DEFLATED, 31) if encoding == "gzip" else None
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Compresses a chunk, returning the output available so far."""
+
+        return self._brotli.process(chunk) if self._brotli is not None else self._gzip.compress(chunk)
+
+    def finish(self) -> bytes:
+        """Returns the remaining output."""
+
+        return self._brotli.finish() if self._brotli is not None else self._gzip.flush()
+
+
+# pylint: disable=too-few-public-methods
+class Compression:
+    """
+    WSGI middleware compressing responses with gzip or brotli, as negotiated by the `Accept-Encoding` of the
+    request.  Bodies are compressed as they are produced, so streamed responses stay streamed (chunked) and
+    are never held in memory in full.
+
+    Only compressible content types are compressed; range requests, responses which are already encoded and
+    responses of a known size below `minimum_size` are sent as they are.
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+    minimum_size: int
+        Responses of a known smaller size are sent uncompressed (compression would not pay off).
+    level: int
+        The gzip compression level (1-9).
+    """
+
+    minimum_size: int
+    level: int
+
+    def __init__(self, application: Callable, minimum_size: int = 1024, level: int = 6):
+        if minimum_size < 0:
+            raise ValueError(f"minimum_size must not be negative, received: {minimum_size}")
+        if not 1 <= level <= 9:
+            raise ValueError(f"level must be between 1 and 9, received: {level}")
+
+        self.application = application
+        self.minimum_size = minimum_size
+        self.level = level
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        encoding: Optional[str] = negotiate_encoding(accept_encoding=environ.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None or environ.get("REQUEST_METHOD") == "HEAD" or "HTTP_RANGE" in environ:
+            return self.application(environ, start_response)
+
+        decision: dict[str, bool] = {}
+
+        def negotiate(status: str, headers: list, exc_info: Any = None) -> Callable:
+            decision["compress"] = _compressible(status=status, headers=headers, minimum_size=self.minimum_size)
+            if decision["compress"]:
+                headers = [(name, value) for name, value in headers if name.lower() != "content-length"]
+                headers.extend([("Content-Encoding", encoding), ("Vary", "Accept-Encoding")])
+            return start_response(status, headers, exc_info)
+
+        result: Iterable[bytes] = self.application(environ, negotiate)
+        if decision.get("compress") is False:
+            # Left untouched, e.g. so file downloads keep using the server's file wrapper.
+            return result
+        return self._compress(result=result, encoding=encoding, decision=decision)
+
+    def _compress(self, result: Iterable[bytes], encoding: str, decision: dict[str, bool]) -> Iterator[bytes]:
+        """Compresses the body of a response once the application decided to send it compressed."""
+
+        compressor: _Compressor = _Compressor(encoding=encoding, level=self.level)
+        try:
+            for chunk in result:
+                # start_response is called by the time the first chunk is produced.
+                if not decision["compress"]:
+                    yield chunk
+                    continue
+                compressed: bytes = compressor.compress(chunk)
+                if compressed:
+                    yield compressed
+            if decision.get("compress"):
+                yield compressor.finish()
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+
+
+def apply_compression(application: Callable) -> Callable:
+    """
+    Wraps this server process' application with the response compression configured by the wrapper (if any).
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+
+    Returns
+    -------
+        The application, wrapped by `Compression` if compression is enabled.
+    """
+
+    settings: Optional[str] = os.environ.get(COMPRESSION_ENV_VAR)
+    if not settings:
+        return application
+    compression: dict = json.loads(settings)
+    return Compression(application=application, minimum_size=compression["minimum_size"], level=compression["level"])
@@ -0,0 +1,47 @@
+""" Serves a WSGI application with gunicorn's Python API """
+
+from typing import Any
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.config import KNOWN_SETTINGS
+
+
+# pylint: disable=abstract-method
+class MLFlowGunicornApplication(BaseApplication):
+    """
+    Runs gunicorn in the current interpreter for an application which is already loaded, instead of launching
+    a `gunicorn` process which imports it again.  With `preload_app` set, workers are forked from the loaded
+    application and start serving immediately.
+
+    Parameters
+    ----------
+    application: Any
+        The WSGI application to serve.
+    options: dict[str, Any]
+        Gunicorn settings (https://docs.gunicorn.org/en/stable/settings.html), keyed by setting name.
+    """
+
+    application: Any
+    options: dict[str, Any]
+
+    def __init__(self, application: Any, options: dict[str, Any]):
+        # Unknown settings are rejected rather than silently ignored.
+        known: set[str] = {setting.name for setting in KNOWN_SETTINGS}
+        unknown: list[str] = sorted(name for name in options if name not in known)
+        if unknown:
+            raise ValueError(f"unknown gunicorn settings: {', '.join(unknown)}")
+
+        self.application = application
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        """Applies the settings."""
+
+        for name, value in self.options.items():
+            self.cfg.set(name, value)
+
+    def load(self) -> Any:
+        """Returns the already loaded application."""
+
+        return self.application
@@ -0,0 +1,46 @@
+""" Gunicorn configuration for `mlflow server` processes (`--config python:<this module>`) """
+
+import os
+
+from ..common.metrics import MULTIPROCESS_DIR_ENV_VAR
+from .metric_buffer import close_metric_buffers, start_metric_buffers
+from .metrics import instrument_application, mark_worker_dead
+from .middleware import apply_middleware
+from .sqlite_tuning import close_single_writers
+
+
+def on_starting(_arbiter) -> None:
+    """
+    Imports the metrics exporter in the master before workers start: imported lazily by `child_exit`, the import
+    could be interrupted by the exit of the next worker at shutdown and fail half initialized.
+    """
+
+    if os.environ.get(MULTIPROCESS_DIR_ENV_VAR):
+        # pylint: disable=import-outside-toplevel,unused-import
+        import prometheus_client.multiprocess
+
+
+def post_worker_init(worker) -> None:
+    """
+    Prepares the mlflow application once a worker loaded it, before it serves requests: instruments it with
+    per route request metrics (when metrics are exported) and applies the middleware enabled by the wrapper.
+    """
+
+    if os.environ.get(MULTIPROCESS_DIR_ENV_VAR):
+        instrument_application(application=worker.wsgi)
+    worker.wsgi = apply_middleware(application=worker.wsgi)
+    start_metric_buffers()
+
+
+def worker_exit(_arbiter, _worker) -> None:
+    """Writes the metrics buffered by an exiting worker to the store and releases its writer lock file."""
+
+    close_metric_buffers()
+    close_single_writers()
+
+
+def child_exit(_arbiter, worker) -> None:
+    """Cleans up the metric files of an exited worker."""
+
+    if os.environ.get(MULTIPROCESS_DIR_ENV_VAR):
+        mark_worker_dead(pid=worker.pid)
@@ -0,0 +1,387 @@
+""" Metric histories archived as Parquet files below the artifact destination """
+
+import json
+import math
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import parse_qs
+
+from ..contracts.dto.artifact_stat import ArtifactStat
+from ..proxy.router import api_endpoint
+from .artifact_stores import ArtifactStore, open_artifact_store
+from .metric_history import query_metric_history, serialize_metric_history
+
+# The artifact destination whose archived histories the launched server processes serve.
+METRIC_ARCHIVE_ENV_VAR: str = "MLFLOW_TRACKING_SERVER_METRIC_ARCHIVE"
+
+# Archives are stored below this directory (prefix) of the artifact destination, one file per run.
+ARCHIVE_DIRECTORY: str = ".mlflow-metric-archive"
+
+ARCHIVE_COMPRESSION: str = "zstd"
+
+# Rows per row group; archives are sorted by metric key, so reading a metric skips the groups of other keys.
+ARCHIVE_ROW_GROUP_SIZE: int = 65536
+
+# Bytes written to or read from remote destinations per request.
+ARCHIVE_PART_SIZE: int = 16 * 1024 * 1024
+
+# Bytes of archive files kept in memory by each server process, least recently read evicted first.
+ARCHIVE_CACHE_SIZE: int = 64 * 1024 * 1024
+
+# Limits of the `metrics/get-history-bulk` endpoint of mlflow.
+MAX_HISTORY_RESULTS: int = 25000
+MAX_RUN_IDS_PER_REQUEST: int = 20
+
+
+def archive_path(run_id: str) -> str:
+    """
+    Returns the path of the archive of a run, relative to the artifact destination.
+
+    Parameters
+    ----------
+    run_id: str
+        The run.
+    """
+
+    # Sharded by the leading characters of the run id, so no directory (prefix) holds every archive.
+    return f"{ARCHIVE_DIRECTORY}/{run_id[:2]}/{run_id}.parquet"
+
+
+def _schema() -> Any:
+    """Returns the schema of archives, the columns of the `metrics` table of mlflow."""
+
+    # pylint: disable=import-outside-toplevel
+    import pyarrow
+
+    return pyarrow.schema(
+        [
+            ("key", pyarrow.string()),
+            ("value", pyarrow.float64()),
+            ("timestamp", pyarrow.int64()),
+            ("step", pyarrow.int64()),
+            ("is_nan", pyarrow.bool_()),
+        ]
+    )
+
+
+class MetricArchive:
+    """
+    The archived metric histories of runs: one Parquet file (zstd compressed, sorted by metric key, timestamp and
+    step) per run below `ARCHIVE_DIRECTORY` of the artifact destination.
+
+    * Writing the archive of a run which already has one merges both, so archiving a run twice (e.g. after an
+      interrupted archival) never duplicates or loses metrics.
+    * Reads are cached in memory up to `cache_size` bytes, validated against the etag of the file.
+
+    Parameters
+    ----------
+    store: ArtifactStore
+        The artifact destination.
+    cache_size: int
+        Bytes of archive files kept in memory.
+    """
+
+    store: ArtifactStore
+    cache_size: int
+
+    def __init__(self, store: ArtifactStore, cache_size: int = ARCHIVE_CACHE_SIZE):
+        self.store = store
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+        self._cached: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def stat(self, run_id: str) -> Optional[ArtifactStat]:
+        """Returns the size and version of the archive of a run, or `None` if the run has none."""
+
+        return self.store.stat(path=archive_path(run_id=run_id))
+
+    def _load(self, run_id: str) -> Optional[bytes]:
+        """Returns the content of the archive of a run, from the cache if it is current."""
+
+        stat: Optional[ArtifactStat] = self.stat(run_id=run_id)
+        with self._lock:
+            cached: Optional[tuple[str, bytes]] = self._cache.pop(run_id, None)
+            if cached is not None:
+                self._cached -= len(cached[1])
+        if stat is None:
+            return None
+        data: Optional[bytes] = cached[1] if cached is not None and cached[0] == stat.etag else None
+        if data is None:
+            data = self.store.read(path=archive_path(run_id=run_id), offset=0, length=stat.size)
+        with self._lock:
+            if len(data) <= self.cache_size and run_id not in self._cache:
+                self._cache[run_id] = (stat.etag, data)
+                self._cached += len(data)
+                while self._cached > self.cache_size:
+                    _, (_, evicted) = self._cache.popitem(last=False)
+                    self._cached -= len(evicted)
+        return data
+
+    @staticmethod
+    def _decode(data: bytes, metric_key: Optional[str] = None) -> Any:
+        """Decodes an archive, only the row groups which may hold `metric_key` if provided."""
+
+        # pylint: disable=import-outside-toplevel
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.parquet
+
+        parquet: Any = pyarrow.parquet.ParquetFile(pyarrow.BufferReader(data))
+        if metric_key is None:
+            return parquet.read(use_threads=False)
+        column: int = parquet.schema_arrow.get_field_index("key")
+        groups: list[int] = []
+        for group in range(parquet.num_row_groups):
+            statistics: Any = parquet.metadata.row_group(group).column(column).statistics
+            if statistics is None or not statistics.has_min_max or statistics.min <= metric_key <= statistics.max:
+                groups.append(group)
+        table: Any = parquet.read_row_groups(groups, use_threads=False) if groups else _schema().empty_table()
+        return table.filter(pyarrow.compute.equal(table["key"], metric_key))  # pylint: disable=no-member
+
+    def history(self, run_id: str, metric_key: str) -> Optional[list[tuple]]:
+        """
+        Reads the archived history of a metric.
+
+        Parameters
+        ----------
+        run_id: str
+            The run.
+        metric_key: str
+            The metric.
+
+        Returns
+        -------
+            The `(key, value, timestamp, step)` of each archived value, or `None` if the run has no archive.
+        """
+
+        data: Optional[bytes] = self._load(run_id=run_id)
+        if data is None:
+            return None
+        table: Any = MetricArchive._decode(data=data, metric_key=metric_key)
+        return [
+            (row["key"], math.nan if row["is_nan"] else row["value"], row["timestamp"], row["step"])
+            for row in table.to_pylist()
+        ]
+
+    def write(self, run_id: str, columns: dict[str, list]) -> int:
+        """
+        Archives metrics of a run, merged with its existing archive.
+
+        Parameters
+        ----------
+        run_id: str
+            The run.
+        columns: dict[str, list]
+            The `key`, `value`, `timestamp`, `step` and `is_nan` of each metric, by column.
+
+        Returns
+        -------
+            The size of the written archive.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import pyarrow
+        import pyarrow.parquet
+
+        table: Any = pyarrow.table(columns, schema=_schema())
+        existing: Optional[bytes] = self._load(run_id=run_id)
+        if existing is not None:
+            table = pyarrow.concat_tables([MetricArchive._decode(data=existing), table])
+        names: list[str] = list(table.column_names)
+        table = (
+            table.group_by(names)
+            .aggregate([])
+            .select(names)
+            .sort_by([("key", "ascending"), ("timestamp", "ascending"), ("step", "ascending")])
+        )
+        output: Any = pyarrow.BufferOutputStream()
+        pyarrow.parquet.write_table(
+            table, output, compression=ARCHIVE_COMPRESSION, row_group_size=ARCHIVE_ROW_GROUP_SIZE
+        )
+        data: bytes = output.getvalue().to_pybytes()
+
+        path: str = archive_path(run_id=run_id)
+        upload_id: str = uuid.uuid4().hex
+        part_size: int = self.store.part_size
+        part_numbers: list[int] = list(range(1, (len(data) + part_size - 1) // part_size + 1))
+        try:
+            for part_number in part_numbers:
+                start: int = (part_number - 1) * part_size
+                self.store.write_part(
+                    path=path, upload_id=upload_id, part_number=part_number, data=data[start : start + part_size]
+                )
+            self.store.complete(path=path, upload_id=upload_id, part_numbers=part_numbers)
+        except Exception:
+            self.store.abort(path=path, upload_id=upload_id)
+            raise
+        return len(data)
+
+    def delete(self, run_id: str) -> None:
+        """Deletes the archive of a run, if it has one."""
+
+        self.store.delete(path=archive_path(run_id=run_id))
+        with self._lock:
+            cached: Optional[tuple[str, bytes]] = self._cache.pop(run_id, None)
+            if cached is not None:
+                self._cached -= len(cached[1])
+
+
+def query_archived_runs(run_ids: list[str], metric_key: str) -> Optional[list[str]]:
+    """
+    Finds the runs whose history of a metric was archived: the database still records its latest value
+    (`latest_metrics`) but no longer its history (`metrics`).
+
+    Parameters
+    ----------
+    run_ids: list[str]
+        The runs.
+    metric_key: str
+        The metric.
+
+    Returns
+    -------
+        The archived runs, or `None` if the store is not database backed.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from mlflow.server.handlers import _get_tracking_store
+    from mlflow.store.tracking.dbmodels.models import SqlLatestMetric, SqlMetric
+    from mlflow.store.tracking.sqlalchemy_store import SqlAlchemyStore
+
+    store: Any = _get_tracking_store()
+    if not isinstance(store, SqlAlchemyStore):
+        return None
+    with store.ManagedSessionMaker() as session:
+        history = session.query(SqlMetric.run_uuid).filter(
+            SqlMetric.run_uuid == SqlLatestMetric.run_uuid, SqlMetric.key == metric_key
+        )
+        query = session.query(SqlLatestMetric.run_uuid).filter(
+            SqlLatestMetric.run_uuid.in_(run_ids), SqlLatestMetric.key == metric_key, ~history.exists()
+        )
+        return [row.run_uuid for row in query]
+
+
+# pylint: disable=too-few-public-methods
+class ArchivedMetricHistory:
+    """
+    WSGI middleware serving archived metric histories back: `metrics/get-history` and `metrics/get-history-bulk`
+    (the charts of the UI) requests for metrics whose history was archived are answered from the archive, with
+    the body mlflow would send had the history stayed in the database.
+
+    Finding archived runs costs a single indexed query per request; requests for histories which were not
+    archived are served by mlflow.
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+    archive: MetricArchive
+        The archived histories.
+    archived: Callable[[list[str], str], Optional[list[str]]]
+        Finds the runs whose history of a metric was archived, defaults to `query_archived_runs`.
+    history: Callable[[str, str], Optional[Iterable[tuple]]]
+        Reads the history of a metric which was not archived, defaults to `query_metric_history`.
+    """
+
+    def __init__(
+        self,
+        application: Callable,
+        archive: MetricArchive,
+        archived: Callable[[list[str], str], Optional[list[str]]] = query_archived_runs,
+        history: Callable[[str, str], Optional[Iterable[tuple]]] = query_metric_history,
+    ):
+        self.application = application
+        self.archive = archive
+        self.archived = archived
+        self.history = history
+
+    def _history(self, run_id: str, metric_key: str) -> Optional[Iterable[bytes]]:
+        """Serves the archived history of a metric of a run, or returns `None` if it was not archived."""
+
+        if not self.archived([run_id], metric_key):
+            return None
+        metrics: Optional[list[tuple]] = self.archive.history(run_id=run_id, metric_key=metric_key)
+        return None if metrics is None else serialize_metric_history(metrics=metrics)
+
+    def _history_bulk(self, run_ids: list[str], metric_key: str, max_results: int) -> Optional[Iterable[bytes]]:
+        """Serves the histories of a metric of runs if any was archived, or returns `None`."""
+
+        archived: list[str] = self.archived(run_ids, metric_key) or []
+        if not archived:
+            return None
+        metrics: list[dict] = []
+        for run_id in sorted(run_ids):
+            rows: Optional[Iterable[tuple]] = (
+                self.archive.history(run_id=run_id, metric_key=metric_key)
+                if run_id in archived
+                else self.history(run_id, metric_key)
+            )
+            ordered: list[tuple] = sorted(rows or [], key=lambda row: (row[2], row[3], row[1]))
+            metrics.extend(
+                {"key": key, "value": value, "timestamp": timestamp, "step": step, "run_id": run_id}
+                for key, value, timestamp, step in ordered[:max_results]
+            )
+        # Encoded like the `jsonify` responses of mlflow.
+        return [(json.dumps({"metrics": metrics}, separators=(",", ":"), sort_keys=True) + "\n").encode("utf-8")]
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        endpoint: Optional[str] = api_endpoint(path=environ.get("PATH_INFO", ""))
+        if environ.get("REQUEST_METHOD", "GET").upper() != "GET" or endpoint not in [
+            "metrics/get-history",
+            "metrics/get-history-bulk",
+        ]:
+            return self.application(environ, start_response)
+
+        parameters: dict[str, list[str]] = parse_qs(environ.get("QUERY_STRING", ""))
+        metric_key: Optional[str] = (parameters.get("metric_key") or [None])[0]
+        run_ids: list[str] = parameters.get("run_id") or parameters.get("run_uuid") or []
+        if not metric_key or not run_ids:
+            return self.application(environ, start_response)
+        try:
+            if endpoint == "metrics/get-history":
+                body: Optional[Iterable[bytes]] = self._history(run_id=run_ids[0], metric_key=metric_key)
+            elif len(run_ids) <= MAX_RUN_IDS_PER_REQUEST:
+                max_results: int = min(
+                    int((parameters.get("max_results") or [MAX_HISTORY_RESULTS])[0]), MAX_HISTORY_RESULTS
+                )
+                body = self._history_bulk(run_ids=run_ids, metric_key=metric_key, max_results=max_results)
+            else:
+                body = None
+        except Exception:  # pylint: disable=broad-exception-caught
+            # mlflow reports invalid requests and failing queries.
+            body = None
+        if body is None:
+            return self.application(environ, start_response)
+
+        start_response("200 OK", [("Content-Type", "application/json")])
+        return body
+
+
+def apply_metric_archive(application: Callable) -> Callable:
+    """
+    Wraps this server process' application with archived metric history serving, if enabled by the wrapper.
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+
+    Returns
+    -------
+        The application, wrapped by `ArchivedMetricHistory` if the artifact destination holding the archives
+        supports direct access.
+    """
+
+    destination: Optional[str] = os.environ.get(METRIC_ARCHIVE_ENV_VAR)
+    if not destination:
+        return application
+    store: Optional[ArtifactStore] = open_artifact_store(
+        destination=destination, part_size=ARCHIVE_PART_SIZE, concurrency=1
+    )
+    if store is None:
+        return application
+    return ArchivedMetricHistory(application=application, archive=MetricArchive(store=store))
@@ -0,0 +1,550 @@
+""" Write-coalescing buffer for the metric logging endpoints of the mlflow tracking server """
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from ..proxy.router import api_endpoint
+from .buffering import read_body
+from .metrics import worker_counter
+from .read_cache import READ_CACHE_ENV_VAR, InvalidationLog
+
+# Buffer settings handed from the wrapper to the launched server processes.
+METRIC_BUFFER_ENV_VAR: str = "MLFLOW_TRACKING_SERVER_METRIC_BUFFER"
+
+BUFFERED_ENDPOINTS: list[str] = ["runs/log-metric", "runs/log-batch"]
+
+# Metrics mlflow accepts per `log_batch` call.
+MAX_METRICS_PER_BATCH: int = 1000
+
+# Runs each worker remembers as accepting metrics.
+KNOWN_RUNS: int = 10000
+
+# Errors of metrics which will never be accepted (e.g. the run was deleted); others (e.g. the database is
+# unreachable) are retried.
+PERMANENT_ERRORS: list[str] = ["INVALID_PARAMETER_VALUE", "RESOURCE_DOES_NOT_EXIST", "INVALID_STATE"]
+
+# The buffers of this process.
+_BUFFERS: list["MetricBuffer"] = []
+
+
+def build_metric_buffer_environment(directory: str, max_latency: float, max_pending: int) -> dict[str, str]:
+    """
+    Builds the environment variable handing the buffer settings to the launched server processes.
+
+    Parameters
+    ----------
+    directory: str
+        The journal directory shared by every server process.
+    max_latency: float
+        Seconds a buffered metric waits at most before it is written to the store.
+    max_pending: int
+        Metrics each worker buffers at most.
+    """
+
+    return {
+        METRIC_BUFFER_ENV_VAR: json.dumps(
+            {"directory": directory, "max_latency": max_latency, "max_pending": max_pending}
+        )
+    }
+
+
+def validate_metric(key: Any, value: float, timestamp: int, step: int) -> bool:
+    """
+    Checks a metric the way mlflow does when logging it (e.g. the key is a valid metric name).
+
+    Parameters
+    ----------
+    key: Any
+        The metric key.
+    value: float
+        The metric value.
+    timestamp: int
+        The metric timestamp, in milliseconds since the epoch.
+    step: int
+        The metric step.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from mlflow.exceptions import MlflowException
+    from mlflow.utils.validation import _validate_metric
+
+    try:
+        _validate_metric(key, value, timestamp, step)
+    except MlflowException:
+        return False
+    return True
+
+
+def log_metrics(run_id: str, metrics: list[list]) -> None:
+    """
+    Writes metrics of a run to the tracking store of the mlflow server, in a single batch.
+
+    Parameters
+    ----------
+    run_id: str
+        The run.
+    metrics: list[list]
+        The `[key, value, timestamp, step]` metrics.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from mlflow.entities import Metric
+    from mlflow.server.handlers import _get_tracking_store
+
+    _get_tracking_store().log_batch(
+        run_id=run_id,
+        metrics=[
+            Metric(key=key, value=value, timestamp=timestamp, step=step) for key, value, timestamp, step in metrics
+        ],
+        params=[],
+        tags=[],
+    )
+
+
+def _requested_metrics(endpoint: str, payload: Any) -> Optional[list]:
+    """Returns the metrics of a logging request for a run, if it only logs metrics."""
+
+    if not isinstance(payload, dict) or not isinstance(payload.get("run_id") or payload.get("run_uuid"), str):
+        return None
+    if endpoint == "runs/log-metric":
+        return [payload]
+    if payload.get("params") or payload.get("tags"):
+        return None
+    requested: Any = payload.get("metrics")
+    if not isinstance(requested, list) or not 0 < len(requested) <= MAX_METRICS_PER_BATCH:
+        return None
+    return requested
+
+
+def parse_metrics(endpoint: str, body: bytes) -> Optional[tuple[str, list[list]]]:
+    """
+    Extracts the metrics of a logging request which can be buffered.
+
+    Parameters
+    ----------
+    endpoint: str
+        The REST endpoint, `runs/log-metric` or `runs/log-batch`.
+    body: bytes
+        The JSON request body.
+
+    Returns
+    -------
+        The run id and its `[key, value, timestamp, step]` metrics, or `None` if the request must be served by
+        mlflow: batches with params or tags, and invalid requests (mlflow reports the error).
+    """
+
+    try:
+        payload: Any = json.loads(body)
+    except ValueError:
+        return None
+    requested: Optional[list] = _requested_metrics(endpoint=endpoint, payload=payload)
+    if requested is None:
+        return None
+
+    metrics: list[list] = []
+    for metric in requested:
+        try:
+            key, value, timestamp = metric["key"], float(metric["value"]), int(metric["timestamp"])
+            step: int = int(metric.get("step") or 0)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+        if not validate_metric(key=key, value=value, timestamp=timestamp, step=step):
+            return None
+        metrics.append([key, value, timestamp, step])
+    run_id: str = payload.get("run_id") or payload.get("run_uuid")
+    return run_id, metrics
+
+
+def _process_alive(pid: int) -> bool:
+    """Checks whether a process exists."""
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# pylint: disable=too-many-instance-attributes
+class MetricBuffer:
+    """
+    WSGI middleware acknowledging metric logging requests (`runs/log-metric`, and `runs/log-batch` without params
+    or tags) once they are appended to a journal file and synced to disk, and writing them to the store from a
+    background thread in one batched insert per run every `max_latency` seconds (or as soon as a full batch is
+    pending).
+
+    * Journals survive crashes of the worker or server: the journals of dead workers are replayed by the next
+      worker starting.  Replays are idempotent, mlflow skips metrics already logged.
+    * Journals also survive crashes of the host: a request is acknowledged once its metrics are `fsync`ed.  Syncs
+      are group commits, requests appended while a sync is running share the next one, so a request waits for at
+      most two syncs and the disk syncs once per burst of concurrent requests rather than once per request.
+    * At most `max_pending` metrics are buffered per worker; beyond it requests are served by mlflow directly.
+    * The first request for each run is served by mlflow, so unknown or deleted runs are reported to clients.
+      Metrics rejected by the store later (e.g. the run was deleted meanwhile) are dropped and counted.
+    * Reads see buffered metrics once they are written, within `max_latency` seconds.
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+    directory: str
+        The journal directory shared by every server process.
+    max_latency: float
+        Seconds a buffered metric waits at most before it is written to the store.
+    max_pending: int
+        Metrics buffered at most.
+    writer: Callable[[str, list[list]], None]
+        Writes a batch of metrics of a run to the store, defaults to `log_metrics`.
+    invalidations: Optional[InvalidationLog]
+        If provided, the read cache entries of runs are invalidated once their metrics are written.
+    """
+
+    directory: Path
+    max_latency: float
+    max_pending: int
+    buffered: int
+    flushed: int
+    dropped: int
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        application: Callable,
+        directory: str,
+        *,
+        max_latency: float = 1.0,
+        max_pending: int = 100000,
+        writer: Callable[[str, list[list]], None] = log_metrics,
+        invalidations: Optional[InvalidationLog] = None,
+    ):
+        if max_latency <= 0:
+            raise ValueError(f"max_latency must be positive, received: {max_latency}")
+        if max_pending < 1:
+            raise ValueError(f"max_pending must be positive, received: {max_pending}")
+
+        self.application = application
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_latency = max_latency
+        self.max_pending = max_pending
+        self.writer = writer
+        self.invalidations = invalidations
+        self.buffered = 0
+        self.flushed = 0
+        self.dropped = 0
+        self._condition: threading.Condition = threading.Condition()
+        self._known_runs: OrderedDict[str, None] = OrderedDict()
+        self._pid: Optional[int] = None
+        self._sequence: int = 0
+        self._journal: Optional[Any] = None
+        self._pending: int = 0
+        # Appends to the journals, and the appends synced to disk (at most one sync runs at a time).
+        self._appended: int = 0
+        self._synced: int = 0
+        self._sync_lock: threading.Lock = threading.Lock()
+        # Journals to write to the store, in order, and the pending metrics each accounts for.
+        self._backlog: list[tuple[Path, int]] = []
+        self._closed: bool = False
+        self._writer: Optional[threading.Thread] = None
+        self._counter: Optional[Any] = worker_counter(
+            name="metric_buffer_metrics",
+            documentation="Metrics of the write buffer, by result (buffered, flushed or dropped)",
+            labels=["result"],
+        )
+        _BUFFERS.append(self)
+
+    def _count(self, result: str, metrics: int) -> None:
+        """Counts buffered, flushed or dropped metrics."""
+
+        setattr(self, result, getattr(self, result) + metrics)
+        if self._counter is not None:
+            self._counter.labels(result=result).inc(metrics)
+
+    def _open_journal(self) -> None:
+        """Starts a new journal of this process."""
+
+        self._sequence += 1
+        # The journal stays open until it is rotated by the writer.
+        self._journal = open(  # pylint: disable=consider-using-with
+            self.directory / f"{self._pid}.{self._sequence}.journal", "a", encoding="utf-8"
+        )
+        # The journal itself must survive a crash of the host, not only what is appended to it.
+        directory: int = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+    def _recover(self) -> None:
+        """Claims the journals of dead processes, which are replayed first."""
+
+        for journal in sorted(self.directory.glob("*.journal")):
+            try:
+                pid: int = int(journal.name.split(".")[0])
+            except ValueError:
+                continue
+            if pid == self._pid or _process_alive(pid=pid):
+                continue
+            self._sequence += 1
+            # Named as a journal of this process, so it is recovered again if this process dies before replaying it.
+            claimed: Path = self.directory / f"{self._pid}.{self._sequence}.journal"
+            try:
+                # Only one of the workers starting concurrently claims each journal.
+                os.rename(journal, claimed)
+            except FileNotFoundError:
+                continue
+            print(f"Replaying buffered metrics of exited process {pid} from {journal}", flush=True)
+            self._backlog.append((claimed, 0))
+
+    def start(self) -> None:
+        """Starts buffering in this process (once per process, e.g. in each forked worker)."""
+
+        with self._condition:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._pending = 0
+            self._appended = 0
+            self._synced = 0
+            # Not inherited: a thread of the parent process may have held it when forking.
+            self._sync_lock = threading.Lock()
+            self._backlog = []
+            self._closed = False
+            self._recover()
+            self._open_journal()
+            self._writer = threading.Thread(target=self._write_continuously, name="metric-buffer", daemon=True)
+            self._writer.start()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Writes the buffered metrics to the store and stops buffering.  Metrics which could not be written remain
+        in their journal and are replayed by the next worker starting.
+
+        Parameters
+        ----------
+        timeout: Optional[float]
+            Seconds to wait for the writer at most.
+        """
+
+        with self._condition:
+            if self._pid != os.getpid() or self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._writer.join(timeout=timeout)
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        endpoint: Optional[str] = api_endpoint(path=environ.get("PATH_INFO", ""))
+        if endpoint not in BUFFERED_ENDPOINTS or environ.get("REQUEST_METHOD", "GET").upper() != "POST":
+            return self.application(environ, start_response)
+
+        parsed: Optional[tuple[str, list[list]]] = parse_metrics(endpoint=endpoint, body=read_body(environ=environ))
+        if parsed is None:
+            return self.application(environ, start_response)
+        run_id, metrics = parsed
+        if run_id not in self._known_runs:
+            return self._serve_first(run_id=run_id, environ=environ, start_response=start_response)
+        if not self._append(run_id=run_id, metrics=metrics):
+            return self.application(environ, start_response)
+
+        start_response("200 OK", [("Content-Type", "application/json"), ("Content-Length", "2")])
+        return [b"{}"]
+
+    def _serve_first(self, run_id: str, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        """Serves the first request for a run through mlflow, remembering the run if it accepted the metrics."""
+
+        def capture(status: str, headers: list, exc_info: Any = None) -> Callable:
+            if status.startswith("200"):
+                with self._condition:
+                    self._known_runs[run_id] = None
+                    while len(self._known_runs) > KNOWN_RUNS:
+                        self._known_runs.popitem(last=False)
+            return start_response(status, headers, exc_info)
+
+        return self.application(environ, capture)
+
+    def _append(self, run_id: str, metrics: list[list]) -> bool:
+        """
+        Appends metrics to the journal and syncs it to disk.
+
+        Returns
+        -------
+            `False` if the buffer is full or closed.
+        """
+
+        self.start()
+        lines: str = "".join(json.dumps([run_id, *metric]) + "\n" for metric in metrics)
+        with self._condition:
+            if self._closed or self._pending + len(metrics) > self.max_pending:
+                return False
+            self._journal.write(lines)
+            self._journal.flush()
+            self._appended += 1
+            appended: int = self._appended
+            self._pending += len(metrics)
+            if self._pending >= MAX_METRICS_PER_BATCH:
+                self._condition.notify_all()
+            self._count(result="buffered", metrics=len(metrics))
+        self._sync(appended=appended)
+        return True
+
+    def _sync(self, appended: int) -> None:
+        """
+        Syncs the journal to disk, unless a sync started after the given append already did (group commit).
+
+        Parameters
+        ----------
+        appended: int
+            The append which must be synced.
+        """
+
+        with self._sync_lock:
+            if self._synced >= appended:
+                return
+            with self._condition:
+                through: int = self._appended
+                if self._journal.closed:
+                    # Closed by the writer, which synced every append first.
+                    self._synced = through
+                    return
+                # Duplicated, so the writer can rotate (and close) the journal while it is synced.
+                descriptor: int = os.dup(self._journal.fileno())
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+            self._synced = through
+
+    def _rotate(self) -> None:
+        """Queues the current journal for writing and starts a new one (called holding the condition)."""
+
+        journal: Path = Path(self._journal.name)
+        # Appends which are not synced yet are synced with the journal they were appended to.
+        os.fsync(self._journal.fileno())
+        self._journal.close()
+        self._backlog.append((journal, self._pending - sum(pending for _, pending in self._backlog)))
+        self._open_journal()
+
+    def _write_continuously(self) -> None:
+        """Writes the journals to the store every `max_latency` seconds until the buffer is closed."""
+
+        while True:
+            with self._condition:
+                queued: int = sum(pending for _, pending in self._backlog)
+                self._condition.wait_for(
+                    lambda: self._closed or self._pending - queued >= MAX_METRICS_PER_BATCH,
+                    timeout=self.max_latency,
+                )
+                if self._pending > sum(pending for _, pending in self._backlog):
+                    self._rotate()
+                closed: bool = self._closed
+                backlog: list[tuple[Path, int]] = list(self._backlog)
+
+            for journal, pending in backlog:
+                if not self._replay(journal=journal):
+                    # The store is unavailable, retried after `max_latency`.
+                    break
+                journal.unlink()
+                with self._condition:
+                    self._backlog.remove((journal, pending))
+                    self._pending -= pending
+
+            if closed:
+                with self._condition:
+                    os.fsync(self._journal.fileno())
+                    self._journal.close()
+                    if os.path.getsize(self._journal.name) == 0:
+                        os.remove(self._journal.name)
+                return
+
+    def _replay(self, journal: Path) -> bool:
+        """
+        Writes the metrics of a journal to the store, in one batch per run and at most `MAX_METRICS_PER_BATCH`.
+
+        Returns
+        -------
+            `False` if the store was unavailable; the journal is then replayed again.
+        """
+
+        runs: dict[str, list[list]] = {}
+        with open(journal, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    run_id, key, value, timestamp, step = json.loads(line)
+                except ValueError:
+                    # The last line of a worker killed while appending.
+                    continue
+                runs.setdefault(run_id, []).append([key, value, timestamp, step])
+
+        for run_id, metrics in runs.items():
+            for start in range(0, len(metrics), MAX_METRICS_PER_BATCH):
+                batch: list[list] = metrics[start : start + MAX_METRICS_PER_BATCH]
+                try:
+                    self.writer(run_id, batch)
+                except Exception as error:  # pylint: disable=broad-exception-caught
+                    if getattr(error, "error_code", None) not in PERMANENT_ERRORS:
+                        print(f"Writing buffered metrics failed, retrying: {error!r}", flush=True)
+                        return False
+                    print(f"Dropping {len(batch)} buffered metrics of run {run_id}: {error}", flush=True)
+                    self._count(result="dropped", metrics=len(batch))
+                    continue
+                self._count(result="flushed", metrics=len(batch))
+            if self.invalidations is not None:
+                self.invalidations.touch(scopes=["runs", f"run:{run_id}"])
+        return True
+
+
+def apply_metric_buffer(application: Callable) -> Callable:
+    """
+    Wraps this server process' application with the metric buffer configured by the wrapper (if any), and
+    starts buffering.
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+
+    Returns
+    -------
+        The application, wrapped by `MetricBuffer` if buffering is enabled.
+    """
+
+    settings: Optional[str] = os.environ.get(METRIC_BUFFER_ENV_VAR)
+    if not settings:
+        return application
+    buffer: dict = json.loads(settings)
+    cache: Optional[str] = os.environ.get(READ_CACHE_ENV_VAR)
+    return MetricBuffer(
+        application=application,
+        directory=buffer["directory"],
+        max_latency=buffer["max_latency"],
+        max_pending=buffer["max_pending"],
+        invalidations=InvalidationLog(directory=json.loads(cache)["directory"]) if cache else None,
+    )
+
+
+def start_metric_buffers() -> None:
+    """Starts the metric buffers of this process, e.g. in a forked worker."""
+
+    for buffer in _BUFFERS:
+        buffer.start()
+
+
+def close_metric_buffers(timeout: Optional[float] = None) -> None:
+    """
+    Writes the buffered metrics of this process to the store, e.g. when a worker exits.
+
+    Parameters
+    ----------
+    timeout: Optional[float]
+        Seconds to wait for each buffer at most.
+    """
+
+    for buffer in _BUFFERS:
+        buffer.close(timeout=timeout)
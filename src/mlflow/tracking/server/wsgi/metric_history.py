@@ -0,0 +1,163 @@
+""" Streamed metric histories """
+
+import itertools
+import json
+import math
+import os
+from typing import Any, Callable, Iterable, Iterator, Optional
+from urllib.parse import parse_qs
+
+from ..proxy.router import api_endpoint
+
+# Enables streaming in the launched server processes.
+STREAM_METRIC_HISTORY_ENV_VAR: str = "MLFLOW_TRACKING_SERVER_STREAM_METRIC_HISTORY"
+
+# Metrics fetched from the database and serialized at a time.
+HISTORY_BATCH_SIZE: int = 1000
+
+
+def query_metric_history(run_id: str, metric_key: str) -> Optional[Iterator[tuple]]:
+    """
+    Reads the history of a metric from the database of the mlflow server in batches, instead of loading it whole.
+
+    Parameters
+    ----------
+    run_id: str
+        The run.
+    metric_key: str
+        The metric.
+
+    Returns
+    -------
+        The `(key, value, timestamp, step)` of each logged value, or `None` if the store is not database backed.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from mlflow.server.handlers import _get_tracking_store
+    from mlflow.store.tracking.dbmodels.models import SqlMetric
+    from mlflow.store.tracking.sqlalchemy_store import SqlAlchemyStore
+
+    store: Any = _get_tracking_store()
+    if not isinstance(store, SqlAlchemyStore):
+        return None
+
+    def rows() -> Iterator[tuple]:
+        with store.ManagedSessionMaker() as session:
+            query = session.query(SqlMetric).filter_by(run_uuid=run_id, key=metric_key)
+            for row in query.yield_per(HISTORY_BATCH_SIZE):
+                yield row.key, math.nan if row.is_nan else row.value, row.timestamp, row.step
+
+    return rows()
+
+
+def _json_value(value: float) -> Any:
+    """Encodes a metric value like protobuf JSON does (non finite values as strings)."""
+
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "Infinity" if value > 0 else "-Infinity"
+    return value
+
+
+def serialize_metric_history(metrics: Iterable[tuple]) -> Iterator[bytes]:
+    """
+    Serializes a metric history as the `metrics/get-history` response of mlflow, a batch of metrics at a time.
+
+    Parameters
+    ----------
+    metrics: Iterable[tuple]
+        The `(key, value, timestamp, step)` of each logged value.
+    """
+
+    batch: list[str] = []
+    started: bool = False
+    for key, value, timestamp, step in metrics:
+        batch.append(
+            json.dumps({"key": key, "value": _json_value(float(value)), "timestamp": timestamp, "step": step}, indent=2)
+        )
+        if len(batch) >= HISTORY_BATCH_SIZE:
+            yield _history_chunk(batch=batch, first=not started)
+            started, batch = True, []
+    if batch:
+        yield _history_chunk(batch=batch, first=not started)
+        started = True
+    # mlflow omits empty repeated fields.
+    yield b"\n  ]\n}" if started else b"{}"
+
+
+def _history_chunk(batch: list[str], first: bool) -> bytes:
+    """Serializes a batch of metrics as a part of the `metrics` array."""
+
+    # Metrics are indented as elements of the `metrics` array of the response.
+    body: str = ",\n".join("    " + metric.replace("\n", "\n    ") for metric in batch)
+    return (('{\n  "metrics": [\n' if first else ",\n") + body).encode("utf-8")
+
+
+# pylint: disable=too-few-public-methods
+class StreamedMetricHistory:
+    """
+    WSGI middleware serving `metrics/get-history` requests for whole histories from the database as a stream:
+    metrics are read and serialized a batch at a time, so the memory of a worker stays bounded whatever the
+    length of a training run.  The response body is the one mlflow would send.
+
+    Paginated requests, requests mlflow rejects and stores which are not database backed are served by mlflow.
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+    history: Callable[[str, str], Optional[Iterator[tuple]]]
+        Reads the history of a metric of a run, defaults to `query_metric_history`.
+    """
+
+    def __init__(
+        self,
+        application: Callable,
+        history: Callable[[str, str], Optional[Iterator[tuple]]] = query_metric_history,
+    ):
+        self.application = application
+        self.history = history
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        if (
+            environ.get("REQUEST_METHOD", "GET").upper() != "GET"
+            or api_endpoint(path=environ.get("PATH_INFO", "")) != "metrics/get-history"
+        ):
+            return self.application(environ, start_response)
+
+        parameters: dict[str, list[str]] = parse_qs(environ.get("QUERY_STRING", ""))
+        run_id: Optional[str] = (parameters.get("run_id") or parameters.get("run_uuid") or [None])[0]
+        metric_key: Optional[str] = (parameters.get("metric_key") or [None])[0]
+        if not run_id or not metric_key or "max_results" in parameters or "page_token" in parameters:
+            return self.application(environ, start_response)
+        metrics: Optional[Iterator[tuple]] = self.history(run_id, metric_key)
+        if metrics is None:
+            return self.application(environ, start_response)
+        try:
+            # Reads the first batch before answering, so a failing query is still reported by mlflow.
+            first: list[tuple] = list(itertools.islice(metrics, 1))
+        except Exception:  # pylint: disable=broad-exception-caught
+            return self.application(environ, start_response)
+
+        start_response("200 OK", [("Content-Type", "application/json")])
+        return serialize_metric_history(metrics=itertools.chain(first, metrics))
+
+
+def apply_metric_history_streaming(application: Callable) -> Callable:
+    """
+    Wraps this server process' application with metric history streaming, if enabled by the wrapper.
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+
+    Returns
+    -------
+        The application, wrapped by `StreamedMetricHistory` if streaming is enabled.
+    """
+
+    if not os.environ.get(STREAM_METRIC_HISTORY_ENV_VAR):
+        return application
+    return StreamedMetricHistory(application=application)
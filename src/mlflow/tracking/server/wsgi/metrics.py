@@ -0,0 +1,117 @@
+""" Request metrics of the mlflow tracking server application """
+
+import os
+from typing import Any, Optional
+
+from ..common.metrics import MULTIPROCESS_DIR_ENV_VAR
+
+# Paths which are polled (probes, scrapes) rather than used.
+EXCLUDED_PATHS: list[str] = ["/health", "/version", "/metrics"]
+
+# Request latency buckets, extended past the exporter defaults for artifact transfers and large searches.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    float("inf"),
+)
+
+# Counters of this process, by name.
+_COUNTERS: dict[str, Any] = {}
+
+
+def route(request: Any) -> str:
+    """
+    Labels a request with the URL rule it matched, e.g. `/api/2.0/mlflow/runs/log-batch`.  Rules keep the label
+    bounded: artifact paths and unmatched requests do not create new series.
+
+    Parameters
+    ----------
+    request: Any
+        The flask request.
+    """
+
+    return str(request.url_rule) if request.url_rule is not None else "unmatched"
+
+
+def instrument_application(application: Any) -> Any:
+    """
+    Adds per route request latency histograms (`mlflow_http_request_duration_seconds{route=...}`), request and
+    exception counters, and a `/metrics` endpoint aggregating every process writing to the multiprocess
+    directory.
+
+    Parameters
+    ----------
+    application: Any
+        The mlflow flask application.
+
+    Returns
+    -------
+        The exporter.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from prometheus_flask_exporter.multiprocess import GunicornInternalPrometheusMetrics
+
+    return GunicornInternalPrometheusMetrics(
+        application,
+        defaults_prefix="mlflow",
+        group_by=route,
+        buckets=LATENCY_BUCKETS,
+        excluded_paths=EXCLUDED_PATHS,
+    )
+
+
+def mark_worker_dead(pid: int) -> None:
+    """
+    Removes the live gauge files of an exited gunicorn worker from the multiprocess directory.
+
+    Parameters
+    ----------
+    pid: int
+        The process id of the worker.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(pid)
+
+
+def worker_counter(name: str, documentation: str, labels: list[str]) -> Optional[Any]:
+    """
+    Returns a counter of this process (created once), aggregated with those of every other process on the
+    `/metrics` endpoint, e.g. `mlflow_<name>_total`.
+
+    Parameters
+    ----------
+    name: str
+        The name of the counter, without the `mlflow_` prefix.
+    documentation: str
+        The help text of the counter.
+    labels: list[str]
+        The label names of the counter.
+
+    Returns
+    -------
+        The counter, or `None` when metrics are not exported.
+    """
+
+    if not os.environ.get(MULTIPROCESS_DIR_ENV_VAR):
+        return None
+    if name not in _COUNTERS:
+        # pylint: disable=import-outside-toplevel
+        from prometheus_client import Counter
+
+        _COUNTERS[name] = Counter(name, documentation, labels, namespace="mlflow")
+    return _COUNTERS[name]
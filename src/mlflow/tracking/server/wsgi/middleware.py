@@ -0,0 +1,38 @@
+""" Middleware applied to the mlflow application of each server process """
+
+from typing import Callable
+
+from .artifact_transfers import apply_artifact_transfers
+from .compression import apply_compression
+from .metric_archive import apply_metric_archive
+from .metric_buffer import apply_metric_buffer
+from .metric_history import apply_metric_history_streaming
+from .read_cache import apply_read_cache
+from .sqlite_tuning import apply_sqlite_tuning
+
+
+def apply_middleware(application: Callable) -> Callable:
+    """
+    Wraps the mlflow application with the middleware enabled by the wrapper, outermost first:
+
+    * response compression, so cached and streamed responses are compressed too
+    * direct artifact transfers (ranged downloads, multipart uploads)
+    * the read cache, whose hits skip everything below
+    * archived metric histories
+    * metric history streaming
+    * the metric buffer, whose acknowledgements skip the single writer lock
+    * the SQLite tuning (connection pragmas and the single writer lock)
+
+    Parameters
+    ----------
+    application: Callable
+        The mlflow WSGI application.
+    """
+
+    application = apply_sqlite_tuning(application=application)
+    application = apply_metric_buffer(application=application)
+    application = apply_metric_history_streaming(application=application)
+    application = apply_metric_archive(application=application)
+    application = apply_read_cache(application=application)
+    application = apply_artifact_transfers(application=application)
+    return apply_compression(application=application)
@@ -0,0 +1,417 @@
+""" Read-through cache for the hot read endpoints of the mlflow tracking server """
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+from urllib.parse import parse_qs
+
+from ..proxy.router import api_endpoint
+from .buffering import drain, read_body
+from .metrics import worker_counter
+
+# Cache settings handed from the wrapper to the launched server processes.
+READ_CACHE_ENV_VAR: str = "MLFLOW_TRACKING_SERVER_READ_CACHE"
+
+# Cached endpoints and the scope their responses depend on: a scope kind and the request parameter naming the
+# entity (`None` for collections, which any write of that kind invalidates).
+CACHED_ENDPOINTS: dict[str, tuple[str, Optional[str]]] = {
+    "runs/get": ("run", "run_id"),
+    "metrics/get-history": ("run", "run_id"),
+    "runs/search": ("runs", None),
+    "experiments/get": ("experiment", "experiment_id"),
+    "experiments/get-by-name": ("experiments", None),
+    "experiments/search": ("experiments", None),
+    "registered-models/get": ("model", "name"),
+    "registered-models/get-latest-versions": ("model", "name"),
+    "model-versions/get": ("model", "name"),
+    "registered-models/search": ("models", None),
+    "model-versions/search": ("models", None),
+}
+
+# Methods which do not modify the store.
+SAFE_METHODS: list[str] = ["GET", "HEAD", "OPTIONS"]
+
+# Scope every cached response depends on, invalidated by writes whose effect cannot be scoped (e.g. deleting
+# an experiment deletes its runs).
+ALL_SCOPE: str = "all"
+
+# Request parameters which name the entity of a request, per scope kind.
+ENTITY_PARAMETERS: dict[str, list[str]] = {
+    "run": ["run_id", "run_uuid"],
+    "experiment": ["experiment_id"],
+    "model": ["name"],
+}
+
+
+def build_read_cache_environment(directory: str, ttl: float, max_entries: int) -> dict[str, str]:
+    """
+    Builds the environment variable handing the cache settings to the launched server processes.
+
+    Parameters
+    ----------
+    directory: str
+        The invalidation directory shared by every server process.
+    ttl: float
+        Seconds a cached response is served at most.
+    max_entries: int
+        Responses cached per worker.
+    """
+
+    return {READ_CACHE_ENV_VAR: json.dumps({"directory": directory, "ttl": ttl, "max_entries": max_entries})}
+
+
+class InvalidationLog:
+    """
+    Records when each scope was last written to, shared by every worker of every server process: one file per
+    scope whose modification time is the time of the latest write.  A cached response is stale once any scope
+    it depends on was written to after the response was read from the store.
+
+    Parameters
+    ----------
+    directory: str
+        The shared directory (created if missing).
+    """
+
+    directory: Path
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, scope: str) -> Path:
+        return self.directory / hashlib.sha1(scope.encode("utf-8")).hexdigest()
+
+    def touch(self, scopes: list[str]) -> None:
+        """
+        Records a write to scopes.
+
+        Parameters
+        ----------
+        scopes: list[str]
+            The written scopes.
+        """
+
+        now: int = time.time_ns()
+        for scope in scopes:
+            path: Path = self._path(scope=scope)
+            path.touch()
+            os.utime(path, ns=(now, now))
+
+    def changed_since(self, scopes: list[str], timestamp: int) -> bool:
+        """
+        Checks whether any scope was written to at or after a time.
+
+        Parameters
+        ----------
+        scopes: list[str]
+            The scopes to check.
+        timestamp: int
+            The time, in nanoseconds since the epoch.
+        """
+
+        for scope in scopes:
+            try:
+                if os.stat(self._path(scope=scope)).st_mtime_ns >= timestamp:
+                    return True
+            except FileNotFoundError:
+                continue
+        return False
+
+
+# pylint: disable=too-few-public-methods,too-many-arguments
+class _CachedResponse:
+    """A cached response and the scopes it depends on."""
+
+    def __init__(self, status: str, headers: list, body: bytes, *, scopes: list[str], read_at: int, expires_at: float):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.scopes = scopes
+        self.read_at = read_at
+        self.expires_at = expires_at
+
+
+def request_parameters(environ: dict, body: Optional[bytes]) -> dict[str, str]:
+    """
+    Returns the parameters of a request, from its query string and JSON body.
+
+    Parameters
+    ----------
+    environ: dict
+        The WSGI environment of the request (only its `QUERY_STRING` is read).
+    body: Optional[bytes]
+        The request body, if read.
+    """
+
+    parameters: dict[str, str] = {
+        name: values[0] for name, values in parse_qs(environ.get("QUERY_STRING", "")).items() if values
+    }
+    if body:
+        try:
+            payload: Any = json.loads(body)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict):
+            parameters.update({name: str(value) for name, value in payload.items() if isinstance(value, (str, int))})
+    return parameters
+
+
+def _entity(kind: str, parameters: dict[str, str]) -> Optional[str]:
+    """Returns the entity a request names for a scope kind, if any."""
+
+    for name in ENTITY_PARAMETERS.get(kind, []):
+        if parameters.get(name):
+            return parameters[name]
+    return None
+
+
+def write_scopes(endpoint: str, parameters: dict[str, str]) -> list[str]:
+    """
+    Returns the scopes a write request invalidates.
+
+    Parameters
+    ----------
+    endpoint: str
+        The REST endpoint, e.g. `runs/log-batch`.
+    parameters: dict[str, str]
+        The request parameters.
+    """
+
+    if endpoint.startswith("runs/"):
+        run: Optional[str] = _entity(kind="run", parameters=parameters)
+        return ["runs", f"run:{run}"] if run else ["runs"]
+    if endpoint in ["experiments/update", "experiments/set-experiment-tag"]:
+        experiment: Optional[str] = _entity(kind="experiment", parameters=parameters)
+        if experiment:
+            return ["experiments", f"experiment:{experiment}"]
+    if endpoint.startswith("registered-models/") or endpoint.startswith("model-versions/"):
+        model: Optional[str] = _entity(kind="model", parameters=parameters)
+        if model:
+            return ["models", f"model:{model}"]
+    return [ALL_SCOPE]
+
+
+def read_scopes(endpoint: str, parameters: dict[str, str]) -> list[str]:
+    """
+    Returns the scopes the response of a cached endpoint depends on.
+
+    Parameters
+    ----------
+    endpoint: str
+        The REST endpoint, e.g. `runs/get`.
+    parameters: dict[str, str]
+        The request parameters.
+    """
+
+    kind, parameter = CACHED_ENDPOINTS[endpoint]
+    if parameter is None:
+        return [ALL_SCOPE, kind]
+    entity: Optional[str] = _entity(kind=kind, parameters=parameters)
+    # Without an entity the request is rejected by mlflow, its error response is not cached.
+    return [ALL_SCOPE, f"{kind}:{entity}"]
+
+
+# pylint: disable=too-many-instance-attributes
+class ReadCache:
+    """
+    WSGI middleware caching successful responses of the hot read endpoints (`CACHED_ENDPOINTS`) per worker, in
+    a least recently used cache whose entries expire after `ttl` seconds.  Writes served by any worker of any
+    server process invalidate the cached responses of the run, experiment or registered model they modify
+    through a shared `InvalidationLog`, so a client reading after its own write never sees the stale response.
+
+    Responses carry an `X-MLflow-Cache: hit|miss` header; hits and misses are counted per endpoint.
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+    directory: str
+        The invalidation directory shared by every server process.
+    ttl: float
+        Seconds a cached response is served at most.
+    max_entries: int
+        Responses cached by this worker.
+    max_entry_bytes: int
+        Larger responses (e.g. big searches) are not cached.
+    """
+
+    ttl: float
+    max_entries: int
+    max_entry_bytes: int
+    hits: int
+    misses: int
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        application: Callable,
+        directory: str,
+        ttl: float = 5.0,
+        max_entries: int = 1024,
+        max_entry_bytes: int = 1024 * 1024,
+    ):
+        if ttl <= 0:
+            raise ValueError(f"ttl must be positive, received: {ttl}")
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, received: {max_entries}")
+
+        self.application = application
+        self.invalidations: InvalidationLog = InvalidationLog(directory=directory)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_entry_bytes = max_entry_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, _CachedResponse] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._counter: Optional[Any] = worker_counter(
+            name="read_cache_requests",
+            documentation="Requests to cached tracking server endpoints, by endpoint and result (hit or miss)",
+            labels=["endpoint", "result"],
+        )
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        endpoint: Optional[str] = api_endpoint(path=environ.get("PATH_INFO", ""))
+        method: str = environ.get("REQUEST_METHOD", "GET").upper()
+        if endpoint is None:
+            return self.application(environ, start_response)
+        if endpoint in CACHED_ENDPOINTS and method in ["GET", "POST"]:
+            return self._read(endpoint=endpoint, environ=environ, start_response=start_response)
+        if method not in SAFE_METHODS:
+            return self._write(endpoint=endpoint, environ=environ, start_response=start_response)
+        return self.application(environ, start_response)
+
+    def _count(self, endpoint: str, result: str) -> None:
+        """Counts a hit or a miss."""
+
+        if result == "hit":
+            self.hits += 1
+        else:
+            self.misses += 1
+        if self._counter is not None:
+            self._counter.labels(endpoint=endpoint, result=result).inc()
+
+    def _lookup(self, key: tuple) -> Optional[_CachedResponse]:
+        """Returns the fresh cached response of a request, evicting it if stale."""
+
+        with self._lock:
+            entry: Optional[_CachedResponse] = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at > time.monotonic() and not self.invalidations.changed_since(
+                scopes=entry.scopes, timestamp=entry.read_at
+            ):
+                self._entries.move_to_end(key)
+                return entry
+            del self._entries[key]
+            return None
+
+    def _store(self, key: tuple, entry: _CachedResponse) -> None:
+        """Caches a response, evicting the least recently used ones beyond `max_entries`."""
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _read(self, endpoint: str, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        """Serves a cached endpoint from the cache, or reads through to the application."""
+
+        body: bytes = read_body(environ=environ)
+        key: tuple = (
+            environ["REQUEST_METHOD"],
+            environ.get("PATH_INFO", ""),
+            environ.get("QUERY_STRING", ""),
+            body,
+            environ.get("HTTP_AUTHORIZATION"),
+        )
+        entry: Optional[_CachedResponse] = self._lookup(key=key)
+        if entry is not None:
+            self._count(endpoint=endpoint, result="hit")
+            start_response(entry.status, entry.headers + [("X-MLflow-Cache", "hit")])
+            return [entry.body]
+
+        self._count(endpoint=endpoint, result="miss")
+        # Taken before the store is read: a write committed while reading invalidates the response.
+        read_at: int = time.time_ns()
+        entry = _CachedResponse(
+            status="",
+            headers=[],
+            body=b"",
+            scopes=read_scopes(endpoint=endpoint, parameters=request_parameters(environ, body)),
+            read_at=read_at,
+            expires_at=0.0,
+        )
+
+        def capture(status: str, headers: list, exc_info: Any = None) -> Callable:
+            entry.status, entry.headers = status, headers
+            return start_response(status, headers + [("X-MLflow-Cache", "miss")], exc_info)
+
+        return self._read_through(key=key, entry=entry, result=self.application(environ, capture))
+
+    def _read_through(self, key: tuple, entry: _CachedResponse, result: Iterable[bytes]) -> Iterator[bytes]:
+        """Passes a response on, caching it if it is successful and at most `max_entry_bytes` long."""
+
+        buffered: Optional[list[bytes]] = []
+        size: int = 0
+        try:
+            for chunk in result:
+                if buffered is None:
+                    yield chunk
+                    continue
+                buffered.append(chunk)
+                size += len(chunk)
+                if size > self.max_entry_bytes:
+                    # Too large to cache, e.g. a streamed metric history: passed on as it is produced.
+                    yield from buffered
+                    buffered = None
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+
+        if buffered is not None:
+            entry.body = b"".join(buffered)
+            if entry.status.startswith("200"):
+                entry.expires_at = time.monotonic() + self.ttl
+                self._store(key=key, entry=entry)
+            yield entry.body
+
+    def _write(self, endpoint: str, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        """Serves a write and invalidates the scopes it modified once it completed (or failed)."""
+
+        scopes: list[str] = write_scopes(
+            endpoint=endpoint, parameters=request_parameters(environ=environ, body=read_body(environ=environ))
+        )
+        try:
+            return [drain(result=self.application(environ, start_response))]
+        finally:
+            self.invalidations.touch(scopes=scopes)
+
+
+def apply_read_cache(application: Callable) -> Callable:
+    """
+    Wraps this server process' application with the read cache configured by the wrapper (if any).
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+
+    Returns
+    -------
+        The application, wrapped by `ReadCache` if caching is enabled.
+    """
+
+    settings: Optional[str] = os.environ.get(READ_CACHE_ENV_VAR)
+    if not settings:
+        return application
+    cache: dict = json.loads(settings)
+    return ReadCache(
+        application=application, directory=cache["directory"], ttl=cache["ttl"], max_entries=cache["max_entries"]
+    )
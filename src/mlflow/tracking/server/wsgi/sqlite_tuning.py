@@ -0,0 +1,206 @@
+""" SQLite tuning for tracking servers backed by a local database file """
+
+import fcntl
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Iterable, Optional
+
+from ..contracts.types.route_class import RouteClass
+from ..proxy.router import classify_request
+from .buffering import drain
+
+# Tuning handed from the wrapper to the launched server processes.
+SQLITE_TUNING_ENV_VAR: str = "MLFLOW_TRACKING_SERVER_SQLITE_TUNING"
+
+# Per connection pragmas: WAL only needs a full sync at checkpoints, a 64 MiB page cache and 256 MiB of the
+# database mapped into memory.
+SQLITE_PRAGMAS: dict[str, str] = {"synchronous": "NORMAL", "cache_size": "-65536", "mmap_size": "268435456"}
+
+# The pragmas applied by the connection listener of this process.
+_CONNECTION_PRAGMAS: dict[str, str] = {}
+
+# The single writers of this process.
+_WRITERS: list["SingleWriter"] = []
+
+
+def sqlite_database_path(uri: str) -> Optional[str]:
+    """
+    Returns the database file of a `sqlite:///` backend store uri, or `None` for other stores.
+
+    Parameters
+    ----------
+    uri: str
+        The backend store uri.
+    """
+
+    if not uri.startswith("sqlite:///"):
+        return None
+    return uri.split(sep="sqlite:///")[1].split("?")[0]
+
+
+def enable_wal(path: str) -> str:
+    """
+    Switches a database to write-ahead logging, which lets readers proceed while a writer commits.  The journal
+    mode is persistent, so it is set once rather than on every connection.
+
+    Parameters
+    ----------
+    path: str
+        The database file (created if missing).
+
+    Returns
+    -------
+        The resulting journal mode.
+    """
+
+    with sqlite3.connect(path, timeout=30.0) as connection:
+        return connection.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+
+
+def build_tuning_environment(busy_timeout: int, writer_lock: Optional[str] = None) -> dict[str, str]:
+    """
+    Builds the environment variable handing the tuning to the launched server processes.
+
+    Parameters
+    ----------
+    busy_timeout: int
+        Milliseconds a connection waits on a locked database before failing.
+    writer_lock: Optional[str]
+        If provided, run mutations are serialized across every server process with this lock file.
+    """
+
+    pragmas: dict[str, str] = {"busy_timeout": str(busy_timeout), **SQLITE_PRAGMAS}
+    return {SQLITE_TUNING_ENV_VAR: json.dumps({"pragmas": pragmas, "writer_lock": writer_lock})}
+
+
+def _apply_connection_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+    """SQLAlchemy `connect` listener applying the installed pragmas to new SQLite connections."""
+
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in _CONNECTION_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def install_connection_pragmas(pragmas: dict[str, str]) -> None:
+    """
+    Applies pragmas to every SQLite connection opened by SQLAlchemy in this process from now on (including the
+    engines mlflow creates lazily in each worker).
+
+    Parameters
+    ----------
+    pragmas: dict[str, str]
+        The pragma values keyed by pragma name.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    _CONNECTION_PRAGMAS.clear()
+    _CONNECTION_PRAGMAS.update(pragmas)
+    if not event.contains(Engine, "connect", _apply_connection_pragmas):
+        event.listen(Engine, "connect", _apply_connection_pragmas)
+
+
+# pylint: disable=too-few-public-methods
+class SingleWriter:
+    """
+    WSGI middleware serializing run mutations (metric, param and tag logging, run lifecycle) across every
+    thread and process of the deployment, so concurrent loggers queue for the single SQLite writer instead of
+    failing with `database is locked`.  Reads are not serialized.
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+    lock_path: str
+        The lock file shared by every server process.
+    """
+
+    lock_path: str
+
+    def __init__(self, application: Callable, lock_path: str):
+        self.application = application
+        self.lock_path = lock_path
+        self._opening: threading.Lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._thread_lock: threading.Lock = threading.Lock()
+        self._lock_file: Optional[Any] = None
+        _WRITERS.append(self)
+
+    def _open(self) -> None:
+        """Opens the lock file in this process (once per process, e.g. in each forked worker)."""
+
+        with self._opening:
+            if self._pid == os.getpid():
+                return
+            # Processes forked after the middleware was built (e.g. by the preloading gunicorn master) would share
+            # its open file, and with it the flock: each process opens the lock file itself.  The lock file stays
+            # open for the life of the worker; flock excludes other processes, the thread lock other threads of
+            # this process (which share the open file).
+            self._thread_lock = threading.Lock()
+            self._lock_file = open(self.lock_path, "a+b")  # pylint: disable=consider-using-with
+            self._pid = os.getpid()
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        if classify_request(method=environ.get("REQUEST_METHOD", "GET"), path=environ.get("PATH_INFO", "")) != (
+            RouteClass.WRITE
+        ):
+            return self.application(environ, start_response)
+
+        self._open()
+        with self._thread_lock:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                # Run mutations answer with small JSON bodies; they are produced while holding the lock.
+                return [drain(result=self.application(environ, start_response))]
+            finally:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Closes the lock file of this process, once it no longer serves requests (e.g. when a worker exits)."""
+
+        with self._opening:
+            if self._pid != os.getpid():
+                return
+            with self._thread_lock:
+                self._lock_file.close()
+            self._pid = None
+
+
+def close_single_writers() -> None:
+    """Closes the lock files of the single writers of this process, e.g. when a worker exits."""
+
+    for writer in _WRITERS:
+        writer.close()
+
+
+def apply_sqlite_tuning(application: Callable) -> Callable:
+    """
+    Applies the tuning handed down by the wrapper (if any) to this server process.
+
+    Parameters
+    ----------
+    application: Callable
+        The WSGI application.
+
+    Returns
+    -------
+        The application, wrapped by `SingleWriter` if writes are serialized.
+    """
+
+    tuning: Optional[str] = os.environ.get(SQLITE_TUNING_ENV_VAR)
+    if not tuning:
+        return application
+    settings: dict = json.loads(tuning)
+    install_connection_pragmas(pragmas=settings["pragmas"])
+    if settings.get("writer_lock"):
+        return SingleWriter(application=application, lock_path=settings["writer_lock"])
+    return application
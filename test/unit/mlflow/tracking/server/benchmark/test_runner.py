@@ -0,0 +1,113 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.mlflow.tracking.server.benchmark.runner import BenchmarkRunner
+from src.mlflow.tracking.server.contracts.dto.workload_result import WorkloadResult
+from src.mlflow.tracking.server.contracts.types.benchmark_workload import BenchmarkWorkload
+
+
+class MockTrackingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    artifacts: dict = {}
+    requests: list = []
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def _respond(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        MockTrackingHandler.requests.append(("GET", self.path))
+        if self.path == "/health":
+            self._respond(200, b"OK")
+        elif self.path == "/version":
+            self._respond(200, b"2.6.0")
+        elif self.path in MockTrackingHandler.artifacts:
+            self._respond(200, MockTrackingHandler.artifacts[self.path])
+        else:
+            self._respond(404, b"{}")
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        MockTrackingHandler.requests.append(("PUT", self.path))
+        MockTrackingHandler.artifacts[self.path] = self.rfile.read(int(self.headers["Content-Length"]))
+        self._respond(200, b"{}")
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        MockTrackingHandler.requests.append(("POST", self.path))
+        request: dict = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        endpoint: str = self.path[len("/api/2.0/mlflow/") :]
+        if endpoint == "experiments/create":
+            self._respond(200, json.dumps({"experiment_id": "1"}).encode("utf-8"))
+        elif endpoint == "runs/create":
+            run_id: str = f"run{len(MockTrackingHandler.requests)}"
+            self._respond(200, json.dumps({"run": {"info": {"run_id": run_id}}}).encode("utf-8"))
+        elif endpoint == "runs/log-batch":
+            self._respond(200 if len(request["metrics"]) == 100 else 400, b"{}")
+        elif endpoint == "runs/search":
+            # Searches fail, to check errors are counted.
+            self._respond(500, b"{}")
+        else:
+            self._respond(200, b"{}")
+
+
+class TestBenchmarkRunner(unittest.TestCase):
+    def test_workload_result(self):
+        result = WorkloadResult(
+            workload=BenchmarkWorkload.LOG_METRIC, latencies=[0.004, 0.001, 0.003, 0.002], errors=1, elapsed=2.0
+        )
+
+        self.assertEqual(result.requests, 4)
+        self.assertEqual(result.throughput, 2.0)
+        self.assertEqual(result.percentile(50), 0.002)
+        self.assertEqual(result.percentile(99), 0.004)
+        self.assertEqual(result.to_dict()["latency_ms"]["p90"], 4.0)
+        self.assertEqual(WorkloadResult(workload=BenchmarkWorkload.LOG_METRIC, latencies=[]).to_dict()["throughput"], 0)
+
+    def test_run(self):
+        MockTrackingHandler.artifacts, MockTrackingHandler.requests = {}, []
+        with ThreadingHTTPServer(("127.0.0.1", 0), MockTrackingHandler) as server:
+            thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+            thread.start()
+            try:
+                runner = BenchmarkRunner(
+                    host="127.0.0.1",
+                    port=server.server_address[1],
+                    workloads=list(BenchmarkWorkload),
+                    clients=3,
+                    requests=10,
+                    artifact_size=1000,
+                )
+                self.assertTrue(runner.wait_until_ready(timeout=10))
+                report: dict = runner.run()
+            finally:
+                server.shutdown()
+                thread.join()
+
+        self.assertEqual(report["mlflow_version"], "2.6.0")
+        self.assertEqual(list(report["workloads"]), [workload.value for workload in BenchmarkWorkload])
+        for workload, result in report["workloads"].items():
+            self.assertEqual(result["requests"], 10)
+            self.assertEqual(result["errors"], 10 if workload == "search_runs" else 0)
+        self.assertEqual(report["workloads"]["artifact_download"]["bytes_per_second"] > 0, True)
+        # Each client logs to a run of its own.
+        runs: set = {path.split("/")[6] for method, path in MockTrackingHandler.requests if method == "PUT"}
+        self.assertEqual(len(runs), 3)
+        self.assertEqual(len([path for path in MockTrackingHandler.artifacts if "/upload-" in path]), 10)
+
+    def test_validation(self):
+        for kwargs in [{"clients": 0}, {"requests": 0}, {"artifact_size": -1}]:
+            with self.assertRaises(ValueError):
+                BenchmarkRunner(host="127.0.0.1", port=1, workloads=[], **kwargs)
+        with self.assertRaises(ValueError):
+            BenchmarkRunner(host="127.0.0.1", port=1, workloads=["unknown"])
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestBenchmarkRunner())
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.mlflow.tracking.server.common.metrics import (
+    MULTIPROCESS_DIR_ENV_VAR,
+    WrapperMetrics,
+    prepare_multiprocess_directory,
+)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_prepare_multiprocess_directory(self):
+        with tempfile.TemporaryDirectory() as directory, patch.dict(os.environ, {}):
+            path = Path(directory) / "metrics"
+            self.assertEqual(prepare_multiprocess_directory(path=str(path)), str(path))
+            self.assertTrue(path.is_dir())
+            self.assertEqual(os.environ[MULTIPROCESS_DIR_ENV_VAR], str(path))
+
+            (path / "counter_1.db").write_bytes(b"mock")
+            prepare_multiprocess_directory(path=str(path), reset=False)
+            self.assertEqual(os.listdir(path), ["counter_1.db"])
+
+            prepare_multiprocess_directory(path=str(path), reset=True)
+            self.assertEqual(os.listdir(path), [])
+
+    def test_time_activity(self):
+        metrics = WrapperMetrics()
+        with metrics.time_activity(activity="gc"):
+            pass
+        with self.assertRaises(RuntimeError):
+            with metrics.time_activity(activity="gc"):
+                raise RuntimeError("mock")
+
+        for status in ["success", "failure"]:
+            self.assertEqual(
+                metrics.registry.get_sample_value(
+                    "mlflow_wrapper_activity_duration_seconds_count", {"activity": "gc", "status": status}
+                ),
+                1.0,
+            )
+
+    def test_counters(self):
+        metrics = WrapperMetrics()
+        metrics.process_restarts.labels(process="tracking").inc()
+        metrics.log_lines_forwarded.labels(process="tracking").inc(3)
+
+        self.assertEqual(
+            metrics.registry.get_sample_value("mlflow_wrapper_process_restarts_total", {"process": "tracking"}), 1.0
+        )
+        self.assertEqual(
+            metrics.registry.get_sample_value("mlflow_wrapper_log_lines_forwarded_total", {"process": "tracking"}),
+            3.0,
+        )
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestMetrics())
@@ -0,0 +1,33 @@
+import unittest
+
+from src.mlflow.tracking.server.common.phase_timer import PhaseTimer
+
+
+class TestPhaseTimer(unittest.TestCase):
+    def test_records_phases_in_order(self):
+        timer = PhaseTimer()
+        with timer.phase("secrets"):
+            pass
+        with self.assertRaises(RuntimeError):
+            with timer.phase("mlflow import"):
+                raise RuntimeError("mock")
+
+        self.assertEqual([name for name, _ in timer.phases], ["secrets", "mlflow import"])
+        self.assertTrue(all(duration >= 0 for _, duration in timer.phases))
+
+    def test_report(self):
+        timer = PhaseTimer(started_at=0.0)
+        timer.phases = [("secrets", 0.25), ("backend store", 1.5)]
+
+        lines = timer.report(milestone="port bound").splitlines()
+
+        self.assertEqual(lines[0], "Startup phases:")
+        self.assertEqual(lines[1], "  secrets          0.250s")
+        self.assertEqual(lines[2], "  backend store    1.500s")
+        self.assertTrue(lines[3].startswith("  port bound "))
+        self.assertTrue(lines[3].endswith("s (total)"))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestPhaseTimer())
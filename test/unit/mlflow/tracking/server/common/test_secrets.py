@@ -1,7 +1,10 @@
 import os
+import tempfile
 import unittest
+from unittest.mock import MagicMock, patch
 
-from src.mlflow.tracking.server.common.secrets import load_ae5_user_secrets
+from src.mlflow.tracking.server.common import secrets
+from src.mlflow.tracking.server.common.secrets import SecretsLoader, SecretsWatcher, load_ae5_user_secrets
 
 
 class TestSecrets(unittest.TestCase):
@@ -32,6 +35,52 @@ class TestSecrets(unittest.TestCase):
 
         self.assertFalse(secret_name in os.environ)
 
+    def test_loader_reads_changed_secrets_only(self):
+        with tempfile.TemporaryDirectory() as directory, patch.dict(os.environ, {}):
+            for name, value in [("MOCK_USER", "user"), ("MOCK_PASSWORD", "password")]:
+                with open(file=os.path.join(directory, name), mode="w", encoding="utf-8") as file:
+                    file.write(value)
+            os.mkdir(os.path.join(directory, "..data"))
+            loader: SecretsLoader = SecretsLoader(secrets_path=directory)
+
+            self.assertEqual(loader.load(), ["MOCK_PASSWORD", "MOCK_USER"])
+            self.assertEqual(os.environ["MOCK_PASSWORD"], "password")
+            self.assertNotIn("..data", os.environ)
+
+            # Unchanged secrets are restored without reading them again.
+            del os.environ["MOCK_USER"]
+            with patch.object(secrets, "_read_secret", side_effect=AssertionError("read")):
+                self.assertEqual(loader.load(), [])
+            self.assertEqual(os.environ["MOCK_USER"], "user")
+
+            # Rotated secrets are read again, removed secrets are removed from the environment.
+            with open(file=os.path.join(directory, "MOCK_PASSWORD"), mode="w", encoding="utf-8") as file:
+                file.write("rotated password")
+            os.utime(os.path.join(directory, "MOCK_PASSWORD"), ns=(0, 0))
+            os.unlink(os.path.join(directory, "MOCK_USER"))
+            self.assertEqual(loader.load(), ["MOCK_PASSWORD", "MOCK_USER"])
+            self.assertEqual(os.environ["MOCK_PASSWORD"], "rotated password")
+            self.assertNotIn("MOCK_USER", os.environ)
+
+        self.assertIsNone(SecretsLoader(secrets_path="some/path").load())
+        with self.assertRaises(ValueError):
+            SecretsLoader(concurrency=0)
+
+    def test_watcher_notifies_changes(self):
+        loader: MagicMock = MagicMock(load=MagicMock(side_effect=[["MOCK_PASSWORD"], [], None]))
+        on_change: MagicMock = MagicMock()
+        watcher: SecretsWatcher = SecretsWatcher(loader=loader, interval=60, on_change=on_change)
+
+        self.assertEqual(watcher.poll(), ["MOCK_PASSWORD"])
+        self.assertEqual(watcher.poll(), [])
+        self.assertEqual(watcher.poll(), [])
+        on_change.assert_called_once_with(["MOCK_PASSWORD"])
+
+        watcher.start()
+        watcher.stop()
+        with self.assertRaises(ValueError):
+            SecretsWatcher(loader=loader, interval=0, on_change=on_change)
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner()
@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.mlflow.tracking.server.common.system import available_cpu_count
+
+
+class TestSystem(unittest.TestCase):
+    def test_available_cpu_count_without_quota(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch("os.sched_getaffinity", return_value={0, 1, 2, 3}, create=True):
+                self.assertEqual(available_cpu_count(cgroup_root=tmp_dir), 4)
+
+    def test_available_cpu_count_with_cgroup_v2_quota(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            Path(tmp_dir, "cpu.max").write_text("150000 100000\n", encoding="utf-8")
+            with patch("os.sched_getaffinity", return_value={0, 1, 2, 3}, create=True):
+                self.assertEqual(available_cpu_count(cgroup_root=tmp_dir), 2)
+
+    def test_available_cpu_count_with_unlimited_cgroup_v2_quota(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            Path(tmp_dir, "cpu.max").write_text("max 100000\n", encoding="utf-8")
+            with patch("os.sched_getaffinity", return_value={0, 1, 2, 3}, create=True):
+                self.assertEqual(available_cpu_count(cgroup_root=tmp_dir), 4)
+
+    def test_available_cpu_count_with_cgroup_v1_quota(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.makedirs(f"{tmp_dir}/cpu")
+            Path(tmp_dir, "cpu", "cpu.cfs_quota_us").write_text("100000\n", encoding="utf-8")
+            Path(tmp_dir, "cpu", "cpu.cfs_period_us").write_text("100000\n", encoding="utf-8")
+            with patch("os.sched_getaffinity", return_value={0, 1, 2, 3}, create=True):
+                self.assertEqual(available_cpu_count(cgroup_root=tmp_dir), 1)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestSystem())
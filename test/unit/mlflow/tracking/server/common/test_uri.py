@@ -0,0 +1,21 @@
+import unittest
+
+from src.mlflow.tracking.server.common.uri import is_database_uri, local_path
+
+
+class TestUri(unittest.TestCase):
+    def test_local_path(self):
+        self.assertEqual(local_path("/data/artifacts"), "/data/artifacts")
+        self.assertEqual(local_path("file:///data/artifacts"), "/data/artifacts")
+        self.assertIsNone(local_path("s3://bucket/artifacts"))
+
+    def test_is_database_uri(self):
+        self.assertTrue(is_database_uri("sqlite:///mydb.sqlite"))
+        self.assertTrue(is_database_uri("postgresql+psycopg2://user@host/mlflow"))
+        self.assertFalse(is_database_uri("/data/mlruns"))
+        self.assertFalse(is_database_uri("file:///data/mlruns"))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestUri())
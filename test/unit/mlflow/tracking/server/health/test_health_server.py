@@ -0,0 +1,55 @@
+import http.client
+import json
+import threading
+import unittest
+
+from src.mlflow.tracking.server.health.health_server import HealthServer
+from src.mlflow.tracking.server.health.monitor import HealthMonitor
+
+
+class TestHealthServer(unittest.TestCase):
+    def setUp(self):
+        self.monitor = HealthMonitor(
+            liveness={"tracking": lambda: (True, "running")}, readiness={"backend_store": lambda: (False, "down")}
+        )
+        self.monitor.probe(kind="liveness")
+        self.monitor.probe(kind="readiness")
+        self.server = HealthServer(address="127.0.0.1", port=0, monitor=self.monitor)
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+
+    def _get(self, path: str) -> tuple[int, dict]:
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=5)
+        try:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            connection.close()
+
+    def test_livez(self):
+        status, body = self._get("/livez")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body["status"], "ok")
+        self.assertEqual(body["checks"]["tracking"]["detail"], "running")
+
+    def test_readyz(self):
+        status, body = self._get("/readyz?verbose")
+
+        self.assertEqual(status, 503)
+        self.assertEqual(body["status"], "unavailable")
+        self.assertFalse(body["checks"]["backend_store"]["healthy"])
+
+    def test_unknown_path(self):
+        self.assertEqual(self._get("/health")[0], 404)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestHealthServer())
@@ -0,0 +1,80 @@
+import threading
+import time
+import unittest
+
+from src.mlflow.tracking.server.health.monitor import HealthMonitor
+
+
+class TestHealthMonitor(unittest.TestCase):
+    def test_not_probed_yet_is_unhealthy(self):
+        monitor = HealthMonitor(liveness={"mock": lambda: (True, "ok")}, readiness={})
+
+        healthy, results = monitor.status(kind="liveness")
+
+        self.assertFalse(healthy)
+        self.assertEqual(results["mock"].detail, "not probed yet")
+        self.assertTrue(monitor.status(kind="readiness")[0])
+
+    def test_caches_probe_results(self):
+        calls = []
+
+        def probe():
+            calls.append(1)
+            return True, "ok"
+
+        monitor = HealthMonitor(liveness={}, readiness={"mock": probe})
+        monitor.probe(kind="readiness")
+        for _ in range(10):
+            self.assertTrue(monitor.status(kind="readiness")[0])
+
+        self.assertEqual(len(calls), 1)
+
+    def test_failing_and_raising_probes(self):
+        def raising():
+            raise RuntimeError("mock")
+
+        monitor = HealthMonitor(liveness={}, readiness={"failing": lambda: (False, "down"), "raising": raising})
+        monitor.probe(kind="readiness")
+        healthy, results = monitor.status(kind="readiness")
+
+        self.assertFalse(healthy)
+        self.assertEqual(results["failing"].detail, "down")
+        self.assertEqual(results["raising"].detail, "probe failed: RuntimeError")
+
+    def test_stale_results_are_unhealthy(self):
+        monitor = HealthMonitor(liveness={}, readiness={"mock": lambda: (True, "ok")}, readiness_interval=0.01)
+        monitor.probe(kind="readiness")
+        time.sleep(0.05)
+
+        healthy, results = monitor.status(kind="readiness")
+
+        self.assertFalse(healthy)
+        self.assertEqual(results["mock"].detail, "stale: ok")
+
+    def test_slow_readiness_does_not_delay_liveness(self):
+        release = threading.Event()
+
+        def hanging():
+            release.wait(timeout=10)
+            return True, "ok"
+
+        monitor = HealthMonitor(
+            liveness={"mock": lambda: (True, "ok")}, readiness={"hanging": hanging}, liveness_interval=0.01
+        )
+        monitor.start()
+        try:
+            time.sleep(0.1)
+            self.assertTrue(monitor.status(kind="liveness")[0])
+            self.assertFalse(monitor.status(kind="readiness")[0])
+        finally:
+            monitor.stop()
+            release.set()
+
+    def test_rejects_invalid_intervals(self):
+        with self.assertRaises(ValueError):
+            HealthMonitor(liveness={}, readiness={}, readiness_interval=0)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestHealthMonitor())
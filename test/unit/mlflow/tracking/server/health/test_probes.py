@@ -0,0 +1,87 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+from src.mlflow.tracking.server.health.probes import (
+    BackendStoreProbe,
+    build_artifacts_destination_probe,
+    build_http_probe,
+    build_process_probe,
+)
+
+
+class MockHealthHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.send_response(200 if self.path == "/health" else 500)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"OK")
+
+
+class TestProbes(unittest.TestCase):
+    def test_process_probe(self):
+        self.assertEqual(build_process_probe(state=lambda: "pending")(), (True, "pending"))
+        self.assertEqual(build_process_probe(state=lambda: "running")(), (True, "running"))
+        self.assertEqual(build_process_probe(state=lambda: "exited")(), (False, "exited"))
+
+    def test_http_probe(self):
+        with ThreadingHTTPServer(("127.0.0.1", 0), MockHealthHandler) as server:
+            thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+            thread.start()
+            port = server.server_address[1]
+            try:
+                self.assertTrue(build_http_probe(host="127.0.0.1", port=port)()[0])
+                self.assertFalse(build_http_probe(host="127.0.0.1", port=port, path="/broken")()[0])
+            finally:
+                server.shutdown()
+                thread.join()
+
+        self.assertFalse(build_http_probe(host="127.0.0.1", port=port, timeout=0.5)()[0])
+
+    def test_backend_store_probe_sqlite(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "mydb.sqlite")
+            self.assertFalse(BackendStoreProbe(uri=f"sqlite:///{path}")()[0])
+            # The probe must not create the database.
+            self.assertFalse(os.path.exists(path))
+
+            sqlite3.connect(path).close()
+            self.assertEqual(BackendStoreProbe(uri=f"sqlite:///{path}")(), (True, "database answered"))
+
+    def test_backend_store_probe_update(self):
+        with tempfile.TemporaryDirectory() as directory:
+            probe = BackendStoreProbe(uri=os.path.join(directory, "missing"))
+            self.assertFalse(probe()[0])
+
+            engine = MagicMock()
+            probe._engine = engine
+            probe.update(uri=directory)
+
+            # The connection with the former uri is closed.
+            engine.dispose.assert_called_once_with()
+            self.assertTrue(probe()[0])
+
+    def test_backend_store_probe_file_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertTrue(BackendStoreProbe(uri=directory)()[0])
+            self.assertTrue(BackendStoreProbe(uri=f"file://{directory}")()[0])
+            self.assertFalse(BackendStoreProbe(uri=os.path.join(directory, "missing"))()[0])
+
+    def test_artifacts_destination_probe(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(build_artifacts_destination_probe(destination=directory)(), (True, "writable"))
+            self.assertEqual(os.listdir(directory), [])
+            self.assertFalse(build_artifacts_destination_probe(destination=os.path.join(directory, "missing"))()[0])
+        self.assertTrue(build_artifacts_destination_probe(destination="s3://bucket/artifacts")()[0])
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestProbes())
@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import sqlalchemy
+from alembic import command
+from alembic.operations import Operations
+
+from src.mlflow.tracking.server.contracts.dto.database_upgrade_plan import DatabaseUpgradePlan
+from src.mlflow.tracking.server.maintenance.database_upgrade import DatabaseUpgrade, migration_tables
+
+ENVIRONMENT: str = """
+from alembic import context
+
+with context.config.attributes["connection"].engine.connect() as connection:
+    context.configure(connection=connection)
+    with context.begin_transaction():
+        context.run_migrations()
+"""
+
+MIGRATIONS: dict[str, str] = {
+    "aaa": '''"""create metrics"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "aaa"
+down_revision = None
+
+
+def upgrade():
+    op.create_table("metrics", sa.Column("run_uuid", sa.String(32)), sa.Column("value", sa.Float))
+''',
+    "bbb": '''"""create index on run_uuid"""
+from alembic import op
+
+revision = "bbb"
+down_revision = "aaa"
+
+
+def upgrade():
+    for table in ["metrics"]:
+        op.create_index(f"index_{table}_run_uuid", table, ["run_uuid"])
+''',
+}
+
+
+class TestDatabaseUpgrade(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.scripts = os.path.join(self.directory.name, "migrations")
+        os.makedirs(os.path.join(self.scripts, "versions"))
+        with open(file=os.path.join(self.scripts, "env.py"), mode="w", encoding="utf-8") as file:
+            file.write(ENVIRONMENT)
+        for revision, script in MIGRATIONS.items():
+            with open(
+                file=os.path.join(self.scripts, "versions", f"{revision}.py"), mode="w", encoding="utf-8"
+            ) as file:
+                file.write(script)
+        self.path = os.path.join(self.directory.name, "store.sqlite")
+        self.upgrade = DatabaseUpgrade(
+            backend_store_uri=f"sqlite:///{self.path}", rows_per_second=100, script_location=self.scripts
+        )
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_migration_tables(self):
+        self.assertEqual(
+            migration_tables(path=os.path.join(self.scripts, "versions", "bbb.py"), tables=["runs", "metrics"]),
+            ["metrics"],
+        )
+
+    def test_plan_and_run(self):
+        # Planning does not create a missing database.
+        plan: DatabaseUpgradePlan = self.upgrade.plan()
+        self.assertEqual((plan.current, plan.target, plan.migrations), (None, "bbb", []))
+        self.assertFalse(os.path.exists(self.path))
+
+        config = self.upgrade._config()
+        with sqlalchemy.create_engine(f"sqlite:///{self.path}").connect() as connection:
+            config.attributes["connection"] = connection
+            command.upgrade(config, "aaa")
+        with sqlite3.connect(self.path) as connection:
+            connection.executemany("INSERT INTO metrics VALUES (?, ?)", [("r", value) for value in range(500)])
+
+        plan = self.upgrade.plan()
+        self.assertEqual((plan.current, plan.target), ("aaa", "bbb"))
+        self.assertEqual(
+            [migration.to_dict() for migration in plan.migrations],
+            [
+                {
+                    "revision": "bbb",
+                    "description": "create index on run_uuid",
+                    "tables": ["metrics"],
+                    "rows": 500,
+                    "estimated_seconds": 6.0,
+                    "elapsed": None,
+                }
+            ],
+        )
+        self.assertEqual(plan.estimated_seconds, 6.0)
+        self.assertIsNone(plan.active_sessions)
+
+        applied: DatabaseUpgradePlan = self.upgrade.run(plan=plan)
+        self.assertGreater(applied.migrations[0].elapsed, 0)
+        with sqlite3.connect(self.path) as connection:
+            indexes = connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'metrics'"
+            ).fetchall()
+        self.assertEqual(indexes, [("index_metrics_run_uuid",)])
+        self.assertEqual(self.upgrade.plan().migrations, [])
+
+    def test_run_requires_schema(self):
+        sqlite3.connect(self.path).close()
+        with self.assertRaises(ValueError):
+            self.upgrade.run()
+
+    def test_online_index_creation(self):
+        upgrade = DatabaseUpgrade(backend_store_uri="postgresql://localhost/mlflow", online=True)
+        operations: MagicMock = MagicMock()
+        with patch.object(upgrade, "_connect", return_value=MagicMock(dialect=MagicMock())) as patched_connect:
+            patched_connect.return_value.dialect.name = "postgresql"
+            with upgrade._concurrent_indexes():
+                Operations.create_index(operations, "index_metrics_run_uuid", "metrics", ["run_uuid"])
+
+        operations.get_context.return_value.autocommit_block.assert_called_once_with()
+        self.assertEqual(operations.invoke.call_args[0][0].kw, {"postgresql_concurrently": True})
+        # Only the upgrade creates indexes concurrently.
+        self.assertNotEqual(Operations.create_index.__name__, "create_index_concurrently")
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            DatabaseUpgrade(backend_store_uri="sqlite://", rows_per_second=0)
+        with self.assertRaises(ValueError):
+            DatabaseUpgrade(backend_store_uri="sqlite://", lock_timeout=0)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestDatabaseUpgrade())
@@ -0,0 +1,61 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from src.mlflow.tracking.server.contracts.dto.garbage_collection_report import GarbageCollectionReport
+from src.mlflow.tracking.server.maintenance.garbage_collection_daemon import GarbageCollectionDaemon
+
+
+class TestGarbageCollectionDaemon(unittest.TestCase):
+    def test_init_validates(self):
+        with self.assertRaises(ValueError):
+            GarbageCollectionDaemon(collector=MagicMock(), interval=0)
+
+    def test_collect(self):
+        collector = MagicMock()
+        collector.run.return_value = GarbageCollectionReport(runs=3)
+        daemon = GarbageCollectionDaemon(collector=collector, dry_run=True)
+
+        self.assertEqual(daemon.collect().runs, 3)
+        collector.run.assert_called_once_with(dry_run=True)
+        self.assertEqual(daemon.passes, 1)
+
+    def test_collect_survives_failures(self):
+        collector = MagicMock()
+        collector.run.side_effect = RuntimeError("database unavailable")
+        daemon = GarbageCollectionDaemon(collector=collector)
+
+        self.assertIsNone(daemon.collect())
+        self.assertEqual(daemon.passes, 1)
+
+    def test_replace_collector(self):
+        collector, replacement = MagicMock(), MagicMock()
+        replacement.run.return_value = GarbageCollectionReport(runs=1)
+        daemon = GarbageCollectionDaemon(collector=collector)
+
+        daemon.replace_collector(collector=replacement)
+
+        # A pass in flight stops, the next passes use the replacement.
+        collector.stop.assert_called_once_with()
+        self.assertEqual(daemon.collect().runs, 1)
+        collector.run.assert_not_called()
+
+    def test_run_until_stopped(self):
+        collector = MagicMock()
+        collector.run.return_value = GarbageCollectionReport()
+        daemon = GarbageCollectionDaemon(collector=collector, interval=0.01)
+        thread = threading.Thread(target=daemon.run)
+        thread.start()
+        while daemon.passes < 3:
+            pass
+        daemon.stop()
+        thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertGreaterEqual(collector.run.call_count, 3)
+        collector.stop.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestGarbageCollectionDaemon())
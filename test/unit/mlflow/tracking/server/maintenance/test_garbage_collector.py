@@ -0,0 +1,236 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from src.mlflow.tracking.server.maintenance.garbage_collector import GarbageCollector, parse_duration
+from src.mlflow.tracking.server.wsgi.artifact_stores import LocalArtifactStore
+from src.mlflow.tracking.server.wsgi.metric_archive import MetricArchive
+
+FIXTURE_STORE: str = "test/fixtures/mlflow/local/store/mydb.sqlite"
+DAY: int = 24 * 60 * 60 * 1000
+
+
+class TestGarbageCollector(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = os.path.join(self.tmp_dir, "mydb.sqlite")
+        self.artifacts = os.path.join(self.tmp_dir, "artifacts")
+        self.checkpoint = os.path.join(self.tmp_dir, "checkpoint.json")
+        shutil.copyfile(FIXTURE_STORE, self.store)
+
+        now = int(time.time() * 1000)
+        with sqlite3.connect(self.store) as connection:
+            connection.execute(
+                "INSERT INTO experiments VALUES (1, 'expired', 'mlflow-artifacts:/1', 'deleted', ?, ?)",
+                (now - 90 * DAY, now - 90 * DAY),
+            )
+            connection.execute(
+                "INSERT INTO experiment_tags VALUES ('note', 'expired', 1)",
+            )
+            runs = [
+                ("run0", 0, "deleted", now - 40 * DAY),
+                ("run1", 0, "deleted", now - 40 * DAY),
+                ("run2", 0, "deleted", now - 40 * DAY),
+                ("run3", 0, "deleted", now - 1 * DAY),
+                ("run4", 0, "active", None),
+                ("run5", 1, "deleted", now - 1 * DAY),
+            ]
+            for run_id, experiment_id, stage, deleted_time in runs:
+                connection.execute(
+                    "INSERT INTO runs (run_uuid, name, source_type, status, lifecycle_stage, artifact_uri, "
+                    "experiment_id, deleted_time) VALUES (?, ?, 'LOCAL', 'FINISHED', ?, ?, ?, ?)",
+                    (
+                        run_id,
+                        run_id,
+                        stage,
+                        f"mlflow-artifacts:/{experiment_id}/{run_id}/artifacts",
+                        experiment_id,
+                        deleted_time,
+                    ),
+                )
+                connection.execute("INSERT INTO params VALUES ('alpha', '0.1', ?)", (run_id,))
+                connection.execute("INSERT INTO tags VALUES ('mlflow.user', 'someone', ?)", (run_id,))
+                connection.execute("INSERT INTO metrics VALUES ('loss', 1.0, 0, ?, 0, 0)", (run_id,))
+                connection.execute("INSERT INTO latest_metrics VALUES ('loss', 1.0, 0, 0, 0, ?)", (run_id,))
+
+                directory = os.path.join(self.artifacts, str(experiment_id), run_id, "artifacts")
+                os.makedirs(directory)
+                with open(os.path.join(directory, "model.bin"), "wb") as file:
+                    file.write(b"x" * 100)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def build_collector(self, **kwargs) -> GarbageCollector:
+        return GarbageCollector(
+            backend_store_uri=f"sqlite:///{self.store}",
+            artifacts_destination=self.artifacts,
+            older_than=timedelta(days=30),
+            checkpoint_path=self.checkpoint,
+            **kwargs,
+        )
+
+    def remaining(self, table: str) -> list:
+        with sqlite3.connect(self.store) as connection:
+            column = "experiment_id" if table.startswith("experiment") else "run_uuid"
+            return sorted(row[0] for row in connection.execute(f"SELECT {column} FROM {table}"))
+
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration("30d0h0m0s"), timedelta(days=30))
+        self.assertEqual(parse_duration("2d8h5m20s"), timedelta(days=2, hours=8, minutes=5, seconds=20))
+        self.assertEqual(parse_duration("1.5h"), timedelta(minutes=90))
+        for value in ["", "30 days", "h"]:
+            with self.assertRaises(ValueError):
+                parse_duration(value)
+
+    def test_init_validates(self):
+        with self.assertRaises(ValueError):
+            self.build_collector(batch_size=0)
+        with self.assertRaises(ValueError):
+            self.build_collector(workers=0)
+        with self.assertRaises(ValueError):
+            self.build_collector(max_runs_per_minute=0)
+
+    def test_rate_limit_caps_batch_size(self):
+        self.assertEqual(self.build_collector(batch_size=500, max_runs_per_minute=60).batch_size, 60)
+        self.assertEqual(self.build_collector(batch_size=500, max_runs_per_minute=0.5).batch_size, 1)
+        self.assertEqual(self.build_collector(batch_size=10, max_runs_per_minute=60).batch_size, 10)
+
+    def test_run_is_rate_limited(self):
+        collector = self.build_collector(batch_size=1, max_runs_per_minute=600)
+        with patch.object(collector._stop, "wait") as patched_wait:
+            report = collector.run(dry_run=False)
+
+        self.assertEqual(report.runs, 4)
+        # One pause per deleted batch, each up to 60 / 600 seconds
+        self.assertEqual(patched_wait.call_count, 4)
+        for call in patched_wait.call_args_list:
+            self.assertLessEqual(call[1]["timeout"], 0.1)
+
+    def test_stop(self):
+        collector = self.build_collector(batch_size=1)
+        original = collector._delete_runs
+
+        def stopping(run_ids):
+            original(run_ids)
+            collector.stop()
+
+        with patch.object(collector, "_delete_runs", side_effect=stopping):
+            report = collector.run(dry_run=False)
+
+        self.assertEqual((report.runs, report.experiments), (1, 0))
+        self.assertEqual(self.remaining("experiments"), [0, 1])
+        with open(self.checkpoint, encoding="utf-8") as file:
+            self.assertEqual(json.load(file)["last_run"], "run0")
+
+    def test_dry_run(self):
+        report = self.build_collector(batch_size=2).run(dry_run=True)
+
+        self.assertTrue(report.dry_run)
+        # run0-run2 expired, run5 belongs to the expired experiment
+        self.assertEqual(report.runs, 4)
+        self.assertEqual(report.experiments, 1)
+        self.assertEqual(report.bytes_freed, 400)
+        self.assertEqual(report.failures, 0)
+        self.assertEqual(self.remaining("runs"), ["run0", "run1", "run2", "run3", "run4", "run5"])
+        self.assertEqual(self.remaining("experiments"), [0, 1])
+        self.assertTrue(os.path.exists(os.path.join(self.artifacts, "0", "run0")))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_run(self):
+        report = self.build_collector(batch_size=2, workers=2).run(dry_run=False)
+
+        self.assertEqual((report.runs, report.experiments, report.bytes_freed), (4, 1, 400))
+        for table in ["runs", "params", "tags", "metrics", "latest_metrics"]:
+            self.assertEqual(self.remaining(table), ["run3", "run4"])
+        self.assertEqual(self.remaining("experiments"), [0])
+        self.assertEqual(self.remaining("experiment_tags"), [])
+        self.assertFalse(os.path.exists(os.path.join(self.artifacts, "0", "run0", "artifacts")))
+        self.assertFalse(os.path.exists(os.path.join(self.artifacts, "1", "run5", "artifacts")))
+        self.assertTrue(os.path.exists(os.path.join(self.artifacts, "0", "run3", "artifacts")))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_run_deletes_archived_metrics(self):
+        archive = MetricArchive(store=LocalArtifactStore(root=self.artifacts, part_size=1024, concurrency=1))
+        columns = {"key": ["loss"], "value": [1.0], "timestamp": [0], "step": [0], "is_nan": [False]}
+        sizes = {run_id: archive.write(run_id=run_id, columns=columns) for run_id in ["run0", "run3"]}
+
+        report = self.build_collector().run(dry_run=True)
+        self.assertEqual(report.bytes_freed, 400 + sizes["run0"])
+
+        self.build_collector().run(dry_run=False)
+        self.assertIsNone(archive.stat(run_id="run0"))
+        self.assertIsNotNone(archive.stat(run_id="run3"))
+
+    def test_run_keeps_runs_whose_artifacts_fail(self):
+        collector = self.build_collector()
+        original = collector._collect_artifacts
+
+        def failing(run, dry_run):
+            return (False, 0) if run[0] == "run1" else original(run, dry_run)
+
+        with patch.object(collector, "_collect_artifacts", side_effect=failing):
+            report = collector.run(dry_run=False)
+
+        self.assertEqual((report.runs, report.failures), (3, 1))
+        self.assertEqual(self.remaining("runs"), ["run1", "run3", "run4"])
+        self.assertEqual(self.remaining("params"), ["run1", "run3", "run4"])
+
+    def test_run_resumes_from_checkpoint(self):
+        collector = self.build_collector(batch_size=1)
+        original = collector._delete_runs
+        calls = []
+
+        def interrupted(run_ids):
+            calls.append(run_ids)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            original(run_ids)
+
+        with patch.object(collector, "_delete_runs", side_effect=interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                collector.run(dry_run=False)
+
+        with open(self.checkpoint, encoding="utf-8") as file:
+            state = json.load(file)
+        self.assertEqual(state["last_run"], "run0")
+        self.assertEqual(state["report"]["runs"], 1)
+
+        # The artifacts of run1 were deleted before the interruption, its metadata is deleted on resume
+        report = self.build_collector(batch_size=1).run(dry_run=False)
+        self.assertEqual((report.runs, report.experiments, report.bytes_freed), (4, 1, 300))
+        self.assertEqual(self.remaining("runs"), ["run3", "run4"])
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_checkpoint_of_another_store_is_ignored(self):
+        with open(self.checkpoint, "w", encoding="utf-8") as file:
+            json.dump({"store": "other", "last_run": "run9", "report": {}}, file)
+
+        report = self.build_collector().run(dry_run=False)
+        self.assertEqual(report.runs, 4)
+
+    def test_unresolvable_artifacts_delete_metadata(self):
+        collector = self.build_collector()
+        collector.artifacts_destination = None
+
+        self.assertEqual(collector._collect_artifacts(("run0", "mlflow-artifacts:/0/run0/artifacts"), False), (True, 0))
+        self.assertTrue(os.path.exists(os.path.join(self.artifacts, "0", "run0", "artifacts")))
+
+    def test_resolve_artifacts(self):
+        collector = self.build_collector()
+        collector.artifacts_destination = "s3://bucket/root/"
+
+        self.assertEqual(collector._resolve_artifacts("mlflow-artifacts:/0/run0"), "s3://bucket/root/0/run0")
+        self.assertEqual(collector._resolve_artifacts("mlflow-artifacts://host:5000/0/run0"), "s3://bucket/root/0/run0")
+        self.assertEqual(collector._resolve_artifacts("/data/0/run0"), "/data/0/run0")
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestGarbageCollector())
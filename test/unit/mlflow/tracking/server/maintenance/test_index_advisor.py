@@ -0,0 +1,141 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from sqlalchemy.dialects import mysql, postgresql
+
+from src.mlflow.tracking.server.maintenance.index_advisor import IndexAdvisor, read_query_log, serves
+
+FIXTURE_STORE: str = "test/fixtures/mlflow/local/store/mydb.sqlite"
+
+SEARCH_BY_PARAM: str = (
+    "SELECT runs.run_uuid FROM runs JOIN (SELECT params.run_uuid AS run_uuid FROM params "
+    "WHERE params.key = $1 AND params.value = $2) AS anon_1 ON runs.run_uuid = anon_1.run_uuid"
+)
+
+QUERY_LOG: str = f"""2024-01-01 00:00:00 UTC [42] LOG:  duration: 1500.250 ms  statement: {SEARCH_BY_PARAM}
+2024-01-01 00:00:01 UTC [42] LOG:  duration: 5.000 ms  statement: SELECT 1
+2024-01-01 00:00:02 UTC [42] LOG:  duration: 800.000 ms  execute <unnamed>: SELECT metrics.value FROM metrics
+\tWHERE metrics.run_uuid = $1 AND metrics.key = $2
+# Time: 2024-01-01T00:00:03
+# Query_time: 2.5  Lock_time: 0.0 Rows_sent: 1  Rows_examined: 100000
+SET timestamp=1704067203;
+SELECT `latest_metrics` . `run_uuid` FROM `latest_metrics` WHERE `latest_metrics` . `key` = ? AND `latest_metrics` . `value` > ? ;
+"""
+
+
+class TestIndexAdvisor(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = os.path.join(self.tmp_dir, "mydb.sqlite")
+        shutil.copyfile(FIXTURE_STORE, self.store)
+        self.query_log = os.path.join(self.tmp_dir, "queries.log")
+        with open(file=self.query_log, mode="w", encoding="utf-8") as file:
+            file.write(QUERY_LOG)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def indexes(self) -> set[str]:
+        with sqlite3.connect(self.store) as connection:
+            return {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+    def test_init_validates(self):
+        with self.assertRaises(ValueError):
+            IndexAdvisor(backend_store_uri=f"sqlite:///{self.store}", slow_query_ms=-1)
+        with self.assertRaises(ValueError):
+            IndexAdvisor(backend_store_uri=f"sqlite:///{self.store}", query_log="/missing/queries.log")
+
+    def test_read_query_log(self):
+        self.assertEqual(
+            read_query_log(path=self.query_log, slow_query_ms=100),
+            [
+                (SEARCH_BY_PARAM, 1, 1500.25),
+                ("SELECT metrics.value FROM metrics WHERE metrics.run_uuid = $1 AND metrics.key = $2", 1, 800.0),
+                (
+                    "SELECT `latest_metrics` . `run_uuid` FROM `latest_metrics` WHERE `latest_metrics` . `key` = ? AND `latest_metrics` . `value` > ? ;",
+                    1,
+                    2500.0,
+                ),
+            ],
+        )
+        self.assertEqual(len(read_query_log(path=self.query_log)), 4)
+
+    def test_serves(self):
+        self.assertTrue(serves(statement=SEARCH_BY_PARAM, table="params", columns=["key", "value"]))
+        self.assertFalse(serves(statement=SEARCH_BY_PARAM, table="tags", columns=["key", "value"]))
+        # Selecting the column is not filtering by it.
+        self.assertFalse(serves(statement=SEARCH_BY_PARAM, table="params", columns=["run_uuid"]))
+        statement: str = 'SELECT 1 FROM latest_metrics WHERE "latest_metrics"."key" = $1'
+        self.assertTrue(serves(statement=statement, table="latest_metrics", columns=["key"]))
+        self.assertFalse(serves(statement=statement, table="metrics", columns=["key"]))
+
+    def test_definitions(self):
+        self.assertEqual(
+            IndexAdvisor._definition(
+                dialect=postgresql.dialect(), table="params", columns=["key", "value"], include=["run_uuid"]
+            ),
+            (
+                "index_params_value_hash",
+                ["value"],
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS index_params_value_hash ON params USING hash (value)",
+            ),
+        )
+        self.assertEqual(
+            IndexAdvisor._definition(
+                dialect=postgresql.dialect(), table="latest_metrics", columns=["key", "value"], include=["run_uuid"]
+            )[2],
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS index_latest_metrics_key_value_advised ON latest_metrics "
+            "(key, value) INCLUDE (run_uuid)",
+        )
+        self.assertEqual(
+            IndexAdvisor._definition(
+                dialect=mysql.dialect(), table="tags", columns=["key", "value"], include=["run_uuid"]
+            )[2],
+            "CREATE INDEX index_tags_key_value_advised ON tags (`key`, value(255)) ALGORITHM=INPLACE LOCK=NONE",
+        )
+
+    def test_plan_without_workload(self):
+        report = IndexAdvisor(backend_store_uri=f"sqlite:///{self.store}").plan()
+
+        self.assertTrue(report.dry_run)
+        self.assertIsNone(report.sampled)
+        self.assertEqual(list(report.tables), ["params", "tags", "latest_metrics", "metrics"])
+        self.assertEqual(
+            [recommendation.name for recommendation in report.recommendations],
+            [
+                "index_params_key_value_advised",
+                "index_tags_key_value_advised",
+                "index_latest_metrics_key_value_advised",
+                "index_metrics_run_uuid_key_advised",
+            ],
+        )
+        self.assertEqual(report.maintenance[0], ("ANALYZE params", None))
+        # Nothing was executed.
+        self.assertNotIn("index_params_key_value_advised", self.indexes())
+
+    def test_plan_from_query_log(self):
+        report = IndexAdvisor(backend_store_uri=f"sqlite:///{self.store}", query_log=self.query_log).plan()
+
+        self.assertEqual(report.sampled, 3)
+        self.assertEqual(
+            [(item.table, item.statements, item.total_ms) for item in report.recommendations],
+            [("params", 1, 1500.25), ("latest_metrics", 1, 2500.0), ("metrics", 1, 800.0)],
+        )
+
+    def test_run(self):
+        advisor = IndexAdvisor(backend_store_uri=f"sqlite:///{self.store}", vacuum=True)
+
+        report = advisor.run(create_indexes=False)
+        self.assertFalse(report.dry_run)
+        self.assertNotIn("index_params_key_value_advised", self.indexes())
+        self.assertEqual(report.maintenance[-1][0], "VACUUM")
+        self.assertTrue(all(elapsed is not None for _, elapsed in report.maintenance))
+
+        report = advisor.run(create_indexes=True)
+        self.assertTrue(all(item.elapsed is not None and item.error is None for item in report.recommendations))
+        self.assertLessEqual({item.name for item in report.recommendations}, self.indexes())
+        # Created indexes are not recommended again.
+        self.assertEqual(advisor.plan().recommendations, [])
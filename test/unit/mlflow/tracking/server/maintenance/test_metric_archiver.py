@@ -0,0 +1,125 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from src.mlflow.tracking.server.maintenance.metric_archiver import ROW_BYTES, MetricArchiver
+from src.mlflow.tracking.server.wsgi.artifact_stores import LocalArtifactStore
+from src.mlflow.tracking.server.wsgi.metric_archive import MetricArchive
+
+FIXTURE_STORE: str = "test/fixtures/mlflow/local/store/mydb.sqlite"
+DAY: int = 24 * 60 * 60 * 1000
+STEPS: int = 50
+
+
+class TestMetricArchiver(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = os.path.join(self.tmp_dir, "mydb.sqlite")
+        self.archive = MetricArchive(
+            store=LocalArtifactStore(root=os.path.join(self.tmp_dir, "artifacts"), part_size=1024, concurrency=1)
+        )
+        shutil.copyfile(FIXTURE_STORE, self.store)
+
+        now = int(time.time() * 1000)
+        with sqlite3.connect(self.store) as connection:
+            runs = [
+                ("run0", "FINISHED", "active", now - 100 * DAY),
+                ("run1", "FAILED", "active", now - 100 * DAY),
+                ("run2", "FINISHED", "active", now - 1 * DAY),
+                ("run3", "RUNNING", "active", None),
+                ("run4", "FINISHED", "deleted", now - 100 * DAY),
+            ]
+            for run_id, status, stage, end_time in runs:
+                connection.execute(
+                    "INSERT INTO runs (run_uuid, name, source_type, status, lifecycle_stage, artifact_uri, "
+                    "experiment_id, end_time) VALUES (?, ?, 'LOCAL', ?, ?, ?, 0, ?)",
+                    (run_id, run_id, status, stage, f"mlflow-artifacts:/0/{run_id}/artifacts", end_time),
+                )
+                for step in range(STEPS):
+                    connection.execute(
+                        "INSERT INTO metrics VALUES ('loss', ?, ?, ?, ?, 0)", (1.0 / (step + 1), step, run_id, step)
+                    )
+                connection.execute("INSERT INTO latest_metrics VALUES ('loss', 0.02, 49, 49, 0, ?)", (run_id,))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def build_archiver(self, **kwargs) -> MetricArchiver:
+        return MetricArchiver(
+            backend_store_uri=f"sqlite:///{self.store}", archive=self.archive, older_than=timedelta(days=30), **kwargs
+        )
+
+    def remaining(self, table: str) -> dict[str, int]:
+        with sqlite3.connect(self.store) as connection:
+            return dict(connection.execute(f"SELECT run_uuid, COUNT(*) FROM {table} GROUP BY run_uuid").fetchall())
+
+    def test_init_validates(self):
+        with self.assertRaises(ValueError):
+            self.build_archiver(batch_size=0)
+        with self.assertRaises(ValueError):
+            self.build_archiver(workers=0)
+
+    def test_dry_run(self):
+        report = self.build_archiver(batch_size=1).run(dry_run=True)
+
+        self.assertTrue(report.dry_run)
+        self.assertEqual(report.runs, 2)
+        self.assertEqual(report.rows, 2 * STEPS)
+        self.assertEqual(report.table_bytes, 2 * STEPS * (len("loss") + ROW_BYTES))
+        self.assertEqual(report.archive_bytes, 0)
+        self.assertEqual(self.remaining("metrics"), {f"run{index}": STEPS for index in range(5)})
+        self.assertIsNone(self.archive.stat(run_id="run0"))
+
+    def test_run(self):
+        report = self.build_archiver(batch_size=1, workers=2).run(dry_run=False)
+
+        self.assertEqual((report.runs, report.rows, report.failures), (2, 2 * STEPS, 0))
+        self.assertGreater(report.archive_bytes, 0)
+        self.assertEqual(self.remaining("metrics"), {"run2": STEPS, "run3": STEPS, "run4": STEPS})
+        self.assertEqual(self.remaining("latest_metrics"), {f"run{index}": 1 for index in range(5)})
+        history = self.archive.history(run_id="run1", metric_key="loss")
+        self.assertEqual(len(history), STEPS)
+        self.assertEqual(history[-1], ("loss", 1.0 / STEPS, STEPS - 1, STEPS - 1))
+
+        # Archived runs are not archived again.
+        self.assertEqual(self.build_archiver().run(dry_run=False).runs, 0)
+
+    def test_metrics_logged_while_archiving_are_kept(self):
+        archiver = self.build_archiver()
+        write = self.archive.write
+
+        def logging_write(run_id, columns):
+            with sqlite3.connect(self.store) as connection:
+                connection.execute("INSERT INTO metrics VALUES ('late', 1.0, 1, ?, 0, 0)", (run_id,))
+            return write(run_id=run_id, columns=columns)
+
+        with patch.object(self.archive, "write", side_effect=logging_write):
+            report = archiver.run(dry_run=False)
+
+        self.assertEqual((report.runs, report.failures), (0, 2))
+        self.assertEqual(self.remaining("metrics")["run0"], STEPS + 1)
+
+        # The next archival merges the archive written meanwhile.
+        self.assertEqual(self.build_archiver().run(dry_run=False).rows, 2 * (STEPS + 1))
+        self.assertEqual(len(self.archive.history(run_id="run0", metric_key="loss")), STEPS)
+        self.assertEqual(len(self.archive.history(run_id="run0", metric_key="late")), 1)
+
+    def test_stop(self):
+        archiver = self.build_archiver(batch_size=1)
+        original = archiver._archive_batch
+
+        def stopping(**kwargs):
+            archiver.stop()
+            return original(**kwargs)
+
+        with patch.object(archiver, "_archive_batch", side_effect=stopping):
+            report = archiver.run(dry_run=False)
+
+        self.assertEqual(report.runs, 1)
+        self.assertEqual(self.remaining("metrics").get("run0"), None)
+        self.assertEqual(self.remaining("metrics")["run1"], STEPS)
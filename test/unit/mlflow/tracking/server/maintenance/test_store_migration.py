@@ -0,0 +1,127 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.mlflow.tracking.server.maintenance.store_migration import StoreMigration
+
+FIXTURE_STORE: str = "test/fixtures/mlflow/local/store/mydb.sqlite"
+RUNS: int = 25
+STEPS: int = 10
+
+
+class TestStoreMigration(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmp_dir, "source.sqlite")
+        self.target = os.path.join(self.tmp_dir, "target.sqlite")
+        self.source_artifacts = os.path.join(self.tmp_dir, "source-artifacts")
+        self.target_artifacts = os.path.join(self.tmp_dir, "target-artifacts")
+        self.checkpoint = os.path.join(self.tmp_dir, "checkpoint.json")
+        shutil.copyfile(FIXTURE_STORE, self.source)
+        # The target schema exists (at the same revision) and is empty.
+        shutil.copyfile(FIXTURE_STORE, self.target)
+        with sqlite3.connect(self.target) as connection:
+            connection.execute("DELETE FROM experiments")
+
+        with sqlite3.connect(self.source) as connection:
+            for index in range(RUNS):
+                run_id = f"run{index:02d}"
+                connection.execute(
+                    "INSERT INTO runs (run_uuid, name, source_type, status, lifecycle_stage, artifact_uri, "
+                    "experiment_id) VALUES (?, ?, 'LOCAL', 'FINISHED', 'active', ?, 0)",
+                    (run_id, run_id, f"mlflow-artifacts:/0/{run_id}/artifacts"),
+                )
+                connection.execute("INSERT INTO params VALUES ('alpha', '0.1', ?)", (run_id,))
+                for step in range(STEPS):
+                    connection.execute("INSERT INTO metrics VALUES ('loss', ?, ?, ?, ?, 0)", (step, step, run_id, step))
+        os.makedirs(os.path.join(self.source_artifacts, "0", "run03", "artifacts"))
+        with open(os.path.join(self.source_artifacts, "0", "run03", "artifacts", "model.bin"), "wb") as file:
+            file.write(b"0" * 1000)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def build_migration(self, **kwargs) -> StoreMigration:
+        return StoreMigration(
+            source_uri=f"sqlite:///{self.source}",
+            target_uri=f"sqlite:///{self.target}",
+            source_artifacts=self.source_artifacts,
+            target_artifacts=self.target_artifacts,
+            batch_size=10,
+            chunk_size=7,
+            checkpoint_path=self.checkpoint,
+            **kwargs,
+        )
+
+    def count(self, table: str) -> int:
+        with sqlite3.connect(self.target) as connection:
+            return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_init_validates(self):
+        with self.assertRaises(ValueError):
+            self.build_migration(workers=0)
+        with self.assertRaises(ValueError):
+            StoreMigration(source_uri="sqlite:///a.db", target_uri="sqlite:///a.db")
+        with self.assertRaises(ValueError):
+            StoreMigration(source_uri="sqlite:///a.db", target_uri="sqlite:///b.db", target_artifacts="/tmp/b")
+
+    def test_dry_run(self):
+        report = self.build_migration().run(dry_run=True)
+
+        self.assertTrue(report.dry_run)
+        self.assertEqual(report.tables["runs"], RUNS)
+        self.assertEqual(report.tables["metrics"], RUNS * STEPS)
+        self.assertNotIn("alembic_version", report.tables)
+        self.assertEqual(report.artifact_runs, RUNS)
+        self.assertEqual(self.count("runs"), 0)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_run(self):
+        report = self.build_migration().run(dry_run=False)
+
+        self.assertEqual((report.tables["runs"], report.tables["params"]), (RUNS, RUNS))
+        self.assertEqual(report.rows, 1 + RUNS * (STEPS + 2))
+        self.assertEqual((report.artifact_runs, report.artifact_bytes, report.failures), (RUNS, 1000, 0))
+        self.assertEqual((self.count("experiments"), self.count("runs")), (1, RUNS))
+        self.assertEqual(self.count("metrics"), RUNS * STEPS)
+        self.assertTrue(os.path.isfile(os.path.join(self.target_artifacts, "0", "run03", "artifacts", "model.bin")))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_run_resumes_from_checkpoint(self):
+        migration = self.build_migration()
+        copy_table = migration._copy_table
+
+        def stopping(name, **kwargs):
+            copy_table(name=name, **kwargs)
+            if name == "runs":
+                migration.stop()
+
+        with patch.object(migration, "_copy_table", side_effect=stopping):
+            report = migration.run(dry_run=False)
+
+        self.assertEqual(report.tables["runs"], RUNS)
+        self.assertEqual(self.count("metrics"), 0)
+        with open(self.checkpoint, encoding="utf-8") as file:
+            self.assertIn("runs", json.load(file)["completed"])
+
+        # Rows copied again are skipped.
+        with sqlite3.connect(self.target) as connection:
+            connection.execute("INSERT INTO params VALUES ('alpha', '0.1', 'run00')")
+        report = self.build_migration().run(dry_run=False)
+
+        self.assertEqual(report.tables["runs"], RUNS)
+        self.assertEqual(self.count("runs"), RUNS)
+        self.assertEqual(self.count("params"), RUNS)
+        self.assertEqual(self.count("metrics"), RUNS * STEPS)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_schema_revisions_must_match(self):
+        with sqlite3.connect(self.target) as connection:
+            connection.execute("UPDATE alembic_version SET version_num = 'other'")
+
+        with self.assertRaises(ValueError):
+            self.build_migration().run(dry_run=False)
@@ -0,0 +1,76 @@
+import io
+import json
+import subprocess
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+from src.mlflow.tracking.server.contracts.types.log_format import LogFormat
+from src.mlflow.tracking.server.process.log_forwarder import MAX_LINE_SIZE, LogForwarder
+
+
+def run_python(forwarder: LogForwarder, name: str, code: str) -> None:
+    with subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, stderr=subprocess.PIPE) as process:
+        forwarder.add(name=name, process=process)
+        process.wait()
+        forwarder.drain()
+
+
+class TestLogForwarder(unittest.TestCase):
+    def test_prefixed_captures_stdout_and_stderr(self):
+        output = io.BytesIO()
+        with LogForwarder(output=output, log_format=LogFormat.PREFIXED) as forwarder:
+            run_python(forwarder, "mock", "import sys; print('out'); print('err', file=sys.stderr)")
+        lines = sorted(output.getvalue().decode("utf-8").splitlines())
+        self.assertEqual(lines, ["[mock] err", "[mock] out"])
+        self.assertEqual(forwarder.lines_forwarded, 2)
+
+    def test_raw_forwards_partial_last_line(self):
+        output = io.BytesIO()
+        with LogForwarder(output=output, log_format=LogFormat.RAW) as forwarder:
+            run_python(forwarder, "mock", "import sys; sys.stdout.write('first\\nsecond')")
+        self.assertEqual(output.getvalue(), b"first\nsecond\n")
+
+    def test_splits_overlong_lines(self):
+        output = io.BytesIO()
+        with LogForwarder(output=output, log_format=LogFormat.RAW) as forwarder:
+            run_python(forwarder, "mock", f"import sys; sys.stdout.write('x' * {2 * MAX_LINE_SIZE + 3})")
+        self.assertEqual([len(line) for line in output.getvalue().split(b"\n")], [MAX_LINE_SIZE, MAX_LINE_SIZE, 3, 0])
+
+    def test_json_records(self):
+        output = io.BytesIO()
+        with LogForwarder(output=output, log_format=LogFormat.JSON) as forwarder:
+            run_python(forwarder, "mock", "import sys; print('hello', file=sys.stderr)")
+        records = [json.loads(line) for line in output.getvalue().decode("utf-8").splitlines()]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["source"], "mock")
+        self.assertEqual(records[0]["stream"], "stderr")
+        self.assertEqual(records[0]["message"], "hello")
+        self.assertIn("timestamp", records[0])
+
+    def test_rate_limit_drops_and_reports(self):
+        output = io.BytesIO()
+        with LogForwarder(output=output, log_format=LogFormat.RAW, max_lines_per_second=10) as forwarder:
+            run_python(forwarder, "mock", "print('\\n'.join(str(i) for i in range(1000)))")
+        self.assertEqual(forwarder.lines_forwarded + forwarder.lines_dropped, 1000)
+        self.assertGreater(forwarder.lines_dropped, 0)
+        self.assertIn(b"dropped log lines (mock: ", output.getvalue())
+
+    def test_counts_lines_in_metrics(self):
+        metrics = MagicMock()
+        with LogForwarder(output=io.BytesIO(), metrics=metrics) as forwarder:
+            run_python(forwarder, "mock", "print('a'); print('b')")
+
+        metrics.log_lines_forwarded.labels.assert_called_with(process="mock")
+        self.assertEqual(
+            sum(call.args[0] for call in metrics.log_lines_forwarded.labels.return_value.inc.call_args_list), 2
+        )
+
+    def test_rejects_invalid_rate_limit(self):
+        with self.assertRaises(ValueError):
+            LogForwarder(max_lines_per_second=0)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestLogForwarder())
@@ -0,0 +1,164 @@
+import shlex
+import signal
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.mlflow.tracking.server.contracts.dto.process_definition import ProcessDefinition
+from src.mlflow.tracking.server.contracts.dto.restart_policy import RestartPolicy
+from src.mlflow.tracking.server.process.crash_loop_error import CrashLoopError
+from src.mlflow.tracking.server.process.supervisor import ProcessSupervisor, _SupervisedProcess
+
+
+def python_cmd(code: str) -> str:
+    return f"{shlex.quote(sys.executable)} -c {shlex.quote(code)}"
+
+
+class TestProcessSupervisor(unittest.TestCase):
+    def _run_in_thread(self, supervisor: ProcessSupervisor) -> threading.Thread:
+        thread = threading.Thread(target=supervisor.run, daemon=True)
+        thread.start()
+        return thread
+
+    def test_requires_unique_names(self):
+        with self.assertRaises(ValueError):
+            ProcessSupervisor(
+                definitions=[
+                    ProcessDefinition(name="mock", shell_out_cmd="mock"),
+                    ProcessDefinition(name="mock", shell_out_cmd="mock"),
+                ]
+            )
+
+    def test_restarts_crashed_process(self):
+        supervisor = ProcessSupervisor(
+            definitions=[ProcessDefinition(name="crash", shell_out_cmd=python_cmd("import sys; sys.exit(3)"))],
+            policy=RestartPolicy(initial_backoff=0.01, max_backoff=0.01, max_restarts=1000),
+            poll_interval=0.01,
+        )
+        thread = self._run_in_thread(supervisor)
+        deadline = time.monotonic() + 10
+        while supervisor.restart_counts()["crash"] < 3 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        supervisor.stop()
+        thread.join(timeout=10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertGreaterEqual(supervisor.restart_counts()["crash"], 3)
+
+    def test_detects_crash_loop(self):
+        supervisor = ProcessSupervisor(
+            definitions=[
+                ProcessDefinition(name="stable", shell_out_cmd=python_cmd("import time; time.sleep(30)")),
+                ProcessDefinition(name="crash", shell_out_cmd=python_cmd("import sys; sys.exit(1)")),
+            ],
+            policy=RestartPolicy(initial_backoff=0.01, max_backoff=0.01, max_restarts=2, restart_window=60),
+            poll_interval=0.01,
+        )
+        with self.assertRaises(CrashLoopError):
+            supervisor.run()
+
+        # The rest of the group is stopped as well.
+        self.assertIsNotNone(supervisor.processes["stable"].returncode)
+
+    def test_stop_forwards_signal(self):
+        supervisor = ProcessSupervisor(
+            definitions=[ProcessDefinition(name="sleep", shell_out_cmd=python_cmd("import time; time.sleep(30)"))],
+            poll_interval=0.01,
+        )
+        thread = self._run_in_thread(supervisor)
+        while supervisor.processes["sleep"] is None:
+            time.sleep(0.01)
+        supervisor.stop()
+        thread.join(timeout=10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(supervisor.processes["sleep"].returncode, -signal.SIGTERM)
+
+    def test_reports_ready_once_started(self):
+        ready = threading.Event()
+        supervisor = ProcessSupervisor(
+            definitions=[ProcessDefinition(name="sleep", shell_out_cmd=python_cmd("import time; time.sleep(30)"))],
+            poll_interval=0.01,
+            on_ready=ready.set,
+        )
+        thread = self._run_in_thread(supervisor)
+
+        self.assertTrue(ready.wait(timeout=10))
+        self.assertIsNotNone(supervisor.processes["sleep"])
+        supervisor.stop()
+        thread.join(timeout=10)
+
+    def test_rolling_restart(self):
+        supervisor = ProcessSupervisor(
+            definitions=[
+                ProcessDefinition(name="first", shell_out_cmd=python_cmd("import time; time.sleep(30)")),
+                ProcessDefinition(name="second", shell_out_cmd=python_cmd("import time; time.sleep(30)")),
+            ],
+            poll_interval=0.01,
+        )
+        thread = self._run_in_thread(supervisor)
+        while None in supervisor.processes.values():
+            time.sleep(0.01)
+        previous = supervisor.processes
+        supervisor.restart()
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and any(
+            supervisor.processes[name] is process for name, process in previous.items()
+        ):
+            time.sleep(0.05)
+        supervisor.stop()
+        thread.join(timeout=10)
+
+        self.assertFalse(thread.is_alive())
+        for name, process in previous.items():
+            self.assertEqual(process.returncode, -signal.SIGTERM)
+            self.assertIsNot(supervisor.processes[name], process)
+        # Planned restarts are not crashes.
+        self.assertEqual(supervisor.restart_counts(), {"first": 0, "second": 0})
+
+    def test_stop_kills_after_drain_timeout(self):
+        code: str = (
+            "import signal, sys, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+            "print('ready', flush=True); time.sleep(30)"
+        )
+        supervisor = ProcessSupervisor(
+            definitions=[ProcessDefinition(name="stubborn", shell_out_cmd=python_cmd(code))],
+            drain_timeout=0.5,
+            poll_interval=0.01,
+        )
+        thread = self._run_in_thread(supervisor)
+        while supervisor.processes["stubborn"] is None:
+            time.sleep(0.01)
+        time.sleep(0.5)
+        supervisor.stop()
+        thread.join(timeout=10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(supervisor.processes["stubborn"].returncode, -signal.SIGKILL)
+
+    def test_exponential_backoff(self):
+        supervisor = ProcessSupervisor(
+            definitions=[],
+            policy=RestartPolicy(initial_backoff=1, max_backoff=5, multiplier=2, max_restarts=100, stable_after=60),
+        )
+        child = _SupervisedProcess(ProcessDefinition(name="mock", shell_out_cmd="mock"))
+        child.process = MagicMock()
+
+        delays: list[float] = []
+        for now in range(5):
+            child.started_at = now
+            supervisor._schedule_restart(child=child, now=now)
+            delays.append(child.restart_at - now)
+        self.assertEqual(delays, [1, 2, 4, 5, 5])
+
+        # A process which stayed up long enough starts over with the initial backoff.
+        child.started_at = 100
+        supervisor._schedule_restart(child=child, now=200)
+        self.assertEqual(child.restart_at - 200, 1)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestProcessSupervisor())
@@ -0,0 +1,291 @@
+import base64
+import http.client
+import json
+import threading
+import time
+import unittest
+from email.message import Message
+from http.server import ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+from src.mlflow.tracking.server.contracts.types.priority_class import PriorityClass
+from src.mlflow.tracking.server.contracts.types.rate_limit_scope import RateLimitScope
+from src.mlflow.tracking.server.contracts.types.route_class import RouteClass
+from src.mlflow.tracking.server.proxy.admission import (
+    AdmissionControl,
+    AdmissionQueue,
+    AdmissionRouter,
+    RateLimiter,
+    classify_priority,
+    request_client,
+    request_user,
+)
+from src.mlflow.tracking.server.proxy.request_rejected_error import RequestRejectedError
+
+from .test_router import MockUpstreamHandler
+
+
+class MockRunHandler(MockUpstreamHandler):
+    def do_GET(self):
+        if not self.path.startswith("/api/2.0/mlflow/runs/get"):
+            self._reply()
+            return
+        self.server.lookups += 1
+        found: bool = "run_id=run1" in self.path
+        payload: bytes = json.dumps({"run": {"info": {"experiment_id": "7"}}} if found else {}).encode("utf-8")
+        self.send_response(200 if found else 404)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def headers(**values: str) -> Message:
+    message = Message()
+    for name, value in values.items():
+        message[name.replace("_", "-")] = value
+    return message
+
+
+class TestRequestIdentity(unittest.TestCase):
+    def test_classify_priority(self):
+        for method, path, priority in [
+            ("GET", "/", PriorityClass.INTERACTIVE),
+            ("GET", "/static-files/js/main.js", PriorityClass.INTERACTIVE),
+            ("POST", "/ajax-api/2.0/mlflow/runs/search", PriorityClass.INTERACTIVE),
+            ("GET", "/api/2.0/mlflow/registered-models/search", PriorityClass.INTERACTIVE),
+            ("POST", "/api/2.0/mlflow/model-versions/create", PriorityClass.INTERACTIVE),
+            ("POST", "/api/2.0/mlflow/runs/search", PriorityClass.STANDARD),
+            ("POST", "/api/2.0/mlflow/runs/create", PriorityClass.STANDARD),
+            ("GET", "/api/2.0/mlflow-artifacts/artifacts/0/run1/artifacts/model.pkl", PriorityClass.STANDARD),
+            ("POST", "/api/2.0/mlflow/runs/log-batch", PriorityClass.BULK),
+            ("POST", "/ajax-api/2.0/mlflow/runs/set-tag?x=1", PriorityClass.BULK),
+            ("PUT", "/api/2.0/mlflow-artifacts/artifacts/0/run1/artifacts/model.pkl", PriorityClass.BULK),
+        ]:
+            self.assertEqual(classify_priority(method, path), priority, path)
+
+    def test_request_user_and_client(self):
+        basic: str = "Basic " + base64.b64encode(b"alice:guessed").decode()
+        spoofed: Message = headers(Authorization=basic, X_Forwarded_User="bob", X_Forwarded_For="10.9.9.9")
+        # Without a trusted proxy, the headers are the client's own claims.
+        self.assertIsNone(request_user(spoofed, trusted_proxy=False))
+        self.assertEqual(request_client(spoofed, "10.0.0.5", trusted_proxy=False), "10.0.0.5")
+
+        # The proxy names the user and appends the address it received the request from.
+        self.assertEqual(request_user(spoofed, trusted_proxy=True), "bob")
+        self.assertIsNone(request_user(headers(Authorization=basic), trusted_proxy=True))
+        self.assertEqual(
+            request_client(headers(X_Forwarded_For="10.9.9.9, 10.0.0.1"), "127.0.0.1", trusted_proxy=True), "10.0.0.1"
+        )
+        self.assertEqual(request_client(headers(), "127.0.0.1", trusted_proxy=True), "127.0.0.1")
+
+    def test_limit_keys(self):
+        admission = AdmissionControl(
+            queues={route_class: AdmissionQueue(concurrency=1) for route_class in RouteClass},
+            limiter=RateLimiter(rate=1, burst=1),
+            scopes=["client", RateLimitScope.USER, RateLimitScope.EXPERIMENT],
+            trusted_proxy=True,
+        )
+        experiment_of = MagicMock(return_value="7")
+
+        self.assertTrue(admission.reads_bodies)
+        self.assertEqual(
+            admission.limit_keys(headers(X_Forwarded_User="bob"), "10.0.0.1", {"experiment_id": "3"}, experiment_of),
+            ["client:10.0.0.1", "user:bob", "experiment:3"],
+        )
+        self.assertEqual(
+            admission.limit_keys(headers(), "10.0.0.1", {"run_id": "run1"}, experiment_of),
+            ["client:10.0.0.1", "experiment:7"],
+        )
+        experiment_of.assert_called_once_with("run1")
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_init_validates(self):
+        for kwargs in [{"rate": 0, "burst": 1}, {"rate": 1, "burst": 0}]:
+            with self.assertRaises(ValueError):
+                RateLimiter(**kwargs)
+
+    def test_acquire(self):
+        limiter = RateLimiter(rate=10, burst=2, max_buckets=2)
+
+        with patch("src.mlflow.tracking.server.proxy.admission.time.monotonic", return_value=100.0) as patched:
+            self.assertEqual([limiter.acquire(["client:a"]) for _ in range(2)], [0.0, 0.0])
+            self.assertAlmostEqual(limiter.acquire(["client:a"]), 0.1)
+            # A request takes a token from every bucket only if each has one.
+            self.assertAlmostEqual(limiter.acquire(["client:b", "client:a"]), 0.1)
+            self.assertEqual(limiter.acquire(["client:b"]), 0.0)
+
+            patched.return_value = 100.2
+            self.assertEqual(limiter.acquire(["client:a"]), 0.0)
+            # The least recently seen identity is forgotten.
+            limiter.acquire(["client:c"])
+            self.assertEqual(list(limiter._buckets), ["client:a", "client:c"])
+
+
+class TestAdmissionQueue(unittest.TestCase):
+    def test_init_validates(self):
+        for kwargs in [{"concurrency": 0}, {"max_queue": 0}, {"max_latency": 0}]:
+            with self.assertRaises(ValueError):
+                AdmissionQueue(**{"concurrency": 1, **kwargs})
+
+    def test_queued_requests_are_served_by_priority(self):
+        queue = AdmissionQueue(concurrency=1, max_latency=5)
+        admitted: float = queue.admit(PriorityClass.STANDARD)
+        served: list[str] = []
+
+        def request(priority: PriorityClass):
+            served.append(priority.value if queue.admit(priority) is not None else "shed")
+            queue.release(time.monotonic())
+
+        threads: list[threading.Thread] = []
+        for priority in [PriorityClass.BULK, PriorityClass.STANDARD, PriorityClass.INTERACTIVE]:
+            threads.append(threading.Thread(target=request, args=(priority,)))
+            threads[-1].start()
+            while len(queue._waiting) < len(threads):
+                time.sleep(0.01)
+        queue.release(admitted)
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(served, ["interactive", "standard", "bulk"])
+        self.assertEqual(queue._active, 0)
+
+    def test_requests_are_shed(self):
+        queue = AdmissionQueue(concurrency=1, max_queue=1, max_latency=0.05)
+        queue.admit(PriorityClass.STANDARD)
+
+        # waited too long
+        self.assertIsNone(queue.admit(PriorityClass.INTERACTIVE))
+
+        # full: the lowest priority request is shed for a higher priority one
+        queue.max_latency = 5
+        results: dict = {}
+        bulk = threading.Thread(target=lambda: results.update(bulk=queue.admit(PriorityClass.BULK)))
+        bulk.start()
+        while not queue._waiting:
+            time.sleep(0.01)
+        self.assertIsNone(queue.admit(PriorityClass.BULK))
+        interactive = threading.Thread(
+            target=lambda: results.update(interactive=queue.admit(PriorityClass.INTERACTIVE))
+        )
+        interactive.start()
+        bulk.join(5)
+        self.assertIsNone(results["bulk"])
+        queue.release(time.monotonic())
+        interactive.join(5)
+        self.assertIsNotNone(results["interactive"])
+
+        # expected to wait longer than allowed
+        queue._service_time = 10.0
+        self.assertIsNone(queue.admit(PriorityClass.STANDARD))
+
+    def test_admission_control_rejects(self):
+        metrics = MagicMock()
+        queue = AdmissionQueue(concurrency=1, max_latency=0.05)
+        admission = AdmissionControl(
+            queues={route_class: queue for route_class in RouteClass},
+            limiter=RateLimiter(rate=1, burst=1),
+            metrics=metrics,
+        )
+        with self.assertRaises(ValueError):
+            AdmissionControl(queues={RouteClass.READ: queue})
+
+        admitted: float = admission.admit(RouteClass.READ, PriorityClass.STANDARD, ["client:a"])
+        with self.assertRaises(RequestRejectedError) as context:
+            admission.admit(RouteClass.READ, PriorityClass.STANDARD, ["client:a"])
+        self.assertGreater(context.exception.retry_after, 0)
+        with self.assertRaises(RequestRejectedError) as context:
+            admission.admit(RouteClass.WRITE, PriorityClass.BULK, ["client:b"])
+        self.assertEqual(context.exception.retry_after, 0.05)
+        admission.release(RouteClass.READ, admitted)
+
+        self.assertEqual(
+            [call.kwargs for call in metrics.requests_rejected.labels.call_args_list],
+            [{"reason": "rate_limit", "priority": "standard"}, {"reason": "overload", "priority": "bulk"}],
+        )
+
+
+class TestAdmissionRouter(unittest.TestCase):
+    def setUp(self):
+        self.upstream = ThreadingHTTPServer(("127.0.0.1", 0), MockRunHandler)
+        self.upstream.pool_name = "tracking"
+        self.upstream.lookups = 0
+        threading.Thread(target=self.upstream.serve_forever, args=(0.05,), daemon=True).start()
+        self.queue = AdmissionQueue(concurrency=1, max_latency=0.05)
+        self.router = AdmissionRouter(
+            address="127.0.0.1",
+            port=0,
+            upstreams={route_class: ("127.0.0.1", self.upstream.server_address[1]) for route_class in RouteClass},
+            admission=AdmissionControl(
+                queues={route_class: self.queue for route_class in RouteClass},
+                limiter=RateLimiter(rate=0.01, burst=1),
+                scopes=[RateLimitScope.EXPERIMENT],
+            ),
+        )
+        threading.Thread(target=self.router.serve_forever, args=(0.05,), daemon=True).start()
+
+    def tearDown(self):
+        for server in [self.router, self.upstream]:
+            server.shutdown()
+            server.server_close()
+
+    def _request(self, method: str, path: str, body=None) -> http.client.HTTPResponse:
+        connection = http.client.HTTPConnection("127.0.0.1", self.router.server_address[1], timeout=5)
+        self.addCleanup(connection.close)
+        connection.request(method, path, body=body)
+        return connection.getresponse()
+
+    def test_requests_are_rate_limited_per_experiment(self):
+        body: bytes = json.dumps({"run_id": "run1", "key": "loss", "value": 0.5, "timestamp": 1}).encode()
+
+        response = self._request("POST", "/api/2.0/mlflow/runs/log-metric", body=body)
+        self.assertEqual((response.status, json.loads(response.read())["size"]), (200, len(body)))
+        response = self._request("POST", "/api/2.0/mlflow/runs/log-metric", body=body)
+        self.assertEqual(response.status, 429)
+        self.assertEqual(response.headers["Retry-After"], "100")
+        self.assertEqual(json.loads(response.read())["error_code"], "REQUEST_LIMIT_EXCEEDED")
+        # The experiment of the run is looked up once.
+        self.assertEqual(self.upstream.lookups, 1)
+
+        # other experiments, unknown runs and probes are not limited by it
+        for path in ["/api/2.0/mlflow/experiments/get?experiment_id=3", "/api/2.0/mlflow/runs/get?run_id=run2"]:
+            self.assertNotEqual(self._request("GET", path).status, 429)
+        self.assertEqual(self._request("GET", "/health").status, 200)
+
+    def test_requests_are_shed_when_overloaded(self):
+        admitted: float = self.queue.admit(PriorityClass.STANDARD)
+
+        response = self._request("GET", "/api/2.0/mlflow/experiments/search")
+        self.assertEqual((response.status, response.headers["Retry-After"]), (429, "1"))
+        response.read()
+        self.assertEqual(self._request("GET", "/health").status, 200)
+
+        self.queue.release(admitted)
+        self.assertEqual(self._request("GET", "/api/2.0/mlflow/experiments/search").status, 200)
+
+    def test_spoofed_identities_are_not_trusted(self):
+        self.router.admission = AdmissionControl(
+            queues={route_class: self.queue for route_class in RouteClass},
+            limiter=RateLimiter(rate=0.01, burst=1),
+            scopes=[RateLimitScope.CLIENT, RateLimitScope.USER],
+        )
+        statuses: list[int] = []
+        for number in range(3):
+            basic: str = "Basic " + base64.b64encode(f"user{number}:x".encode()).decode()
+            connection = http.client.HTTPConnection("127.0.0.1", self.router.server_address[1], timeout=5)
+            connection.request(
+                "GET",
+                "/api/2.0/mlflow/experiments/search",
+                headers={
+                    "X-Forwarded-For": f"10.0.0.{number}",
+                    "X-Forwarded-User": f"user{number}",
+                    "Authorization": basic,
+                },
+            )
+            response = connection.getresponse()
+            response.read()
+            connection.close()
+            statuses.append(response.status)
+
+        # Every request is limited as the peer address, whatever it claims.
+        self.assertEqual(statuses, [200, 429, 429])
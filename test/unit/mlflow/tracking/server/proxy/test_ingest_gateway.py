@@ -0,0 +1,311 @@
+import asyncio
+import http.client
+import json
+import math
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
+
+from src.mlflow.tracking.server.proxy.ingest_gateway import (
+    MAX_FLOAT,
+    IngestGateway,
+    IngestRequest,
+    IngestWriter,
+    asyncpg_dsn,
+    build_ingest_gateway_command,
+    build_rows,
+    parse_ingest_request,
+)
+from src.mlflow.tracking.server.proxy.param_conflict_error import ParamConflictError
+
+from .test_router import MockUpstreamHandler
+
+
+class MockWriter:
+    def __init__(self, accept: bool):
+        self.accept = accept
+        self.requests: list[IngestRequest] = []
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def submit(self, request):
+        self.requests.append(request)
+        return self.accept
+
+
+class MockConnection:
+    def __init__(self, active: list[str], params: list[tuple]):
+        self.active = active
+        self.params = params
+
+    async def fetch(self, query, *args):
+        if query.startswith("SELECT run_uuid FROM runs"):
+            return [{"run_uuid": run_id} for run_id in args[0] if run_id in self.active]
+        if query.startswith("INSERT INTO params"):
+            logged = {(run_id, key): value for run_id, key, value in self.params}
+            return [
+                {"run_uuid": run_id, "key": key}
+                for key, value, run_id in zip(*args)
+                if logged.setdefault((run_id, key), value) == value
+            ]
+        return [{"run_uuid": run_id, "key": key, "value": value} for run_id, key, value in self.params]
+
+
+class TestIngestParsing(unittest.TestCase):
+    def setUp(self):
+        # mlflow validates keys, values and batch limits
+        self.validation = patch(
+            "src.mlflow.tracking.server.proxy.ingest_gateway.validate_ingest", return_value=True
+        ).start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_asyncpg_dsn(self):
+        self.assertEqual(asyncpg_dsn("postgresql+psycopg2://user@host/mlflow"), "postgresql://user@host/mlflow")
+        self.assertEqual(
+            asyncpg_dsn("postgres://host/mlflow?sslmode=require"), "postgresql://host/mlflow?sslmode=require"
+        )
+        for uri in ["sqlite:///mydb.sqlite", "mysql://host/mlflow", "/tmp/mlruns"]:
+            with self.assertRaises(ValueError):
+                asyncpg_dsn(uri)
+
+    def test_build_ingest_gateway_command(self):
+        command = build_ingest_gateway_command(
+            address="0.0.0.0", port=8086, upstream=("127.0.0.1", 5000), connections=2, batch_size=500, max_latency=0.0
+        )
+
+        self.assertTrue(
+            command.endswith(
+                "-m src.mlflow.tracking.server.proxy.ingest_gateway --address 0.0.0.0 --port 8086 "
+                "--upstream 127.0.0.1:5000 --connections 2 --batch-size 500 --max-latency 0.0"
+            )
+        )
+
+    def test_parse_ingest_request(self):
+        request = parse_ingest_request(
+            "runs/log-metric", json.dumps({"run_id": "run1", "key": "loss", "value": 0.5, "timestamp": 10}).encode()
+        )
+        self.assertEqual(
+            (request.run_id, request.metrics, request.params, request.tags), ("run1", [("loss", 0.5, 10, 0)], [], [])
+        )
+
+        request = parse_ingest_request(
+            "runs/log-batch",
+            json.dumps(
+                {
+                    "run_id": "run1",
+                    "metrics": [{"key": "loss", "value": "NaN", "timestamp": 10, "step": 2}],
+                    "params": [{"key": "lr", "value": "0.1"}],
+                    "tags": [{"key": "team", "value": "ml"}],
+                }
+            ).encode(),
+        )
+        self.assertTrue(math.isnan(request.metrics[0][1]))
+        self.assertEqual((request.params, request.tags, request.rows), ([("lr", "0.1")], [("team", "ml")], 3))
+
+        self.assertEqual(
+            parse_ingest_request("runs/set-tag", b'{"run_uuid": "run1", "key": "team", "value": "ml"}').tags,
+            [("team", "ml")],
+        )
+        self.assertEqual(
+            parse_ingest_request("runs/log-parameter", b'{"run_id": "run1", "key": "lr", "value": "0.1"}').params,
+            [("lr", "0.1")],
+        )
+
+    def test_parse_ingest_request_leaves_requests_to_mlflow(self):
+        for endpoint, payload in [
+            ("runs/log-metric", "not json"),
+            ("runs/log-metric", '{"key": "loss", "value": 0.5, "timestamp": 10}'),
+            ("runs/log-metric", '{"run_id": "run1", "key": "loss", "value": true, "timestamp": 10}'),
+            ("runs/log-metric", '{"run_id": "run1", "key": "loss", "value": 0.5, "timestamp": 1.5}'),
+            ("runs/log-parameter", '{"run_id": "run1", "key": "lr", "value": 0.1}'),
+            ("runs/log-batch", '{"run_id": "run1"}'),
+            ("runs/log-batch", '{"run_id": "run1", "metrics": {}}'),
+            # mlflow also renames the run
+            ("runs/set-tag", '{"run_id": "run1", "key": "mlflow.runName", "value": "name"}'),
+        ]:
+            self.assertIsNone(parse_ingest_request(endpoint, payload.encode()), payload)
+
+        self.validation.return_value = False
+        self.assertIsNone(parse_ingest_request("runs/set-tag", b'{"run_id": "run1", "key": "", "value": ""}'))
+
+    def test_build_rows(self):
+        params, metrics, latest, tags = build_rows(
+            requests=[
+                IngestRequest(
+                    run_id="run1",
+                    metrics=[("loss", 1.0, 10, 0), ("loss", float("nan"), 20, 1), ("acc", float("inf"), 5, 0)],
+                    params=[("lr", "0.1")],
+                    tags=[("team", "ml")],
+                ),
+                IngestRequest(run_id="run1", metrics=[("loss", 2.0, 5, 1)], params=[], tags=[("team", "ai")]),
+                IngestRequest(run_id="run0", metrics=[("loss", 1.0, 10, 0)], params=[], tags=[]),
+                # ties with the NaN logged first, which stays the latest metric (as in mlflow)
+                IngestRequest(run_id="run1", metrics=[("loss", 0.0, 20, 1)], params=[], tags=[]),
+            ]
+        )
+
+        self.assertEqual(params, [("lr", "0.1", "run1")])
+        self.assertEqual(
+            metrics,
+            [
+                ("loss", 1.0, 10, 0, "run0", False),
+                ("acc", MAX_FLOAT, 5, 0, "run1", False),
+                ("loss", 1.0, 10, 0, "run1", False),
+                ("loss", 2.0, 5, 1, "run1", False),
+                ("loss", 0.0, 20, 1, "run1", False),
+                ("loss", 0.0, 20, 1, "run1", True),
+            ],
+        )
+        # The latest metric has the highest (step, timestamp, value).
+        self.assertEqual(
+            latest,
+            [
+                ("loss", 1.0, 10, 0, "run0", False),
+                ("acc", MAX_FLOAT, 5, 0, "run1", False),
+                ("loss", 0.0, 20, 1, "run1", True),
+            ],
+        )
+        self.assertEqual(tags, [("team", "ai", "run1")])
+
+
+class TestIngestWriter(unittest.TestCase):
+    def setUp(self):
+        self.writer = IngestWriter(backend_store_uri="postgresql://host/mlflow", connections=1, batch_size=4)
+
+    def test_init_validates(self):
+        for kwargs in [{"connections": 0}, {"batch_size": 0}, {"max_latency": -1}]:
+            with self.assertRaises(ValueError):
+                IngestWriter(backend_store_uri="postgresql://host/mlflow", **kwargs)
+        with self.assertRaises(ValueError):
+            IngestWriter(backend_store_uri="sqlite:///mydb.sqlite")
+
+    def test_requests_are_coalesced_into_batches(self):
+        batches: list[list[str]] = []
+
+        async def write(batch):
+            batches.append([request.run_id for request, _ in batch])
+
+        async def run():
+            queue = asyncio.Queue()
+            for run_id in ["run1", "run2", "run3"]:
+                queue.put_nowait(
+                    (IngestRequest(run_id=run_id, metrics=[], params=[("a", "1"), ("b", "2")], tags=[]), None)
+                )
+            queue.put_nowait(None)
+            await self.writer._write_continuously(queue=queue)
+
+        with patch.object(self.writer, "_write", side_effect=write):
+            asyncio.run(run())
+
+        self.assertEqual(batches, [["run1", "run2"], ["run3"]])
+
+    def test_accepted(self):
+        requests = [
+            IngestRequest(run_id="run1", metrics=[], params=[("lr", "0.1")], tags=[]),
+            # changes a logged param
+            IngestRequest(run_id="run1", metrics=[], params=[("seed", "2")], tags=[]),
+            # changes a param of the same batch
+            IngestRequest(run_id="run2", metrics=[], params=[("lr", "0.2")], tags=[]),
+            IngestRequest(run_id="run2", metrics=[], params=[("lr", "0.3")], tags=[]),
+            # deleted or unknown run
+            IngestRequest(run_id="run3", metrics=[("loss", 1.0, 1, 0)], params=[], tags=[]),
+        ]
+        connection = MockConnection(active=["run1", "run2"], params=[("run1", "seed", "1"), ("run1", "lr", "0.1")])
+
+        accepted = asyncio.run(self.writer._accepted(connection=connection, requests=requests))
+
+        self.assertEqual(accepted, [requests[0], requests[2]])
+
+    def test_write_params(self):
+        # run1/seed was logged by a concurrent batch after the batch checked its params
+        connection = MockConnection(active=["run1"], params=[("run1", "lr", "0.1"), ("run1", "seed", "2")])
+
+        asyncio.run(self.writer._write_params(connection=connection, rows=[("lr", "0.1", "run1")]))
+        with self.assertRaisesRegex(ParamConflictError, "run1/seed"):
+            asyncio.run(
+                self.writer._write_params(connection=connection, rows=[("lr", "0.1", "run1"), ("seed", "1", "run1")])
+            )
+
+
+class TestIngestGateway(unittest.TestCase):
+    def setUp(self):
+        self.upstream = ThreadingHTTPServer(("127.0.0.1", 0), MockUpstreamHandler)
+        self.upstream.pool_name = "tracking"
+        threading.Thread(target=self.upstream.serve_forever, args=(0.05,), daemon=True).start()
+        patch("src.mlflow.tracking.server.proxy.ingest_gateway.validate_ingest", return_value=True).start()
+
+    def tearDown(self):
+        patch.stopall()
+        self.upstream.shutdown()
+        self.upstream.server_close()
+
+    def serve(self, accept: bool, upstream=None) -> IngestGateway:
+        gateway = IngestGateway(
+            address="127.0.0.1",
+            port=0,
+            upstream=upstream or ("127.0.0.1", self.upstream.server_address[1]),
+            writer=MockWriter(accept=accept),
+        )
+        thread = threading.Thread(target=asyncio.run, args=(gateway.serve(),), daemon=True)
+        thread.start()
+        self.assertTrue(gateway.started.wait(5))
+
+        def stop():
+            gateway.stop()
+            thread.join(5)
+
+        self.addCleanup(stop)
+        return gateway
+
+    def test_logging_is_written_by_the_gateway(self):
+        gateway = self.serve(accept=True)
+        connection = http.client.HTTPConnection("127.0.0.1", gateway.port, timeout=5)
+        body = json.dumps({"run_id": "run1", "key": "loss", "value": 0.5, "timestamp": 10})
+
+        for _ in range(2):
+            connection.request("POST", "/api/2.0/mlflow/runs/log-metric", body=body)
+            response = connection.getresponse()
+            self.assertEqual((response.status, response.read()), (200, b"{}"))
+        connection.close()
+
+        self.assertEqual([request.metrics for request in gateway.writer.requests], [[("loss", 0.5, 10, 0)]] * 2)
+
+    def test_other_requests_are_forwarded(self):
+        gateway = self.serve(accept=False)
+        connection = http.client.HTTPConnection("127.0.0.1", gateway.port, timeout=5)
+
+        for method, path, body in [
+            # declined by the writer
+            ("POST", "/api/2.0/mlflow/runs/set-tag", b'{"run_id": "run1", "key": "team", "value": "ml"}'),
+            ("GET", "/api/2.0/mlflow/runs/get?run_id=run1", None),
+            ("POST", "/api/2.0/mlflow/runs/search", b"{}"),
+            ("PUT", "/api/2.0/mlflow-artifacts/artifacts/0/run1/artifacts/model.pkl", iter([b"abc", b"def"])),
+        ]:
+            connection.request(method, path, body=body, encode_chunked=not isinstance(body, (bytes, type(None))))
+            response = connection.getresponse()
+            self.assertEqual(response.status, 200)
+            payload = json.loads(response.read())
+            self.assertEqual((payload["method"], payload["path"]), (method, path))
+            self.assertEqual(payload["size"], 6 if method == "PUT" else len(body or b""))
+        # The client is appended to the hops forwarded by a proxy in front of the gateway.
+        connection.request("GET", "/api/2.0/mlflow/runs/get?run_id=run1", headers={"X-Forwarded-For": "10.0.0.1"})
+        self.assertEqual(json.loads(connection.getresponse().read())["forwarded_for"], ["10.0.0.1, 127.0.0.1"])
+        connection.close()
+
+        self.assertEqual(len(gateway.writer.requests), 1)
+
+    def test_unavailable_upstream(self):
+        gateway = self.serve(accept=True, upstream=("127.0.0.1", 1))
+        connection = http.client.HTTPConnection("127.0.0.1", gateway.port, timeout=5)
+
+        connection.request("GET", "/api/2.0/mlflow/runs/get?run_id=run1")
+
+        self.assertEqual(connection.getresponse().status, 502)
+        connection.close()
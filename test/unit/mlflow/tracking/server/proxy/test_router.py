@@ -0,0 +1,155 @@
+import http.client
+import json
+import socket
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.mlflow.tracking.server.contracts.types.route_class import RouteClass
+from src.mlflow.tracking.server.proxy.router import MLFlowRouter, artifact_endpoint, classify_request
+
+
+class MockUpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self):
+        length: int = int(self.headers.get("Content-Length", 0) or 0)
+        body: bytes = self.rfile.read(length) if length else b""
+        if "chunked" in self.headers.get("Transfer-Encoding", ""):
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        payload: bytes = json.dumps(
+            {
+                "pool": self.server.pool_name,
+                "method": self.command,
+                "path": self.path,
+                "size": len(body),
+                "forwarded_for": self.headers.get_all("X-Forwarded-For"),
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    do_GET = _reply
+    do_POST = _reply
+    do_HEAD = _reply
+    do_PUT = _reply
+
+
+class TestRouter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.upstreams: dict = {}
+        self.servers: list = []
+        for route_class in RouteClass:
+            server = ThreadingHTTPServer(("127.0.0.1", 0), MockUpstreamHandler)
+            server.pool_name = route_class.value
+            threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+            self.servers.append(server)
+            self.upstreams[route_class] = ("127.0.0.1", server.server_address[1])
+
+        self.router = MLFlowRouter(address="127.0.0.1", port=0, upstreams=self.upstreams)
+        threading.Thread(target=self.router.serve_forever, args=(0.05,), daemon=True).start()
+
+    def tearDown(self) -> None:
+        for server in [self.router, *self.servers]:
+            server.shutdown()
+            server.server_close()
+
+    def _request(self, method: str, path: str, body=None, headers=None) -> dict:
+        connection = http.client.HTTPConnection("127.0.0.1", self.router.server_address[1], timeout=5)
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        self.assertEqual(response.status, 200)
+        payload: dict = json.loads(response.read())
+        connection.close()
+        return payload
+
+    def test_classify_request(self):
+        self.assertEqual(classify_request("POST", "/api/2.0/mlflow/runs/log-metric"), RouteClass.WRITE)
+        self.assertEqual(classify_request("POST", "/ajax-api/2.0/mlflow/runs/log-batch"), RouteClass.WRITE)
+        self.assertEqual(classify_request("POST", "/api/2.0/mlflow/runs/search"), RouteClass.READ)
+        self.assertEqual(classify_request("GET", "/api/2.0/mlflow/runs/get?run_id=1"), RouteClass.READ)
+        self.assertEqual(classify_request("GET", "/api/2.0/mlflow/runs/log-metric"), RouteClass.READ)
+        self.assertEqual(classify_request("GET", "/"), RouteClass.READ)
+        self.assertEqual(
+            classify_request("PUT", "/api/2.0/mlflow-artifacts/artifacts/0/run/artifacts/model.pkl"),
+            RouteClass.ARTIFACT,
+        )
+
+    def test_artifact_endpoint(self):
+        self.assertEqual(
+            artifact_endpoint("/api/2.0/mlflow-artifacts/artifacts/0/r/artifacts/m.pkl"), "0/r/artifacts/m.pkl"
+        )
+        self.assertEqual(artifact_endpoint("/ajax-api/2.0/mlflow-artifacts/artifacts/a.txt"), "a.txt")
+        self.assertIsNone(artifact_endpoint("/api/2.0/mlflow-artifacts/artifacts"))
+        self.assertIsNone(artifact_endpoint("/api/2.0/mlflow/runs/get"))
+
+    def test_routes_requests_to_pools(self):
+        self.assertEqual(self._request("POST", "/api/2.0/mlflow/runs/log-metric", body=b"{}")["pool"], "write")
+        self.assertEqual(self._request("POST", "/api/2.0/mlflow/runs/search", body=b"{}")["pool"], "read")
+        self.assertEqual(self._request("GET", "/api/2.0/mlflow-artifacts/artifacts")["pool"], "artifact")
+
+    def test_streams_request_bodies(self):
+        body: bytes = b"x" * (1024 * 1024)
+        payload: dict = self._request("PUT", "/api/2.0/mlflow-artifacts/artifacts/a/b", body=body)
+        self.assertEqual(payload["size"], len(body))
+
+        payload = self._request(
+            "PUT", "/api/2.0/mlflow-artifacts/artifacts/a/b", body=iter([b"a" * 10, b"b" * 20]), headers={}
+        )
+        self.assertEqual(payload["size"], 30)
+
+    def test_appends_the_client_to_forwarded_hops(self):
+        payload: dict = self._request("GET", "/api/2.0/mlflow/runs/get")
+        self.assertEqual(payload["forwarded_for"], ["127.0.0.1"])
+
+        connection = http.client.HTTPConnection("127.0.0.1", self.router.server_address[1], timeout=5)
+        connection.putrequest("GET", "/api/2.0/mlflow/runs/get")
+        connection.putheader("X-Forwarded-For", "10.0.0.1, 10.0.0.2")
+        connection.putheader("X-Forwarded-For", "10.0.0.3")
+        connection.endheaders()
+        payload = json.loads(connection.getresponse().read())
+        connection.close()
+        self.assertEqual(payload["forwarded_for"], ["10.0.0.1, 10.0.0.2, 10.0.0.3, 127.0.0.1"])
+
+    def test_malformed_chunked_body(self):
+        with socket.create_connection(("127.0.0.1", self.router.server_address[1]), timeout=5) as client:
+            client.sendall(
+                b"PUT /api/2.0/mlflow-artifacts/artifacts/a/b HTTP/1.1\r\nHost: router\r\n"
+                b"Transfer-Encoding: chunked\r\n\r\nnot a size\r\n"
+            )
+            response = client.makefile("rb").readline()
+        self.assertTrue(response.startswith(b"HTTP/1.1 400"), response)
+
+        # The upstream serves the next request.
+        self.assertEqual(self._request("GET", "/api/2.0/mlflow-artifacts/artifacts")["pool"], "artifact")
+
+    def test_unavailable_upstream(self):
+        self.servers[0].shutdown()
+        self.servers[0].server_close()
+        connection = http.client.HTTPConnection("127.0.0.1", self.router.server_address[1], timeout=5)
+        connection.request("POST", "/api/2.0/mlflow/runs/log-metric", body=b"{}")
+        self.assertEqual(connection.getresponse().status, 502)
+        connection.close()
+        self.servers.pop(0)
+
+    def test_requires_all_upstreams(self):
+        with self.assertRaises(ValueError):
+            MLFlowRouter(address="127.0.0.1", port=0, upstreams={RouteClass.READ: ("127.0.0.1", 1)})
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestRouter())
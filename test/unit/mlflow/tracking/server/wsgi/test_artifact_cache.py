@@ -0,0 +1,117 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.mlflow.tracking.server.contracts.dto.artifact_stat import ArtifactStat
+from src.mlflow.tracking.server.wsgi.artifact_cache import (
+    ARTIFACT_CACHE_ENV_VAR,
+    ArtifactCache,
+    build_artifact_cache_environment,
+    open_artifact_cache,
+)
+
+
+class TestArtifactCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ArtifactCache(directory=self.tmp_dir.name, max_bytes=100)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def fill(self, path: str, content: bytes, etag: str = "v1", md5: str = None) -> bytes:
+        stat = ArtifactStat(size=len(content), etag=etag, md5=md5)
+        return b"".join(
+            self.cache.fill(destination="gs://b", path=path, stat=stat, chunks=iter([content[:4], content[4:]]))
+        )
+
+    def lookup(self, path: str, content: bytes, etag: str = "v1"):
+        return self.cache.lookup(destination="gs://b", path=path, stat=ArtifactStat(size=len(content), etag=etag))
+
+    def test_init_validates(self):
+        with self.assertRaises(ValueError):
+            ArtifactCache(directory=self.tmp_dir.name, max_bytes=0)
+
+    def test_filled_downloads_are_served(self):
+        self.assertIsNone(self.lookup("1/model.pkl", b"model bytes"))
+        self.assertEqual(self.fill("1/model.pkl", b"model bytes"), b"model bytes")
+
+        cached = self.lookup("1/model.pkl", b"model bytes")
+        with open(cached, "rb") as file:
+            self.assertEqual(file.read(), b"model bytes")
+        # A new version of the artifact is not served from the cache.
+        self.assertIsNone(self.lookup("1/model.pkl", b"model bytes", etag="v2"))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_identical_content_is_stored_once(self):
+        self.fill("1/model.pkl", b"same model")
+        self.fill("2/model.pkl", b"same model")
+
+        self.assertEqual(self.lookup("1/model.pkl", b"same model"), self.lookup("2/model.pkl", b"same model"))
+        self.assertEqual(sum(len(names) for _, _, names in os.walk(os.path.join(self.tmp_dir.name, "blobs"))), 1)
+
+    def test_concurrent_downloads_of_an_artifact(self):
+        barrier = threading.Barrier(4)
+        errors = []
+
+        def download():
+            barrier.wait()
+            try:
+                for _ in range(10):
+                    self.assertEqual(self.fill("1/model.pkl", b"model bytes"), b"model bytes")
+            except OSError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=download) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        # Every download finishing links the same reference, none fails.
+        self.assertEqual(errors, [])
+        with open(self.lookup("1/model.pkl", b"model bytes"), "rb") as file:
+            self.assertEqual(file.read(), b"model bytes")
+        links = [name for _, _, names in os.walk(self.tmp_dir.name) for name in names if name.endswith(".tmp")]
+        self.assertEqual(links, [])
+
+    def test_incomplete_and_corrupted_downloads_are_not_cached(self):
+        chunks = self.cache.fill(
+            destination="gs://b", path="a", stat=ArtifactStat(size=8, etag="v1"), chunks=iter([b"abcd", b"efgh"])
+        )
+        next(chunks)
+        chunks.close()
+        self.fill("b", b"content", md5="0" * 32)
+
+        self.assertIsNone(self.lookup("a", b"abcdefgh"))
+        self.assertIsNone(self.lookup("b", b"content"))
+        self.assertEqual(os.listdir(os.path.join(self.tmp_dir.name, "tmp")), [])
+
+    def test_least_recently_served_are_evicted(self):
+        for path in ["a", "b", "c"]:
+            self.fill(path, path.encode("utf-8") * 40)
+            time.sleep(0.01)
+        # c evicted a (least recently served), b stays cached.
+        self.assertIsNone(self.lookup("a", b"a" * 40))
+        self.assertIsNotNone(self.lookup("b", b"b" * 40))
+        self.assertIsNotNone(self.lookup("c", b"c" * 40))
+        # Larger artifacts than the cache pass through uncached.
+        self.assertEqual(self.fill("d", b"d" * 101), b"d" * 101)
+        self.assertIsNone(self.lookup("d", b"d" * 101))
+
+    def test_open_artifact_cache(self):
+        with patch.dict(os.environ, {}):
+            os.environ.pop(ARTIFACT_CACHE_ENV_VAR, None)
+            self.assertIsNone(open_artifact_cache())
+            os.environ.update(build_artifact_cache_environment(directory=self.tmp_dir.name, max_bytes=5))
+            cache = open_artifact_cache()
+
+        self.assertEqual((cache.directory, cache.max_bytes), (self.tmp_dir.name, 5))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestArtifactCache())
@@ -0,0 +1,151 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.mlflow.tracking.server.contracts.dto.artifact_stat import ArtifactStat
+from src.mlflow.tracking.server.wsgi.artifact_stores import (
+    UPLOADS_DIRECTORY,
+    ArtifactStore,
+    GCSArtifactStore,
+    LocalArtifactStore,
+    open_artifact_store,
+)
+
+
+class MemoryArtifactStore(ArtifactStore):
+    def __init__(self, files: dict, part_size: int, concurrency: int):
+        super().__init__(part_size=part_size, concurrency=concurrency)
+        self.files = files
+        self.uploads = {}
+        self.reads = []
+
+    def stat(self, path):
+        return (
+            ArtifactStat(size=len(self.files[path]), etag=str(hash(self.files[path]))) if path in self.files else None
+        )
+
+    def read(self, path, offset, length):
+        self.reads.append((offset, length))
+        return self.files[path][offset : offset + length]
+
+    def write_part(self, path, upload_id, part_number, data):
+        self.uploads.setdefault((path, upload_id), {})[part_number] = data
+
+    def parts(self, path, upload_id):
+        return {number: len(data) for number, data in self.uploads.get((path, upload_id), {}).items()}
+
+    def complete(self, path, upload_id, part_numbers):
+        staged = self.uploads.pop((path, upload_id), {})
+        self.files[path] = b"".join(staged[number] for number in part_numbers)
+
+    def abort(self, path, upload_id):
+        self.uploads.pop((path, upload_id), None)
+
+    def delete(self, path):
+        self.files.pop(path, None)
+
+
+class TestArtifactStores(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = LocalArtifactStore(root=self.tmp_dir.name, part_size=4, concurrency=2)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_parallel_stream_keeps_order(self):
+        store = MemoryArtifactStore(files={"a": bytes(range(100))}, part_size=7, concurrency=3)
+        self.assertEqual(b"".join(store.stream(path="a", offset=5, length=90)), bytes(range(5, 95)))
+        self.assertEqual(len(store.reads), 13)
+        self.assertEqual(sorted(store.reads)[-1], (89, 6))
+
+    def test_incomplete_store_cannot_be_created(self):
+        class ReadOnlyArtifactStore(ArtifactStore):  # pylint: disable=abstract-method
+            def read(self, path, offset, length):
+                return b""
+
+        with self.assertRaises(TypeError):
+            ReadOnlyArtifactStore(part_size=4, concurrency=2)
+
+    def test_local_multipart_upload(self):
+        upload_id = "0" * 32
+        self.store.write_part(path="1/r/model.pkl", upload_id=upload_id, part_number=2, data=b"world")
+        self.store.write_part(path="1/r/model.pkl", upload_id=upload_id, part_number=1, data=b"hello ")
+        # A retried part replaces the previous one.
+        self.store.write_part(path="1/r/model.pkl", upload_id=upload_id, part_number=2, data=b"there")
+        self.assertEqual(self.store.parts(path="1/r/model.pkl", upload_id=upload_id), {1: 6, 2: 5})
+
+        self.store.complete(path="1/r/model.pkl", upload_id=upload_id, part_numbers=[1, 2])
+
+        self.assertEqual(self.store.stat(path="1/r/model.pkl").size, 11)
+        self.assertEqual(b"".join(self.store.stream(path="1/r/model.pkl", offset=6, length=5)), b"there")
+        self.assertEqual(os.listdir(os.path.join(self.tmp_dir.name, UPLOADS_DIRECTORY)), [])
+        self.assertIsNone(self.store.stat(path="1/r"))
+
+        self.store.delete(path="1/r/model.pkl")
+        self.store.delete(path="1/r/model.pkl")
+        self.assertIsNone(self.store.stat(path="1/r/model.pkl"))
+
+    def test_local_concurrent_part_uploads(self):
+        upload_id = "1" * 32
+        payloads = [bytes([number]) * 256 * 1024 for number in range(8)]
+        barrier = threading.Barrier(len(payloads))
+        errors = []
+
+        def upload(data: bytes):
+            barrier.wait()
+            try:
+                for _ in range(5):
+                    self.store.write_part(path="f", upload_id=upload_id, part_number=1, data=data)
+            except OSError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=upload, args=(data,)) for data in payloads]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        # The part is one of the uploads in full, and no staged file is left behind.
+        self.assertEqual(errors, [])
+        staging = os.path.join(self.tmp_dir.name, UPLOADS_DIRECTORY, upload_id)
+        self.assertEqual(os.listdir(staging), ["00001"])
+        with open(os.path.join(staging, "00001"), "rb") as file:
+            self.assertIn(file.read(), payloads)
+
+    def test_local_uploads_expire(self):
+        for upload_id in ["a" * 32, "b" * 32]:
+            self.store.write_part(path="f", upload_id=upload_id, part_number=1, data=b"x")
+        staging = os.path.join(self.tmp_dir.name, UPLOADS_DIRECTORY, "a" * 32)
+        os.utime(staging, (time.time() - 8 * 24 * 3600,) * 2)
+
+        self.store.expire_uploads()
+
+        self.assertEqual(os.listdir(os.path.join(self.tmp_dir.name, UPLOADS_DIRECTORY)), ["b" * 32])
+
+    def test_gcs_composes_32_parts_at_a_time(self):
+        bucket = MagicMock()
+        target = MagicMock()
+        bucket.blob.side_effect = lambda name: target if name == "root/f" else name
+        bucket.list_blobs.return_value = []
+        store = GCSArtifactStore(bucket=bucket, prefix="root", part_size=4, concurrency=2)
+
+        store.complete(path="f", upload_id="c" * 32, part_numbers=list(range(1, 71)))
+
+        rounds = [call.args[0] for call in target.compose.call_args_list]
+        self.assertEqual([len(sources) for sources in rounds], [32, 32, 8])
+        self.assertIs(rounds[1][0], target)
+        self.assertEqual(rounds[2][-1], f"root/{UPLOADS_DIRECTORY}/{'c' * 32}/00070")
+
+    def test_open_artifact_store(self):
+        self.assertIsInstance(open_artifact_store(self.tmp_dir.name, 4, 2), LocalArtifactStore)
+        self.assertIsInstance(open_artifact_store(f"file://{self.tmp_dir.name}", 4, 2), LocalArtifactStore)
+        self.assertIsNone(open_artifact_store("s3://bucket/path", 4, 2))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestArtifactStores())
@@ -0,0 +1,188 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.mlflow.tracking.server.wsgi.artifact_cache import ArtifactCache
+from src.mlflow.tracking.server.wsgi.artifact_transfers import (
+    ARTIFACT_TRANSFERS_ENV_VAR,
+    ARTIFACTS_DESTINATION_ENV_VAR,
+    MEBIBYTE,
+    SERVE_ARTIFACTS_ENV_VAR,
+    ArtifactTransfers,
+    apply_artifact_transfers,
+    build_artifact_transfer_environment,
+    parse_range,
+    safe_artifact_path,
+)
+
+ARTIFACTS: str = "/api/2.0/mlflow-artifacts/artifacts/"
+
+
+def request(method: str, path: str, query: str = "", body: bytes = b"", headers: dict = None) -> dict:
+    return {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": ARTIFACTS + path,
+        "QUERY_STRING": query,
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+        **(headers or {}),
+    }
+
+
+class TestArtifactTransfers(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.calls = []
+
+        def application(environ, start_response):
+            self.calls.append(environ["PATH_INFO"])
+            start_response("200 OK", [("Content-Type", "application/json")])
+            return [b"{}"]
+
+        self.transfers = ArtifactTransfers(
+            application=application, destination=self.tmp_dir.name, part_size=MEBIBYTE, concurrency=2
+        )
+        self.data = os.urandom(2 * MEBIBYTE + 100)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def serve(self, environ: dict) -> tuple[str, dict, bytes]:
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response.update({"status": status, "headers": dict(headers)})
+
+        body = b"".join(self.transfers(environ, start_response))
+        return response["status"], response["headers"], body
+
+    def test_init_validates(self):
+        with self.assertRaises(ValueError):
+            ArtifactTransfers(application=None, destination=self.tmp_dir.name, part_size=1024)
+        with self.assertRaises(ValueError):
+            ArtifactTransfers(application=None, destination=self.tmp_dir.name, concurrency=0)
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range("bytes=0-9", 100), (0, 10))
+        self.assertEqual(parse_range("bytes=90-", 100), (90, 10))
+        self.assertEqual(parse_range("bytes=-10", 100), (90, 10))
+        self.assertEqual(parse_range("bytes=50-500", 100), (50, 50))
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 100))
+        self.assertIsNone(parse_range("bytes=9-1", 100))
+        self.assertIsNone(parse_range("", 100))
+        with self.assertRaises(ValueError):
+            parse_range("bytes=100-", 100)
+
+    def test_safe_artifact_path(self):
+        self.assertEqual(safe_artifact_path("1/r/artifacts/model.pkl"), "1/r/artifacts/model.pkl")
+        for path in ["", "/etc/passwd", "1/../../etc", "a\\b", "file:///etc", ".mlflow-uploads/x/00001"]:
+            self.assertIsNone(safe_artifact_path(path))
+
+    def test_upload_and_ranged_download(self):
+        status, _, body = self.serve(request("PUT", "1/r/artifacts/model.pkl", body=self.data))
+        self.assertEqual((status, body), ("200 OK", b"{}"))
+
+        status, headers, body = self.serve(request("GET", "1/r/artifacts/model.pkl"))
+        self.assertEqual((status, body), ("200 OK", self.data))
+        self.assertEqual(headers["Accept-Ranges"], "bytes")
+        self.assertEqual(headers["Content-Disposition"], "attachment; filename=model.pkl")
+
+        status, headers, body = self.serve(
+            request("GET", "1/r/artifacts/model.pkl", headers={"HTTP_RANGE": f"bytes={MEBIBYTE}-"})
+        )
+        self.assertEqual((status, body), ("206 PARTIAL CONTENT", self.data[MEBIBYTE:]))
+        self.assertEqual(headers["Content-Range"], f"bytes {MEBIBYTE}-{len(self.data) - 1}/{len(self.data)}")
+
+        status, headers, _ = self.serve(
+            request("GET", "1/r/artifacts/model.pkl", headers={"HTTP_RANGE": f"bytes={len(self.data)}-"})
+        )
+        self.assertEqual(status, "416 RANGE NOT SATISFIABLE")
+        self.assertEqual(self.calls, [])
+
+    def test_etags_and_cached_downloads(self):
+        cache = ArtifactCache(directory=os.path.join(self.tmp_dir.name, "cache"), max_bytes=10 * MEBIBYTE)
+        self.transfers.cache = cache
+        self.serve(request("PUT", "1/r/artifacts/model.pkl", body=self.data))
+
+        _, headers, first = self.serve(request("GET", "1/r/artifacts/model.pkl"))
+        _, cached_headers, second = self.serve(request("GET", "1/r/artifacts/model.pkl"))
+        status, _, part = self.serve(request("GET", "1/r/artifacts/model.pkl", headers={"HTTP_RANGE": "bytes=0-99"}))
+
+        self.assertEqual((first, second, part), (self.data, self.data, self.data[:100]))
+        self.assertEqual((headers["X-MLflow-Cache"], cached_headers["X-MLflow-Cache"]), ("miss", "hit"))
+        self.assertEqual(status, "206 PARTIAL CONTENT")
+        self.assertEqual(cache.hits, 2)
+
+        status, _, _ = self.serve(
+            request("GET", "1/r/artifacts/model.pkl", headers={"HTTP_IF_NONE_MATCH": headers["ETag"]})
+        )
+        self.assertEqual(status, "304 NOT MODIFIED")
+
+    def test_resumable_multipart_upload(self):
+        _, _, body = self.serve(request("POST", "1/r/artifacts/model.pkl", "uploads"))
+        upload = json.loads(body)
+        self.assertEqual((upload["part_size"], upload["concurrency"]), (MEBIBYTE, 2))
+        query = f"upload_id={upload['upload_id']}"
+
+        # Parts arrive out of order; the upload is interrupted after two of them.
+        for number in [3, 1]:
+            part = self.data[(number - 1) * MEBIBYTE : number * MEBIBYTE]
+            status, _, _ = self.serve(request("PUT", "1/r/artifacts/model.pkl", f"{query}&part_number={number}", part))
+            self.assertEqual(status, "200 OK")
+        status, _, body = self.serve(request("POST", "1/r/artifacts/model.pkl", query))
+        self.assertEqual(status, "400 BAD REQUEST")
+        self.assertIn("missing parts", json.loads(body)["message"])
+
+        _, _, body = self.serve(request("GET", "1/r/artifacts/model.pkl", query))
+        self.assertEqual([part["part_number"] for part in json.loads(body)["parts"]], [1, 3])
+        part = self.data[MEBIBYTE : 2 * MEBIBYTE]
+        self.serve(request("PUT", "1/r/artifacts/model.pkl", f"{query}&part_number=2", part))
+        status, _, _ = self.serve(request("POST", "1/r/artifacts/model.pkl", query))
+
+        self.assertEqual(status, "200 OK")
+        with open(os.path.join(self.tmp_dir.name, "1/r/artifacts/model.pkl"), "rb") as file:
+            self.assertEqual(file.read(), self.data)
+
+    def test_invalid_parts_are_rejected(self):
+        upload_id = "d" * 32
+        for query, body in [
+            ("upload_id=../../x&part_number=1", b"x"),
+            (f"upload_id={upload_id}&part_number=0", b"x"),
+            (f"upload_id={upload_id}&part_number=1", b"x" * (MEBIBYTE + 1)),
+        ]:
+            status, _, _ = self.serve(request("PUT", "a.bin", query, body))
+            self.assertEqual(status, "400 BAD REQUEST")
+
+    def test_other_requests_are_served_by_mlflow(self):
+        os.makedirs(os.path.join(self.tmp_dir.name, "1/r/artifacts"))
+        self.serve(request("GET", "1/r/artifacts"))
+        self.serve(request("GET", "missing.txt"))
+        self.serve(request("PUT", "../escape.txt", body=b"x"))
+        self.serve({"REQUEST_METHOD": "GET", "PATH_INFO": "/api/2.0/mlflow-artifacts/artifacts", "QUERY_STRING": ""})
+
+        self.assertEqual(len(self.calls), 4)
+        self.assertFalse(os.path.exists(os.path.join(os.path.dirname(self.tmp_dir.name), "escape.txt")))
+
+    def test_apply_artifact_transfers(self):
+        def application(_environ, _start_response):
+            return [b""]
+
+        settings = {SERVE_ARTIFACTS_ENV_VAR: "true", ARTIFACTS_DESTINATION_ENV_VAR: self.tmp_dir.name}
+        with patch.dict(os.environ, settings):
+            os.environ.pop(ARTIFACT_TRANSFERS_ENV_VAR, None)
+            self.assertIs(apply_artifact_transfers(application=application), application)
+            os.environ.update(build_artifact_transfer_environment(part_size=4 * MEBIBYTE, concurrency=3))
+            transfers = apply_artifact_transfers(application=application)
+            os.environ[SERVE_ARTIFACTS_ENV_VAR] = "false"
+            self.assertIs(apply_artifact_transfers(application=application), application)
+
+        self.assertIsInstance(transfers, ArtifactTransfers)
+        self.assertEqual((transfers.part_size, transfers.concurrency), (4 * MEBIBYTE, 3))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestArtifactTransfers())
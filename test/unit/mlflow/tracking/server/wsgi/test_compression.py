@@ -0,0 +1,89 @@
+import gzip
+import os
+import unittest
+from unittest.mock import patch
+
+from src.mlflow.tracking.server.wsgi.compression import (
+    COMPRESSION_ENV_VAR,
+    Compression,
+    apply_compression,
+    build_compression_environment,
+    negotiate_encoding,
+)
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.headers = [("Content-Type", "application/json")]
+        self.chunks = [b'{"metrics": [', b"1.0, " * 1000, b"1.0]}"]
+
+        def application(_environ, start_response):
+            start_response("200 OK", list(self.headers))
+            yield from self.chunks
+
+        self.application = application
+        self.compression = Compression(application=application, minimum_size=100)
+
+    def serve(self, environ: dict) -> tuple[bytes, dict]:
+        headers = {}
+
+        def start_response(_status, response_headers, exc_info=None):
+            headers.update(response_headers)
+
+        return b"".join(self.compression(environ, start_response)), headers
+
+    def test_init_validates(self):
+        with self.assertRaises(ValueError):
+            Compression(application=None, minimum_size=-1)
+        with self.assertRaises(ValueError):
+            Compression(application=None, level=10)
+
+    @patch("src.mlflow.tracking.server.wsgi.compression.brotli", None)
+    def test_negotiate_encoding(self):
+        self.assertEqual(negotiate_encoding("gzip, deflate, br"), "gzip")
+        self.assertEqual(negotiate_encoding("*"), "gzip")
+        self.assertIsNone(negotiate_encoding("gzip;q=0, identity"))
+        self.assertIsNone(negotiate_encoding(""))
+
+    def test_negotiate_encoding_prefers_brotli(self):
+        with patch("src.mlflow.tracking.server.wsgi.compression.brotli", object()):
+            self.assertEqual(negotiate_encoding("gzip, br"), "br")
+            self.assertEqual(negotiate_encoding("gzip, br;q=0"), "gzip")
+
+    @patch("src.mlflow.tracking.server.wsgi.compression.brotli", None)
+    def test_streamed_gzip(self):
+        body, headers = self.serve({"REQUEST_METHOD": "GET", "HTTP_ACCEPT_ENCODING": "gzip"})
+
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(headers["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(body), b"".join(self.chunks))
+        self.assertLess(len(body), len(b"".join(self.chunks)))
+
+    def test_uncompressed_responses(self):
+        body, headers = self.serve({"REQUEST_METHOD": "GET"})
+        self.assertNotIn("Content-Encoding", headers)
+        self.assertEqual(body, b"".join(self.chunks))
+
+        self.headers = [("Content-Type", "application/json"), ("Content-Length", "10")]
+        body, headers = self.serve({"REQUEST_METHOD": "GET", "HTTP_ACCEPT_ENCODING": "gzip"})
+        self.assertNotIn("Content-Encoding", headers)
+
+        self.headers = [("Content-Type", "application/octet-stream")]
+        body, headers = self.serve({"REQUEST_METHOD": "GET", "HTTP_ACCEPT_ENCODING": "gzip"})
+        self.assertNotIn("Content-Encoding", headers)
+        self.assertEqual(body, b"".join(self.chunks))
+
+    def test_apply_compression(self):
+        with patch.dict(os.environ, {}):
+            os.environ.pop(COMPRESSION_ENV_VAR, None)
+            self.assertIs(apply_compression(application=self.application), self.application)
+            os.environ.update(build_compression_environment(minimum_size=512, level=3))
+            compression = apply_compression(application=self.application)
+
+        self.assertIsInstance(compression, Compression)
+        self.assertEqual((compression.minimum_size, compression.level), (512, 3))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestCompression())
@@ -0,0 +1,29 @@
+import unittest
+
+from src.mlflow.tracking.server.wsgi.gunicorn_application import MLFlowGunicornApplication
+
+
+def mock_app(_environ, start_response):
+    start_response("200 OK", [])
+    return [b""]
+
+
+class TestMLFlowGunicornApplication(unittest.TestCase):
+    def test_applies_settings_and_loads_application(self):
+        application = MLFlowGunicornApplication(
+            application=mock_app, options={"bind": ["127.0.0.1:9000"], "workers": 3, "preload_app": True}
+        )
+
+        self.assertEqual(application.cfg.bind, ["127.0.0.1:9000"])
+        self.assertEqual(application.cfg.workers, 3)
+        self.assertTrue(application.cfg.preload_app)
+        self.assertIs(application.load(), mock_app)
+
+    def test_rejects_unknown_settings(self):
+        with self.assertRaises(ValueError):
+            MLFlowGunicornApplication(application=mock_app, options={"no_such_setting": 1})
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestMLFlowGunicornApplication())
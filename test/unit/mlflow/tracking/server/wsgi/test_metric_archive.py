@@ -0,0 +1,166 @@
+import json
+import math
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.mlflow.tracking.server.wsgi.artifact_stores import LocalArtifactStore
+from src.mlflow.tracking.server.wsgi.metric_archive import (
+    METRIC_ARCHIVE_ENV_VAR,
+    ArchivedMetricHistory,
+    MetricArchive,
+    apply_metric_archive,
+    archive_path,
+)
+
+
+def columns(rows: list[tuple]) -> dict[str, list]:
+    """The `(key, value, timestamp, step, is_nan)` rows of the metrics table, by column."""
+
+    names = ["key", "value", "timestamp", "step", "is_nan"]
+    return {name: [row[index] for row in rows] for index, name in enumerate(names)}
+
+
+class TestMetricArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = LocalArtifactStore(root=self.tmp_dir.name, part_size=512, concurrency=1)
+        self.archive = MetricArchive(store=self.store)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_archive_path(self):
+        self.assertEqual(archive_path(run_id="abcdef"), ".mlflow-metric-archive/ab/abcdef.parquet")
+
+    def test_write_and_read_history(self):
+        rows = [("loss", 1.0 / (step + 1), 1000 + step, step, False) for step in range(2000)]
+        rows += [("accuracy", 0.5, 1000, 0, False), ("loss", 0.0, 5000, 2000, True)]
+
+        size = self.archive.write(run_id="run1", columns=columns(rows))
+
+        self.assertEqual(self.archive.stat(run_id="run1").size, size)
+        # Written in multiple parts.
+        self.assertGreater(size, self.store.part_size)
+        history = self.archive.history(run_id="run1", metric_key="loss")
+        self.assertEqual(len(history), 2001)
+        self.assertEqual(history[0], ("loss", 1.0, 1000, 0))
+        self.assertTrue(math.isnan(history[-1][1]))
+        self.assertEqual(self.archive.history(run_id="run1", metric_key="accuracy"), [("accuracy", 0.5, 1000, 0)])
+        self.assertEqual(self.archive.history(run_id="run1", metric_key="missing"), [])
+        self.assertIsNone(self.archive.history(run_id="run2", metric_key="loss"))
+
+    def test_write_merges_existing_archive(self):
+        self.archive.write(run_id="run1", columns=columns([("loss", 1.0, 1, 0, False), ("loss", 2.0, 2, 1, False)]))
+        self.archive.write(run_id="run1", columns=columns([("loss", 2.0, 2, 1, False), ("loss", 3.0, 3, 2, False)]))
+
+        self.assertEqual(
+            self.archive.history(run_id="run1", metric_key="loss"),
+            [("loss", 1.0, 1, 0), ("loss", 2.0, 2, 1), ("loss", 3.0, 3, 2)],
+        )
+
+    def test_reads_are_cached_until_replaced(self):
+        self.archive.write(run_id="run1", columns=columns([("loss", 1.0, 1, 0, False)]))
+        self.archive.history(run_id="run1", metric_key="loss")
+
+        with patch.object(self.store, "read", wraps=self.store.read) as patched_read:
+            self.archive.history(run_id="run1", metric_key="loss")
+            self.assertEqual(patched_read.call_count, 0)
+
+            # Replaced by another process.
+            other = LocalArtifactStore(root=self.tmp_dir.name, part_size=512, concurrency=1)
+            MetricArchive(store=other).write(run_id="run1", columns=columns([("loss", 2.0, 2, 1, False)]))
+            self.assertEqual(len(self.archive.history(run_id="run1", metric_key="loss")), 2)
+            self.assertEqual(patched_read.call_count, 1)
+
+        self.archive.delete(run_id="run1")
+        self.assertIsNone(self.archive.history(run_id="run1", metric_key="loss"))
+
+    def test_cache_is_bounded(self):
+        archive = MetricArchive(store=self.store, cache_size=4096)
+        for run_id in ["run1", "run2", "run3"]:
+            archive.write(run_id=run_id, columns=columns([("loss", 1.0, 1, 0, False)]))
+            archive.history(run_id=run_id, metric_key="loss")
+
+        self.assertLessEqual(archive._cached, 4096)
+        self.assertEqual(archive._cached, sum(len(data) for _, data in archive._cache.values()))
+        self.assertIn("run3", archive._cache)
+
+
+class TestArchivedMetricHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.archive = MetricArchive(store=LocalArtifactStore(root=self.tmp_dir.name, part_size=1024, concurrency=1))
+        self.archive.write(run_id="run1", columns=columns([("loss", 0.5, 2, 1, False), ("loss", 1.0, 1, 0, False)]))
+        self.calls = []
+
+        def application(environ, start_response):
+            self.calls.append(environ["QUERY_STRING"])
+            start_response("200 OK", [("Content-Type", "application/json")])
+            return [b"{}"]
+
+        self.middleware = ArchivedMetricHistory(
+            application=application,
+            archive=self.archive,
+            archived=lambda run_ids, metric_key: [run_id for run_id in run_ids if run_id == "run1"],
+            history=lambda run_id, metric_key: iter([("loss", 2.0, 5, 0)]),
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def serve(self, endpoint: str, query: str) -> bytes:
+        environ = {"REQUEST_METHOD": "GET", "PATH_INFO": f"/ajax-api/2.0/mlflow/{endpoint}", "QUERY_STRING": query}
+        return b"".join(self.middleware(environ, lambda *_: None))
+
+    def test_archived_history_is_served(self):
+        body = self.serve("metrics/get-history", "run_id=run1&metric_key=loss")
+
+        self.assertEqual(
+            json.loads(body),
+            {
+                "metrics": [
+                    {"key": "loss", "value": 1.0, "timestamp": 1, "step": 0},
+                    {"key": "loss", "value": 0.5, "timestamp": 2, "step": 1},
+                ]
+            },
+        )
+        self.assertEqual(self.calls, [])
+
+    def test_bulk_history_merges_archived_runs(self):
+        body = self.serve("metrics/get-history-bulk", "run_id=run2&run_id=run1&metric_key=loss&max_results=1")
+
+        self.assertEqual(
+            json.loads(body),
+            {
+                "metrics": [
+                    {"key": "loss", "value": 1.0, "timestamp": 1, "step": 0, "run_id": "run1"},
+                    {"key": "loss", "value": 2.0, "timestamp": 5, "step": 0, "run_id": "run2"},
+                ]
+            },
+        )
+        self.assertEqual(self.calls, [])
+
+    def test_other_requests_are_served_by_mlflow(self):
+        self.serve("metrics/get-history", "run_id=run2&metric_key=loss")
+        self.serve("metrics/get-history-bulk", "run_id=run2&metric_key=loss")
+        self.serve("metrics/get-history", "run_id=run1")
+        self.serve("runs/get", "run_id=run1")
+        # Archived in the database, but the archive is gone.
+        self.archive.delete(run_id="run1")
+        self.serve("metrics/get-history", "run_id=run1&metric_key=loss")
+
+        self.assertEqual(len(self.calls), 5)
+
+    def test_apply_metric_archive(self):
+        def application(_environ, _start_response):
+            return []
+
+        with patch.dict(os.environ, {}):
+            os.environ.pop(METRIC_ARCHIVE_ENV_VAR, None)
+            self.assertIs(apply_metric_archive(application=application), application)
+            os.environ[METRIC_ARCHIVE_ENV_VAR] = "s3://bucket/artifacts"
+            self.assertIs(apply_metric_archive(application=application), application)
+            os.environ[METRIC_ARCHIVE_ENV_VAR] = self.tmp_dir.name
+            self.assertIsInstance(apply_metric_archive(application=application), ArchivedMetricHistory)
@@ -0,0 +1,199 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.mlflow.tracking.server.wsgi.metric_buffer import MetricBuffer, parse_metrics
+
+API: str = "/api/2.0/mlflow/"
+
+
+def request(endpoint: str, body: dict) -> dict:
+    payload: bytes = json.dumps(body).encode("utf-8")
+    return {
+        "REQUEST_METHOD": "POST",
+        "PATH_INFO": API + endpoint,
+        "CONTENT_LENGTH": str(len(payload)),
+        "wsgi.input": io.BytesIO(payload),
+    }
+
+
+def metric(step: int, key: str = "loss") -> dict:
+    return {"key": key, "value": 0.5, "timestamp": 1000, "step": step}
+
+
+class RejectedMetrics(Exception):
+    error_code = "INVALID_PARAMETER_VALUE"
+
+
+class TestMetricBuffer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.calls = []
+        self.writer = MagicMock()
+        # mlflow validates metric keys
+        self.validation = patch(
+            "src.mlflow.tracking.server.wsgi.metric_buffer.validate_metric",
+            side_effect=lambda key, value, timestamp, step: ".." not in key,
+        )
+        self.validation.start()
+
+        def application(environ, start_response):
+            self.calls.append(environ["PATH_INFO"])
+            start_response("200 OK", [("Content-Type", "application/json")])
+            return [b"{}"]
+
+        self.buffer = MetricBuffer(
+            application=application, directory=self.tmp_dir.name, max_latency=60.0, max_pending=5, writer=self.writer
+        )
+
+    def tearDown(self):
+        self.buffer.close()
+        self.validation.stop()
+        self.tmp_dir.cleanup()
+
+    def serve(self, environ: dict) -> str:
+        statuses = []
+        body = b"".join(self.buffer(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+        self.assertEqual(body, b"{}")
+        return statuses[0]
+
+    def logged(self) -> dict:
+        logged = {}
+        for call in self.writer.call_args_list:
+            logged.setdefault(call[0][0], []).extend(step for _, _, _, step in call[0][1])
+        return logged
+
+    def test_init_validates(self):
+        with self.assertRaises(ValueError):
+            MetricBuffer(application=None, directory=self.tmp_dir.name, max_latency=0)
+        with self.assertRaises(ValueError):
+            MetricBuffer(application=None, directory=self.tmp_dir.name, max_pending=0)
+
+    def test_parse_metrics(self):
+        self.assertEqual(
+            parse_metrics("runs/log-metric", json.dumps({"run_id": "r1", **metric(step=3)}).encode()),
+            ("r1", [["loss", 0.5, 1000, 3]]),
+        )
+        self.assertEqual(
+            parse_metrics("runs/log-batch", json.dumps({"run_id": "r1", "metrics": [metric(1), metric(2)]}).encode())[
+                1
+            ],
+            [["loss", 0.5, 1000, 1], ["loss", 0.5, 1000, 2]],
+        )
+        for endpoint, body in [
+            ("runs/log-batch", {"run_id": "r1", "metrics": [metric(1)], "params": [{"key": "a", "value": "1"}]}),
+            ("runs/log-batch", {"run_id": "r1", "metrics": []}),
+            ("runs/log-metric", {"run_id": "r1", "key": "loss", "value": "x", "timestamp": 1}),
+            ("runs/log-metric", {"key": "loss", "value": 1.0, "timestamp": 1}),
+            ("runs/log-metric", {"run_id": "r1", "key": "../loss", "value": 1.0, "timestamp": 1}),
+        ]:
+            self.assertIsNone(parse_metrics(endpoint, json.dumps(body).encode()), body)
+
+    def test_buffers_after_the_first_request_of_a_run(self):
+        for step in range(3):
+            self.assertEqual(self.serve(request("runs/log-metric", {"run_id": "r1", **metric(step)})), "200 OK")
+        self.serve(request("runs/log-batch", {"run_id": "r1", "metrics": [metric(3), metric(4)]}))
+
+        # The first request validated the run through mlflow
+        self.assertEqual(self.calls, [API + "runs/log-metric"])
+        self.assertEqual(self.buffer.buffered, 4)
+        self.writer.assert_not_called()
+
+        self.buffer.close()
+        self.assertEqual(self.logged(), {"r1": [1, 2, 3, 4]})
+        self.assertEqual(self.buffer.flushed, 4)
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+    def test_concurrent_requests_share_a_sync(self):
+        self.serve(request("runs/log-metric", {"run_id": "r1", **metric(0)}))
+        self.buffer.start()
+        syncing, release = threading.Event(), threading.Event()
+        synced = []
+
+        def fsync(descriptor):
+            syncing.set()
+            release.wait(timeout=10)
+            synced.append(descriptor)
+
+        with patch("src.mlflow.tracking.server.wsgi.metric_buffer.os.fsync", side_effect=fsync):
+            first = threading.Thread(
+                target=self.serve, args=(request("runs/log-metric", {"run_id": "r1", **metric(1)}),)
+            )
+            first.start()
+            self.assertTrue(syncing.wait(timeout=10))
+            # Appended while the first sync runs, acknowledged after one more sync.
+            others = [
+                threading.Thread(
+                    target=self.serve, args=(request("runs/log-metric", {"run_id": "r1", **metric(step)}),)
+                )
+                for step in range(2, 5)
+            ]
+            for thread in others:
+                thread.start()
+            while self.buffer.buffered < 4:
+                time.sleep(0.01)
+            release.set()
+            for thread in [first, *others]:
+                thread.join()
+
+        self.assertEqual(len(synced), 2)
+
+    def test_full_buffer_writes_synchronously(self):
+        self.serve(request("runs/log-metric", {"run_id": "r1", **metric(0)}))
+        for step in range(1, 8):
+            self.serve(request("runs/log-metric", {"run_id": "r1", **metric(step)}))
+
+        self.assertEqual(self.buffer.buffered, 5)
+        self.assertEqual(len(self.calls), 3)
+
+    def test_params_are_not_buffered(self):
+        self.serve(request("runs/log-metric", {"run_id": "r1", **metric(0)}))
+        self.serve(
+            request("runs/log-batch", {"run_id": "r1", "metrics": [metric(1)], "params": [{"key": "a", "value": "1"}]})
+        )
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.buffer.buffered, 0)
+
+    def test_rejected_metrics_are_dropped(self):
+        self.writer.side_effect = RejectedMetrics("run is deleted")
+        self.serve(request("runs/log-metric", {"run_id": "r1", **metric(0)}))
+        self.serve(request("runs/log-metric", {"run_id": "r1", **metric(1)}))
+        self.buffer.close()
+
+        self.assertEqual((self.buffer.flushed, self.buffer.dropped), (0, 1))
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+    def test_unavailable_store_keeps_the_journal(self):
+        self.writer.side_effect = ConnectionError("database is unreachable")
+        self.serve(request("runs/log-metric", {"run_id": "r1", **metric(0)}))
+        self.serve(request("runs/log-metric", {"run_id": "r1", **metric(1)}))
+        self.buffer.close()
+
+        self.assertEqual(self.buffer.flushed, 0)
+        journals = os.listdir(self.tmp_dir.name)
+        self.assertEqual(len(journals), 1)
+
+        # The next worker replays the journal once this one exited
+        self.writer.reset_mock(side_effect=True)
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0)
+        os.waitpid(pid, 0)
+        os.rename(os.path.join(self.tmp_dir.name, journals[0]), os.path.join(self.tmp_dir.name, f"{pid}.1.journal"))
+        successor = MetricBuffer(application=None, directory=self.tmp_dir.name, writer=self.writer)
+        successor.start()
+        successor.close()
+
+        self.assertEqual(self.logged(), {"r1": [1]})
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestMetricBuffer())
@@ -0,0 +1,92 @@
+import json
+import math
+import os
+import unittest
+from unittest.mock import patch
+
+from src.mlflow.tracking.server.wsgi.metric_history import (
+    STREAM_METRIC_HISTORY_ENV_VAR,
+    StreamedMetricHistory,
+    apply_metric_history_streaming,
+    serialize_metric_history,
+)
+
+
+def mlflow_json(metrics: list[dict]) -> bytes:
+    """The body mlflow sends (protobuf JSON, indented by two spaces)."""
+
+    return json.dumps({"metrics": metrics} if metrics else {}, indent=2).encode("utf-8")
+
+
+class TestMetricHistory(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.rows = None
+
+        def application(environ, start_response):
+            self.calls.append(environ["QUERY_STRING"])
+            start_response("200 OK", [("Content-Type", "application/json")])
+            return [b"{}"]
+
+        def history(run_id, metric_key):
+            return iter(self.rows) if self.rows is not None else None
+
+        self.streaming = StreamedMetricHistory(application=application, history=history)
+
+    def serve(self, query: str) -> bytes:
+        environ = {"REQUEST_METHOD": "GET", "PATH_INFO": "/api/2.0/mlflow/metrics/get-history", "QUERY_STRING": query}
+        return b"".join(self.streaming(environ, lambda *_: None))
+
+    def test_serialization_matches_mlflow(self):
+        rows = [("loss", float(step) / 3, 1700000000000 + step, step) for step in range(2500)]
+        rows.append(("loss", math.nan, 1, 2500))
+        rows.append(("loss", -math.inf, 2, 2501))
+        expected = [{"key": key, "value": value, "timestamp": ts, "step": step} for key, value, ts, step in rows[:-2]]
+        expected.append({"key": "loss", "value": "NaN", "timestamp": 1, "step": 2500})
+        expected.append({"key": "loss", "value": "-Infinity", "timestamp": 2, "step": 2501})
+
+        chunks = list(serialize_metric_history(metrics=rows))
+
+        self.assertEqual(b"".join(chunks), mlflow_json(expected))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(b"".join(serialize_metric_history(metrics=[])), mlflow_json([]))
+
+    def test_whole_histories_are_streamed(self):
+        self.rows = [("loss", 0.5, 1, 0)]
+        body = self.serve("run_id=r1&metric_key=loss")
+
+        self.assertEqual(json.loads(body), {"metrics": [{"key": "loss", "value": 0.5, "timestamp": 1, "step": 0}]})
+        self.assertEqual(self.calls, [])
+
+    def test_other_requests_are_served_by_mlflow(self):
+        self.rows = []
+        self.serve("run_id=r1&metric_key=loss&max_results=10")
+        self.serve("run_id=r1")
+        self.rows = None
+        self.serve("run_id=r1&metric_key=loss")
+
+        self.assertEqual(len(self.calls), 3)
+
+    def test_failing_queries_are_served_by_mlflow(self):
+        def rows():
+            raise RuntimeError("no such table")
+            yield  # pylint: disable=unreachable
+
+        self.rows = rows()
+        self.assertEqual(self.serve("run_id=r1&metric_key=loss"), b"{}")
+        self.assertEqual(len(self.calls), 1)
+
+    def test_apply_metric_history_streaming(self):
+        def application(_environ, _start_response):
+            return [b""]
+
+        with patch.dict(os.environ, {}):
+            os.environ.pop(STREAM_METRIC_HISTORY_ENV_VAR, None)
+            self.assertIs(apply_metric_history_streaming(application=application), application)
+            os.environ[STREAM_METRIC_HISTORY_ENV_VAR] = "true"
+            self.assertIsInstance(apply_metric_history_streaming(application=application), StreamedMetricHistory)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestMetricHistory())
@@ -0,0 +1,23 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.mlflow.tracking.server.wsgi.metrics import route
+
+
+class TestMetrics(unittest.TestCase):
+    def test_route_labels_by_url_rule(self):
+        request = MagicMock()
+        request.url_rule = "/api/2.0/mlflow-artifacts/artifacts/<path:artifact_path>"
+
+        self.assertEqual(route(request), "/api/2.0/mlflow-artifacts/artifacts/<path:artifact_path>")
+
+    def test_route_labels_unmatched_requests(self):
+        request = MagicMock()
+        request.url_rule = None
+
+        self.assertEqual(route(request), "unmatched")
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestMetrics())
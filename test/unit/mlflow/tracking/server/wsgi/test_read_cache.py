@@ -0,0 +1,166 @@
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from src.mlflow.tracking.server.wsgi.read_cache import (
+    READ_CACHE_ENV_VAR,
+    InvalidationLog,
+    ReadCache,
+    apply_read_cache,
+    build_read_cache_environment,
+    read_scopes,
+    write_scopes,
+)
+
+API: str = "/api/2.0/mlflow/"
+
+
+def request(method: str, endpoint: str, query: str = "", body: dict = None) -> dict:
+    payload: bytes = json.dumps(body).encode("utf-8") if body is not None else b""
+    return {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": API + endpoint,
+        "QUERY_STRING": query,
+        "CONTENT_LENGTH": str(len(payload)),
+        "wsgi.input": io.BytesIO(payload),
+    }
+
+
+class TestReadCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.calls = []
+        self.status = "200 OK"
+
+        def application(environ, start_response):
+            self.calls.append((environ["PATH_INFO"], environ["wsgi.input"].read()))
+            start_response(self.status, [("Content-Type", "application/json")])
+            return [json.dumps({"calls": len(self.calls)}).encode("utf-8")]
+
+        self.cache = ReadCache(application=application, directory=self.tmp_dir.name, ttl=60.0, max_entries=2)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def serve(self, environ: dict) -> tuple[bytes, dict]:
+        headers = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            headers.update(response_headers)
+
+        return b"".join(self.cache(environ, start_response)), headers
+
+    def test_init_validates(self):
+        with self.assertRaises(ValueError):
+            ReadCache(application=None, directory=self.tmp_dir.name, ttl=0)
+        with self.assertRaises(ValueError):
+            ReadCache(application=None, directory=self.tmp_dir.name, max_entries=0)
+
+    def test_scopes(self):
+        self.assertEqual(read_scopes("runs/get", {"run_id": "r1"}), ["all", "run:r1"])
+        self.assertEqual(read_scopes("runs/search", {}), ["all", "runs"])
+        self.assertEqual(write_scopes("runs/log-batch", {"run_id": "r1"}), ["runs", "run:r1"])
+        self.assertEqual(write_scopes("runs/create", {"experiment_id": "0"}), ["runs"])
+        self.assertEqual(write_scopes("experiments/update", {"experiment_id": "1"}), ["experiments", "experiment:1"])
+        self.assertEqual(write_scopes("registered-models/delete", {"name": "m"}), ["models", "model:m"])
+        self.assertEqual(write_scopes("experiments/delete", {"experiment_id": "1"}), ["all"])
+
+    def test_hit(self):
+        first, headers = self.serve(request("GET", "runs/get", "run_id=r1"))
+        self.assertEqual(headers["X-MLflow-Cache"], "miss")
+        second, headers = self.serve(request("GET", "runs/get", "run_id=r1"))
+        self.assertEqual(headers["X-MLflow-Cache"], "hit")
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_search_body_is_part_of_the_key(self):
+        self.serve(request("POST", "runs/search", body={"experiment_ids": ["0"]}))
+        self.serve(request("POST", "runs/search", body={"experiment_ids": ["1"]}))
+        self.serve(request("POST", "runs/search", body={"experiment_ids": ["0"]}))
+
+        self.assertEqual(len(self.calls), 2)
+        # The application still receives the body
+        self.assertEqual(json.loads(self.calls[1][1]), {"experiment_ids": ["1"]})
+
+    def test_write_invalidates_its_run(self):
+        self.serve(request("GET", "runs/get", "run_id=r1"))
+        self.serve(request("GET", "runs/get", "run_id=r2"))
+        self.serve(request("POST", "runs/log-batch", body={"run_id": "r1", "metrics": []}))
+        self.serve(request("GET", "runs/get", "run_id=r1"))
+        self.serve(request("GET", "runs/get", "run_id=r2"))
+
+        # r1 was read again, r2 served from the cache
+        self.assertEqual([path for path, _ in self.calls].count(API + "runs/get"), 3)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_write_of_another_process_invalidates(self):
+        self.serve(request("GET", "registered-models/get", "name=m"))
+        InvalidationLog(directory=self.tmp_dir.name).touch(scopes=["model:m"])
+        self.serve(request("GET", "registered-models/get", "name=m"))
+
+        self.assertEqual(len(self.calls), 2)
+
+    def test_errors_are_not_cached(self):
+        self.status = "404 NOT FOUND"
+        self.serve(request("GET", "experiments/get-by-name", "experiment_name=x"))
+        self.serve(request("GET", "experiments/get-by-name", "experiment_name=x"))
+
+        self.assertEqual(len(self.calls), 2)
+
+    def test_large_responses_are_streamed_uncached(self):
+        def application(environ, start_response):
+            self.calls.append((environ["PATH_INFO"], b""))
+            start_response("200 OK", [("Content-Type", "application/json")])
+            yield from [b"x" * 600, b"y" * 600, b"z"]
+
+        cache = ReadCache(application=application, directory=self.tmp_dir.name, max_entry_bytes=1000)
+        for _ in range(2):
+            body = b"".join(cache(request("GET", "metrics/get-history", "run_id=r1&metric_key=m"), lambda *_: None))
+
+        self.assertEqual(body, b"x" * 600 + b"y" * 600 + b"z")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_entries_expire(self):
+        self.serve(request("GET", "runs/get", "run_id=r1"))
+        with patch("src.mlflow.tracking.server.wsgi.read_cache.time.monotonic", return_value=time.monotonic() + 61):
+            self.serve(request("GET", "runs/get", "run_id=r1"))
+
+        self.assertEqual(len(self.calls), 2)
+
+    def test_least_recently_used_are_evicted(self):
+        for run_id in ["r1", "r2", "r1", "r3", "r1", "r2"]:
+            self.serve(request("GET", "runs/get", f"run_id={run_id}"))
+
+        # r2 was evicted by r3, r1 stayed cached
+        self.assertEqual(len(self.calls), 4)
+
+    def test_uncached_requests_pass_through(self):
+        self.serve(request("GET", "metrics/get-history-bulk", "run_id=r1"))
+        self.serve(request("GET", "metrics/get-history-bulk", "run_id=r1"))
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+    def test_apply_read_cache(self):
+        def application(_environ, _start_response):
+            return [b""]
+
+        with patch.dict(os.environ, {}):
+            os.environ.pop(READ_CACHE_ENV_VAR, None)
+            self.assertIs(apply_read_cache(application=application), application)
+            os.environ.update(build_read_cache_environment(directory=self.tmp_dir.name, ttl=2.0, max_entries=10))
+            cache = apply_read_cache(application=application)
+
+        self.assertIsInstance(cache, ReadCache)
+        self.assertEqual((cache.ttl, cache.max_entries), (2.0, 10))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestReadCache())
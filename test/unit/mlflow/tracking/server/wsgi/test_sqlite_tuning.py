@@ -0,0 +1,165 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+
+from src.mlflow.tracking.server.wsgi.sqlite_tuning import (
+    SQLITE_TUNING_ENV_VAR,
+    SingleWriter,
+    apply_sqlite_tuning,
+    build_tuning_environment,
+    enable_wal,
+    install_connection_pragmas,
+    sqlite_database_path,
+)
+
+FIXTURE_STORE: str = "test/fixtures/mlflow/local/store/mydb.sqlite"
+
+
+class TestSqliteTuning(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = os.path.join(self.tmp_dir, "mydb.sqlite")
+        shutil.copyfile(FIXTURE_STORE, self.store)
+
+    def tearDown(self):
+        install_connection_pragmas(pragmas={})
+        shutil.rmtree(self.tmp_dir)
+
+    def test_sqlite_database_path(self):
+        self.assertEqual(sqlite_database_path("sqlite:///data/mydb.sqlite"), "data/mydb.sqlite")
+        self.assertEqual(sqlite_database_path("sqlite:////data/mydb.sqlite?timeout=5"), "/data/mydb.sqlite")
+        self.assertIsNone(sqlite_database_path("postgresql://host/mlflow"))
+        self.assertIsNone(sqlite_database_path("./mlruns"))
+
+    def test_enable_wal(self):
+        self.assertEqual(enable_wal(path=self.store), "wal")
+        with sqlite3.connect(self.store) as connection:
+            self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_build_tuning_environment(self):
+        settings = json.loads(build_tuning_environment(busy_timeout=5000)[SQLITE_TUNING_ENV_VAR])
+
+        self.assertEqual(settings["pragmas"]["busy_timeout"], "5000")
+        self.assertEqual(settings["pragmas"]["synchronous"], "NORMAL")
+        self.assertIsNone(settings["writer_lock"])
+
+    def test_install_connection_pragmas(self):
+        install_connection_pragmas(pragmas={"busy_timeout": "1234", "synchronous": "NORMAL"})
+        # Installing again replaces the pragmas rather than adding a listener
+        install_connection_pragmas(pragmas={"busy_timeout": "4321", "synchronous": "NORMAL"})
+
+        engine = create_engine(f"sqlite:///{self.store}")
+        with engine.connect() as connection:
+            self.assertEqual(connection.execute(text("PRAGMA busy_timeout")).scalar(), 4321)
+            # NORMAL
+            self.assertEqual(connection.execute(text("PRAGMA synchronous")).scalar(), 1)
+        engine.dispose()
+
+    def test_apply_sqlite_tuning_without_tuning(self):
+        def application(_environ, _start_response):
+            return [b""]
+
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop(SQLITE_TUNING_ENV_VAR, None)
+            self.assertIs(apply_sqlite_tuning(application=application), application)
+
+    def test_apply_sqlite_tuning_with_single_writer(self):
+        def application(_environ, _start_response):
+            return [b""]
+
+        lock_path = os.path.join(self.tmp_dir, "writer.lock")
+        with patch.dict(os.environ, build_tuning_environment(busy_timeout=1000, writer_lock=lock_path)):
+            wrapped = apply_sqlite_tuning(application=application)
+        self.addCleanup(wrapped.close)
+
+        self.assertIsInstance(wrapped, SingleWriter)
+        self.assertEqual(wrapped.lock_path, lock_path)
+
+    def test_single_writer_serializes_writes(self):
+        active = []
+        overlaps = []
+
+        def application(environ, _start_response):
+            active.append(environ["PATH_INFO"])
+            if len(active) > 1:
+                overlaps.append(list(active))
+            time.sleep(0.02)
+            active.remove(environ["PATH_INFO"])
+            return [b"{}"]
+
+        writer = SingleWriter(application=application, lock_path=os.path.join(self.tmp_dir, "writer.lock"))
+        self.addCleanup(writer.close)
+        environ = {"REQUEST_METHOD": "POST", "PATH_INFO": "/api/2.0/mlflow/runs/log-batch"}
+        threads = [
+            threading.Thread(target=lambda: self.assertEqual(writer(dict(environ), None), [b"{}"])) for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(overlaps, [])
+
+    def test_single_writer_excludes_forked_processes(self):
+        holding_read, holding_write = os.pipe()
+        released_read, released_write = os.pipe()
+
+        def hold(_environ, _start_response):
+            os.write(holding_write, b"1")
+            time.sleep(0.3)
+            os.write(released_write, b"1")
+            return [b"{}"]
+
+        def check(_environ, _start_response):
+            os.set_blocking(released_read, False)
+            try:
+                return [os.read(released_read, 1)]
+            except BlockingIOError:
+                return [b"overlapped"]
+
+        # Built (and used) before forking, like the middleware of a preloading gunicorn master.
+        application = {"serve": hold}
+        writer = SingleWriter(
+            application=lambda environ, start_response: application["serve"](environ, start_response),
+            lock_path=os.path.join(self.tmp_dir, "writer.lock"),
+        )
+        self.addCleanup(writer.close)
+        environ = {"REQUEST_METHOD": "POST", "PATH_INFO": "/api/2.0/mlflow/runs/log-batch"}
+        application["serve"] = lambda _environ, _start_response: [b"{}"]
+        writer(dict(environ), None)
+
+        pid = os.fork()
+        if pid == 0:
+            application["serve"] = hold
+            writer(dict(environ), None)
+            os._exit(0)
+        os.read(holding_read, 1)
+        application["serve"] = check
+        result = writer(dict(environ), None)
+        os.waitpid(pid, 0)
+        for descriptor in [holding_read, holding_write, released_read, released_write]:
+            os.close(descriptor)
+
+        self.assertEqual(result, [b"1"])
+
+    def test_single_writer_passes_reads_through(self):
+        response = iter([b"{}"])
+        writer = SingleWriter(
+            application=lambda _environ, _start_response: response, lock_path=os.path.join(self.tmp_dir, "writer.lock")
+        )
+        self.addCleanup(writer.close)
+
+        self.assertIs(writer({"REQUEST_METHOD": "GET", "PATH_INFO": "/api/2.0/mlflow/runs/get"}, None), response)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestSqliteTuning())